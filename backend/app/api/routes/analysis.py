@@ -30,6 +30,10 @@ from app.services.streetlight import (
 from app.core.config import settings
 from app.core.feature_flags import FeatureFlags, use_local_demographics
 from app.core.database import get_db
+from app.services.data_version import bump_data_version
+from app.services.opportunity_score_job import request_score_refresh
+from app.services.store_index import invalidate_store_index
+from app.utils.http_clients import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -214,6 +218,16 @@ async def get_demographics(request: DemographicsRequest):
                 )
             except Exception:
                 pass
+        elif not use_local_source and FeatureFlags.should_fallback_to_local():
+            logger.warning(f"ArcGIS demographics failed, falling back to local census data: {e}")
+            try:
+                return await fetch_census_demographics(
+                    latitude=request.latitude,
+                    longitude=request.longitude,
+                    radii_miles=[1, 3, 5]
+                )
+            except Exception:
+                pass
         raise HTTPException(status_code=500, detail=f"Error fetching demographics: {str(e)}")
 
 
@@ -338,7 +352,7 @@ async def get_streetlight_usage():
         # Scope to trial period (started Feb 10, 2026, expires Mar 10, 2026)
         params = {"term_start": "2026-02-10T00:00:00.000Z"}
 
-        async with httpx.AsyncClient() as http:
+        async with http_client("streetlight") as http:
             response = await http.get(
                 url, headers=client.headers, params=params, timeout=30
             )
@@ -432,7 +446,7 @@ async def geocode_address_google(address: str, api_key: str) -> tuple[float, flo
     url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {"address": address, "key": api_key}
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("google") as client:
         try:
             response = await client.get(url, params=params, timeout=10)
             response.raise_for_status()
@@ -446,6 +460,9 @@ async def geocode_address_google(address: str, api_key: str) -> tuple[float, flo
             return None
 
 
+REGEOCODE_CHUNK_SIZE = 50  # stores geocoded concurrently, committed together
+
+
 async def run_regeocode_task():
     """Background task to re-geocode all stores."""
     global regeocode_status
@@ -472,39 +489,42 @@ async def run_regeocode_task():
         regeocode_status["updated"] = 0
         regeocode_status["failed"] = 0
 
-        for i, store in enumerate(stores):
+        async def geocode_store(store) -> Optional[tuple[float, float]]:
             store_id, street, city, state, postal_code, old_lat, old_lng = store
-
-            regeocode_status["progress"] = i + 1
-            regeocode_status["message"] = f"Processing store {i+1}/{len(stores)}"
-
             parts = [p for p in [street, city, state, postal_code] if p]
             if not parts:
-                regeocode_status["failed"] += 1
-                continue
-
-            address = ", ".join(parts) + ", USA"
-
-            coords = await geocode_address_google(address, api_key)
-
-            if coords:
-                new_lat, new_lng = coords
-                db.execute(text("""
-                    UPDATE stores
-                    SET latitude = :lat,
-                        longitude = :lng
-                    WHERE id = :id
-                """), {"lat": new_lat, "lng": new_lng, "id": store_id})
-                regeocode_status["updated"] += 1
-            else:
-                regeocode_status["failed"] += 1
-
-            await asyncio.sleep(0.05)
-
-            if (i + 1) % 50 == 0:
-                db.commit()
+                return None
+            return await geocode_address_google(", ".join(parts) + ", USA", api_key)
+
+        # Requests in a chunk run concurrently; the shared Google rate
+        # limiter (app/utils/rate_limits.py) paces them.
+        for start in range(0, len(stores), REGEOCODE_CHUNK_SIZE):
+            chunk = stores[start:start + REGEOCODE_CHUNK_SIZE]
+            results = await asyncio.gather(*(geocode_store(store) for store in chunk))
+
+            for store, coords in zip(chunk, results):
+                if coords:
+                    new_lat, new_lng = coords
+                    db.execute(text("""
+                        UPDATE stores
+                        SET latitude = :lat,
+                            longitude = :lng
+                        WHERE id = :id
+                    """), {"lat": new_lat, "lng": new_lng, "id": store[0]})
+                    regeocode_status["updated"] += 1
+                else:
+                    regeocode_status["failed"] += 1
+
+            db.commit()
+            done = start + len(chunk)
+            regeocode_status["progress"] = done
+            regeocode_status["message"] = f"Processing store {done}/{len(stores)}"
 
         db.commit()
+        # Raw UPDATEs bypass ORM events, so signal the change explicitly
+        invalidate_store_index()
+        bump_data_version("stores re-geocoded")
+        request_score_refresh()
         regeocode_status["message"] = f"Complete! Updated {regeocode_status['updated']}, failed {regeocode_status['failed']}"
 
     except Exception as e:
@@ -10,6 +10,8 @@ import logging
 from fastapi import APIRouter, HTTPException, Query
 
 from app.core.config import settings
+from app.utils.http_clients import http_client
+from app.utils.ttl_cache import KB, MB, TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,18 @@ ACS_LAYERS = {
     "tract": 2,
 }
 
+# Boundary layers only change with each ACS / TIGER vintage; whole-state
+# GeoJSON is large, so entries are compressed and shared across workers.
+BOUNDARY_CACHE_TTL = 7 * 86400  # 7 days
+BOUNDARY_CACHE_MAX_BYTES = 128 * MB
+_boundary_cache = TTLCache(
+    "boundaries", BOUNDARY_CACHE_TTL,
+    max_entries=200,
+    max_bytes=BOUNDARY_CACHE_MAX_BYTES,
+    compress_min_bytes=64 * KB,
+    l2=True,
+)
+
 # State bounding boxes for ZCTA queries (ZCTAs don't have a STATE field)
 STATE_BOUNDS = {
     "AL": {"minX": -88.5, "minY": 30.1, "maxX": -84.9, "maxY": 35.0},
@@ -135,6 +149,11 @@ async def get_demographic_boundaries(
             detail=f"Invalid geography: {geography}. Supported: tract, county"
         )
 
+    cache_key = f"acs_{state_upper}_{geography_lower}_{metric}"
+    cached = await _boundary_cache.aget(cache_key)
+    if cached is not None:
+        return cached
+
     fips_code = STATE_FIPS[state_upper]
     layer_index = ACS_LAYERS[geography_lower]
 
@@ -153,9 +172,9 @@ async def get_demographic_boundaries(
         "outSR": "4326",
     }
 
-    async with httpx.AsyncClient(timeout=90.0) as client:
+    async with http_client("arcgis") as client:
         try:
-            response = await client.get(url, params=params)
+            response = await client.get(url, params=params, timeout=90.0)
             response.raise_for_status()
             geojson = response.json()
 
@@ -182,6 +201,7 @@ async def get_demographic_boundaries(
                     elif metric == "income":
                         props["metric_value"] = income
 
+            _boundary_cache.set(cache_key, geojson)
             return geojson
 
         except httpx.HTTPStatusError as e:
@@ -217,6 +237,11 @@ async def get_county_boundaries(
             detail=f"Invalid state: {state}. Supported states: {', '.join(STATE_FIPS.keys())}"
         )
 
+    cache_key = f"counties_{state_upper}"
+    cached = await _boundary_cache.aget(cache_key)
+    if cached is not None:
+        return cached
+
     fips_code = STATE_FIPS[state_upper]
 
     params = {
@@ -227,11 +252,13 @@ async def get_county_boundaries(
         "outSR": "4326",
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with http_client("tigerweb") as client:
         try:
             response = await client.get(TIGER_COUNTIES_URL, params=params)
             response.raise_for_status()
-            return response.json()
+            geojson = response.json()
+            _boundary_cache.set(cache_key, geojson)
+            return geojson
         except httpx.HTTPStatusError as e:
             raise HTTPException(
                 status_code=e.response.status_code,
@@ -256,6 +283,11 @@ async def get_city_boundaries(
             detail=f"Invalid state: {state}. Supported states: {', '.join(STATE_FIPS.keys())}"
         )
 
+    cache_key = f"cities_{state_upper}"
+    cached = await _boundary_cache.aget(cache_key)
+    if cached is not None:
+        return cached
+
     fips_code = STATE_FIPS[state_upper]
 
     params = {
@@ -266,11 +298,13 @@ async def get_city_boundaries(
         "outSR": "4326",
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with http_client("tigerweb") as client:
         try:
             response = await client.get(TIGER_PLACES_URL, params=params)
             response.raise_for_status()
-            return response.json()
+            geojson = response.json()
+            _boundary_cache.set(cache_key, geojson)
+            return geojson
         except httpx.HTTPStatusError as e:
             raise HTTPException(
                 status_code=e.response.status_code,
@@ -300,6 +334,11 @@ async def get_zipcode_boundaries(
             detail=f"Invalid state: {state}. Supported states: {', '.join(STATE_FIPS.keys())}"
         )
 
+    cache_key = f"zipcodes_{state_upper}"
+    cached = await _boundary_cache.aget(cache_key)
+    if cached is not None:
+        return cached
+
     bounds = STATE_BOUNDS[state_upper]
 
     params = {
@@ -313,11 +352,13 @@ async def get_zipcode_boundaries(
         "outSR": "4326",
     }
 
-    async with httpx.AsyncClient(timeout=90.0) as client:
+    async with http_client("tigerweb") as client:
         try:
             response = await client.get(TIGER_ZCTAS_URL, params=params)
             response.raise_for_status()
-            return response.json()
+            geojson = response.json()
+            _boundary_cache.set(cache_key, geojson)
+            return geojson
         except httpx.HTTPStatusError as e:
             raise HTTPException(
                 status_code=e.response.status_code,
@@ -36,6 +36,9 @@ from app.services.mapbox_isochrone import (
 )
 from app.core.config import settings
 from app.core.database import get_db
+from app.utils.cache_metrics import get_cache_metrics
+from app.utils.circuit_breakers import get_circuit_breaker_stats
+from app.utils.rate_limits import get_rate_limit_stats
 
 logger = logging.getLogger(__name__)
 
@@ -286,6 +289,30 @@ async def get_matrix_cache_statistics():
     return get_cache_stats()
 
 
+@router.get("/cache-metrics/")
+def get_cache_metrics_endpoint(include_workers: bool = True):
+    """
+    Hit/miss/stale-hit rates, evictions, bytes held, average entry age and
+    upstream calls avoided for every cache namespace.
+
+    Reported for this worker, per worker (snapshots shared through the L2
+    cache tier), and aggregated across workers.
+    """
+    return get_cache_metrics(include_workers=include_workers)
+
+
+@router.get("/rate-limits/")
+async def get_rate_limit_statistics():
+    """Per-provider rate limits with this worker's request, throttling and retry counts."""
+    return get_rate_limit_stats()
+
+
+@router.get("/circuit-breakers/")
+async def get_circuit_breaker_statistics():
+    """Per-provider circuit breaker state, failures, fast-failed calls and hedged requests (this worker)."""
+    return get_circuit_breaker_stats()
+
+
 @router.post("/matrix/clear-cache/")
 async def clear_matrix_cache_endpoint():
     """Clear the Matrix API cache."""
@@ -18,9 +18,14 @@ Ranking (site quality first):
   7. Distress tiebreaker (up to 10 pts)
 """
 
+import asyncio
+import json
 import logging
+import math
 
-from fastapi import APIRouter, Depends, HTTPException
+import numpy as np
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
@@ -38,135 +43,71 @@ from app.services.attom import (
 )
 from app.services.local_property import (
     search_properties_by_bounds as local_search_bounds,
+    _convert_county_property_to_listing,
 )
 from app.core.config import settings
 from app.core.feature_flags import FeatureFlags, use_local_demographics, use_local_properties
-from app.core.database import get_db
-from app.models.store import Store
+from app.core.database import get_db, SessionLocal
+from app.models.activity_node import ActivityNode
+from app.models.opportunity_score import OpportunityScore
 from app.models.scraped_listing import ScrapedListing
-from app.utils.geo import haversine
+from app.utils.circuit_breakers import circuit_open
+from app.utils.geo import haversine, nearest_k
+from app.utils.spatial_hash import DedupResult, dedupe_by_proximity
+from app.utils.single_flight import SingleFlight
+from app.utils.timing import StageTimer
+from app.services.store_index import StoreIndex, get_store_index, NO_STORE_DISTANCE
 from app.services.viewport_cache import (
-    get_cached_demographics,
+    get_demographics_allow_stale,
     cache_demographics,
-    get_cached_retail_nodes,
+    demographics_cache_key,
+    get_retail_nodes_allow_stale,
     cache_retail_nodes,
+    retail_nodes_cache_key,
     get_cached_attom,
     cache_attom,
+    get_cached_property_tiles,
+    cache_property_tile,
+    property_tiles_for_bounds,
+    property_tile_bounds,
+    property_tile_of,
+    get_cached_opportunity_search,
+    cache_opportunity_search,
 )
+from app.services.cache_warmer import get_warm_status, run_warm_task
+from app.services.data_version import get_data_version
 from app.services.arcgis import fetch_demographics as fetch_arcgis_demographics
-from app.services.census_demographics import fetch_demographics as fetch_census_demographics
+from app.services.census_demographics import (
+    fetch_demographics as fetch_census_demographics,
+    fetch_bulk_ring_demographics,
+)
 from app.services.mapbox_places import fetch_mapbox_pois
+from app.services.opportunity_score_job import (
+    ANCHOR_NODE_CATEGORY,
+    MaterializedInputs,
+    query_materialized_opportunities,
+    score_with_materialized_inputs,
+    run_refresh_task,
+    get_refresh_status,
+)
+from app.services.opportunity_scoring import (
+    VERIZON_FAMILY_BRANDS,
+    DEFAULT_MIN_PARCEL_ACRES,
+    DEFAULT_MAX_PARCEL_ACRES,
+    DEFAULT_MIN_BUILDING_SQFT,
+    DEFAULT_MAX_BUILDING_SQFT,
+    CORPORATE_GATE_MILES,
+    _filter_properties_for_opportunities,
+    _calculate_priority_rank,
+    build_scoring_features,
+    score_priority_batch,
+    top_k_indices,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/opportunities", tags=["opportunities"])
 
-# Verizon-family brands for co-location scoring
-VERIZON_FAMILY_BRANDS = ["russell_cellular", "victra", "verizon_corporate"]
-
-# State-level average population density (people per sq mi) for relative scoring.
-# Source: US Census Bureau. Used to normalize density so rural Iowa retail hubs
-# score well relative to their state, not against absolute metro thresholds.
-STATE_DENSITY_BASELINES = {
-    # Primary target markets
-    "IA": 55.0,    # Iowa
-    "NE": 25.0,    # Nebraska
-    # Secondary target markets
-    "NV": 28.0,    # Nevada
-    "ID": 22.0,    # Idaho
-    # Common surrounding states (for edge cases)
-    "MN": 70.0,    # Minnesota
-    "SD": 12.0,    # South Dakota
-    "MO": 88.0,    # Missouri
-    "WI": 108.0,   # Wisconsin
-    "IL": 230.0,   # Illinois
-    "KS": 36.0,    # Kansas
-    "CO": 56.0,    # Colorado
-    "WY": 6.0,     # Wyoming
-    "MT": 8.0,     # Montana
-    "UT": 40.0,    # Utah
-    "OR": 44.0,    # Oregon
-    "WA": 115.0,   # Washington
-    # Fallback for any other state
-    "_default": 90.0,
-}
-
-# Land use keywords indicating incompatible commercial uses (can't convert to wireless retail)
-EXCLUDED_LAND_USE_KEYWORDS = {
-    # Gas/Auto
-    "gas station", "service station", "auto repair", "car wash", "tire",
-    "oil change", "auto body", "auto dealer", "parking garage", "parking lot",
-    "auto parts", "auto service",
-    # Food/Drink
-    "restaurant", "fast food", "bar ", "tavern", "brewery", "pizza",
-    "coffee shop", "bakery", "deli", "liquor store", "ice cream", "donut",
-    # Medical
-    "dental", "medical", "hospital", "clinic", "veterinar", "pharmacy",
-    "optom", "chiropract", "urgent care", "dialysis", "physician",
-    # Finance
-    "bank", "credit union",
-    # Lodging
-    "hotel", "motel", "inn ", "resort",
-    # Religious/Civic
-    "church", "mosque", "temple", "synagogue", "worship", "funeral",
-    "cemetery", "mortuary", "cremator",
-    # Industrial/Utility
-    "warehouse", "storage", "industrial", "manufacturing", "plant ",
-    "utility", "water treatment",
-    # Government
-    "government", "post office", "fire station", "police", "library",
-    "courthouse",
-    # Education
-    "school", "university", "college", "daycare", "child care",
-    # Other incompatible
-    "laundromat", "dry clean", "salon", "barber", "tattoo", "nail salon",
-    "gym", "fitness", "bowling", "theater", "cinema", "nightclub",
-    "car dealer", "grocery", "supermarket", "convenience store",
-    # Residential (NOT suitable for commercial retail)
-    "residential", "single family", "single-family", "multifamily", "multi-family",
-    "apartment", "condominium", "condo", "townhouse", "townhome", "duplex",
-    "triplex", "fourplex", "mobile home", "manufactured home", "rv park",
-    "trailer park", "assisted living", "nursing home", "senior living",
-    "group home", "halfway house",
-    # Parks/Recreation
-    "park", "playground", "recreation", "sports field", "athletic",
-    "golf course", "golf ", "tennis court", "swimming pool", "skate park",
-    # Agriculture
-    "farm", "agricultural", "ranch", "crop", "orchard", "nursery",
-    "vineyard", "greenhouse", "livestock", "dairy", "grain",
-    # Infrastructure
-    "railroad", "rail yard", "airport", "airstrip", "helipad",
-    "cell tower", "telecommunication", "substation", "power line",
-    # Environmental/Waste
-    "junkyard", "scrapyard", "landfill", "dump ", "quarry", "mine ",
-    "stormwater", "retention pond", "drainage", "sewage", "wastewater",
-    # Waterfront/Outdoor
-    "campground", "marina", "boat ramp", "fishing",
-    # Advertising
-    "billboard",
-}
-
-# Land use keywords indicating availability (vacant, former, closed, etc.)
-AVAILABILITY_LAND_USE_KEYWORDS = {
-    "vacant", "former", "closed", "abandoned", "demolished", "unused",
-}
-
-
-def _is_excluded_land_use(land_use: str | None) -> bool:
-    """Check if a property's land use indicates an incompatible commercial use."""
-    if not land_use:
-        return False
-    land_use_lower = land_use.lower()
-    return any(keyword in land_use_lower for keyword in EXCLUDED_LAND_USE_KEYWORDS)
-
-
-def _has_availability_keywords(land_use: str | None) -> bool:
-    """Check if land use text indicates the property is available (vacant, former, closed, etc.)."""
-    if not land_use:
-        return False
-    land_use_lower = land_use.lower()
-    return any(keyword in land_use_lower for keyword in AVAILABILITY_LAND_USE_KEYWORDS)
-
 
 def _fetch_scraped_listings(
     db: Session,
@@ -281,37 +222,37 @@ def _fetch_scraped_listings(
 def _merge_and_deduplicate(
     attom_properties: List[PropertyListing],
     scraped_properties: List[PropertyListing],
-) -> List[PropertyListing]:
+) -> DedupResult[PropertyListing]:
     """
     Merge ATTOM and scraped properties, deduplicating by proximity.
     If a scraped listing is within ~50m of an ATTOM property, keep the scraped version.
+
+    Returns a DedupResult whose ``kept`` list is scraped listings followed by
+    surviving ATTOM properties, and whose ``merged_into`` maps each dropped
+    ATTOM id to the scraped listing id that replaced it.
     """
-    if not scraped_properties:
-        return attom_properties
+    result = dedupe_by_proximity(
+        preferred=scraped_properties,
+        candidates=attom_properties,
+        coords=lambda p: (p.latitude, p.longitude),
+        key=lambda p: p.id,
+    )
 
-    # Build set of scraped locations for quick proximity check
-    scraped_coords = [(p.latitude, p.longitude) for p in scraped_properties]
+    if result.removed > 0:
+        logger.info(f"Dedup: removed {result.removed} ATTOM properties overlapping with scraped listings")
+        logger.debug(f"Dedup merges: {result.merged_into}")
 
-    deduplicated_attom = []
-    for prop in attom_properties:
-        is_duplicate = False
-        for slat, slng in scraped_coords:
-            if abs(prop.latitude - slat) < 0.0005 and abs(prop.longitude - slng) < 0.0005:
-                is_duplicate = True
-                break
-        if not is_duplicate:
-            deduplicated_attom.append(prop)
+    return result
 
-    removed = len(attom_properties) - len(deduplicated_attom)
-    if removed > 0:
-        logger.info(f"Dedup: removed {removed} ATTOM properties overlapping with scraped listings")
 
-    return scraped_properties + deduplicated_attom
+def _located(properties: List[PropertyListing]) -> List[PropertyListing]:
+    """Properties that have coordinates (distance scoring skips the rest)."""
+    return [p for p in properties if p.latitude is not None and p.longitude is not None]
 
 
 def _calculate_corporate_store_distances(
     properties: List[PropertyListing],
-    db: Session,
+    store_index: StoreIndex,
     bounds_min_lat: float,
     bounds_max_lat: float,
     bounds_min_lng: float,
@@ -328,36 +269,30 @@ def _calculate_corporate_store_distances(
     lat_buffer = buffer_miles / 69.0
     lng_buffer = buffer_miles / 55.0
 
-    corporate_stores = db.query(Store).filter(
-        Store.brand == "verizon_corporate",
-        Store.latitude.isnot(None),
-        Store.longitude.isnot(None),
-        Store.latitude >= bounds_min_lat - lat_buffer,
-        Store.latitude <= bounds_max_lat + lat_buffer,
-        Store.longitude >= bounds_min_lng - lng_buffer,
-        Store.longitude <= bounds_max_lng + lng_buffer,
-    ).all()
+    located = _located(properties)
+    result = store_index.nearest(
+        [p.latitude for p in located],
+        [p.longitude for p in located],
+        brands=["verizon_corporate"],
+        bounds=(
+            bounds_min_lat - lat_buffer,
+            bounds_max_lat + lat_buffer,
+            bounds_min_lng - lng_buffer,
+            bounds_max_lng + lng_buffer,
+        ),
+    )
 
     distance_map: dict[str, float] = {}
-    for prop in properties:
-        if prop.latitude is None or prop.longitude is None:
-            continue
-        if not corporate_stores:
-            # No corporate stores nearby - maximum gap
-            distance_map[prop.id] = 999.0
-            continue
-        min_dist = min(
-            haversine(prop.longitude, prop.latitude, store.longitude, store.latitude)
-            for store in corporate_stores
-        )
-        distance_map[prop.id] = round(min_dist, 2)
+    for prop, dist in zip(located, result.distances.tolist()):
+        # No corporate stores nearby - maximum gap
+        distance_map[prop.id] = round(dist, 2) if result.stores_in_range else NO_STORE_DISTANCE
 
-    return distance_map, len(corporate_stores)
+    return distance_map, result.stores_in_range
 
 
 def _calculate_verizon_family_distances(
     properties: List[PropertyListing],
-    db: Session,
+    store_index: StoreIndex,
     bounds_min_lat: float,
     bounds_max_lat: float,
     bounds_min_lng: float,
@@ -375,353 +310,54 @@ def _calculate_verizon_family_distances(
     lat_buffer = buffer_miles / 69.0
     lng_buffer = buffer_miles / 55.0
 
-    vz_stores = db.query(Store).filter(
-        Store.brand.in_(VERIZON_FAMILY_BRANDS),
-        Store.latitude.isnot(None),
-        Store.longitude.isnot(None),
-        Store.latitude >= bounds_min_lat - lat_buffer,
-        Store.latitude <= bounds_max_lat + lat_buffer,
-        Store.longitude >= bounds_min_lng - lng_buffer,
-        Store.longitude <= bounds_max_lng + lng_buffer,
-    ).all()
+    located = _located(properties)
+    result = store_index.nearest(
+        [p.latitude for p in located],
+        [p.longitude for p in located],
+        brands=VERIZON_FAMILY_BRANDS,
+        bounds=(
+            bounds_min_lat - lat_buffer,
+            bounds_max_lat + lat_buffer,
+            bounds_min_lng - lng_buffer,
+            bounds_max_lng + lng_buffer,
+        ),
+    )
 
     distance_map: dict[str, tuple[float, str]] = {}
-    for prop in properties:
-        if prop.latitude is None or prop.longitude is None:
-            continue
-        if not vz_stores:
-            distance_map[prop.id] = (999.0, "none")
-            continue
-        nearest_dist = None
-        nearest_brand = ""
-        for store in vz_stores:
-            d = haversine(prop.longitude, prop.latitude, store.longitude, store.latitude)
-            if nearest_dist is None or d < nearest_dist:
-                nearest_dist = d
-                nearest_brand = store.brand
-        distance_map[prop.id] = (round(nearest_dist, 2), nearest_brand)
+    for prop, dist, brand in zip(located, result.distances.tolist(), result.brands):
+        if not result.stores_in_range:
+            distance_map[prop.id] = (NO_STORE_DISTANCE, "none")
+        else:
+            distance_map[prop.id] = (round(dist, 2), brand)
 
-    return distance_map, len(vz_stores)
+    return distance_map, result.stores_in_range
 
 
-# ---------------------------------------------------------------------------
-# Eligibility filter — 3 clear categories
-# ---------------------------------------------------------------------------
-
-def _filter_properties_for_opportunities(
+def _calculate_retail_anchor_distances(
     properties: List[PropertyListing],
-    min_parcel_acres: float,
-    max_parcel_acres: float,
-    min_building_sqft: Optional[float],
-    max_building_sqft: Optional[float],
-    include_retail: bool,
-    include_office: bool,
-    include_land: bool,
-) -> List[PropertyListing]:
+    anchor_pois: list[dict],
+) -> dict[str, dict]:
     """
-    Apply CSOKi eligibility filter with 3 categories:
-
-    Category A — Vacant Land (ATTOM):
-        property_type == LAND, lot 0.8-2ac, not excluded land use
+    Calculate distance from each property to the nearest retail anchor POI.
 
-    Category B — For-Lease Listings (Crexi/LoopNet):
-        Already confirmed available, size-filtered during import
-
-    Category C — Vacant Retail/Office (ATTOM):
-        property_type in (RETAIL, OFFICE), building 2500-6000 sqft,
-        must have vacancy evidence, not excluded land use, not multi-tenant
+    Returns:
+        {property_id: {"distance": miles, "name": anchor_name}}
     """
-    filtered = []
-
-    for prop in properties:
-        # Property type gate — only retail, office, and land
-        if prop.property_type == PropertyType.RETAIL and not include_retail:
-            continue
-        if prop.property_type == PropertyType.OFFICE and not include_office:
-            continue
-        if prop.property_type == PropertyType.LAND and not include_land:
-            continue
-        if prop.property_type not in (PropertyType.RETAIL, PropertyType.OFFICE, PropertyType.LAND):
-            continue
-
-        is_scraped = prop.source in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO)
-
-        # --- Category B: For-lease listings pass through ---
-        if is_scraped:
-            filtered.append(prop)
-            continue
-
-        # Excluded land uses apply to all ATTOM properties
-        if _is_excluded_land_use(prop.land_use):
-            continue
-
-        # --- Category A: Vacant Land ---
-        if prop.property_type == PropertyType.LAND:
-            # Lot size filter
-            if prop.lot_size_acres:
-                if prop.lot_size_acres < min_parcel_acres or prop.lot_size_acres > max_parcel_acres:
-                    continue
-            filtered.append(prop)
-            continue
-
-        # --- Category C: Vacant Retail/Office ---
-        if prop.property_type in (PropertyType.RETAIL, PropertyType.OFFICE):
-            # Building size filter
-            if prop.sqft:
-                if min_building_sqft and prop.sqft < min_building_sqft:
-                    continue
-                if max_building_sqft and prop.sqft > max_building_sqft:
-                    continue
-
-            # Multi-tenant heuristic
-            if prop.sqft and prop.sqft > 10000:
-                signal_descriptions = " ".join(
-                    [s.description.lower() for s in prop.opportunity_signals]
-                )
-                land_use_lower = (prop.land_use or "").lower()
-                if any(
-                    term in signal_descriptions or term in land_use_lower
-                    for term in ["multi", "center", "plaza", "strip"]
-                ):
-                    continue
-
-            # Must have vacancy evidence
-            prop_signal_types = {s.signal_type for s in prop.opportunity_signals}
-            has_vacancy = "vacant_property" in prop_signal_types
-            has_availability = _has_availability_keywords(prop.land_use)
-            if not has_vacancy and not has_availability:
-                continue
-
-            filtered.append(prop)
-
-    logger.info(
-        f"Eligibility filter: {len(filtered)} of {len(properties)} passed "
-        f"(scraped={sum(1 for p in filtered if p.source in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO))}, "
-        f"land={sum(1 for p in filtered if p.property_type == PropertyType.LAND)}, "
-        f"vacant_bldg={sum(1 for p in filtered if p.property_type in (PropertyType.RETAIL, PropertyType.OFFICE) and p.source not in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO))})"
+    located = _located(properties)
+    if not anchor_pois or not located:
+        return {}
+
+    distances, indices = nearest_k(
+        np.array([p.latitude for p in located]),
+        np.array([p.longitude for p in located]),
+        np.array([a["lat"] for a in anchor_pois], dtype=np.float64),
+        np.array([a["lng"] for a in anchor_pois], dtype=np.float64),
+        k=1,
     )
-    return filtered
-
-
-# ---------------------------------------------------------------------------
-# Site-quality-first scoring (v2 — relative density, income, Goldilocks gap)
-# ---------------------------------------------------------------------------
-
-def _calculate_priority_rank(
-    listing: PropertyListing,
-    nearest_corporate_distance: Optional[float] = None,
-    nearest_retail_node_distance: Optional[float] = None,
-    nearest_vz_family_distance: Optional[float] = None,
-    area_population_1mi: Optional[int] = None,
-    area_population_3mi: Optional[int] = None,
-    area_density_1mi: Optional[float] = None,
-    area_density_3mi: Optional[float] = None,
-    area_income_3mi: Optional[int] = None,
-) -> tuple[int, List[str]]:
-    """
-    Calculate site-quality-first ranking score (v2).
-
-    Returns (rank_score, priority_signals)
-    Higher rank_score = higher priority
-
-    Tier 1: Relative Population Density (0-35)
-    Tier 2: Median Household Income (0-25)
-    Tier 3: Retail Anchor Proximity (0-30)
-    Tier 4: Corporate Gap — Goldilocks Zone (0-30)
-    Tier 5: Availability Quality (0-20) — equalized
-    Tier 6: Size Fit (0-15)
-    Tier 7: VZ-Family Co-location (0-10)
-    Tier 8: Distress Tiebreaker (0-15)
-
-    Max possible: 180 pts. Practical excellent: 120+
-    """
-    rank_score = 0
-    priority_signals = []
-
-    signal_types = {s.signal_type for s in listing.opportunity_signals}
-
-    # === TIER 1: RELATIVE POPULATION DENSITY (up to 35 pts) ===
-    # Uses density ratio to state baseline so rural Iowa retail hubs score well
-
-    if area_density_1mi is not None or area_density_3mi is not None:
-        state = (listing.state or "").upper()
-        baseline = STATE_DENSITY_BASELINES.get(state, STATE_DENSITY_BASELINES["_default"])
-
-        density = area_density_1mi if area_density_1mi is not None else area_density_3mi
-        ratio = density / baseline if baseline > 0 else 0
-
-        density_pts = 0
-        if ratio >= 50:
-            density_pts = 35
-            priority_signals.append(f"Urban-core density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
-        elif ratio >= 20:
-            density_pts = 30
-            priority_signals.append(f"High density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
-        elif ratio >= 10:
-            density_pts = 25
-            priority_signals.append(f"Good density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
-        elif ratio >= 5:
-            density_pts = 18
-            priority_signals.append(f"Moderate density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
-        elif ratio >= 2:
-            density_pts = 8
-            priority_signals.append(f"Low density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
-
-        # Bonus for strong 3mi catchment area
-        if area_density_3mi is not None and area_density_1mi is not None:
-            ratio_3mi = area_density_3mi / baseline if baseline > 0 else 0
-            if ratio_3mi >= 10 and density_pts < 35:
-                density_pts = min(density_pts + 5, 35)
-                priority_signals.append(f"Strong 3mi catchment ({area_density_3mi:,.0f}/sqmi)")
-
-        rank_score += density_pts
-
-    # === TIER 2: MEDIAN HOUSEHOLD INCOME (up to 25 pts) ===
-    # Verizon criteria: $50K+ min, $60K+ preferred
-
-    if area_income_3mi is not None:
-        income = area_income_3mi
-        if income >= 80000:
-            rank_score += 25
-            priority_signals.append(f"Premium income area (${income:,} median HH)")
-        elif income >= 70000:
-            rank_score += 22
-            priority_signals.append(f"Strong income (${income:,} median HH)")
-        elif income >= 60000:
-            rank_score += 18
-            priority_signals.append(f"Good income (${income:,} median HH)")
-        elif income >= 50000:
-            rank_score += 12
-            priority_signals.append(f"Adequate income (${income:,} median HH)")
-        elif income >= 40000:
-            rank_score += 5
-            priority_signals.append(f"Below-target income (${income:,} median HH)")
-
-    # === TIER 3: RETAIL ANCHOR PROXIMITY (up to 30 pts) ===
-    # Continuous decay curve for better differentiation
-
-    if nearest_retail_node_distance is not None:
-        d = nearest_retail_node_distance
-        if d <= 0.15:
-            anchor_pts = 30
-            priority_signals.append("Adjacent to major retail anchor")
-        elif d <= 0.5:
-            anchor_pts = round(30 - (d - 0.15) * (12 / 0.35))
-            priority_signals.append(f"Near major retail anchor ({d:.2f}mi)")
-        elif d <= 1.0:
-            anchor_pts = round(18 - (d - 0.5) * (10 / 0.5))
-            priority_signals.append(f"Retail anchor within {d:.1f}mi")
-        elif d <= 1.5:
-            anchor_pts = round(8 - (d - 1.0) * (6 / 0.5))
-            priority_signals.append(f"Retail anchor at {d:.1f}mi")
-        else:
-            anchor_pts = 0
-        rank_score += max(anchor_pts, 0)
-
-    # === TIER 4: CORPORATE GAP — GOLDILOCKS ZONE (up to 30 pts) ===
-    # Bell curve: 2-5mi ideal, <1.5mi too close, >12mi too far
-
-    if nearest_corporate_distance is not None:
-        d = nearest_corporate_distance
-
-        if d >= 900:
-            # No corporate store found in search area
-            corp_pts = 5
-            priority_signals.append("No VZ Corporate store in area (neutral)")
-        elif d < 1.5:
-            corp_pts = 0
-            priority_signals.append(f"Too close to VZ Corporate ({d:.1f}mi)")
-        elif d < 2.0:
-            corp_pts = round((d - 1.5) * (15 / 0.5))
-            priority_signals.append(f"Near corporate boundary ({d:.1f}mi)")
-        elif d <= 5.0:
-            corp_pts = 30
-            priority_signals.append(f"Ideal corporate gap ({d:.1f}mi)")
-        elif d <= 8.0:
-            corp_pts = round(30 - (d - 5.0) * (15 / 3.0))
-            priority_signals.append(f"Good corporate gap ({d:.1f}mi)")
-        elif d <= 12.0:
-            corp_pts = round(15 - (d - 8.0) * (10 / 4.0))
-            priority_signals.append(f"Distant from corporate ({d:.1f}mi)")
-        else:
-            corp_pts = 3
-            priority_signals.append(f"Very distant from corporate ({d:.1f}mi)")
-
-        rank_score += max(corp_pts, 0)
-
-    # === TIER 5: AVAILABILITY QUALITY (up to 20 pts) — EQUALIZED ===
-    # All confirmed-available sources max at 20 pts (no listing auto-domination)
-
-    if listing.source in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO):
-        rank_score += 20
-        source_label = listing.source.value.title()
-        txn_label = f"for {listing.transaction_type}" if listing.transaction_type else "for lease/sale"
-        priority_signals.append(f"Active listing {txn_label} ({source_label})")
-    elif listing.property_type == PropertyType.LAND:
-        rank_score += 20
-        priority_signals.append("Vacant land (buildable)")
-    else:
-        has_vacancy = "vacant_property" in signal_types
-        has_availability = _has_availability_keywords(listing.land_use)
-        if has_vacancy and has_availability:
-            rank_score += 18
-            priority_signals.append(f"Confirmed vacant ({listing.land_use})")
-        elif has_vacancy:
-            rank_score += 14
-            priority_signals.append("Vacant building")
-        elif has_availability:
-            rank_score += 14
-            priority_signals.append(f"Available ({listing.land_use})")
-        else:
-            rank_score += 8
-            priority_signals.append("Potential availability")
-
-    # === TIER 6: SIZE FIT (up to 15 pts) ===
-
-    if listing.property_type == PropertyType.LAND and listing.lot_size_acres:
-        if 0.8 <= listing.lot_size_acres <= 1.2:
-            rank_score += 15
-            priority_signals.append(f"Ideal lot size ({listing.lot_size_acres:.1f}ac)")
-        elif listing.lot_size_acres <= 2.0:
-            rank_score += 10
-            priority_signals.append(f"Acceptable lot size ({listing.lot_size_acres:.1f}ac)")
-    elif listing.sqft and listing.property_type in (PropertyType.RETAIL, PropertyType.OFFICE):
-        if 2500 <= listing.sqft <= 3500:
-            rank_score += 15
-            priority_signals.append(f"Ideal building size ({listing.sqft:,.0f} sqft)")
-        elif listing.sqft <= 6000:
-            rank_score += 10
-            priority_signals.append(f"Acceptable building size ({listing.sqft:,.0f} sqft)")
-
-    # === TIER 7: VZ FAMILY CO-LOCATION BONUS (up to 10 pts) ===
-
-    if nearest_vz_family_distance is not None:
-        if nearest_vz_family_distance <= 0.5:
-            rank_score += 10
-            priority_signals.append(f"Near VZ-family store ({nearest_vz_family_distance:.1f}mi)")
-        elif nearest_vz_family_distance <= 1.0:
-            rank_score += 5
-            priority_signals.append(f"VZ-family store within 1mi")
-
-    # === TIER 8: DISTRESS TIEBREAKER (up to 15 pts) ===
-
-    if "distress" in signal_types:
-        rank_score += 15
-        priority_signals.append("Foreclosure/distress")
-    elif "tax_delinquent" in signal_types:
-        rank_score += 12
-        priority_signals.append("Tax delinquent")
-    elif "absentee_owner" in signal_types and "long_term_owner" in signal_types:
-        rank_score += 8
-        priority_signals.append("Absentee + long-term owner")
-    elif "absentee_owner" in signal_types:
-        rank_score += 5
-        priority_signals.append("Absentee owner")
-    elif "long_term_owner" in signal_types:
-        rank_score += 3
-        priority_signals.append("Long-term owner")
-
-    return rank_score, priority_signals
+    return {
+        prop.id: {"distance": dist, "name": anchor_pois[idx]["name"]}
+        for prop, dist, idx in zip(located, distances[:, 0].tolist(), indices[:, 0].tolist())
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -736,10 +372,10 @@ class OpportunitySearchRequest(BaseModel):
     max_lng: float
 
     # Optional overrides for parcel/building size
-    min_parcel_acres: float = Field(default=0.8, description="Minimum parcel size in acres")
-    max_parcel_acres: float = Field(default=2.0, description="Maximum parcel size in acres")
-    min_building_sqft: Optional[float] = Field(default=2500, description="Minimum building size (if building exists)")
-    max_building_sqft: Optional[float] = Field(default=6000, description="Maximum building size (if building exists)")
+    min_parcel_acres: float = Field(default=DEFAULT_MIN_PARCEL_ACRES, description="Minimum parcel size in acres")
+    max_parcel_acres: float = Field(default=DEFAULT_MAX_PARCEL_ACRES, description="Maximum parcel size in acres")
+    min_building_sqft: Optional[float] = Field(default=DEFAULT_MIN_BUILDING_SQFT, description="Minimum building size (if building exists)")
+    max_building_sqft: Optional[float] = Field(default=DEFAULT_MAX_BUILDING_SQFT, description="Maximum building size (if building exists)")
 
     # Property type preferences
     include_retail: bool = Field(default=True, description="Include retail properties")
@@ -787,12 +423,11 @@ class OpportunityRanking(BaseModel):
     market_viability_score: Optional[float] = None
 
 
-class OpportunitySearchResponse(BaseModel):
-    """Response for opportunity search."""
+class OpportunitySearchHeader(BaseModel):
+    """Opportunity search metadata (first line of the NDJSON stream)."""
     center_latitude: float
     center_longitude: float
     total_found: int
-    opportunities: List[OpportunityRanking]
     search_timestamp: str
     filters_applied: dict
 
@@ -803,19 +438,563 @@ class OpportunitySearchResponse(BaseModel):
     viewport_population_center: Optional[dict] = None
 
 
+class OpportunitySearchResponse(OpportunitySearchHeader):
+    """Response for opportunity search."""
+    opportunities: List[OpportunityRanking]
+
+
+# ---------------------------------------------------------------------------
+# Upstream fetch stages (independent — run concurrently by the endpoint)
+# ---------------------------------------------------------------------------
+
+# Concurrent identical upstream fetches share one call (keyed like the caches)
+_properties_flight = SingleFlight("properties")
+_demographics_flight = SingleFlight("demographics")
+_anchors_flight = SingleFlight("retail_nodes")
+
+
+async def _none() -> None:
+    """Placeholder awaitable for disabled stages."""
+    return None
+
+
+async def _search_property_source(
+    bounds: GeoBounds,
+    property_types: List[PropertyType],
+    use_local_property_source: bool,
+    limit: int,
+) -> PropertySearchResult:
+    """
+    One property search (local county DB, falling back to ATTOM if allowed).
+
+    While ATTOM's circuit breaker is open, searches go straight to the local
+    county DB when FALLBACK_TO_LOCAL allows (sources == ["LOCAL"]).
+    """
+    try:
+        if use_local_property_source:
+            logger.info("Using local property data for opportunities search")
+            return await local_search_bounds(
+                bounds=bounds,
+                property_types=property_types,
+                min_opportunity_score=0,
+                limit=limit,
+            )
+        fallback_to_local = FeatureFlags.should_fallback_to_local()
+        if fallback_to_local and circuit_open("attom"):
+            logger.warning("ATTOM circuit breaker open, using local property data")
+            return await local_search_bounds(
+                bounds=bounds,
+                property_types=property_types,
+                min_opportunity_score=0,
+                limit=limit,
+            )
+        result = await attom_search_bounds(
+            bounds=bounds,
+            property_types=property_types,
+            min_opportunity_score=0,
+            limit=limit,
+        )
+        # Per-type ATTOM failures are swallowed; an empty result from a breaker that just opened is an outage
+        if fallback_to_local and not result.properties and result.truncated and circuit_open("attom"):
+            logger.warning("ATTOM circuit breaker opened during search, using local property data")
+            return await local_search_bounds(
+                bounds=bounds,
+                property_types=property_types,
+                min_opportunity_score=0,
+                limit=limit,
+            )
+        return result
+    except Exception as e:
+        if (
+            use_local_property_source
+            and FeatureFlags.should_fallback_to_attom()
+            and settings.ATTOM_API_KEY
+        ):
+            logger.warning(f"Local property search failed, falling back to ATTOM: {e}")
+            return await attom_search_bounds(
+                bounds=bounds,
+                property_types=property_types,
+                min_opportunity_score=0,
+                limit=limit,
+            )
+        raise
+
+
+async def _fetch_candidate_properties(
+    request: "OpportunitySearchRequest",
+    bounds: GeoBounds,
+    property_types: List[PropertyType],
+    use_local_property_source: bool,
+) -> List[PropertyListing]:
+    """
+    Search property API (ATTOM or local county DB), cached 1hr per grid tile.
+
+    The viewport is covered by PROPERTY_TILE_DEG tiles. Cached tiles are
+    reused and only the rectangle enclosing the missing ones is searched
+    (still a single search). The fetched tiles are cached only when that
+    search was complete (not truncated by a result or radius cap); otherwise
+    the assembled viewport is cached under its snapped bounds as before.
+    Local results standing in for ATTOM (circuit breaker open) aren't cached.
+    """
+    type_key = "|".join(sorted(pt.value for pt in property_types))
+    cached_attom_props = await get_cached_attom(
+        request.min_lat, request.max_lat, request.min_lng, request.max_lng, type_key
+    )
+    if cached_attom_props is not None:
+        logger.info(f"Property cache hit: {len(cached_attom_props)} properties")
+        return cached_attom_props
+
+    source = "local" if use_local_property_source else "attom"
+    tiles = property_tiles_for_bounds(request.min_lat, request.max_lat, request.min_lng, request.max_lng)
+    cached_tiles = await get_cached_property_tiles(tiles, source, type_key)
+    missing = [tile for tile in tiles if tile not in cached_tiles]
+    properties = [p for tile_props in cached_tiles.values() for p in tile_props]
+
+    complete = True
+    degraded = False
+    if missing:
+        min_lat, max_lat, min_lng, max_lng = property_tile_bounds(missing)
+        if not use_local_property_source:
+            # ATTOM searches the circle inscribed in the bounds; grow the
+            # bounds so that circle covers the corners of every missing tile
+            grow_lat = (max_lat - min_lat) * (math.sqrt(2) - 1) / 2
+            grow_lng = (max_lng - min_lng) * (math.sqrt(2) - 1) / 2
+            min_lat, max_lat = min_lat - grow_lat, max_lat + grow_lat
+            min_lng, max_lng = min_lng - grow_lng, max_lng + grow_lng
+        query_bounds = GeoBounds(min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng)
+        flight_key = (source, type_key, min_lat, max_lat, min_lng, max_lng, request.limit * 2)
+        result = await _properties_flight.do(flight_key, lambda: _search_property_source(
+            query_bounds, property_types, use_local_property_source, request.limit * 2,
+        ))
+        degraded = not use_local_property_source and "ATTOM" not in result.sources
+        complete = not result.truncated and not degraded
+
+        missing_set = set(missing)
+        fetched: dict[tuple, List[PropertyListing]] = {tile: [] for tile in missing}
+        for prop in result.properties:
+            tile = property_tile_of(prop.latitude, prop.longitude)
+            if tile in missing_set:
+                fetched[tile].append(prop)
+        if complete:
+            for tile, tile_props in fetched.items():
+                cache_property_tile(tile, source, tile_props, type_key)
+        properties.extend(p for tile_props in fetched.values() for p in tile_props)
+        logger.info(
+            f"Property tiles: {len(tiles) - len(missing)}/{len(tiles)} cached, "
+            f"fetched {len(result.properties)} properties for {len(missing)} tiles"
+            + ("" if complete else " (truncated, tiles not cached)")
+        )
+    else:
+        logger.info(f"Property tile cache hit: {len(tiles)} tiles")
+
+    # Tiles overhang the viewport; keep the best-scored in-view candidates,
+    # at most what one uncapped search per property type could return
+    seen_ids = set()
+    in_view = []
+    for prop in properties:
+        if prop.id in seen_ids or not (
+            request.min_lat <= prop.latitude <= request.max_lat
+            and request.min_lng <= prop.longitude <= request.max_lng
+        ):
+            continue
+        seen_ids.add(prop.id)
+        in_view.append(prop)
+    in_view.sort(key=lambda p: p.opportunity_score or 0, reverse=True)
+    in_view = in_view[:request.limit * 2 * max(1, len(property_types))]
+
+    if not complete and not degraded:
+        cache_attom(
+            request.min_lat, request.max_lat, request.min_lng, request.max_lng,
+            in_view, type_key
+        )
+    return in_view
+
+
+def _load_store_index() -> StoreIndex:
+    """Load the shared store index with a dedicated session (runs in the threadpool)."""
+    db = SessionLocal()
+    try:
+        return get_store_index(db)
+    finally:
+        db.close()
+
+
+def _viewport_population_from_response(demo_response) -> dict:
+    """Flatten a 1mi/3mi DemographicsResponse into the viewport population dict."""
+    return {
+        "pop_1mi": demo_response.radii[0].total_population,
+        "pop_3mi": demo_response.radii[1].total_population,
+        "density_1mi": demo_response.radii[0].population_density,
+        "density_3mi": demo_response.radii[1].population_density,
+        "income_3mi": demo_response.radii[1].median_household_income,
+    }
+
+
+async def _fetch_viewport_population(
+    center_lat: float,
+    center_lng: float,
+    use_local_demographics_source: bool,
+) -> Optional[dict]:
+    """Fetch viewport-center demographics (1 ArcGIS/Census call, cached 24hr, then served stale while refreshing). Non-fatal."""
+    key = (demographics_cache_key(center_lat, center_lng), use_local_demographics_source)
+    load = lambda: _load_viewport_population(center_lat, center_lng, use_local_demographics_source)
+
+    cached_demo, stale = await get_demographics_allow_stale(center_lat, center_lng)
+    if cached_demo:
+        if stale:
+            _demographics_flight.refresh(key, load)
+        return cached_demo
+    return await _demographics_flight.do(key, load)
+
+
+async def _load_viewport_population(
+    center_lat: float,
+    center_lng: float,
+    use_local_demographics_source: bool,
+) -> Optional[dict]:
+    """Uncached, non-fatal body of _fetch_viewport_population (fills the cache)."""
+    try:
+        if use_local_demographics_source:
+            demo_response = await fetch_census_demographics(
+                center_lat, center_lng, radii_miles=[1, 3]
+            )
+        else:
+            demo_response = await fetch_arcgis_demographics(
+                center_lat, center_lng, radii_miles=[1, 3]
+            )
+        viewport_population = _viewport_population_from_response(demo_response)
+        cache_demographics(center_lat, center_lng, viewport_population)
+        return viewport_population
+    except Exception as e:
+        if (
+            use_local_demographics_source
+            and FeatureFlags.should_fallback_to_arcgis()
+            and settings.ARCGIS_API_KEY
+        ):
+            logger.warning(f"Local demographics failed, falling back to ArcGIS: {e}")
+            try:
+                demo_response = await fetch_arcgis_demographics(
+                    center_lat, center_lng, radii_miles=[1, 3]
+                )
+                viewport_population = _viewport_population_from_response(demo_response)
+                cache_demographics(center_lat, center_lng, viewport_population)
+                return viewport_population
+            except Exception as fallback_error:
+                logger.warning(f"ArcGIS demographics fallback failed (non-fatal): {fallback_error}")
+        elif not use_local_demographics_source and FeatureFlags.should_fallback_to_local():
+            # Not cached, so ArcGIS values come back once its circuit breaker closes
+            logger.warning(f"ArcGIS demographics failed, falling back to local census data: {e}")
+            try:
+                demo_response = await fetch_census_demographics(
+                    center_lat, center_lng, radii_miles=[1, 3]
+                )
+                return _viewport_population_from_response(demo_response)
+            except Exception as fallback_error:
+                logger.warning(f"Local demographics fallback failed (non-fatal): {fallback_error}")
+        else:
+            logger.warning(f"Demographics lookup failed (non-fatal): {e}")
+    return None
+
+
+async def _fetch_candidate_populations(properties: List[PropertyListing]) -> dict[str, dict]:
+    """
+    Per-candidate 1mi/3mi ring demographics via one bulk local Census query.
+
+    Returns {property_id: population dict}; candidates with no tract coverage
+    are omitted so the caller can fall back to viewport-center values. Non-fatal.
+    """
+    located = _located(properties)
+    if not located:
+        return {}
+    try:
+        responses = await fetch_bulk_ring_demographics(
+            [(p.latitude, p.longitude) for p in located], radii_miles=[1, 3]
+        )
+    except Exception as e:
+        logger.warning(f"Bulk ring demographics failed, using viewport center (non-fatal): {e}")
+        return {}
+
+    population_data = {}
+    for prop, demo_response in zip(located, responses):
+        if demo_response.radii[0].total_population is None and demo_response.radii[1].total_population is None:
+            continue
+        population_data[prop.id] = _viewport_population_from_response(demo_response)
+    logger.info(f"Bulk ring demographics: {len(population_data)} of {len(located)} candidates covered")
+    return population_data
+
+
+async def _fetch_anchor_pois(center_lat: float, center_lng: float) -> list[dict]:
+    """Fetch retail anchor stores near viewport center (1 Mapbox call, cached 1hr, then served stale while refreshing). Non-fatal."""
+    key = retail_nodes_cache_key(center_lat, center_lng)
+    load = lambda: _load_anchor_pois(center_lat, center_lng)
+
+    cached_nodes, stale = await get_retail_nodes_allow_stale(center_lat, center_lng)
+    if cached_nodes is not None:
+        if stale:
+            _anchors_flight.refresh(key, load)
+        return cached_nodes
+    return await _anchors_flight.do(key, load)
+
+
+def _load_local_anchor_pois(center_lat: float, center_lng: float, radius_miles: float) -> list[dict]:
+    """Shopping activity nodes within radius_miles (runs in the threadpool)."""
+    lat_deg = radius_miles / 69.0
+    lng_deg = radius_miles / (69.0 * max(0.01, math.cos(math.radians(center_lat))))
+    db = SessionLocal()
+    try:
+        rows = db.query(ActivityNode.name, ActivityNode.latitude, ActivityNode.longitude).filter(
+            ActivityNode.node_category == ANCHOR_NODE_CATEGORY,
+            ActivityNode.latitude.between(center_lat - lat_deg, center_lat + lat_deg),
+            ActivityNode.longitude.between(center_lng - lng_deg, center_lng + lng_deg),
+        ).all()
+    finally:
+        db.close()
+    return [
+        {"name": r.name or "Retail anchor", "lat": r.latitude, "lng": r.longitude}
+        for r in rows
+        if haversine(center_lng, center_lat, r.longitude, r.latitude) <= radius_miles
+    ]
+
+
+async def _local_anchor_fallback(center_lat: float, center_lng: float) -> list[dict]:
+    """Local anchors while Mapbox Search's circuit breaker is open (not cached). Non-fatal."""
+    if not FeatureFlags.should_fallback_to_local():
+        return []
+    logger.warning("Mapbox Search circuit breaker open, using local shopping activity nodes as anchors")
+    try:
+        return await asyncio.to_thread(_load_local_anchor_pois, center_lat, center_lng, 1.5)
+    except Exception as e:
+        logger.warning(f"Local anchor fallback failed (non-fatal): {e}")
+        return []
+
+
+async def _load_anchor_pois(center_lat: float, center_lng: float) -> list[dict]:
+    """Uncached, non-fatal body of _fetch_anchor_pois (fills the cache)."""
+    if circuit_open("mapbox_search"):
+        return await _local_anchor_fallback(center_lat, center_lng)
+    try:
+        anchor_result = await fetch_mapbox_pois(
+            center_lat, center_lng,
+            radius_meters=2414,  # 1.5 miles
+            categories=["anchors"],
+        )
+        anchor_pois = [
+            {"name": poi.name, "lat": poi.latitude, "lng": poi.longitude}
+            for poi in anchor_result.pois
+        ]
+        # Per-category Mapbox errors are swallowed; don't cache an outage as "no anchors"
+        if not anchor_pois and circuit_open("mapbox_search"):
+            return await _local_anchor_fallback(center_lat, center_lng)
+        cache_retail_nodes(center_lat, center_lng, anchor_pois)
+        return anchor_pois
+    except Exception as e:
+        logger.warning(f"Mapbox anchor search failed (non-fatal): {e}")
+        return []
+
+
+def _uses_default_scoring(request: "OpportunitySearchRequest") -> bool:
+    """True when the request matches the filters materialized scores were computed with."""
+    return (
+        request.min_parcel_acres == DEFAULT_MIN_PARCEL_ACRES
+        and request.max_parcel_acres == DEFAULT_MAX_PARCEL_ACRES
+        and request.min_building_sqft == DEFAULT_MIN_BUILDING_SQFT
+        and request.max_building_sqft == DEFAULT_MAX_BUILDING_SQFT
+        and request.enable_corporate_distance_scoring
+        and request.enable_population_scoring
+        and request.enable_retail_node_scoring
+        and request.enable_income_scoring
+    )
+
+
+def _materialized_entry(prop: PropertyListing, score: OpportunityScore) -> dict:
+    """Ranked-opportunity dict (same shape the scoring loop builds) from a score row."""
+    return {
+        "property": prop,
+        "rank_score": score.rank_score,
+        "priority_signals": json.loads(score.priority_signals or "[]"),
+        "signal_count": len(prop.opportunity_signals),
+        "nearest_corporate_store_miles": score.nearest_corporate_miles,
+        "nearest_retail_node_miles": score.nearest_anchor_miles,
+        "nearest_retail_node_name": score.nearest_anchor_name,
+        "nearest_verizon_family_miles": score.nearest_vz_family_miles,
+        "nearest_verizon_family_name": score.nearest_vz_family_brand,
+        "area_population_1mi": score.population_1mi,
+        "area_population_3mi": score.population_3mi,
+        "area_density_1mi": score.density_1mi,
+        "area_income_3mi": score.income_3mi,
+        "market_viability_score": score.rank_score,
+    }
+
+
+def _load_materialized_opportunities(
+    bounds: GeoBounds,
+    property_types: List[PropertyType],
+    limit: int,
+) -> Optional[tuple[List[dict], List[PropertyListing], MaterializedInputs]]:
+    """
+    Pre-ranked local county candidates from the opportunity_scores table.
+
+    Returns (ranked-opportunity dicts for current rows, viewport properties
+    with no current row to score live, the inputs those rows used), or None
+    when too much of the viewport is unscored so the caller scores live.
+    """
+    db = SessionLocal()
+    try:
+        found = query_materialized_opportunities(db, bounds, property_types, limit)
+        if found is None:
+            return None
+        entries = [
+            _materialized_entry(_convert_county_property_to_listing(county_prop), score)
+            for county_prop, score in found.rows
+        ]
+        unscored = []
+        for county_prop in found.unscored:
+            try:
+                unscored.append(_convert_county_property_to_listing(county_prop))
+            except Exception as e:
+                logger.error(f"Error converting county property {county_prop.id}: {e}")
+        logger.info(
+            f"Materialized scores: {len(entries)} pre-ranked local candidates in viewport, "
+            f"{len(unscored)} without a current score"
+        )
+        return entries, unscored, found.inputs
+    finally:
+        db.close()
+
+
 # ---------------------------------------------------------------------------
 # Main endpoint
 # ---------------------------------------------------------------------------
 
+def _search_cache_params(request: OpportunitySearchRequest) -> dict:
+    """Everything that affects a search result, for the response cache key."""
+    return {
+        **request.model_dump(),
+        "use_local_properties": use_local_properties(),
+        "use_local_demographics": use_local_demographics(),
+    }
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches etag (weak comparison, '*' matches)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
 @router.post("/search", response_model=OpportunitySearchResponse)
-async def search_opportunities(request: OpportunitySearchRequest, db: Session = Depends(get_db)):
+async def search_opportunities(
+    request: OpportunitySearchRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+):
     """
     Search for CSOKi-qualified property opportunities.
 
     Finds available sites (vacant land, for-lease listings, vacant buildings)
     and ranks them by site quality: population density, retail anchor proximity,
     corporate gap distance, and size fit.
+
+    Responses are cached by snapped viewport + parameters + data version and
+    carry an ETag; send it back in If-None-Match to get a 304 when unchanged.
+    Per-stage timings are reported in the Server-Timing header.
+    """
+    timer = StageTimer()
+    params = _search_cache_params(request)
+    with timer.stage("cache"):
+        data_version = await asyncio.to_thread(get_data_version)
+        cached = get_cached_opportunity_search(params, data_version)
+
+    if cached is not None:
+        body, etag = cached["body"], cached["etag"]
+    else:
+        response = await _run_opportunity_search(request, db, timer)
+        with timer.stage("serialize"):
+            body = response.model_dump_json().encode()
+        etag = cache_opportunity_search(params, data_version, body)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Server-Timing": timer.server_timing_header(),
+    }
+    if _etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _run_opportunity_search(
+    request: OpportunitySearchRequest,
+    db: Session,
+    timer: Optional[StageTimer] = None,
+) -> OpportunitySearchResponse:
+    """Uncached opportunity search (see search_opportunities)."""
+    header, ranked_opportunities = await _search_and_rank(request, db, timer)
+    return OpportunitySearchResponse(
+        **header.model_dump(),
+        opportunities=[_to_ranking(opp, idx + 1) for idx, opp in enumerate(ranked_opportunities)],
+    )
+
+
+@router.post("/search/stream")
+async def stream_opportunities(request: OpportunitySearchRequest, db: Session = Depends(get_db)):
+    """
+    Streaming variant of /search for large result sets (exports, state-wide views).
+
+    Returns NDJSON: the first line is the OpportunitySearchHeader metadata,
+    then one OpportunityRanking per line in rank order. Each line is encoded
+    as it is sent, so the full response is never held in memory and clients
+    can render the first results while the rest arrive. Server-Timing covers
+    the work done before the first line is sent.
+    """
+    timer = StageTimer()
+    header, ranked_opportunities = await _search_and_rank(request, db, timer)
+
+    def ndjson_lines():
+        yield header.model_dump_json() + "\n"
+        for idx, opp in enumerate(ranked_opportunities):
+            yield _to_ranking(opp, idx + 1).model_dump_json() + "\n"
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"Server-Timing": timer.server_timing_header()},
+    )
+
+
+def _to_ranking(opp: dict, rank: int) -> OpportunityRanking:
+    """Convert a ranked-opportunity dict to its response model."""
+    return OpportunityRanking(
+        property=opp["property"],
+        rank=rank,
+        priority_signals=opp["priority_signals"],
+        signal_count=opp["signal_count"],
+        nearest_corporate_store_miles=opp["nearest_corporate_store_miles"],
+        nearest_retail_node_miles=opp["nearest_retail_node_miles"],
+        nearest_retail_node_name=opp["nearest_retail_node_name"],
+        nearest_verizon_family_miles=opp["nearest_verizon_family_miles"],
+        nearest_verizon_family_name=opp["nearest_verizon_family_name"],
+        area_population_1mi=opp["area_population_1mi"],
+        area_population_3mi=opp["area_population_3mi"],
+        area_density_1mi=opp["area_density_1mi"],
+        area_income_3mi=opp["area_income_3mi"],
+        market_viability_score=opp["market_viability_score"],
+    )
+
+
+async def _search_and_rank(
+    request: OpportunitySearchRequest,
+    db: Session,
+    timer: Optional[StageTimer] = None,
+) -> tuple["OpportunitySearchHeader", List[dict]]:
+    """
+    Fetch, filter and score candidates; returns response metadata and the ranked top `limit`.
+
+    Per-stage wall times are recorded on `timer` (reported as Server-Timing).
     """
+    timer = timer or StageTimer()
+    timer.mark()
     use_local_property_source = use_local_properties()
     use_local_demographics_source = use_local_demographics()
 
@@ -848,70 +1027,71 @@ async def search_opportunities(request: OpportunitySearchRequest, db: Session =
             detail="Must include at least one property type (retail, office, or land)"
         )
 
+    center_lat = (request.min_lat + request.max_lat) / 2
+    center_lng = (request.min_lng + request.max_lng) / 2
+
     try:
-        # 1. Search property API (ATTOM or local county DB, cached 1hr by viewport bounds)
-        type_key = "|".join(sorted(pt.value for pt in property_types))
-        cached_attom_props = get_cached_attom(
-            request.min_lat, request.max_lat, request.min_lng, request.max_lng, type_key
-        )
-        if cached_attom_props is not None:
-            logger.info(f"Property cache hit: {len(cached_attom_props)} properties")
-            attom_properties = cached_attom_props
-        else:
+        # 0. Local mode with default filters: county candidates come pre-scored
+        #    from opportunity_scores (one indexed query) instead of live scoring.
+        #    Properties without a current row are scored live below.
+        materialized: Optional[List[dict]] = None
+        unscored_properties: List[PropertyListing] = []
+        materialized_inputs: Optional[MaterializedInputs] = None
+        if use_local_property_source and _uses_default_scoring(request):
             try:
-                if use_local_property_source:
-                    logger.info("Using local property data for opportunities search")
-                    result: PropertySearchResult = await local_search_bounds(
-                        bounds=bounds,
-                        property_types=property_types,
-                        min_opportunity_score=0,
-                        limit=request.limit * 2,
-                    )
-                else:
-                    result: PropertySearchResult = await attom_search_bounds(
-                        bounds=bounds,
-                        property_types=property_types,
-                        min_opportunity_score=0,
-                        limit=request.limit * 2,
-                    )
+                loaded = await asyncio.to_thread(
+                    _load_materialized_opportunities, bounds, property_types, request.limit * 2
+                )
+                if loaded is not None:
+                    materialized, unscored_properties, materialized_inputs = loaded
             except Exception as e:
-                if (
-                    use_local_property_source
-                    and FeatureFlags.should_fallback_to_attom()
-                    and settings.ATTOM_API_KEY
-                ):
-                    logger.warning(f"Local property search failed, falling back to ATTOM: {e}")
-                    result = await attom_search_bounds(
-                        bounds=bounds,
-                        property_types=property_types,
-                        min_opportunity_score=0,
-                        limit=request.limit * 2,
-                    )
-                else:
-                    raise
-            attom_properties = result.properties
-            cache_attom(
-                request.min_lat, request.max_lat, request.min_lng, request.max_lng,
-                attom_properties, type_key
-            )
-
-        # 2. Fetch scraped listings (Crexi/LoopNet)
-        scraped_properties = _fetch_scraped_listings(
-            db=db,
-            bounds=bounds,
-            min_parcel_acres=request.min_parcel_acres,
-            max_parcel_acres=request.max_parcel_acres,
-            min_building_sqft=request.min_building_sqft,
-            max_building_sqft=request.max_building_sqft,
-            include_retail=request.include_retail,
-            include_office=request.include_office,
-            include_land=request.include_land,
+                logger.warning(f"Materialized score lookup failed, scoring live (non-fatal): {e}")
+            timer.lap("materialized")
+
+        # 1. Independent upstream stages run concurrently; blocking DB work
+        #    (scraped listings, store index) goes to the threadpool.
+        (
+            attom_properties,
+            scraped_properties,
+            store_index,
+            viewport_population,
+            anchor_pois,
+        ) = await asyncio.gather(
+            timer.timed("properties", _fetch_candidate_properties(
+                request, bounds, property_types, use_local_property_source
+            )) if materialized is None else _none(),
+            timer.timed("scraped", asyncio.to_thread(
+                _fetch_scraped_listings,
+                db=db,
+                bounds=bounds,
+                min_parcel_acres=request.min_parcel_acres,
+                max_parcel_acres=request.max_parcel_acres,
+                min_building_sqft=request.min_building_sqft,
+                max_building_sqft=request.max_building_sqft,
+                include_retail=request.include_retail,
+                include_office=request.include_office,
+                include_land=request.include_land,
+            )),
+            timer.timed("store_index", asyncio.to_thread(_load_store_index)),
+            timer.timed("viewport_demographics", _fetch_viewport_population(
+                center_lat, center_lng, use_local_demographics_source
+            )) if request.enable_population_scoring else _none(),
+            timer.timed("anchors", _fetch_anchor_pois(center_lat, center_lng))
+            if request.enable_retail_node_scoring and materialized is None else _none(),
         )
-
-        # 3. Merge + deduplicate
-        all_properties = _merge_and_deduplicate(attom_properties, scraped_properties)
-
-        # 4. Apply eligibility filter
+        attom_properties = attom_properties or []
+        anchor_pois = anchor_pois or []
+        timer.lap("gather")
+
+        # 2. Merge + deduplicate (scraped listings also replace nearby pre-ranked rows)
+        all_properties = _merge_and_deduplicate(attom_properties + unscored_properties, scraped_properties).kept
+        if materialized:
+            replaced = _merge_and_deduplicate(
+                [opp["property"] for opp in materialized], scraped_properties
+            ).merged_into
+            materialized = [opp for opp in materialized if opp["property"].id not in replaced]
+
+        # 3. Apply eligibility filter
         filtered_properties = _filter_properties_for_opportunities(
             properties=all_properties,
             min_parcel_acres=request.min_parcel_acres,
@@ -922,153 +1102,112 @@ async def search_opportunities(request: OpportunitySearchRequest, db: Session =
             include_office=request.include_office,
             include_land=request.include_land,
         )
+        timer.lap("merge_filter")
 
-        # --- Market viability data fetching (for scoring) ---
+        # 3b. With pre-ranked rows, the live candidates (scraped listings and
+        #     properties without a current row) are scored from the same inputs
+        #     as the stored rows, so all rank_scores are comparable. The steps
+        #     below then only compute response metadata.
+        if materialized is not None:
+            live_scores = await score_with_materialized_inputs(filtered_properties, materialized_inputs)
+            materialized.extend(_materialized_entry(prop, score) for prop, score in live_scores)
+            filtered_properties = []
+            timer.lap("materialized_live")
 
-        center_lat = (request.min_lat + request.max_lat) / 2
-        center_lng = (request.min_lng + request.max_lng) / 2
+        # --- Market viability enrichment (in-memory, no I/O) ---
 
-        # 5a. Corporate store distances (DB-only)
+        # 4a. Corporate store distances
         corporate_distances: dict[str, float] = {}
         corporate_store_count = 0
         if request.enable_corporate_distance_scoring:
             corporate_distances, corporate_store_count = _calculate_corporate_store_distances(
                 properties=filtered_properties,
-                db=db,
+                store_index=store_index,
                 bounds_min_lat=request.min_lat,
                 bounds_max_lat=request.max_lat,
                 bounds_min_lng=request.min_lng,
                 bounds_max_lng=request.max_lng,
             )
 
-        # 5a-gate. Hard gate: remove properties too close to VZ Corporate (<1.0mi)
+        # 4a-gate. Hard gate: remove properties too close to VZ Corporate (<1.0mi)
         if request.enable_corporate_distance_scoring and corporate_distances:
             pre_gate_count = len(filtered_properties)
             filtered_properties = [
                 prop for prop in filtered_properties
-                if corporate_distances.get(prop.id, 999.0) >= 1.0
+                if corporate_distances.get(prop.id, NO_STORE_DISTANCE) >= CORPORATE_GATE_MILES
             ]
             gate_removed = pre_gate_count - len(filtered_properties)
             if gate_removed > 0:
                 logger.info(f"Corporate proximity gate removed {gate_removed} properties (<1.0mi from VZ Corporate)")
 
-        # 5b. VZ family distances for co-location scoring (DB-only)
-        vz_family_distances: dict[str, tuple[float, str]] = {}
-        vz_family_store_count = 0
+        # 4b. VZ family distances for co-location scoring
         vz_family_distances, vz_family_store_count = _calculate_verizon_family_distances(
             properties=filtered_properties,
-            db=db,
+            store_index=store_index,
             bounds_min_lat=request.min_lat,
             bounds_max_lat=request.max_lat,
             bounds_min_lng=request.min_lng,
             bounds_max_lng=request.max_lng,
         )
+        timer.lap("store_distances")
 
-        # 6. Fetch viewport-center demographics (1 ArcGIS call, cached 24hr)
+        # 5. Ring demographics: per-candidate from one bulk PostGIS query when
+        #    local demographics are enabled, viewport-center values otherwise
+        #    (and for any candidate the bulk query couldn't cover).
         population_data: dict[str, dict] = {}
-        viewport_population = None
-
-        if request.enable_population_scoring:
-            cached_demo = get_cached_demographics(center_lat, center_lng)
-            if cached_demo:
-                viewport_population = cached_demo
-            else:
-                try:
-                    if use_local_demographics_source:
-                        demo_response = await fetch_census_demographics(
-                            center_lat, center_lng, radii_miles=[1, 3]
-                        )
-                    else:
-                        demo_response = await fetch_arcgis_demographics(
-                            center_lat, center_lng, radii_miles=[1, 3]
-                        )
-                    viewport_population = {
-                        "pop_1mi": demo_response.radii[0].total_population,
-                        "pop_3mi": demo_response.radii[1].total_population,
-                        "density_1mi": demo_response.radii[0].population_density,
-                        "density_3mi": demo_response.radii[1].population_density,
-                        "income_3mi": demo_response.radii[1].median_household_income,
-                    }
-                    cache_demographics(center_lat, center_lng, viewport_population)
-                except Exception as e:
-                    if (
-                        use_local_demographics_source
-                        and FeatureFlags.should_fallback_to_arcgis()
-                        and settings.ARCGIS_API_KEY
-                    ):
-                        logger.warning(f"Local demographics failed, falling back to ArcGIS: {e}")
-                        try:
-                            demo_response = await fetch_arcgis_demographics(
-                                center_lat, center_lng, radii_miles=[1, 3]
-                            )
-                            viewport_population = {
-                                "pop_1mi": demo_response.radii[0].total_population,
-                                "pop_3mi": demo_response.radii[1].total_population,
-                                "density_1mi": demo_response.radii[0].population_density,
-                                "density_3mi": demo_response.radii[1].population_density,
-                                "income_3mi": demo_response.radii[1].median_household_income,
-                            }
-                            cache_demographics(center_lat, center_lng, viewport_population)
-                        except Exception as fallback_error:
-                            logger.warning(f"ArcGIS demographics fallback failed (non-fatal): {fallback_error}")
-                    else:
-                        logger.warning(f"Demographics lookup failed (non-fatal): {e}")
-
+        if request.enable_population_scoring and use_local_demographics_source:
+            population_data = await _fetch_candidate_populations(filtered_properties)
         if viewport_population:
             for prop in filtered_properties:
-                population_data[prop.id] = {
+                population_data.setdefault(prop.id, {
                     "pop_1mi": viewport_population.get("pop_1mi"),
                     "pop_3mi": viewport_population.get("pop_3mi"),
                     "density_1mi": viewport_population.get("density_1mi"),
                     "density_3mi": viewport_population.get("density_3mi"),
                     "income_3mi": viewport_population.get("income_3mi"),
-                }
+                })
+        timer.lap("candidate_demographics")
 
-        # 7. Fetch retail anchor stores near viewport center (1 Mapbox call, cached 1hr)
+        # 6. Nearest retail anchor per candidate
         retail_node_data: dict[str, dict] = {}
         retail_nodes_found = 0
-        anchor_pois: list[dict] = []
-
-        if request.enable_retail_node_scoring:
-            cached_nodes = get_cached_retail_nodes(center_lat, center_lng)
-            if cached_nodes is not None:
-                anchor_pois = cached_nodes
-            else:
-                try:
-                    anchor_result = await fetch_mapbox_pois(
-                        center_lat, center_lng,
-                        radius_meters=2414,  # 1.5 miles
-                        categories=["anchors"],
-                    )
-                    anchor_pois = [
-                        {"name": poi.name, "lat": poi.latitude, "lng": poi.longitude}
-                        for poi in anchor_result.pois
-                    ]
-                    cache_retail_nodes(center_lat, center_lng, anchor_pois)
-                except Exception as e:
-                    logger.warning(f"Mapbox anchor search failed (non-fatal): {e}")
-
         if anchor_pois:
             retail_nodes_found = len(anchor_pois)
-            for prop in filtered_properties:
-                nearest_dist = None
-                nearest_name = None
-                for anchor in anchor_pois:
-                    d = haversine(prop.longitude, prop.latitude, anchor["lng"], anchor["lat"])
-                    if nearest_dist is None or d < nearest_dist:
-                        nearest_dist = d
-                        nearest_name = anchor["name"]
-                retail_node_data[prop.id] = {"distance": nearest_dist, "name": nearest_name}
-
-        # 8. Score each property with site-quality-first formula
-        ranked_opportunities = []
-        for prop in filtered_properties:
-            corp_dist = corporate_distances.get(prop.id)
-            pop_info = population_data.get(prop.id, {})
-            retail_info = retail_node_data.get(prop.id, {})
-            vz_info = vz_family_distances.get(prop.id)
+            retail_node_data = _calculate_retail_anchor_distances(filtered_properties, anchor_pois)
+        elif materialized_inputs is not None:
+            retail_nodes_found = materialized_inputs.anchors_in(bounds)
+        timer.lap("anchor_distances")
+
+        # 7. Score all candidates in one vectorized pass, then build priority
+        #    signal strings only for the top `limit` (the only ones returned)
+        corp_dists = [corporate_distances.get(p.id) for p in filtered_properties]
+        pop_infos = [population_data.get(p.id, {}) for p in filtered_properties]
+        retail_infos = [retail_node_data.get(p.id, {}) for p in filtered_properties]
+        vz_infos = [vz_family_distances.get(p.id) for p in filtered_properties]
+        income_inputs = [
+            pop.get("income_3mi") if request.enable_income_scoring else None for pop in pop_infos
+        ]
 
-            rank_score, priority_signals = _calculate_priority_rank(
+        scores = score_priority_batch(build_scoring_features(
+            filtered_properties,
+            nearest_corporate_distance=corp_dists,
+            nearest_retail_node_distance=[r.get("distance") for r in retail_infos],
+            nearest_vz_family_distance=[vz[0] if vz else None for vz in vz_infos],
+            area_density_1mi=[pop.get("density_1mi") for pop in pop_infos],
+            area_density_3mi=[pop.get("density_3mi") for pop in pop_infos],
+            area_income_3mi=income_inputs,
+        ))
+
+        ranked_opportunities = []
+        for i in top_k_indices(scores, request.limit).tolist():
+            prop = filtered_properties[i]
+            corp_dist = corp_dists[i]
+            pop_info = pop_infos[i]
+            retail_info = retail_infos[i]
+            vz_info = vz_infos[i]
+            rank_score = int(scores[i])
+
+            _, priority_signals = _calculate_priority_rank(
                 prop,
                 nearest_corporate_distance=corp_dist,
                 nearest_retail_node_distance=retail_info.get("distance"),
@@ -1077,7 +1216,7 @@ async def search_opportunities(request: OpportunitySearchRequest, db: Session =
                 area_population_3mi=pop_info.get("pop_3mi"),
                 area_density_1mi=pop_info.get("density_1mi"),
                 area_density_3mi=pop_info.get("density_3mi"),
-                area_income_3mi=pop_info.get("income_3mi") if request.enable_income_scoring else None,
+                area_income_3mi=income_inputs[i],
             )
             ranked_opportunities.append({
                 "property": prop,
@@ -1096,36 +1235,19 @@ async def search_opportunities(request: OpportunitySearchRequest, db: Session =
                 "market_viability_score": rank_score,
             })
 
-        # 9. Sort by score descending, apply limit
+        if materialized:
+            ranked_opportunities.extend(materialized)
+
+        # 8. Sort by score descending, apply limit
         ranked_opportunities.sort(key=lambda x: x["rank_score"], reverse=True)
         ranked_opportunities = ranked_opportunities[:request.limit]
+        timer.lap("score")
 
-        # 10. Convert to response format with 1-based ranking
-        opportunities = [
-            OpportunityRanking(
-                property=opp["property"],
-                rank=idx + 1,
-                priority_signals=opp["priority_signals"],
-                signal_count=opp["signal_count"],
-                nearest_corporate_store_miles=opp["nearest_corporate_store_miles"],
-                nearest_retail_node_miles=opp["nearest_retail_node_miles"],
-                nearest_retail_node_name=opp["nearest_retail_node_name"],
-                nearest_verizon_family_miles=opp["nearest_verizon_family_miles"],
-                nearest_verizon_family_name=opp["nearest_verizon_family_name"],
-                area_population_1mi=opp["area_population_1mi"],
-                area_population_3mi=opp["area_population_3mi"],
-                area_density_1mi=opp["area_density_1mi"],
-                area_income_3mi=opp["area_income_3mi"],
-                market_viability_score=opp["market_viability_score"],
-            )
-            for idx, opp in enumerate(ranked_opportunities)
-        ]
-
-        return OpportunitySearchResponse(
+        # 9. Response metadata (opportunities are converted by the caller)
+        header = OpportunitySearchHeader(
             center_latitude=center_lat,
             center_longitude=center_lng,
-            total_found=len(opportunities),
-            opportunities=opportunities,
+            total_found=len(ranked_opportunities),
             search_timestamp=datetime.now().isoformat(),
             filters_applied={
                 "parcel_size_acres": f"{request.min_parcel_acres}-{request.max_parcel_acres}",
@@ -1149,6 +1271,7 @@ async def search_opportunities(request: OpportunitySearchRequest, db: Session =
             retail_nodes_found=retail_nodes_found,
             viewport_population_center=viewport_population,
         )
+        return header, ranked_opportunities
 
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
@@ -1156,6 +1279,55 @@ async def search_opportunities(request: OpportunitySearchRequest, db: Session =
         raise HTTPException(status_code=500, detail=f"Error searching opportunities: {str(e)}")
 
 
+@router.post("/scores/refresh")
+async def refresh_materialized_scores(
+    background_tasks: BackgroundTasks,
+    source_county: Optional[str] = None,
+    full: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Recompute materialized opportunity scores for local county properties (background task).
+
+    Incremental by default: only properties that changed, or whose store /
+    ACS / anchor inputs changed since they were scored, are recomputed.
+    """
+    status = get_refresh_status(db)
+    if status["running"]:
+        raise HTTPException(status_code=409, detail="Score refresh already in progress")
+
+    background_tasks.add_task(run_refresh_task, source_county, full)
+    return {"status": "started", "source_county": source_county, "full": full}
+
+
+@router.get("/scores/status")
+async def get_materialized_score_status(db: Session = Depends(get_db)):
+    """Progress of the last score refresh and row counts in opportunity_scores."""
+    return get_refresh_status(db)
+
+
+@router.post("/cache/warm")
+async def warm_opportunity_caches(background_tasks: BackgroundTasks):
+    """
+    Pre-populate property tiles, demographics, anchors, traffic and boundary
+    caches for the target markets (background task).
+
+    Respects per-provider call spacing and the ATTOM / ArcGIS call budgets;
+    entries that are still fresh are not refetched.
+    """
+    if get_warm_status()["running"]:
+        raise HTTPException(status_code=409, detail="Cache warm already in progress")
+
+    background_tasks.add_task(run_warm_task)
+    return {"status": "started"}
+
+
+@router.get("/cache/warm/status")
+async def get_cache_warm_status():
+    """Progress of the running cache warm and the result of the last one."""
+    return get_warm_status()
+
+
 @router.get("/stats")
 async def get_opportunity_stats():
     """
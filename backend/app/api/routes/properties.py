@@ -32,6 +32,7 @@ from app.services.local_property import (
 )
 from app.core.config import settings
 from app.core.feature_flags import FeatureFlags, use_local_properties
+from app.utils.http_clients import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +101,7 @@ async def get_parcel_info(request: ParcelRequest):
         "si_srid": "4326"
     }
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("reportall") as client:
         try:
             response = await client.get(url, params=params, timeout=15)
             response.raise_for_status()
@@ -5,10 +5,13 @@ Serves state DOT traffic count data (AADT) from various sources.
 Proxies ArcGIS REST services and caches responses for performance.
 """
 from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
 import httpx
 from datetime import datetime, timedelta
 
+from app.utils.http_clients import http_client
+from app.utils.single_flight import SingleFlight
+from app.utils.ttl_cache import KB, MB, TTLCache
+
 router = APIRouter()
 
 # State DOT service URLs
@@ -23,10 +26,22 @@ STATE_SERVICES = {
     # "NV": {"name": "Nevada", "url": "...", "fields": "..."},
 }
 
-# Simple in-memory cache (will expire on restart)
-# TODO: Move to Redis for production
-_cache: Dict[str, tuple[Any, datetime]] = {}
+# Bounded cache shared across workers via L2 (survives restarts). State GeoJSON
+# layers are several MB each, so they are stored compressed. AADT counts are
+# published yearly, so expired layers are served for up to a week while a
+# background refresh runs.
 CACHE_TTL = timedelta(hours=24)
+CACHE_STALE_GRACE = timedelta(days=6)
+CACHE_MAX_BYTES = 64 * MB
+_cache = TTLCache(
+    "traffic", CACHE_TTL.total_seconds(),
+    max_entries=50,  # one layer per state
+    max_bytes=CACHE_MAX_BYTES,
+    compress_min_bytes=64 * KB,
+    l2=True,
+    stale_grace_seconds=CACHE_STALE_GRACE.total_seconds(),
+)
+_flight = SingleFlight("traffic")
 
 
 @router.get("/states")
@@ -68,17 +83,24 @@ async def get_traffic_data(state_code: str):
             detail=f"Traffic data not available for state: {state_code}. Available: {list(STATE_SERVICES.keys())}"
         )
     
-    # Check cache
+    # Check cache (stale layers are returned immediately and refreshed in the background)
     cache_key = f"traffic_{state_code}"
-    if cache_key in _cache:
-        data, cached_at = _cache[cache_key]
-        if datetime.now() - cached_at < CACHE_TTL:
-            return data
+    cached = await _cache.aget_allow_stale(cache_key)
+    if cached is not None:
+        result, stale = cached
+        if stale:
+            _flight.refresh(cache_key, lambda: _fetch_state_traffic(state_code))
+        return result
     
-    # Fetch from ArcGIS
+    return await _flight.do(cache_key, lambda: _fetch_state_traffic(state_code))
+
+
+async def _fetch_state_traffic(state_code: str) -> dict:
+    """Fetch a state's traffic layer from ArcGIS and cache it."""
+    cache_key = f"traffic_{state_code}"
     service = STATE_SERVICES[state_code]
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client("state_dot") as client:
             response = await client.get(
                 f"{service['url']}/query",
                 params={
@@ -104,7 +126,7 @@ async def get_traffic_data(state_code: str):
             }
             
             # Cache result
-            _cache[cache_key] = (result, datetime.now())
+            _cache.set(cache_key, result)
             
             return result
             
@@ -134,8 +156,7 @@ async def clear_cache(state_code: str):
     state_code = state_code.upper()
     cache_key = f"traffic_{state_code}"
     
-    if cache_key in _cache:
-        del _cache[cache_key]
+    if _cache.delete(cache_key):
         return {"message": f"Cache cleared for {state_code}"}
     
     return {"message": f"No cache found for {state_code}"}
@@ -37,6 +37,51 @@ class Settings(BaseSettings):
     LOOPNET_USERNAME: Optional[str] = None
     LOOPNET_PASSWORD: Optional[str] = None
 
+    # Upstream API base URLs (override to point at local stand-ins, e.g. benchmarks/)
+    ATTOM_BASE_URL: str = "https://api.gateway.attomdata.com/propertyapi/v1.0.0"
+    ARCGIS_GEOENRICH_URL: str = "https://geoenrich.arcgis.com/arcgis/rest/services/World/geoenrichmentserver/GeoEnrichment/enrich"
+    CENSUS_API_BASE_URL: str = "https://api.census.gov/data"
+    CENSUS_GEOCODER_URL: str = "https://geocoding.geo.census.gov/geocoder"
+    MAPBOX_API_BASE_URL: str = "https://api.mapbox.com"
+    # Negotiate HTTP/2 on the pooled upstream clients (needs the `h2` package)
+    HTTP2_ENABLED: bool = True
+    # Per-provider overrides of app/utils/rate_limits.PROVIDER_LIMITS (JSON),
+    # e.g. {"attom": {"rate": 10, "concurrency": 16}}
+    PROVIDER_RATE_LIMITS: dict[str, dict] = {}
+    # Per-provider circuit breakers (app/utils/circuit_breakers.py); overrides of
+    # BREAKER_POLICIES (JSON), e.g. {"arcgis": {"slow_call_seconds": 5}}
+    CIRCUIT_BREAKERS_ENABLED: bool = True
+    CIRCUIT_BREAKERS: dict[str, dict] = {}
+    # Hedged GETs: provider limits (e.g. ["census", "mapbox_search"]) whose GETs get a
+    # second copy sent once the first is slower than their recent latency percentile
+    HEDGED_REQUEST_PROVIDERS: list[str] = []
+    HEDGE_DELAY_PERCENTILE: float = 95.0
+    HEDGE_MIN_DELAY_SECONDS: float = 0.25
+
+    # Ring demographics intersect the subdivided census_tract_parts table once it
+    # is built (scripts/build_tract_parts.py); False always uses census_tracts
+    CENSUS_TRACT_PARTS_ENABLED: bool = True
+    # Summed-area population raster (scripts/build_population_raster.py). With fast
+    # mode on, bulk ring demographics read approximate totals from it unless exact=True
+    POPULATION_RASTER_PATH: str = "data/population_raster"
+    DEMOGRAPHICS_FAST_MODE: bool = False
+
+    # Shared L2 cache behind the in-process caches (sqlite, lmdb, redis, none)
+    CACHE_L2_BACKEND: str = "sqlite"
+    CACHE_L2_PATH: str = "data/cache"
+    CACHE_L2_REDIS_URL: Optional[str] = None
+    CACHE_L2_MAX_BYTES: int = 512 * 1024 * 1024
+    # Serve expired entries within each namespace's grace window while refreshing in the background
+    CACHE_STALE_WHILE_REVALIDATE: bool = True
+
+    # Cache warm-up for TARGET_MARKET_CITIES (app/services/cache_warmer.py)
+    CACHE_WARM_ON_STARTUP: bool = False  # one worker per run (L2 lease, see cache_warmer)
+    CACHE_WARM_STARTUP_DELAY_SECONDS: float = 30.0
+    CACHE_WARM_INTERVAL_HOURS: float = 0.0  # 0 = warm once at startup only
+    CACHE_WARM_MIN_INTERVAL_SECONDS: float = 1.0  # spacing between calls to the same provider
+    CACHE_WARM_ATTOM_CALL_BUDGET: int = 400  # per run; ATTOM bills per call
+    CACHE_WARM_ARCGIS_CALL_BUDGET: int = 150  # per run; GeoEnrichment consumes credits
+
     # Geocoding
     GEOCODING_USER_AGENT: str = "csoki-site-selection/1.0"
     GEOCODING_RATE_LIMIT: float = 1.0
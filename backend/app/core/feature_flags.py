@@ -28,6 +28,7 @@ class FeatureFlags:
     _ENABLE_GRADUAL_ROLLOUT = "ENABLE_GRADUAL_ROLLOUT"
     _ROLLOUT_PERCENTAGE = "ROLLOUT_PERCENTAGE"
     _FALLBACK_TO_EXTERNAL = "FALLBACK_TO_EXTERNAL"
+    _FALLBACK_TO_LOCAL = "FALLBACK_TO_LOCAL"
     _DATA_SOURCE_MODE = "DATA_SOURCE_MODE"
     
     # Default values
@@ -37,6 +38,7 @@ class FeatureFlags:
         _ENABLE_GRADUAL_ROLLOUT: True,
         _ROLLOUT_PERCENTAGE: 0,
         _FALLBACK_TO_EXTERNAL: True,
+        _FALLBACK_TO_LOCAL: True,
         _DATA_SOURCE_MODE: "external",  # external, local, hybrid
     }
     
@@ -160,6 +162,11 @@ class FeatureFlags:
     def should_fallback_to_arcgis(cls) -> bool:
         """Should we fallback to ArcGIS API if local demographics data fails?"""
         return cls._get_bool_flag(cls._FALLBACK_TO_EXTERNAL) and hasattr(settings, 'ARCGIS_API_KEY') and settings.ARCGIS_API_KEY
+
+    @classmethod
+    def should_fallback_to_local(cls) -> bool:
+        """Should we fallback to local data (properties, census, anchors) if an external API fails or its circuit breaker is open?"""
+        return cls._get_bool_flag(cls._FALLBACK_TO_LOCAL)
     
     # --- Global Data Source Control ---
     
@@ -234,6 +241,7 @@ class FeatureFlags:
                 "local_properties_enabled": cls._get_bool_flag(cls._ENABLE_LOCAL_PROPERTIES),
                 "local_demographics_enabled": cls._get_bool_flag(cls._ENABLE_LOCAL_DEMOGRAPHICS),
                 "fallback_to_external": cls._get_bool_flag(cls._FALLBACK_TO_EXTERNAL),
+                "fallback_to_local": cls._get_bool_flag(cls._FALLBACK_TO_LOCAL),
             },
             "database_availability": {
                 "local_property_db": cls.has_local_property_db(),
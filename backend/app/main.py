@@ -2,17 +2,23 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 from pathlib import Path
 
 from app.core.config import settings
 from app.core.database import engine, Base, SessionLocal
 from app.api import api_router
+from app.utils.http_clients import close_http_clients, open_http_clients
 from app.models.store import Store
 from app.models.team_property import TeamProperty  # Ensure table is created
 from app.models.scraped_listing import ScrapedListing  # Ensure table is created
 from app.models.scout import ScoutJob, ScoutReport, ScoutDecision  # Ensure SCOUT tables created
 from app.models.analysis_job import AnalysisJob  # Ensure table is created
+from app.models.acs_tract_value import AcsTractValue  # Ensure table is created
+from app.models.census_response import CensusResponse  # Ensure table is created
+from app.models.county_property import CountyProperty  # Ensure table is created
+from app.models.opportunity_score import OpportunityScore  # Ensure table is created
 
 
 class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
@@ -39,6 +45,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
 
+    # Pooled upstream HTTP clients shared by every service
+    await open_http_clients()
+
     # Create database tables (in production, use Alembic migrations)
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created/verified")
@@ -71,6 +80,8 @@ async def lifespan(app: FastAPI):
             total_geocoded = sum(s.get('geocoded', 0) for s in stats.values())
             if total_imported > 0:
                 logger.info(f"Imported {total_imported} new stores ({total_geocoded} with coordinates)")
+                from app.services.opportunity_score_job import request_score_refresh
+                request_score_refresh()
             else:
                 logger.info(f"All stores up to date ({store_count} in database)")
         else:
@@ -91,10 +102,31 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
+    # Warm caches for the target markets in the background (after a short delay;
+    # workers share one run per interval through an L2 lease)
+    warm_task = None
+    if settings.CACHE_WARM_ON_STARTUP:
+        from app.services.cache_warmer import run_warm_schedule
+        warm_task = asyncio.create_task(run_warm_schedule())
+        logger.info("Cache warm-up scheduled")
+
+    # Share this worker's cache metrics with the others (via the L2 tier)
+    from app.utils.cache_metrics import run_metrics_publisher
+    metrics_task = asyncio.create_task(run_metrics_publisher())
+
+    # Run score refreshes requested by imports outside the app (via the L2 tier)
+    from app.services.opportunity_score_job import run_refresh_watch
+    refresh_watch_task = asyncio.create_task(run_refresh_watch())
+
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    if warm_task is not None:
+        warm_task.cancel()
+    metrics_task.cancel()
+    refresh_watch_task.cancel()
+    await close_http_clients()
 
 
 # Create FastAPI application
@@ -125,6 +157,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
 
 # Include API routes
@@ -3,5 +3,8 @@ from app.models.team_property import TeamProperty
 from app.models.opportunity_feedback import OpportunityFeedback
 from app.models.activity_node import ActivityNode
 from app.models.analysis_job import AnalysisJob, JobStatus, JobPriority
+from app.models.acs_tract_value import AcsTractValue
+from app.models.census_response import CensusResponse
+from app.models.opportunity_score import OpportunityScore
 
-__all__ = ["Store", "Brand", "TeamProperty", "OpportunityFeedback", "ActivityNode", "AnalysisJob", "JobStatus", "JobPriority"]
+__all__ = ["Store", "Brand", "TeamProperty", "OpportunityFeedback", "ActivityNode", "AnalysisJob", "JobStatus", "JobPriority", "AcsTractValue", "CensusResponse", "OpportunityScore"]
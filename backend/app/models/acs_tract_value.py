@@ -0,0 +1,42 @@
+"""
+ACS Tract Value model.
+
+Local copy of ACS 5-Year tract-level estimates, keyed by tract GEOID so ring
+demographics can be computed by joining against census_tracts in PostGIS
+instead of calling api.census.gov per request.
+
+Filled by scripts/load_acs_tracts.py (app/services/acs_loader.py); until a
+state is loaded, rings there are reported as uncovered.
+"""
+
+from sqlalchemy import Column, String, Float, DateTime, Index
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class AcsTractValue(Base):
+    """ACS 5-Year estimates for a single census tract (columns mirror CensusDemographicsService.acs_variables)."""
+
+    __tablename__ = "acs_tract_values"
+
+    geoid = Column(String(11), primary_key=True)         # state(2) + county(3) + tract(6)
+    statefp = Column(String(2), nullable=False)
+    countyfp = Column(String(3), nullable=False)
+    vintage = Column(String(4), nullable=False, default="2022")
+
+    total_population = Column(Float)                     # B01003_001E
+    total_households = Column(Float)                     # B11001_001E
+    median_age = Column(Float)                           # B01002_001E
+    median_household_income = Column(Float)              # B19013_001E
+    aggregate_household_income = Column(Float)           # B19025_001E
+    per_capita_income = Column(Float)                    # B19301_001E
+
+    loaded_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_acs_tract_values_county', 'statefp', 'countyfp'),
+    )
+
+    def __repr__(self):
+        return f"<AcsTractValue(geoid={self.geoid}, vintage={self.vintage}, population={self.total_population})>"
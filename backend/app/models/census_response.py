@@ -0,0 +1,38 @@
+"""
+Census Response model.
+
+Persistent store of Census Data API answers (ACS 5-Year tract estimates,
+County Business Patterns county totals). The vintages are fixed, so an answer
+never changes once fetched: rows are filled on first use or by a whole-state
+preload (scripts/preload_census.py) and served locally afterward.
+
+Rows are written by app.services.census_store.
+"""
+
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class CensusResponse(Base):
+    """Values of one variable set for one geography (tract, or county when tract is "")."""
+
+    __tablename__ = "census_responses"
+
+    dataset = Column(String(20), primary_key=True)      # API dataset path, e.g. "acs/acs5", "cbp"
+    vintage = Column(String(4), primary_key=True)       # e.g. "2022"
+    variables = Column(String(255), primary_key=True)   # comma-joined variable codes as requested
+    statefp = Column(String(2), primary_key=True)
+    countyfp = Column(String(3), primary_key=True)
+    tract = Column(String(6), primary_key=True)         # "" for county-level datasets
+
+    values = Column(Text, nullable=False)               # JSON object: variable code -> raw API value
+
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return (
+            f"<CensusResponse({self.dataset} {self.vintage} "
+            f"{self.statefp}{self.countyfp}{self.tract})>"
+        )
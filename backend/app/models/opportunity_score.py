@@ -0,0 +1,66 @@
+"""
+Opportunity Score model.
+
+Materialized site-quality score for each eligible county property, with the
+inputs it was computed from. Lets local-mode opportunity search rank a
+viewport with one indexed bbox + ORDER BY query instead of scoring every
+candidate in Python per request.
+
+Rows are written by app.services.opportunity_score_job; the *_version columns
+record which store set / ACS load / anchor set each row was computed against
+so refreshes only recompute what changed.
+"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class OpportunityScore(Base):
+    """Precomputed _calculate_priority_rank result for one county property (eligible or not)."""
+
+    __tablename__ = "opportunity_scores"
+
+    county_property_id = Column(
+        Integer, ForeignKey("county_properties.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # Denormalized from county_properties for the bbox + ORDER BY query
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    state = Column(String(2))
+    property_type = Column(String(20), nullable=False)        # PropertyType value (retail, office, land)
+    is_eligible = Column(Boolean, nullable=False, default=False)  # Passes the default eligibility filter
+
+    # Scoring inputs
+    nearest_corporate_miles = Column(Float)                   # 999 when no corporate store
+    nearest_vz_family_miles = Column(Float)                   # 999 when no VZ-family store
+    nearest_vz_family_brand = Column(String(50))
+    nearest_anchor_miles = Column(Float)                      # NULL when no anchor nearby
+    nearest_anchor_name = Column(String(255))
+    population_1mi = Column(Integer)
+    population_3mi = Column(Integer)
+    density_1mi = Column(Float)
+    density_3mi = Column(Float)
+    income_3mi = Column(Integer)
+
+    # Result
+    rank_score = Column(Integer)                              # NULL for ineligible properties
+    priority_signals = Column(Text)                           # JSON array of explanation strings
+
+    # Versions the row was computed against
+    score_version = Column(Integer, nullable=False)           # opportunity_scoring.SCORE_VERSION
+    stores_version = Column(String(100))
+    demographics_version = Column(String(100))
+    anchors_version = Column(String(100))
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index('idx_opportunity_scores_location', 'latitude', 'longitude'),
+        Index('idx_opportunity_scores_rank', 'is_eligible', 'rank_score'),
+        Index('idx_opportunity_scores_type_rank', 'property_type', 'rank_score'),
+    )
+
+    def __repr__(self):
+        return f"<OpportunityScore(county_property_id={self.county_property_id}, score={self.rank_score}, version={self.score_version})>"
@@ -0,0 +1,229 @@
+"""
+Bulk loader for the local acs_tract_values table.
+
+Ring demographics join census_tracts against acs_tract_values in PostGIS, so
+the table has to hold every tract of the target states. Sources:
+
+- Census API dumps: JSON files in the API's array-of-arrays format, e.g. the
+  saved output of `.../2022/acs/acs5?get=<ACS_TRACT_VARIABLES>&for=tract:*&in=state:19`
+  (column order doesn't matter).
+- Live Census API: the same request made per state (one call each).
+- ACS 5-Year Table-based Summary File tables: pipe-delimited .dat files
+  (acsdt5y2022-b01003.dat, ...) with a GEO_ID column and <TABLE>_E<NNN>
+  estimate columns. Only tract rows (GEO_ID 1400000US...) are read.
+
+Values are cleaned on the way in: ACS annotation sentinels (negative
+values such as -666666666) and missing values become NULL.
+
+All states are written in one transaction. On PostgreSQL the rows are
+streamed with a single COPY into a temp table and merged with one
+INSERT ... ON CONFLICT. Other databases (SQLite in development) use a batched
+executemany upsert. loaded_at is reset on every loaded row, which bumps the
+ACS data version the opportunity score job checks.
+"""
+
+import csv
+import io
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert
+
+from app.core.database import SessionLocal, engine
+from app.models.acs_tract_value import AcsTractValue
+from app.services.census_store import (
+    ACS_DATASET,
+    ACS_TRACT_VARIABLES,
+    ACS_VINTAGE,
+    TARGET_STATE_FIPS,
+    _call_census_api,
+    _rows_by_county,
+)
+
+logger = logging.getLogger(__name__)
+
+# acs_tract_values columns written by the loader, in COPY order
+_COLUMNS = ["geoid", "statefp", "countyfp", "vintage", *ACS_TRACT_VARIABLES.values()]
+
+# Summary File estimate column (B01003_E001) -> API variable code (B01003_001E)
+_SUMMARY_FILE_COLUMNS = {
+    f"{code.split('_')[0]}_E{code.split('_')[1][:-1]}": code
+    for code in ACS_TRACT_VARIABLES
+}
+_TRACT_GEO_PREFIX = "1400000US"
+
+_SQLITE_BATCH_SIZE = 500
+STATE_FETCH_TIMEOUT = 60.0
+
+
+def _clean(value) -> Optional[float]:
+    """ACS raw value -> float, with missing values and annotation sentinels (< 0) as None."""
+    if value is None or value in ("", "-", "null", "N"):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number >= 0 else None
+
+
+def _record(geoid: str, values: Dict[str, Optional[str]], vintage: str) -> dict:
+    record = {"geoid": geoid, "statefp": geoid[:2], "countyfp": geoid[2:5], "vintage": vintage}
+    for code, field in ACS_TRACT_VARIABLES.items():
+        record[field] = _clean(values.get(code))
+    return record
+
+
+def records_from_api_rows(data: list, vintage: str = ACS_VINTAGE) -> Dict[str, dict]:
+    """acs_tract_values rows from a Census API response (header row + data rows), keyed by GEOID."""
+    records = {}
+    for (state, county), tracts in _rows_by_county(data, list(ACS_TRACT_VARIABLES)).items():
+        for tract, values in tracts.items():
+            geoid = f"{state}{county}{tract}"
+            records[geoid] = _record(geoid, values, vintage)
+    return records
+
+
+def read_api_dumps(paths: Iterable[Path], vintage: str = ACS_VINTAGE) -> Dict[str, dict]:
+    """Records from saved Census API JSON responses."""
+    records: Dict[str, dict] = {}
+    for path in paths:
+        with open(path) as f:
+            found = records_from_api_rows(json.load(f), vintage)
+        logger.info(f"ACS dump {path}: {len(found)} tracts")
+        records.update(found)
+    return records
+
+
+def read_summary_files(
+    directory: Path,
+    state_fips: Iterable[str],
+    vintage: str = ACS_VINTAGE,
+) -> Dict[str, dict]:
+    """
+    Records from ACS Table-based Summary File .dat tables in `directory`.
+
+    Each table contributes its estimate columns; a tract's record is complete
+    once every table holding one of ACS_TRACT_VARIABLES has been read.
+    """
+    states = set(state_fips)
+    values_by_geoid: Dict[str, Dict[str, str]] = {}
+    for path in sorted(Path(directory).glob("*.dat")):
+        with open(path, newline="") as f:
+            reader = csv.reader(f, delimiter="|")
+            header = next(reader, None)
+            if not header or "GEO_ID" not in header:
+                continue
+            wanted = [(i, _SUMMARY_FILE_COLUMNS[name]) for i, name in enumerate(header) if name in _SUMMARY_FILE_COLUMNS]
+            if not wanted:
+                continue
+            geo_idx = header.index("GEO_ID")
+            rows = 0
+            for row in reader:
+                geo_id = row[geo_idx]
+                if not geo_id.startswith(_TRACT_GEO_PREFIX):
+                    continue
+                geoid = geo_id[len(_TRACT_GEO_PREFIX):]
+                if geoid[:2] not in states:
+                    continue
+                values = values_by_geoid.setdefault(geoid, {})
+                for i, code in wanted:
+                    values[code] = row[i]
+                rows += 1
+        logger.info(f"ACS summary file {path.name}: {rows} tract rows ({', '.join(code for _, code in wanted)})")
+    return {geoid: _record(geoid, values, vintage) for geoid, values in values_by_geoid.items()}
+
+
+async def fetch_states(state_fips: Iterable[str], vintage: str = ACS_VINTAGE) -> Dict[str, dict]:
+    """Records for every tract of each state from the live Census API (one call per state)."""
+    records: Dict[str, dict] = {}
+    for fips in state_fips:
+        data = await _call_census_api(ACS_DATASET, vintage, {
+            "get": ",".join(ACS_TRACT_VARIABLES),
+            "for": "tract:*",
+            "in": f"state:{fips}",
+        }, STATE_FETCH_TIMEOUT)
+        found = records_from_api_rows(data, vintage)
+        logger.info(f"ACS API state {fips}: {len(found)} tracts")
+        records.update(found)
+    return records
+
+
+def _copy_postgres(records: List[dict]) -> None:
+    """One COPY into a temp table, then one upsert into acs_tract_values (single transaction)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow(["" if record[c] is None else record[c] for c in _COLUMNS])
+    buffer.seek(0)
+
+    columns = ", ".join(_COLUMNS)
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in _COLUMNS if c != "geoid")
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE TEMP TABLE acs_tract_values_load "
+            "(LIKE acs_tract_values INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cursor.copy_expert(f"COPY acs_tract_values_load ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            f"INSERT INTO acs_tract_values ({columns}, loaded_at) "
+            f"SELECT {columns}, now() FROM acs_tract_values_load "
+            f"ON CONFLICT (geoid) DO UPDATE SET {updates}, loaded_at = now()"
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _upsert_batched(records: List[dict]) -> None:
+    """Portable fallback: delete + executemany insert in batches, one transaction."""
+    db = SessionLocal()
+    try:
+        for start in range(0, len(records), _SQLITE_BATCH_SIZE):
+            batch = records[start:start + _SQLITE_BATCH_SIZE]
+            db.execute(delete(AcsTractValue).where(AcsTractValue.geoid.in_([r["geoid"] for r in batch])))
+            db.execute(insert(AcsTractValue), batch)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def load_acs_tract_values(records: Dict[str, dict]) -> Dict[str, object]:
+    """Write records to acs_tract_values in one bulk load; returns counts per state and timing."""
+    started = time.monotonic()
+    rows = list(records.values())
+    if rows:
+        if engine.dialect.name == "postgresql":
+            _copy_postgres(rows)
+        else:
+            _upsert_batched(rows)
+
+    states: Dict[str, int] = {}
+    for row in rows:
+        states[row["statefp"]] = states.get(row["statefp"], 0) + 1
+    result = {
+        "tracts": len(rows),
+        "states": states,
+        "method": "copy" if engine.dialect.name == "postgresql" else "executemany",
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+    }
+    logger.info(f"Loaded {len(rows)} ACS tracts into acs_tract_values: {result}")
+    return result
+
+
+def target_state_fips(states: Optional[Iterable[str]] = None) -> List[str]:
+    """FIPS codes for state abbreviations (default: TARGET_STATE_FIPS); FIPS codes pass through."""
+    if not states:
+        return list(TARGET_STATE_FIPS.values())
+    return [TARGET_STATE_FIPS.get(s.upper(), s) for s in states]
@@ -5,12 +5,12 @@ Uses the ArcGIS GeoEnrichment API to fetch population, income data.
 Census Bureau API supplements with median age and business/employment data.
 """
 import asyncio
-import httpx
 from typing import Optional
 from pydantic import BaseModel
 
 from app.core.config import settings
 from app.services.census import fetch_census_data
+from app.utils.http_clients import http_client
 
 
 class DemographicMetrics(BaseModel):
@@ -106,7 +106,7 @@ async def fetch_demographics(
     }]
 
     # GeoEnrichment API endpoint
-    url = "https://geoenrich.arcgis.com/arcgis/rest/services/World/geoenrichmentserver/GeoEnrichment/enrich"
+    url = settings.ARCGIS_GEOENRICH_URL
 
     params = {
         "studyAreas": str(study_areas).replace("'", '"'),
@@ -116,7 +116,7 @@ async def fetch_demographics(
         "token": api_key
     }
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("arcgis") as client:
         response = await client.post(url, data=params, timeout=30)
         response.raise_for_status()
         data = response.json()
@@ -17,6 +17,7 @@ from datetime import datetime, timedelta
 from enum import Enum
 
 from ..core.config import settings
+from ..utils.http_clients import http_client
 
 
 # =============================================================================
@@ -43,6 +44,7 @@ class PropertySource(str, Enum):
     LOOPNET = "loopnet"
     COMMERCIALCAFE = "commercialcafe"
     ROFO = "rofo"
+    LOCAL = "local"
 
 
 class OpportunitySignal(BaseModel):
@@ -118,6 +120,7 @@ class PropertySearchResult(BaseModel):
     total_found: int
     sources: List[str]
     search_timestamp: str
+    truncated: bool = False  # the search hit a result/radius cap, so matches may be missing
 
 
 class GeoBounds(BaseModel):
@@ -132,7 +135,7 @@ class GeoBounds(BaseModel):
 # ATTOM API Client
 # =============================================================================
 
-ATTOM_BASE_URL = "https://api.gateway.attomdata.com/propertyapi/v1.0.0"
+ATTOM_BASE_URL = settings.ATTOM_BASE_URL
 
 
 def _get_headers() -> dict:
@@ -441,6 +444,7 @@ async def search_properties_by_bounds(
     approx_radius = max(lat_miles, lng_miles) / 2
 
     # Cap radius at ATTOM's max of 20 miles
+    truncated = approx_radius > 20.0
     approx_radius = min(approx_radius, 20.0)
 
     types_to_search = property_types or [
@@ -471,7 +475,9 @@ async def search_properties_by_bounds(
     for r in results:
         if isinstance(r, Exception):
             print(f"[ATTOM] One property-type search failed: {r}")
+            truncated = True
             continue
+        truncated = truncated or r.truncated
         for prop in r.properties:
             if prop.id not in seen_ids:
                 seen_ids.add(prop.id)
@@ -488,6 +494,7 @@ async def search_properties_by_bounds(
         total_found=len(all_properties),
         sources=["ATTOM"],
         search_timestamp=datetime.now().isoformat(),
+        truncated=truncated,
     )
 
 
@@ -532,8 +539,9 @@ async def _search_attom_api(
     radius_miles = min(radius_miles, 20.0)
 
     properties = []
+    truncated = False
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_client("attom") as client:
         try:
             # ATTOM Property Search using correct parameters
             # Per docs: https://api.developer.attomdata.com/docs
@@ -555,6 +563,8 @@ async def _search_attom_api(
                 data = response.json()
                 property_list = data.get("property", [])
                 print(f"[ATTOM] Found {len(property_list)} properties in response")
+                # A full page means ATTOM has more matches than it returned
+                truncated = len(property_list) >= min(limit, 100)
 
                 for prop in property_list:
                     try:
@@ -656,6 +666,7 @@ async def _search_attom_api(
                 raise ValueError("ATTOM API rate limit exceeded - try again later")
             else:
                 print(f"[ATTOM] API returned status {response.status_code}: {response.text[:500]}")
+                truncated = True  # unknown outcome; don't treat the empty result as complete
 
         except httpx.RequestError as e:
             print(f"[ATTOM] Request error: {e}")
@@ -672,6 +683,7 @@ async def _search_attom_api(
         total_found=len(properties),
         sources=["ATTOM"],
         search_timestamp=datetime.now().isoformat(),
+        truncated=truncated,
     )
 
 
@@ -711,7 +723,7 @@ async def get_property_details(attom_id: str) -> Optional[PropertyListing]:
     if not settings.ATTOM_API_KEY:
         raise ValueError("ATTOM_API_KEY not configured")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_client("attom") as client:
         try:
             response = await client.get(
                 f"{ATTOM_BASE_URL}/property/detail",
@@ -748,7 +760,7 @@ async def check_attom_api_key() -> dict:
             "message": "ATTOM_API_KEY not configured",
         }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_client("attom") as client:
         try:
             # Make a minimal test request
             response = await client.get(
@@ -758,6 +770,7 @@ async def check_attom_api_key() -> dict:
                     "address1": "123 Main St",
                     "address2": "New York, NY",
                 },
+                timeout=10.0,
             )
 
             if response.status_code == 200:
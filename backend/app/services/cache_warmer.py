@@ -0,0 +1,365 @@
+"""
+Cache warm-up for the target markets.
+
+Every cache starts cold after a deploy (the L2 tier only helps once something
+has filled it), so the first searches of the day in each market pay for the
+upstream fetches. The warmer walks TARGET_MARKET_CITIES (routes/listings.py)
+and fills the same cache entries those requests would:
+
+- Per market, a WARM_GRID_RADIUS grid of 0.1 degree cells around the city
+  center: property tiles, viewport-center demographics and anchor POIs, via
+  the opportunity search fetch stages (so keys and cache rules match live
+  search exactly). Demographics/anchors are keyed on 0.1 degree cells and
+  each cell's property search covers its 2x2 PROPERTY_TILE_DEG tiles.
+- Per state, the traffic layer (where one exists) and the boundary layers
+  the map loads by default (counties, cities, ZIP codes, ACS tracts).
+
+Entries that are already fresh are skipped, so a scheduled run only refetches
+what has expired. Calls to each provider are spaced at least
+CACHE_WARM_MIN_INTERVAL_SECONDS apart, and billed providers (ATTOM, ArcGIS
+GeoEnrichment) stop at a per-run call budget. Progress is available from
+get_warm_status().
+
+Every uvicorn worker runs the app lifespan, so scheduled runs (startup and
+CACHE_WARM_INTERVAL_HOURS) first claim a lease in the shared L2 tier; only
+the worker that gets it warms, once per interval for all workers. Without
+an L2 backend the workers can't coordinate (nor share what one warmed), so
+scheduled warming is skipped; run scripts/warm_caches.py instead.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.feature_flags import use_local_demographics, use_local_properties
+from app.services.attom import GeoBounds, PropertyType
+from app.services.viewport_cache import (
+    get_cached_demographics,
+    get_cached_property_tiles,
+    get_cached_retail_nodes,
+    property_tiles_for_bounds,
+)
+from app.utils.cache_backends import get_l2_backend
+
+logger = logging.getLogger(__name__)
+
+# City centers for TARGET_MARKET_CITIES (cities missing here are skipped with a warning)
+MARKET_CENTERS: Dict[Tuple[str, str], Tuple[float, float]] = {
+    ("Des Moines", "IA"): (41.5868, -93.6250),
+    ("Cedar Rapids", "IA"): (41.9779, -91.6656),
+    ("Davenport", "IA"): (41.5236, -90.5776),
+    ("Iowa City", "IA"): (41.6611, -91.5302),
+    ("Omaha", "NE"): (41.2565, -95.9345),
+    ("Lincoln", "NE"): (40.8136, -96.7026),
+    ("Grand Island", "NE"): (40.9264, -98.3420),
+    ("Las Vegas", "NV"): (36.1699, -115.1398),
+    ("Reno", "NV"): (39.5296, -119.8138),
+    ("Henderson", "NV"): (36.0395, -114.9817),
+    ("Boise", "ID"): (43.6150, -116.2023),
+    ("Meridian", "ID"): (43.6121, -116.3915),
+    ("Nampa", "ID"): (43.5407, -116.5635),
+}
+
+WARM_CELL_DEG = 0.1   # demographics / anchor cache cell (viewport_cache precision=1)
+WARM_GRID_RADIUS = 1  # cells either side of the center cell: 3x3 cells (~20mi square)
+
+# Inset so a cell's bounds don't touch the neighbouring property tiles
+_EDGE_EPSILON = 1e-6
+
+# Cross-worker lease for scheduled runs (L2 namespace / key)
+WARM_LEASE_NAMESPACE = "cache_warm"
+WARM_LEASE_KEY = "scheduled_run"
+WARM_STARTUP_LEASE_SECONDS = 3600  # startup-only: workers started within this share one run
+
+_warm_status: Dict[str, Any] = {"running": False, "progress": None, "last_result": None}
+
+
+class _ProviderLimits:
+    """Per-provider call spacing and per-run call budgets."""
+
+    def __init__(self, min_interval: float, budgets: Dict[str, int]):
+        self.min_interval = min_interval
+        self.budgets = budgets
+        self.calls: Dict[str, int] = {}
+        self._last_call: Dict[str, float] = {}
+
+    def has_budget(self, provider: str, calls: int = 1) -> bool:
+        budget = self.budgets.get(provider)
+        return budget is None or self.calls.get(provider, 0) + calls <= budget
+
+    async def acquire(self, provider: str, calls: int = 1):
+        """Wait out the provider's spacing, then charge `calls` against its budget."""
+        wait = self._last_call.get(provider, 0) + self.min_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_call[provider] = time.monotonic()
+        self.calls[provider] = self.calls.get(provider, 0) + calls
+
+
+def _market_cells(center_lat: float, center_lng: float) -> List[Tuple[float, float]]:
+    """Centers of the 0.1 degree cells around a market, nearest first."""
+    row0 = round(center_lat / WARM_CELL_DEG)
+    col0 = round(center_lng / WARM_CELL_DEG)
+    offsets = [
+        (dr, dc)
+        for dr in range(-WARM_GRID_RADIUS, WARM_GRID_RADIUS + 1)
+        for dc in range(-WARM_GRID_RADIUS, WARM_GRID_RADIUS + 1)
+    ]
+    offsets.sort(key=lambda o: abs(o[0]) + abs(o[1]))
+    return [
+        (round((row0 + dr) * WARM_CELL_DEG, 4), round((col0 + dc) * WARM_CELL_DEG, 4))
+        for dr, dc in offsets
+    ]
+
+
+def _cell_bounds(lat: float, lng: float) -> GeoBounds:
+    half = WARM_CELL_DEG / 2 - _EDGE_EPSILON
+    return GeoBounds(min_lat=lat - half, max_lat=lat + half, min_lng=lng - half, max_lng=lng + half)
+
+
+def _new_counts() -> Dict[str, int]:
+    return {"fetched": 0, "cached": 0, "failed": 0, "skipped": 0}
+
+
+async def _warm_cell(
+    lat: float,
+    lng: float,
+    limits: _ProviderLimits,
+    counts: Dict[str, Dict[str, int]],
+    use_local_property_source: bool,
+    use_local_demographics_source: bool,
+):
+    """Fill the property tiles, demographics and anchors for one cell (stages run concurrently)."""
+    from app.api.routes.opportunities import (
+        OpportunitySearchRequest,
+        _fetch_anchor_pois,
+        _fetch_candidate_properties,
+        _fetch_viewport_population,
+    )
+
+    bounds = _cell_bounds(lat, lng)
+    request = OpportunitySearchRequest(
+        min_lat=bounds.min_lat, max_lat=bounds.max_lat,
+        min_lng=bounds.min_lng, max_lng=bounds.max_lng,
+    )
+    property_types = [PropertyType.RETAIL, PropertyType.OFFICE, PropertyType.LAND]
+
+    async def properties():
+        source = "local" if use_local_property_source else "attom"
+        type_key = "|".join(sorted(pt.value for pt in property_types))
+        tiles = property_tiles_for_bounds(bounds.min_lat, bounds.max_lat, bounds.min_lng, bounds.max_lng)
+        if len(await get_cached_property_tiles(tiles, source, type_key)) == len(tiles):
+            counts["properties"]["cached"] += 1
+            return
+        calls = 0 if use_local_property_source else len(property_types)  # one ATTOM call per type
+        if not limits.has_budget(source, calls):
+            counts["properties"]["skipped"] += 1
+            return
+        await limits.acquire(source, calls)
+        await _fetch_candidate_properties(request, bounds, property_types, use_local_property_source)
+        counts["properties"]["fetched"] += 1
+
+    async def demographics():
+        if await get_cached_demographics(lat, lng) is not None:
+            counts["demographics"]["cached"] += 1
+            return
+        provider = "census" if use_local_demographics_source else "arcgis"
+        if not limits.has_budget(provider):
+            counts["demographics"]["skipped"] += 1
+            return
+        await limits.acquire(provider)
+        result = await _fetch_viewport_population(lat, lng, use_local_demographics_source)
+        counts["demographics"]["fetched" if result else "failed"] += 1
+
+    async def anchors():
+        if await get_cached_retail_nodes(lat, lng) is not None:
+            counts["anchors"]["cached"] += 1
+            return
+        if not limits.has_budget("mapbox"):
+            counts["anchors"]["skipped"] += 1
+            return
+        await limits.acquire("mapbox")
+        await _fetch_anchor_pois(lat, lng)
+        counts["anchors"]["fetched"] += 1
+
+    stages = {"properties": properties, "demographics": demographics, "anchors": anchors}
+    results = await asyncio.gather(*(stage() for stage in stages.values()), return_exceptions=True)
+    for name, result in zip(stages, results):
+        if isinstance(result, Exception):
+            counts[name]["failed"] += 1
+            logger.warning(f"Cache warm {name} failed at ({lat}, {lng}): {result}")
+
+
+async def _warm_state(state: str, limits: _ProviderLimits, counts: Dict[str, Dict[str, int]]):
+    """Fill a state's traffic layer and default boundary layers (one request at a time)."""
+    from app.api.routes import boundaries, traffic
+
+    layers = []
+    if state in traffic.STATE_SERVICES:
+        layers.append((
+            "traffic", "state_dot", traffic._cache, f"traffic_{state}",
+            lambda: traffic.get_traffic_data(state),
+        ))
+    if state in boundaries.STATE_FIPS:
+        layers += [
+            ("boundaries", "tigerweb", boundaries._boundary_cache, f"counties_{state}",
+             lambda: boundaries.get_county_boundaries(state=state)),
+            ("boundaries", "tigerweb", boundaries._boundary_cache, f"cities_{state}",
+             lambda: boundaries.get_city_boundaries(state=state)),
+            ("boundaries", "tigerweb", boundaries._boundary_cache, f"zipcodes_{state}",
+             lambda: boundaries.get_zipcode_boundaries(state=state)),
+            ("boundaries", "arcgis_living_atlas", boundaries._boundary_cache, f"acs_{state}_tract_population",
+             lambda: boundaries.get_demographic_boundaries(state=state, metric="population", geography="tract")),
+        ]
+
+    for kind, provider, cache, cache_key, fetch in layers:
+        if cache.get(cache_key) is not None:
+            counts[kind]["cached"] += 1
+            continue
+        if not limits.has_budget(provider):
+            counts[kind]["skipped"] += 1
+            continue
+        await limits.acquire(provider)
+        try:
+            await fetch()
+            counts[kind]["fetched"] += 1
+        except Exception as e:
+            counts[kind]["failed"] += 1
+            logger.warning(f"Cache warm {cache_key} failed: {getattr(e, 'detail', e)}")
+
+
+async def warm_caches(cities: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
+    """
+    Warm every cache for the given (city, state) markets (default: TARGET_MARKET_CITIES).
+
+    Returns per-stage fetched/cached/failed/skipped counts and the upstream
+    calls made per provider. Progress is mirrored into get_warm_status().
+    """
+    if cities is None:
+        from app.api.routes.listings import TARGET_MARKET_CITIES
+        cities = TARGET_MARKET_CITIES
+
+    use_local_property_source = use_local_properties()
+    use_local_demographics_source = use_local_demographics()
+    limits = _ProviderLimits(
+        min_interval=settings.CACHE_WARM_MIN_INTERVAL_SECONDS,
+        budgets={
+            "attom": settings.CACHE_WARM_ATTOM_CALL_BUDGET,
+            "arcgis": settings.CACHE_WARM_ARCGIS_CALL_BUDGET,
+        },
+    )
+    counts = {stage: _new_counts() for stage in ("properties", "demographics", "anchors", "traffic", "boundaries")}
+    started = time.monotonic()
+
+    markets = []
+    for city, state in cities:
+        center = MARKET_CENTERS.get((city, state))
+        if center is None:
+            logger.warning(f"Cache warm: no coordinates for {city}, {state}; skipping")
+            continue
+        markets.append((city, state, center))
+    states = list(dict.fromkeys(state for _, state, _ in markets))
+
+    progress = {"markets_done": 0, "markets_total": len(markets), "states_done": 0,
+                "states_total": len(states), "current": None, "counts": counts, "calls": limits.calls}
+    _warm_status["progress"] = progress
+
+    property_search_available = use_local_property_source or bool(settings.ATTOM_API_KEY)
+    if not property_search_available:
+        logger.warning("Cache warm: ATTOM API key not configured; skipping property tiles")
+        limits.budgets["attom"] = 0
+
+    for city, state, (center_lat, center_lng) in markets:
+        progress["current"] = f"{city}, {state}"
+        for lat, lng in _market_cells(center_lat, center_lng):
+            await _warm_cell(
+                lat, lng, limits, counts, use_local_property_source, use_local_demographics_source
+            )
+        progress["markets_done"] += 1
+        logger.info(
+            f"Cache warm: {city}, {state} done ({progress['markets_done']}/{len(markets)}), "
+            f"calls so far {limits.calls}"
+        )
+
+    for state in states:
+        progress["current"] = state
+        await _warm_state(state, limits, counts)
+        progress["states_done"] += 1
+    progress["current"] = None
+
+    result = {
+        "markets": len(markets),
+        "states": states,
+        "counts": counts,
+        "calls": dict(limits.calls),
+        "budgets": limits.budgets,
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+        "finished_at": datetime.now().isoformat(),
+    }
+    logger.info(f"Cache warm finished in {result['elapsed_seconds']}s: {counts}")
+    return result
+
+
+async def run_warm_task(cities: Optional[List[Tuple[str, str]]] = None) -> None:
+    """Background-task wrapper that records progress for get_warm_status()."""
+    if _warm_status["running"]:
+        logger.info("Cache warm already running; skipping")
+        return
+    _warm_status["running"] = True
+    _warm_status["started_at"] = datetime.now().isoformat()
+    try:
+        _warm_status["last_result"] = await warm_caches(cities)
+    except Exception as e:
+        logger.error(f"Cache warm failed: {e}", exc_info=True)
+        _warm_status["last_result"] = {"error": str(e)}
+    finally:
+        _warm_status["running"] = False
+
+
+async def run_warm_schedule() -> None:
+    """
+    Warm at startup, then every CACHE_WARM_INTERVAL_HOURS (0 = startup only).
+
+    Started from the app lifespan when CACHE_WARM_ON_STARTUP is set; the
+    first run waits CACHE_WARM_STARTUP_DELAY_SECONDS so it doesn't compete
+    with startup work.
+    """
+    await asyncio.sleep(settings.CACHE_WARM_STARTUP_DELAY_SECONDS)
+    interval_seconds = settings.CACHE_WARM_INTERVAL_HOURS * 3600
+    # Shorter than the interval so this tick's lease is gone by the next one
+    lease_seconds = 0.9 * interval_seconds if interval_seconds > 0 else WARM_STARTUP_LEASE_SECONDS
+    while True:
+        if await asyncio.to_thread(_claim_scheduled_run, lease_seconds):
+            await run_warm_task()
+        if settings.CACHE_WARM_INTERVAL_HOURS <= 0:
+            return
+        await asyncio.sleep(settings.CACHE_WARM_INTERVAL_HOURS * 3600)
+
+
+def _claim_scheduled_run(lease_seconds: float) -> bool:
+    """True when this worker won this interval's scheduled run (L2 lease, atomic across workers)."""
+    backend = get_l2_backend()
+    if backend is None:
+        logger.warning(
+            "Cache warm: scheduled warming needs a shared L2 backend (CACHE_L2_BACKEND); "
+            "skipping, use scripts/warm_caches.py"
+        )
+        return False
+    owner = str(os.getpid()).encode()
+    if backend.add(WARM_LEASE_NAMESPACE, WARM_LEASE_KEY, owner, time.time(), lease_seconds):
+        return True
+    logger.info("Cache warm: another worker holds this run's lease; skipping")
+    return False
+
+
+def get_warm_status() -> Dict[str, Any]:
+    """Whether a warm run is in progress, its progress, and the last run's result."""
+    return {
+        **_warm_status,
+        "markets": len(MARKET_CENTERS),
+        "cells_per_market": (2 * WARM_GRID_RADIUS + 1) ** 2,
+    }
@@ -9,11 +9,12 @@ Uses Census Bureau APIs to fetch data that ArcGIS doesn't provide:
 The Census Bureau geocoding API converts lat/lng coordinates to census geography (FIPS codes).
 API key is optional - all Census APIs work without it (just rate-limited).
 """
-import httpx
 from typing import Optional
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.services.census_store import ACS_VINTAGE, CBP_VINTAGE, get_acs_tract_values, get_cbp_county_values
+from app.utils.http_clients import http_client
 
 
 class CensusGeography(BaseModel):
@@ -34,8 +35,8 @@ class CensusData(BaseModel):
     total_employees: Optional[int] = None
 
     # Data source info
-    acs_year: str = "2022"  # Most recent ACS 5-year
-    cbp_year: str = "2021"  # Most recent CBP
+    acs_year: str = ACS_VINTAGE  # Most recent ACS 5-year
+    cbp_year: str = CBP_VINTAGE  # Most recent CBP
 
 
 async def get_census_geography(latitude: float, longitude: float) -> Optional[CensusGeography]:
@@ -44,7 +45,7 @@ async def get_census_geography(latitude: float, longitude: float) -> Optional[Ce
 
     The Census Bureau geocoding API is free and doesn't require authentication.
     """
-    url = "https://geocoding.geo.census.gov/geocoder/geographies/coordinates"
+    url = f"{settings.CENSUS_GEOCODER_URL}/geographies/coordinates"
     params = {
         "x": longitude,
         "y": latitude,
@@ -54,7 +55,7 @@ async def get_census_geography(latitude: float, longitude: float) -> Optional[Ce
         "format": "json"
     }
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("census") as client:
         try:
             response = await client.get(url, params=params, timeout=15)
             response.raise_for_status()
@@ -82,43 +83,26 @@ async def fetch_acs_median_age(
     state_fips: str,
     county_fips: str,
     tract_fips: str,
-    api_key: Optional[str] = None
 ) -> Optional[float]:
     """
     Fetch median age from ACS 5-Year Estimates at tract level.
 
     Variable: B01002_001E = Median Age
-    API key is optional - Census APIs work without it (rate-limited).
+    Served from the persistent Census response store (app/services/census_store.py);
+    the first lookup in a county fetches every tract in it from the ACS API.
     """
-    # ACS 5-Year Estimates API
-    url = "https://api.census.gov/data/2022/acs/acs5"
-    params = {
-        "get": "B01002_001E",  # Median Age
-        "for": f"tract:{tract_fips}",
-        "in": f"state:{state_fips} county:{county_fips}",
-    }
-    if api_key:
-        params["key"] = api_key
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            # Response format: [["B01002_001E", "state", "county", "tract"], ["35.2", "19", "153", "001700"]]
-            if len(data) > 1 and data[1][0]:
-                return float(data[1][0])
-            return None
-        except Exception as e:
-            print(f"ACS API error: {e}")
-            return None
+    try:
+        tracts = await get_acs_tract_values(state_fips, county_fips)
+        value = tracts.get(tract_fips, {}).get("B01002_001E")
+        return float(value) if value else None
+    except Exception as e:
+        print(f"ACS API error: {e}")
+        return None
 
 
 async def fetch_cbp_business_data(
     state_fips: str,
     county_fips: str,
-    api_key: Optional[str] = None
 ) -> tuple[Optional[int], Optional[int]]:
     """
     Fetch business and employee counts from County Business Patterns.
@@ -127,35 +111,16 @@ async def fetch_cbp_business_data(
     Variables:
     - ESTAB = Number of establishments
     - EMP = Number of employees
-    API key is optional - Census APIs work without it (rate-limited).
+    Served from the persistent Census response store after the first lookup.
     """
-    # County Business Patterns API (most recent year)
-    url = "https://api.census.gov/data/2021/cbp"
-    params = {
-        "get": "ESTAB,EMP",
-        "for": f"county:{county_fips}",
-        "in": f"state:{state_fips}",
-        "NAICS2017": "00",  # All industries
-    }
-    if api_key:
-        params["key"] = api_key
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            # Response format: [["ESTAB", "EMP", "state", "county", "NAICS2017"], ["1234", "5678", "19", "153", "00"]]
-            if len(data) > 1:
-                row = data[1]
-                estab = int(row[0]) if row[0] else None
-                emp = int(row[1]) if row[1] else None
-                return estab, emp
-            return None, None
-        except Exception as e:
-            print(f"CBP API error: {e}")
-            return None, None
+    try:
+        values = await get_cbp_county_values(state_fips, county_fips)
+        estab = values.get("ESTAB")
+        emp = values.get("EMP")
+        return (int(estab) if estab else None), (int(emp) if emp else None)
+    except Exception as e:
+        print(f"CBP API error: {e}")
+        return None, None
 
 
 async def fetch_census_data(latitude: float, longitude: float) -> CensusData:
@@ -169,8 +134,6 @@ async def fetch_census_data(latitude: float, longitude: float) -> CensusData:
 
     API key is optional - Census APIs work without it (rate-limited).
     """
-    api_key = settings.CENSUS_API_KEY  # Optional, will work without it
-
     # Step 1: Get census geography from coordinates
     geography = await get_census_geography(latitude, longitude)
     if not geography:
@@ -184,13 +147,11 @@ async def fetch_census_data(latitude: float, longitude: float) -> CensusData:
         geography.state_fips,
         geography.county_fips,
         geography.tract_fips,
-        api_key
     )
 
     cbp_task = fetch_cbp_business_data(
         geography.state_fips,
         geography.county_fips,
-        api_key
     )
 
     median_age, (businesses, employees) = await asyncio.gather(
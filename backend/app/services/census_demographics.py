@@ -11,11 +11,15 @@ Data sources:
 - County Business Patterns API for business/employment data
 - Census TIGER tract shapefiles for spatial analysis (loaded into PostGIS)
 
+ACS and CBP answers are kept in the persistent census_responses store
+(app/services/census_store.py), so once a state is preloaded ring
+demographics are computed entirely from local data.
+
 Note: Consumer spending data is not available from Census Bureau (Esri proprietary).
 """
 import asyncio
-import httpx
 import math
+import numpy as np
 from typing import Optional, List, Dict, Tuple
 from pydantic import BaseModel
 from sqlalchemy import create_engine, text
@@ -23,6 +27,218 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 from app.services.arcgis import DemographicMetrics, DemographicsResponse
+from app.services.census_store import (
+    ACS_TRACT_VARIABLES,
+    CBP_COUNTY_VARIABLES,
+    TARGET_STATE_FIPS,
+    get_acs_tract_values,
+    get_cbp_county_values,
+)
+from app.services.population_raster import BANDS, PopulationRaster, get_population_raster
+from app.services.tract_parts import tract_parts_states
+
+# Tract queries are limited to the target markets' states (bound as :target_states)
+TARGET_STATES = sorted(TARGET_STATE_FIPS.values())
+
+
+# Area-weighted ACS sums a ring's metrics are computed from (columns of _query_ring_sums)
+_ACS_SUMS = (
+    "population", "households", "area_sqmiles",
+    "age_weighted", "age_population",            # median age x population
+    "income_weighted", "income_households",      # median household income x households
+    "aggregate_income",
+    "per_capita_weighted", "per_capita_population",
+)
+_WEIGHTED_SUMS = _ACS_SUMS + ("businesses", "employees")  # + county CBP totals x tract weight
+
+
+# Area weight of every tract in every ring around (:lat, :lng) for :radii (miles).
+# Buffers are built once; only tracts touching the largest ring are candidates
+# for the smaller ones, and tracts wholly inside a ring skip ST_Intersection.
+_RING_WEIGHTS_SQL = """
+    WITH rings AS (
+        SELECT
+            r.radius_miles,
+            ST_Transform(
+                ST_Buffer(
+                    ST_Transform(ST_SetSRID(ST_Point(:lng, :lat), 4326), 3857),
+                    r.radius_miles * 1609.34
+                ), 4326
+            ) AS geom
+        FROM unnest(CAST(:radii AS float8[])) AS r(radius_miles)
+    ),
+    candidates AS (
+        SELECT t.geoid, t.statefp, t.countyfp, t.tractce, t.aland, t.geom, ST_Area(t.geom) AS tract_area
+        FROM census_tracts t
+        WHERE ST_Intersects(t.geom, (SELECT geom FROM rings ORDER BY radius_miles DESC LIMIT 1))
+            AND t.statefp = ANY(CAST(:target_states AS text[]))
+    ),
+    weights AS (
+        SELECT
+            rings.radius_miles,
+            c.geoid,
+            c.statefp,
+            c.countyfp,
+            c.tractce,
+            c.aland / 2589988.11 AS area_sqmiles,  -- Convert sq meters to sq miles
+            CASE
+                WHEN ST_Within(c.geom, rings.geom) THEN 1.0
+                ELSE ST_Area(ST_Intersection(c.geom, rings.geom)) / c.tract_area
+            END AS w
+        FROM rings
+        JOIN candidates c ON ST_Intersects(c.geom, rings.geom)
+    )
+"""
+
+# Same weights with the states listed in :parts_states read from the
+# subdivided census_tract_parts table (app/services/tract_parts.py) and the
+# other target states from census_tracts as above. For parts, rings are the
+# same buffers transformed once into the table's equal-area SRID; a tract's
+# weight is its summed part overlaps over its precomputed area, and parts
+# wholly inside a ring skip ST_Intersection.
+_RING_WEIGHTS_PARTS_SQL = """
+    WITH rings AS (
+        SELECT
+            r.radius_miles,
+            ST_Transform(
+                ST_Buffer(
+                    ST_Transform(ST_SetSRID(ST_Point(:lng, :lat), 4326), 3857),
+                    r.radius_miles * 1609.34
+                ), 4326
+            ) AS geom
+        FROM unnest(CAST(:radii AS float8[])) AS r(radius_miles)
+    ),
+    candidates AS (
+        SELECT t.geoid, t.statefp, t.countyfp, t.tractce, t.aland, t.geom, ST_Area(t.geom) AS tract_area
+        FROM census_tracts t
+        WHERE ST_Intersects(t.geom, (SELECT geom FROM rings ORDER BY radius_miles DESC LIMIT 1))
+            AND t.statefp = ANY(CAST(:target_states AS text[]))
+            AND NOT t.statefp = ANY(CAST(:parts_states AS text[]))
+    ),
+    overlaps AS (
+        SELECT
+            rings.radius_miles,
+            p.geoid, p.statefp, p.countyfp, p.tractce, p.aland, p.tract_area_m2,
+            CASE
+                WHEN ST_Within(p.geom, ring.geom) THEN p.part_area_m2
+                ELSE ST_Area(ST_Intersection(p.geom, ring.geom))
+            END AS overlap_m2
+        FROM rings
+        CROSS JOIN LATERAL (SELECT ST_Transform(rings.geom, 5070) AS geom) AS ring
+        JOIN census_tract_parts p ON ST_Intersects(p.geom, ring.geom)
+        WHERE p.statefp = ANY(CAST(:parts_states AS text[]))
+    ),
+    weights AS (
+        SELECT
+            rings.radius_miles,
+            c.geoid,
+            c.statefp,
+            c.countyfp,
+            c.tractce,
+            c.aland / 2589988.11 AS area_sqmiles,  -- Convert sq meters to sq miles
+            CASE
+                WHEN ST_Within(c.geom, rings.geom) THEN 1.0
+                ELSE ST_Area(ST_Intersection(c.geom, rings.geom)) / c.tract_area
+            END AS w
+        FROM rings
+        JOIN candidates c ON ST_Intersects(c.geom, rings.geom)
+        UNION ALL
+        SELECT
+            radius_miles,
+            geoid,
+            statefp,
+            countyfp,
+            tractce,
+            aland / 2589988.11 AS area_sqmiles,
+            SUM(overlap_m2) / tract_area_m2 AS w
+        FROM overlaps
+        GROUP BY radius_miles, geoid, statefp, countyfp, tractce, aland, tract_area_m2
+    )
+"""
+
+# Bulk form: weights of every tract in every (:lats[i], :lngs[i]) x :radii ring,
+# keyed by the point's 1-based ord.
+_BULK_RING_WEIGHTS_SQL = """
+    WITH pts AS (
+        SELECT p.ord, ST_SetSRID(ST_Point(p.lng, p.lat), 4326) AS geom
+        FROM unnest(CAST(:lats AS float8[]), CAST(:lngs AS float8[]))
+            WITH ORDINALITY AS p(lat, lng, ord)
+    ),
+    rings AS (
+        SELECT
+            pts.ord,
+            r.radius_miles,
+            ST_Transform(
+                ST_Buffer(ST_Transform(pts.geom, 3857), r.radius_miles * 1609.34),
+                4326
+            ) AS geom
+        FROM pts CROSS JOIN unnest(CAST(:radii AS float8[])) AS r(radius_miles)
+    ),
+    weights AS (
+        SELECT
+            rings.ord,
+            rings.radius_miles,
+            t.geoid,
+            t.aland / 2589988.11 AS area_sqmiles,
+            ST_Area(ST_Intersection(t.geom, rings.geom)) / ST_Area(t.geom) AS w
+        FROM rings
+        JOIN census_tracts t ON ST_Intersects(t.geom, rings.geom)
+        WHERE t.statefp = ANY(CAST(:target_states AS text[]))
+    )
+"""
+
+_BULK_RING_WEIGHTS_PARTS_SQL = """
+    WITH pts AS (
+        SELECT p.ord, ST_SetSRID(ST_Point(p.lng, p.lat), 4326) AS geom
+        FROM unnest(CAST(:lats AS float8[]), CAST(:lngs AS float8[]))
+            WITH ORDINALITY AS p(lat, lng, ord)
+    ),
+    rings AS (
+        SELECT
+            pts.ord,
+            r.radius_miles,
+            ST_Transform(
+                ST_Buffer(ST_Transform(pts.geom, 3857), r.radius_miles * 1609.34),
+                4326
+            ) AS geom
+        FROM pts CROSS JOIN unnest(CAST(:radii AS float8[])) AS r(radius_miles)
+    ),
+    overlaps AS (
+        SELECT
+            rings.ord,
+            rings.radius_miles,
+            p.geoid, p.aland, p.tract_area_m2,
+            CASE
+                WHEN ST_Within(p.geom, ring.geom) THEN p.part_area_m2
+                ELSE ST_Area(ST_Intersection(p.geom, ring.geom))
+            END AS overlap_m2
+        FROM rings
+        CROSS JOIN LATERAL (SELECT ST_Transform(rings.geom, 5070) AS geom) AS ring
+        JOIN census_tract_parts p ON ST_Intersects(p.geom, ring.geom)
+        WHERE p.statefp = ANY(CAST(:parts_states AS text[]))
+    ),
+    weights AS (
+        SELECT
+            rings.ord,
+            rings.radius_miles,
+            t.geoid,
+            t.aland / 2589988.11 AS area_sqmiles,
+            ST_Area(ST_Intersection(t.geom, rings.geom)) / ST_Area(t.geom) AS w
+        FROM rings
+        JOIN census_tracts t ON ST_Intersects(t.geom, rings.geom)
+        WHERE t.statefp = ANY(CAST(:target_states AS text[]))
+            AND NOT t.statefp = ANY(CAST(:parts_states AS text[]))
+        UNION ALL
+        SELECT
+            ord,
+            radius_miles,
+            geoid,
+            aland / 2589988.11 AS area_sqmiles,
+            SUM(overlap_m2) / tract_area_m2 AS w
+        FROM overlaps
+        GROUP BY ord, radius_miles, geoid, aland, tract_area_m2
+    )
+"""
 
 
 class CensusTract(BaseModel):
@@ -48,26 +264,17 @@ class CensusDemographicsService:
         self.Session = sessionmaker(bind=self.engine)
         
         # ACS 5-Year Estimates variables
-        self.acs_variables = {
-            "B01003_001E": "total_population",
-            "B11001_001E": "total_households", 
-            "B01002_001E": "median_age",
-            "B19013_001E": "median_household_income",
-            "B19025_001E": "aggregate_household_income",
-            "B19301_001E": "per_capita_income"
-        }
+        self.acs_variables = ACS_TRACT_VARIABLES
         
         # County Business Patterns variables
-        self.cbp_variables = {
-            "ESTAB": "total_businesses",
-            "EMP": "total_employees"
-        }
+        self.cbp_variables = CBP_COUNTY_VARIABLES
 
     async def fetch_demographics(
         self,
         latitude: float,
         longitude: float,
-        radii_miles: List[float] = [1, 3, 5]
+        radii_miles: List[float] = [1, 3, 5],
+        fast: bool = False
     ) -> DemographicsResponse:
         """
         Fetch demographic data using Census Bureau APIs with area-weighted ring buffer analysis.
@@ -76,47 +283,378 @@ class CensusDemographicsService:
             latitude: Center point latitude
             longitude: Center point longitude  
             radii_miles: List of radii to analyze (default: 1, 3, 5 miles)
+            fast: Read approximate totals from the population raster when built
+                (population, households, density and median household income only)
             
         Returns:
             DemographicsResponse matching ArcGIS service format
+
+        When acs_tract_values covers every intersecting tract (scripts/
+        load_acs_tracts.py), all radii come from one PostGIS query returning
+        area-weighted sums; otherwise each radius falls back to the per-tract
+        path (tract list + stored/fetched ACS values).
         """
+        raster = self._fast_raster() if fast else None
+        if raster is not None:
+            by_point, _ = await asyncio.to_thread(
+                self._raster_ring_metrics, raster, [(latitude, longitude)], radii_miles
+            )
+            if 1 in by_point:
+                return self._ring_response(latitude, longitude, radii_miles, by_point[1])
+
+        try:
+            ring_sums = await self._get_ring_sums(latitude, longitude, radii_miles)
+        except Exception as e:
+            print(f"Ring sums query failed, using per-tract demographics: {e}")
+            ring_sums = None
+
+        if ring_sums is not None and all(row.acs_tracts == row.tracts for row in ring_sums):
+            results = await self._metrics_from_ring_sums(radii_miles, ring_sums)
+        else:
+            results = await self._fetch_per_tract_demographics(latitude, longitude, radii_miles)
+
+        return DemographicsResponse(
+            latitude=latitude,
+            longitude=longitude,
+            radii=results,
+            data_vintage="2022",  # ACS 5-Year 2022
+            census_supplemented=True  # All data from Census Bureau
+        )
+
+    async def _fetch_per_tract_demographics(
+        self,
+        latitude: float,
+        longitude: float,
+        radii_miles: List[float]
+    ) -> List[DemographicMetrics]:
+        """
+        Tract weights for every radius from one multi-ring query, then ACS/CBP
+        lookups once for the union of tracts (used until acs_tract_values is loaded).
+        """
+        try:
+            tracts_by_radius = await self._get_ring_tracts(latitude, longitude, radii_miles)
+        except Exception as e:
+            print(f"Error fetching intersecting tracts: {e}")
+            return [DemographicMetrics(radius_miles=r) for r in radii_miles]
+
+        # Rings are nested, so the union is the largest ring's tract set
+        union = {t.geoid: t for tracts in tracts_by_radius.values() for t in tracts}
+        acs_data: Dict[str, Dict[str, Optional[float]]] = {}
+        cbp_data: Dict[str, Dict[str, Optional[int]]] = {}
+        if union:
+            # Fetch ACS demographic data and CBP business data (county level) for all tracts
+            acs_data, cbp_data = await asyncio.gather(
+                self._fetch_acs_data(list(union.values())),
+                self._fetch_cbp_data(list(union.values())),
+            )
+
         results = []
-        
         for radius in radii_miles:
+            tracts = tracts_by_radius.get(float(radius), [])
+            if not tracts:
+                # No tracts found, return empty metrics
+                results.append(DemographicMetrics(radius_miles=radius))
+                continue
             try:
-                # Get intersecting tracts with area weights
-                tracts = await self._get_intersecting_tracts(latitude, longitude, radius)
-                
-                if not tracts:
-                    # No tracts found, return empty metrics
-                    results.append(DemographicMetrics(radius_miles=radius))
-                    continue
-                
-                # Fetch ACS demographic data for all tracts
-                acs_data = await self._fetch_acs_data(tracts)
-                
-                # Fetch CBP business data at county level
-                cbp_data = await self._fetch_cbp_data(tracts)
-                
                 # Calculate area-weighted totals
-                metrics = self._calculate_weighted_demographics(
-                    radius, tracts, acs_data, cbp_data
-                )
-                
-                results.append(metrics)
-                
+                results.append(self._calculate_weighted_demographics(radius, tracts, acs_data, cbp_data))
             except Exception as e:
                 print(f"Error fetching demographics for radius {radius}: {e}")
                 results.append(DemographicMetrics(radius_miles=radius))
         
+        return results
+
+    async def fetch_bulk_ring_demographics(
+        self,
+        points: List[Tuple[float, float]],
+        radii_miles: List[float] = [1, 3],
+        exact: bool = False
+    ) -> List[DemographicsResponse]:
+        """
+        Ring demographics for many points in one set-based PostGIS query.
+
+        Buffers every (point, radius) pair, intersects them with census tracts
+        and aggregates area-weighted totals from the local acs_tract_values
+        table, so N candidates cost one DB round trip and no Census API calls.
+        Only population, households, density and median household income are
+        populated. Points with a ring tract missing from acs_tract_values
+        (load it with scripts/load_acs_tracts.py) are returned empty rather
+        than undercounted.
+
+        Once the population raster is built (and DEMOGRAPHICS_FAST_MODE is on)
+        the same fields come from its summed-area tables instead: approximate,
+        but one vectorized in-process call for any number of points. Points
+        whose rings reach a target state without a raster use the PostGIS
+        query.
+
+        Args:
+            points: (latitude, longitude) pairs
+            radii_miles: Radii to analyze (default: 1, 3 miles)
+            exact: Always use the PostGIS query
+
+        Returns:
+            One DemographicsResponse per input point, in input order
+        """
+        if not points:
+            return []
+        by_point: Dict[int, Dict[float, DemographicMetrics]] = {}
+        pending = list(range(1, len(points) + 1))
+        raster = None if exact else self._fast_raster()
+        if raster is not None:
+            by_point, pending = await asyncio.to_thread(self._raster_ring_metrics, raster, points, radii_miles)
+        if pending:
+            exact_metrics = await self._exact_bulk_ring_metrics([points[i - 1] for i in pending], radii_miles)
+            for ord_, idx in enumerate(pending, start=1):
+                if ord_ in exact_metrics:
+                    by_point[idx] = exact_metrics[ord_]
+
+        return [
+            self._ring_response(lat, lng, radii_miles, by_point.get(idx, {}))
+            for idx, (lat, lng) in enumerate(points, start=1)
+        ]
+
+    async def _exact_bulk_ring_metrics(
+        self,
+        points: List[Tuple[float, float]],
+        radii_miles: List[float]
+    ) -> Dict[int, Dict[float, DemographicMetrics]]:
+        """Ring metrics per 1-based point index from the PostGIS bulk query."""
+        rows = await asyncio.to_thread(self._query_bulk_ring_demographics, points, radii_miles)
+        by_point: Dict[int, Dict[float, DemographicMetrics]] = {}
+        # Tracts missing from acs_tract_values would count as zero, so a
+        # point with any partly loaded ring is left empty and callers fall back
+        uncovered = {row.ord for row in rows if row.acs_tracts < row.tracts}
+        for row in rows:
+            if row.ord in uncovered:
+                continue
+            by_point.setdefault(row.ord, {})[float(row.radius_miles)] = self._ring_metrics(
+                row.radius_miles,
+                population=row.population,
+                households=row.households,
+                income_weighted=row.income_weighted,
+                income_households=row.income_households,
+                area_sqmiles=row.area_sqmiles,
+            )
+        return by_point
+
+    def _fast_raster(self) -> Optional[PopulationRaster]:
+        return get_population_raster() if settings.DEMOGRAPHICS_FAST_MODE else None
+
+    def _raster_ring_metrics(
+        self,
+        raster: PopulationRaster,
+        points: List[Tuple[float, float]],
+        radii_miles: List[float]
+    ) -> Tuple[Dict[int, Dict[float, DemographicMetrics]], List[int]]:
+        """
+        Ring metrics per 1-based point index from the population raster (runs in the threadpool).
+
+        Returns (metrics of covered points, indices of points whose rings
+        reach a target state without a raster).
+        """
+        lats = [lat for lat, _ in points]
+        lngs = [lng for _, lng in points]
+        covered = raster.covered(lats, lngs, max(radii_miles))
+        totals = raster.ring_totals(lats, lngs, radii_miles)
+        # Counts are whole numbers; rounding also drops float32 summed-area noise
+        for band in ("population", "households", "income_households"):
+            totals[band] = np.rint(totals[band])
+        by_point = {
+            idx: {
+                float(r): self._ring_metrics(r, **{band: float(totals[band][idx - 1, k]) for band in BANDS})
+                for k, r in enumerate(radii_miles)
+            }
+            for idx in range(1, len(points) + 1)
+            if covered[idx - 1]
+        }
+        return by_point, [idx for idx in range(1, len(points) + 1) if not covered[idx - 1]]
+
+    @staticmethod
+    def _ring_metrics(
+        radius: float,
+        population: Optional[float],
+        households: Optional[float],
+        income_weighted: Optional[float],
+        income_households: Optional[float],
+        area_sqmiles: Optional[float],
+    ) -> DemographicMetrics:
+        """Bulk ring metrics (population, households, density, median household income) from sums."""
+        population = population or 0
+        households = households or 0
+        area = area_sqmiles or 0
+        density = population / area if area > 0 else None
+        income = income_weighted / income_households if income_households else None
+        return DemographicMetrics(
+            radius_miles=radius,
+            total_population=int(population) if population > 0 else None,
+            total_households=int(households) if households > 0 else None,
+            population_density=round(density, 1) if density else None,
+            median_household_income=int(income) if income else None,
+        )
+
+    @staticmethod
+    def _ring_response(
+        latitude: float,
+        longitude: float,
+        radii_miles: List[float],
+        metrics_by_radius: Dict[float, DemographicMetrics]
+    ) -> DemographicsResponse:
         return DemographicsResponse(
             latitude=latitude,
             longitude=longitude,
-            radii=results,
-            data_vintage="2022",  # ACS 5-Year 2022
-            census_supplemented=True  # All data from Census Bureau
+            radii=[
+                metrics_by_radius.get(float(r)) or DemographicMetrics(radius_miles=r)
+                for r in radii_miles
+            ],
+            data_vintage="2022",
+            census_supplemented=True,
         )
 
+    def _query_bulk_ring_demographics(
+        self,
+        points: List[Tuple[float, float]],
+        radii_miles: List[float]
+    ) -> list:
+        """Blocking PostGIS implementation of fetch_bulk_ring_demographics()."""
+        # Buffers and overlap threshold mirror _RING_WEIGHTS_SQL so bulk
+        # and single-point results agree.
+        parts_states = self._tract_parts_states()
+        weights_sql = _BULK_RING_WEIGHTS_PARTS_SQL if parts_states else _BULK_RING_WEIGHTS_SQL
+        query = text(weights_sql + """
+            SELECT
+                w.ord,
+                w.radius_miles,
+                COUNT(*) AS tracts,
+                COUNT(a.geoid) AS acs_tracts,
+                SUM(a.total_population * w.w) AS population,
+                SUM(a.total_households * w.w) AS households,
+                SUM(w.area_sqmiles * w.w) AS area_sqmiles,
+                SUM(a.median_household_income * a.total_households * w.w)
+                    FILTER (WHERE a.median_household_income > 0) AS income_weighted,
+                SUM(a.total_households * w.w)
+                    FILTER (WHERE a.median_household_income > 0) AS income_households
+            FROM weights w
+            LEFT JOIN acs_tract_values a ON a.geoid = w.geoid
+            WHERE w.w > 0.01  -- Only include tracts with >1% overlap
+            GROUP BY w.ord, w.radius_miles;
+        """)
+
+        with self.engine.connect() as conn:
+            return conn.execute(query, {
+                'lats': [lat for lat, _ in points],
+                'lngs': [lng for _, lng in points],
+                'radii': [float(r) for r in radii_miles],
+                'target_states': TARGET_STATES,
+                'parts_states': parts_states,
+            }).fetchall()
+
+    def _tract_parts_states(self) -> List[str]:
+        """States whose rings are read from census_tract_parts (empty: census_tracts only)."""
+        if not settings.CENSUS_TRACT_PARTS_ENABLED:
+            return []
+        return sorted(tract_parts_states())
+
+    def _ring_weights_sql(self, parts_states: List[str]) -> str:
+        return _RING_WEIGHTS_PARTS_SQL if parts_states else _RING_WEIGHTS_SQL
+
+    async def _get_ring_sums(
+        self,
+        latitude: float,
+        longitude: float,
+        radii_miles: List[float]
+    ) -> list:
+        """
+        Area-weighted ACS sums for every radius in one PostGIS query.
+
+        Returns one row per (radius, county): tract counts (all intersecting
+        vs. with acs_tract_values rows), summed tract weight and weighted
+        area, and the weighted sums _calculate_weighted_demographics builds
+        tract by tract. The blocking query runs in the threadpool.
+        """
+        return await asyncio.to_thread(self._query_ring_sums, latitude, longitude, radii_miles)
+
+    def _query_ring_sums(
+        self,
+        latitude: float,
+        longitude: float,
+        radii_miles: List[float]
+    ) -> list:
+        """Blocking PostGIS implementation of _get_ring_sums()."""
+        parts_states = self._tract_parts_states()
+        query = text(self._ring_weights_sql(parts_states) + """
+            SELECT
+                w.radius_miles,
+                w.statefp,
+                w.countyfp,
+                COUNT(*) AS tracts,
+                COUNT(a.geoid) AS acs_tracts,
+                SUM(w.w) AS weight,
+                SUM(w.area_sqmiles * w.w) AS area_sqmiles,
+                SUM(a.total_population * w.w)
+                    FILTER (WHERE a.total_population > 0) AS population,
+                SUM(a.total_households * w.w)
+                    FILTER (WHERE a.total_households > 0) AS households,
+                SUM(a.median_age * a.total_population * w.w)
+                    FILTER (WHERE a.total_population > 0 AND a.median_age > 0) AS age_weighted,
+                SUM(a.total_population * w.w)
+                    FILTER (WHERE a.total_population > 0 AND a.median_age > 0) AS age_population,
+                SUM(a.median_household_income * a.total_households * w.w)
+                    FILTER (WHERE a.total_households > 0 AND a.median_household_income > 0) AS income_weighted,
+                SUM(a.total_households * w.w)
+                    FILTER (WHERE a.total_households > 0 AND a.median_household_income > 0) AS income_households,
+                SUM(a.aggregate_household_income * w.w)
+                    FILTER (WHERE a.aggregate_household_income > 0) AS aggregate_income,
+                SUM(a.per_capita_income * a.total_population * w.w)
+                    FILTER (WHERE a.per_capita_income > 0 AND a.total_population > 0) AS per_capita_weighted,
+                SUM(a.total_population * w.w)
+                    FILTER (WHERE a.per_capita_income > 0 AND a.total_population > 0) AS per_capita_population
+            FROM weights w
+            LEFT JOIN acs_tract_values a ON a.geoid = w.geoid
+            WHERE w.w > 0.01  -- Only include tracts with >1% overlap
+            GROUP BY w.radius_miles, w.statefp, w.countyfp;
+        """)
+
+        with self.engine.connect() as conn:
+            return conn.execute(query, {
+                'lat': latitude,
+                'lng': longitude,
+                'radii': [float(r) for r in radii_miles],
+                'target_states': TARGET_STATES,
+                'parts_states': parts_states,
+            }).fetchall()
+
+    async def _metrics_from_ring_sums(
+        self,
+        radii_miles: List[float],
+        ring_sums: list
+    ) -> List[DemographicMetrics]:
+        """Combine per-county ring sums (plus county-level CBP values) into metrics per radius."""
+        counties = {(row.statefp, row.countyfp) for row in ring_sums}
+        cbp_by_county = {}
+        for state_fips, county_fips in counties:
+            try:
+                cbp_by_county[(state_fips, county_fips)] = await self._call_cbp_api(state_fips, county_fips)
+            except Exception as e:
+                print(f"CBP API error for {state_fips}_{county_fips}: {e}")
+                cbp_by_county[(state_fips, county_fips)] = {}
+
+        results = []
+        for radius in radii_miles:
+            sums = dict.fromkeys(_WEIGHTED_SUMS, 0.0)
+            for row in ring_sums:
+                if float(row.radius_miles) != float(radius):
+                    continue
+                for name in _ACS_SUMS:
+                    sums[name] += getattr(row, name) or 0
+                # Business data (county-level, so weight by area)
+                cbp = cbp_by_county.get((row.statefp, row.countyfp), {})
+                if cbp.get("total_businesses"):
+                    sums["businesses"] += cbp["total_businesses"] * row.weight
+                if cbp.get("total_employees"):
+                    sums["employees"] += cbp["total_employees"] * row.weight
+            results.append(self._metrics_from_sums(radius, sums))
+        return results
+
     async def _get_intersecting_tracts(
         self, 
         latitude: float, 
@@ -125,57 +663,65 @@ class CensusDemographicsService:
     ) -> List[CensusTract]:
         """
         Find Census tracts that intersect with the buffer circle and calculate area weights.
+
+        Single-radius form of _get_ring_tracts().
+        """
+        tracts_by_radius = await self._get_ring_tracts(latitude, longitude, [radius_miles])
+        return tracts_by_radius.get(float(radius_miles), [])
+
+    async def _get_ring_tracts(
+        self,
+        latitude: float,
+        longitude: float,
+        radii_miles: List[float]
+    ) -> Dict[float, List[CensusTract]]:
+        """
+        Intersecting tracts and area weights for every radius in one PostGIS query.
         
         Uses PostGIS spatial functions to:
-        1. Create a buffer circle around the point
-        2. Find intersecting tracts
-        3. Calculate the percentage of each tract's area within the buffer
+        1. Create all buffer circles around the point at once
+        2. Find tracts intersecting the largest buffer (a superset for the smaller rings)
+        3. Calculate the percentage of each tract's area within each buffer
+
+        Returns {radius: tracts, largest overlap first}. The blocking PostGIS
+        query runs in the threadpool.
         """
-        # Convert radius from miles to meters for PostGIS
-        radius_meters = radius_miles * 1609.34
-        
-        query = text("""
-            WITH buffer AS (
-                SELECT ST_Transform(
-                    ST_Buffer(
-                        ST_Transform(ST_SetSRID(ST_Point(:lng, :lat), 4326), 3857),
-                        :radius_m
-                    ), 4326
-                ) AS geom
-            ),
-            intersecting AS (
-                SELECT 
-                    t.geoid,
-                    t.statefp AS state_fips,
-                    t.countyfp AS county_fips,
-                    t.tractce AS tract_fips,
-                    t.aland / 2589988.11 AS area_sqmiles,  -- Convert sq meters to sq miles
-                    ST_Area(ST_Intersection(t.geom, b.geom)) / ST_Area(t.geom) AS intersection_ratio
-                FROM census_tracts t, buffer b
-                WHERE ST_Intersects(t.geom, b.geom)
-                    AND t.statefp IN ('19', '31', '32', '16')  -- IA, NE, NV, ID
-            )
-            SELECT * FROM intersecting
-            WHERE intersection_ratio > 0.01  -- Only include tracts with >1% overlap
-            ORDER BY intersection_ratio DESC;
+        return await asyncio.to_thread(
+            self._query_ring_tracts, latitude, longitude, radii_miles
+        )
+
+    def _query_ring_tracts(
+        self,
+        latitude: float,
+        longitude: float,
+        radii_miles: List[float]
+    ) -> Dict[float, List[CensusTract]]:
+        """Blocking PostGIS implementation of _get_ring_tracts()."""
+        parts_states = self._tract_parts_states()
+        query = text(self._ring_weights_sql(parts_states) + """
+            SELECT * FROM weights
+            WHERE w > 0.01  -- Only include tracts with >1% overlap
+            ORDER BY radius_miles, w DESC;
         """)
         
         with self.engine.connect() as conn:
             result = conn.execute(query, {
                 'lat': latitude,
                 'lng': longitude, 
-                'radius_m': radius_meters
+                'radii': [float(r) for r in radii_miles],
+                'target_states': TARGET_STATES,
+                'parts_states': parts_states,
             })
             
-            tracts = []
+            tracts: Dict[float, List[CensusTract]] = {float(r): [] for r in radii_miles}
             for row in result:
-                tracts.append(CensusTract(
+                tracts[float(row.radius_miles)].append(CensusTract(
                     geoid=row.geoid,
-                    state_fips=row.state_fips,
-                    county_fips=row.county_fips,
-                    tract_fips=row.tract_fips,
+                    state_fips=row.statefp,
+                    county_fips=row.countyfp,
+                    tract_fips=row.tractce,
                     area_sqmiles=row.area_sqmiles,
-                    intersection_ratio=row.intersection_ratio
+                    intersection_ratio=row.w
                 ))
             
             return tracts
@@ -216,48 +762,28 @@ class CensusDemographicsService:
         county_fips: str, 
         tract_str: str
     ) -> Dict[str, Dict[str, Optional[float]]]:
-        """Call ACS 5-Year Estimates API for specified tracts."""
-        url = "https://api.census.gov/data/2022/acs/acs5"
-        
-        variables = ','.join(self.acs_variables.keys())
-        
-        params = {
-            "get": variables,
-            "for": f"tract:{tract_str}",
-            "in": f"state:{state_fips} county:{county_fips}"
-        }
-        
-        if settings.CENSUS_API_KEY:
-            params["key"] = settings.CENSUS_API_KEY
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-        
-        # Parse response into dict by tract GEOID
+        """ACS 5-Year Estimates for specified tracts (from the response store; API on first use)."""
+        county_values = await get_acs_tract_values(state_fips, county_fips, list(self.acs_variables))
+
+        # Parse into dict by tract GEOID
         result = {}
-        if len(data) > 1:  # First row is headers
-            headers = data[0]
-            for row in data[1:]:
-                # Build tract GEOID
-                state = row[headers.index("state")]
-                county = row[headers.index("county")]  
-                tract = row[headers.index("tract")]
-                geoid = f"{state}{county}{tract}"
-                
-                # Extract variable values
-                tract_data = {}
-                for i, var_code in enumerate(self.acs_variables.keys()):
-                    if var_code in headers:
-                        idx = headers.index(var_code)
-                        value = row[idx]
-                        tract_data[self.acs_variables[var_code]] = (
-                            float(value) if value and value != "-" else None
-                        )
-                
-                result[geoid] = tract_data
-        
+        for tract in tract_str.split(','):
+            values = county_values.get(tract)
+            if values is None:
+                continue
+            geoid = f"{state_fips}{county_fips}{tract}"
+
+            # Extract variable values
+            tract_data = {}
+            for var_code, field in self.acs_variables.items():
+                if var_code in values:
+                    value = values[var_code]
+                    tract_data[field] = (
+                        float(value) if value and value != "-" else None
+                    )
+
+            result[geoid] = tract_data
+
         return result
 
     async def _fetch_cbp_data(self, tracts: List[CensusTract]) -> Dict[str, Dict[str, Optional[int]]]:
@@ -293,30 +819,16 @@ class CensusDemographicsService:
         state_fips: str, 
         county_fips: str
     ) -> Dict[str, Optional[int]]:
-        """Call County Business Patterns API for a single county."""
-        url = "https://api.census.gov/data/2021/cbp"
-        
-        params = {
-            "get": "ESTAB,EMP",
-            "for": f"county:{county_fips}",
-            "in": f"state:{state_fips}",
-            "NAICS2017": "00"  # All industries
-        }
-        
-        if settings.CENSUS_API_KEY:
-            params["key"] = settings.CENSUS_API_KEY
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-        
+        """County Business Patterns for a single county (from the response store; API on first use)."""
+        values = await get_cbp_county_values(state_fips, county_fips, list(self.cbp_variables))
+
         result = {}
-        if len(data) > 1:  # First row is headers  
-            row = data[1]
-            result["total_businesses"] = int(row[0]) if row[0] else None
-            result["total_employees"] = int(row[1]) if row[1] else None
-        
+        if values:
+            estab = values.get("ESTAB")
+            emp = values.get("EMP")
+            result["total_businesses"] = int(estab) if estab else None
+            result["total_employees"] = int(emp) if emp else None
+
         return result
 
     def _calculate_weighted_demographics(
@@ -396,27 +908,50 @@ class CensusDemographicsService:
             if cbp.get("total_employees"):
                 total_employees += cbp["total_employees"] * weight
         
+        return self._metrics_from_sums(radius, {
+            "population": total_population,
+            "households": total_households,
+            "area_sqmiles": total_area,
+            "age_weighted": median_age_sum,
+            "age_population": median_age_population,
+            "income_weighted": income_sum,
+            "income_households": income_households,
+            "aggregate_income": aggregate_income_sum,
+            "per_capita_weighted": per_capita_income_sum,
+            "per_capita_population": per_capita_population,
+            "businesses": total_businesses,
+            "employees": total_employees,
+        })
+
+    def _metrics_from_sums(self, radius: float, sums: Dict[str, float]) -> DemographicMetrics:
+        """DemographicMetrics from area-weighted sums (see _WEIGHTED_SUMS)."""
+        total_population = sums["population"]
+        total_households = sums["households"]
+        total_area = sums["area_sqmiles"]
+        total_businesses = sums["businesses"]
+        total_employees = sums["employees"]
+
         # Calculate final metrics
         population_density = total_population / total_area if total_area > 0 else None
         
         median_age = (
-            median_age_sum / median_age_population 
-            if median_age_population > 0 else None
+            sums["age_weighted"] / sums["age_population"] 
+            if sums["age_population"] > 0 else None
         )
         
         median_household_income = (
-            income_sum / income_households 
-            if income_households > 0 else None
+            sums["income_weighted"] / sums["income_households"] 
+            if sums["income_households"] > 0 else None
         )
         
         average_household_income = (
-            aggregate_income_sum / total_households 
+            sums["aggregate_income"] / total_households 
             if total_households > 0 else None
         )
         
         per_capita_income = (
-            per_capita_income_sum / per_capita_population 
-            if per_capita_population > 0 else None
+            sums["per_capita_weighted"] / sums["per_capita_population"] 
+            if sums["per_capita_population"] > 0 else None
         )
         
         return DemographicMetrics(
@@ -461,7 +996,8 @@ def get_census_demographics_service() -> CensusDemographicsService:
 async def fetch_demographics(
     latitude: float,
     longitude: float, 
-    radii_miles: List[float] = [1, 3, 5]
+    radii_miles: List[float] = [1, 3, 5],
+    fast: bool = False
 ) -> DemographicsResponse:
     """
     Fetch demographic data using Census Bureau APIs (replacement for ArcGIS GeoEnrichment).
@@ -473,6 +1009,7 @@ async def fetch_demographics(
         latitude: Center point latitude
         longitude: Center point longitude
         radii_miles: List of radii to analyze (default: 1, 3, 5 miles)
+        fast: Approximate totals from the population raster when built
         
     Returns:
         DemographicsResponse with Census-based data
@@ -482,4 +1019,20 @@ async def fetch_demographics(
           using area-weighted analysis of Census tract data.
     """
     service = get_census_demographics_service()
-    return await service.fetch_demographics(latitude, longitude, radii_miles)
\ No newline at end of file
+    return await service.fetch_demographics(latitude, longitude, radii_miles, fast)
+
+
+async def fetch_bulk_ring_demographics(
+    points: List[Tuple[float, float]],
+    radii_miles: List[float] = [1, 3],
+    exact: bool = False
+) -> List[DemographicsResponse]:
+    """
+    Fetch ring demographics for many (latitude, longitude) points at once.
+
+    Requires tract ACS values loaded into the local acs_tract_values table.
+    Uses the population raster when built unless exact=True.
+    Returns one DemographicsResponse per point, in input order.
+    """
+    service = get_census_demographics_service()
+    return await service.fetch_bulk_ring_demographics(points, radii_miles, exact)
@@ -0,0 +1,266 @@
+"""
+Persistent store for Census Data API answers.
+
+ACS 5-Year (2022) and County Business Patterns (2021) are fixed vintages, so
+a tract's or county's values never change once fetched. Lookups go through:
+
+1. an in-process dict of the counties already read,
+2. the census_responses table (app/models/census_response.py), keyed by
+   (dataset, vintage, variables, state, county, tract),
+3. api.census.gov on a miss, fetching the whole county in one call
+   (`tract:*`) and storing every row before returning.
+
+preload_states() fetches whole states in one call per dataset (scripts/
+preload_census.py), after which ring demographics for those states make no
+Census API calls at all. Concurrent misses for the same county share one
+fetch. A store that can't be read or written (e.g. table not created yet)
+only costs the API call, as before.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.census_response import CensusResponse
+from app.utils.http_clients import http_client
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+ACS_DATASET = "acs/acs5"
+ACS_VINTAGE = "2022"  # ACS 5-Year 2018-2022
+CBP_DATASET = "cbp"
+CBP_VINTAGE = "2021"
+CBP_NAICS = "00"      # All industries
+
+# ACS 5-Year tract variables used by demographics (code -> field name)
+ACS_TRACT_VARIABLES: Dict[str, str] = {
+    "B01003_001E": "total_population",
+    "B11001_001E": "total_households",
+    "B01002_001E": "median_age",
+    "B19013_001E": "median_household_income",
+    "B19025_001E": "aggregate_household_income",
+    "B19301_001E": "per_capita_income",
+}
+CBP_COUNTY_VARIABLES: Dict[str, str] = {
+    "ESTAB": "total_businesses",
+    "EMP": "total_employees",
+}
+
+# States the demographics queries cover (census_tracts is loaded for these)
+TARGET_STATE_FIPS: Dict[str, str] = {"IA": "19", "NE": "31", "NV": "32", "ID": "16"}
+
+COUNTY_TIMEOUT = 15.0  # seconds
+STATE_TIMEOUT = 60.0
+
+# (dataset, vintage, variables, state, county) -> {tract ("" for county rows): {code: raw value}}
+_CountyKey = Tuple[str, str, str, str, str]
+_county_values: Dict[_CountyKey, Dict[str, Dict[str, Optional[str]]]] = {}
+
+_census_flight = SingleFlight("census_responses")
+
+
+def _variables_key(variables: Iterable[str]) -> str:
+    return ",".join(variables)
+
+
+async def _call_census_api(dataset: str, vintage: str, params: dict, timeout: float) -> list:
+    """One Census Data API call; returns the header row followed by data rows."""
+    url = f"{settings.CENSUS_API_BASE_URL}/{vintage}/{dataset}"
+    if settings.CENSUS_API_KEY:
+        params = {**params, "key": settings.CENSUS_API_KEY}
+    async with http_client("census") as client:
+        response = await client.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def _rows_by_county(data: list, variables: List[str]) -> Dict[Tuple[str, str], Dict[str, Dict[str, Optional[str]]]]:
+    """Group API rows by (state, county), then by tract ("" when the response has no tract column)."""
+    counties: Dict[Tuple[str, str], Dict[str, Dict[str, Optional[str]]]] = {}
+    if len(data) < 2:
+        return counties
+    headers = data[0]
+    state_idx = headers.index("state")
+    county_idx = headers.index("county")
+    tract_idx = headers.index("tract") if "tract" in headers else None
+    var_idx = [(code, headers.index(code)) for code in variables if code in headers]
+    for row in data[1:]:
+        tract = row[tract_idx] if tract_idx is not None else ""
+        counties.setdefault((row[state_idx], row[county_idx]), {})[tract] = {
+            code: row[idx] for code, idx in var_idx
+        }
+    return counties
+
+
+def _load_county(dataset: str, vintage: str, variables: str, state: str, county: str) -> Dict[str, Dict[str, Optional[str]]]:
+    db = SessionLocal()
+    try:
+        rows = db.query(CensusResponse.tract, CensusResponse.values).filter(
+            CensusResponse.dataset == dataset,
+            CensusResponse.vintage == vintage,
+            CensusResponse.variables == variables,
+            CensusResponse.statefp == state,
+            CensusResponse.countyfp == county,
+        ).all()
+        return {row.tract: json.loads(row.values) for row in rows}
+    finally:
+        db.close()
+
+
+def _save_counties(
+    dataset: str,
+    vintage: str,
+    variables: str,
+    counties: Dict[Tuple[str, str], Dict[str, Dict[str, Optional[str]]]],
+) -> int:
+    """Replace the stored rows of each county with the fetched ones; returns rows written."""
+    db = SessionLocal()
+    try:
+        rows = []
+        for (state, county), tracts in counties.items():
+            db.query(CensusResponse).filter(
+                CensusResponse.dataset == dataset,
+                CensusResponse.vintage == vintage,
+                CensusResponse.variables == variables,
+                CensusResponse.statefp == state,
+                CensusResponse.countyfp == county,
+            ).delete(synchronize_session=False)
+            rows.extend(
+                {
+                    "dataset": dataset, "vintage": vintage, "variables": variables,
+                    "statefp": state, "countyfp": county, "tract": tract,
+                    "values": json.dumps(values),
+                }
+                for tract, values in tracts.items()
+            )
+        if rows:
+            db.execute(insert(CensusResponse), rows)
+        db.commit()
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _store(dataset: str, vintage: str, variables: str, counties: dict):
+    """Persist and memoize fetched counties (a failed write is logged, not raised)."""
+    for (state, county), tracts in counties.items():
+        _county_values[(dataset, vintage, variables, state, county)] = tracts
+    try:
+        await asyncio.to_thread(_save_counties, dataset, vintage, variables, counties)
+    except Exception as e:
+        logger.warning(f"Census response store write failed ({dataset} {vintage}): {e}")
+
+
+async def _get_county(
+    dataset: str,
+    vintage: str,
+    variables: List[str],
+    state: str,
+    county: str,
+    params: dict,
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """A county's stored rows, fetching (with `params`) and storing them on a miss."""
+    variables_key = _variables_key(variables)
+    key = (dataset, vintage, variables_key, state, county)
+    found = _county_values.get(key)
+    if found is not None:
+        return found
+
+    async def load() -> Dict[str, Dict[str, Optional[str]]]:
+        try:
+            stored = await asyncio.to_thread(_load_county, dataset, vintage, variables_key, state, county)
+        except Exception as e:
+            logger.warning(f"Census response store read failed ({dataset} {state}{county}): {e}")
+            stored = {}
+        if stored:
+            _county_values[key] = stored
+            return stored
+        data = await _call_census_api(dataset, vintage, params, COUNTY_TIMEOUT)
+        counties = _rows_by_county(data, variables)
+        counties.setdefault((state, county), {})
+        await _store(dataset, vintage, variables_key, counties)
+        return counties[(state, county)]
+
+    return await _census_flight.do(key, load)
+
+
+async def get_acs_tract_values(
+    state_fips: str,
+    county_fips: str,
+    variables: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    ACS 5-Year values for every tract in a county.
+
+    Returns {6-digit tract code: {variable code: raw API value}}; values are
+    the API's strings (None or negative sentinels when not available).
+    """
+    variables = variables or list(ACS_TRACT_VARIABLES)
+    return await _get_county(ACS_DATASET, ACS_VINTAGE, variables, state_fips, county_fips, {
+        "get": ",".join(variables),
+        "for": "tract:*",
+        "in": f"state:{state_fips} county:{county_fips}",
+    })
+
+
+async def get_cbp_county_values(
+    state_fips: str,
+    county_fips: str,
+    variables: Optional[List[str]] = None,
+) -> Dict[str, Optional[str]]:
+    """County Business Patterns totals (all industries) for a county: {variable code: raw API value}."""
+    variables = variables or list(CBP_COUNTY_VARIABLES)
+    rows = await _get_county(CBP_DATASET, CBP_VINTAGE, variables, state_fips, county_fips, {
+        "get": ",".join(variables),
+        "for": f"county:{county_fips}",
+        "in": f"state:{state_fips}",
+        "NAICS2017": CBP_NAICS,
+    })
+    return rows.get("", {})
+
+
+async def preload_states(states: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Fetch and store ACS tract and CBP county values for whole states.
+
+    One API call per dataset per state (default: TARGET_STATE_FIPS). Returns
+    {state: {"counties": n, "tracts": n}}.
+    """
+    states = states or list(TARGET_STATE_FIPS)
+    acs_variables = list(ACS_TRACT_VARIABLES)
+    cbp_variables = list(CBP_COUNTY_VARIABLES)
+    result = {}
+    for state in states:
+        state_fips = TARGET_STATE_FIPS.get(state.upper(), state)
+        acs = _rows_by_county(await _call_census_api(ACS_DATASET, ACS_VINTAGE, {
+            "get": ",".join(acs_variables),
+            "for": "tract:*",
+            "in": f"state:{state_fips}",
+        }, STATE_TIMEOUT), acs_variables)
+        cbp = _rows_by_county(await _call_census_api(CBP_DATASET, CBP_VINTAGE, {
+            "get": ",".join(cbp_variables),
+            "for": "county:*",
+            "in": f"state:{state_fips}",
+            "NAICS2017": CBP_NAICS,
+        }, STATE_TIMEOUT), cbp_variables)
+
+        # Preloads should fail loudly, so write directly rather than through _store()
+        tracts = await asyncio.to_thread(_save_counties, ACS_DATASET, ACS_VINTAGE, _variables_key(acs_variables), acs)
+        await asyncio.to_thread(_save_counties, CBP_DATASET, CBP_VINTAGE, _variables_key(cbp_variables), cbp)
+        for (st, county), rows in acs.items():
+            _county_values[(ACS_DATASET, ACS_VINTAGE, _variables_key(acs_variables), st, county)] = rows
+        for (st, county), rows in cbp.items():
+            _county_values[(CBP_DATASET, CBP_VINTAGE, _variables_key(cbp_variables), st, county)] = rows
+
+        result[state] = {"counties": len(cbp), "tracts": tracts}
+        logger.info(f"Census preload {state}: {tracts} ACS tracts, {len(cbp)} CBP counties")
+    return result
@@ -28,7 +28,6 @@ from sqlalchemy import text
 # Geocoding
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
-import time
 import requests
 
 # GIS support (optional)
@@ -42,6 +41,9 @@ except ImportError:
 from ..models.county_property import CountyProperty
 from ..core.database import SessionLocal
 from ..core.config import settings
+from ..services.opportunity_score_job import request_score_refresh
+from ..utils.rate_limits import get_rate_limiter
+from ..utils.spatial_hash import SpatialHash
 import os
 
 logger = logging.getLogger(__name__)
@@ -219,6 +221,10 @@ class CountyDataImporter:
         )
         self.geocoding_cache = {}
         
+        # Dedup index (parcel IDs + grid-hashed coordinates), loaded on first use
+        self._known_parcels: Optional[Dict[str, Any]] = None
+        self._known_locations: Optional[SpatialHash[Any]] = None
+        
         logger.info(f"[County Import] Initialized for {county_name}, {state_code} (batch: {self.batch_id})")
     
     
@@ -296,13 +302,14 @@ class CountyDataImporter:
                         if property_record and not dry_run:
                             # Check for duplicates
                             existing = self._find_duplicate(db, property_record)
-                            if existing:
+                            if existing is not None:
                                 stats.duplicate_records += 1
-                                logger.debug(f"[County Import] Skipping duplicate parcel {property_record.parcel_id}")
+                                logger.debug(f"[County Import] Skipping duplicate parcel {property_record.parcel_id} (matches {existing})")
                                 continue
                             
                             # Insert record
                             db.add(property_record)
+                            self._register_imported(property_record)
                             stats.imported_records += 1
                             
                             # Commit in batches for performance
@@ -343,6 +350,9 @@ class CountyDataImporter:
             f"{stats.geocoded_records} geocoded"
         )
         
+        if not dry_run and stats.imported_records:
+            request_score_refresh(self.county_name)
+        
         return stats
     
     
@@ -413,11 +423,12 @@ class CountyDataImporter:
                         
                         if property_record and not dry_run:
                             existing = self._find_duplicate(db, property_record)
-                            if existing:
+                            if existing is not None:
                                 stats.duplicate_records += 1
                                 continue
                                 
                             db.add(property_record)
+                            self._register_imported(property_record)
                             stats.imported_records += 1
                             
                             if stats.imported_records % 1000 == 0:
@@ -452,6 +463,9 @@ class CountyDataImporter:
             f"{stats.imported_records}/{stats.total_records} imported"
         )
         
+        if not dry_run and stats.imported_records:
+            request_score_refresh(self.county_name)
+        
         return stats
     
     
@@ -696,8 +710,8 @@ class CountyDataImporter:
                 return cached['lat'], cached['lng']
             
             try:
-                # Rate limit geocoding
-                time.sleep(1.0 / settings.GEOCODING_RATE_LIMIT)
+                # Rate limit geocoding (shared Nominatim limit)
+                get_rate_limiter("nominatim").acquire_blocking()
                 
                 location = self.geocoder.geocode(full_address)
                 if location:
@@ -792,38 +806,59 @@ class CountyDataImporter:
         return any(term in combined for term in vacancy_terms)
     
     
-    def _find_duplicate(self, db: Session, record: CountyProperty) -> Optional[CountyProperty]:
-        """Check for existing duplicate records."""
+    def _load_duplicate_index(self, db: Session) -> None:
+        """
+        Preload parcel IDs and coordinates already stored for this county.
+
+        One query per import run replaces two lookups per row; records added
+        during the run are registered too, so in-file duplicates are caught
+        before they are committed.
+        """
+        self._known_parcels = {}
+        self._known_locations = SpatialHash()
+
+        rows = db.query(
+            CountyProperty.id,
+            CountyProperty.parcel_id,
+            CountyProperty.latitude,
+            CountyProperty.longitude,
+        ).filter(CountyProperty.source_county == self.county_name).all()
+
+        for prop_id, parcel_id, lat, lng in rows:
+            if parcel_id:
+                self._known_parcels.setdefault(parcel_id, prop_id)
+            if lat is not None and lng is not None:
+                self._known_locations.add(lat, lng, prop_id)
+
+        logger.info(f"[County Import] Loaded {len(rows)} existing {self.county_name} records for dedup")
+    
+    
+    def _register_imported(self, record: CountyProperty) -> None:
+        """Add a newly imported record to the dedup index."""
+        ref = f"{self.batch_id}:{record.parcel_id or len(self._known_locations)}"
+        if record.parcel_id:
+            self._known_parcels.setdefault(record.parcel_id, ref)
+        if record.latitude and record.longitude:
+            self._known_locations.add(record.latitude, record.longitude, ref)
+    
+    
+    def _find_duplicate(self, db: Session, record: CountyProperty) -> Optional[Any]:
+        """
+        Check for existing duplicate records.
+
+        Returns the id (or parcel reference, for records imported in this run)
+        of the record this one duplicates, or None.
+        """
+        if self._known_locations is None:
+            self._load_duplicate_index(db)
         
         # Check by parcel ID first (most reliable)
-        if record.parcel_id:
-            existing = db.query(CountyProperty).filter(
-                CountyProperty.source_county == record.source_county,
-                CountyProperty.parcel_id == record.parcel_id
-            ).first()
-            
-            if existing:
-                return existing
+        if record.parcel_id and record.parcel_id in self._known_parcels:
+            return self._known_parcels[record.parcel_id]
         
-        # Check by coordinates (within 50m)
+        # Check by coordinates (within ~50m, grid-hashed)
         if record.latitude and record.longitude:
-            lat_tolerance = 0.0005  # ~50m
-            lng_tolerance = 0.0005
-            
-            existing = db.query(CountyProperty).filter(
-                CountyProperty.source_county == record.source_county,
-                CountyProperty.latitude.between(
-                    record.latitude - lat_tolerance,
-                    record.latitude + lat_tolerance
-                ),
-                CountyProperty.longitude.between(
-                    record.longitude - lng_tolerance, 
-                    record.longitude + lng_tolerance
-                )
-            ).first()
-            
-            if existing:
-                return existing
+            return self._known_locations.find_near(record.latitude, record.longitude)
         
         return None
     
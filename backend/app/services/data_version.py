@@ -0,0 +1,101 @@
+"""
+Data version for opportunity search inputs.
+
+A single integer that changes whenever stores, scraped listings, county
+properties or materialized opportunity scores change, so cached search
+responses can be keyed on it and never outlive the data they were built from.
+
+- Writes made through this process's ORM bump the version immediately
+  (SQLAlchemy mapper events).
+- Writes from other processes (import scripts, other workers) are picked up
+  by a cheap per-table fingerprint (count, max id, max timestamp) checked at
+  most once every DATA_VERSION_CHECK_INTERVAL seconds.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, func
+
+from app.core.database import SessionLocal
+from app.models.county_property import CountyProperty
+from app.models.opportunity_score import OpportunityScore
+from app.models.scraped_listing import ScrapedListing
+from app.models.store import Store
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_CHECK_INTERVAL = 60  # seconds between fingerprint checks
+
+# (model, primary key column, last-modified column) for every tracked table
+_TRACKED_TABLES = [
+    (Store, Store.id, Store.updated_at),
+    (ScrapedListing, ScrapedListing.id, ScrapedListing.updated_at),
+    (CountyProperty, CountyProperty.id, CountyProperty.data_updated),
+    (OpportunityScore, OpportunityScore.county_property_id, OpportunityScore.computed_at),
+]
+
+_version = 0
+_fingerprint: Optional[tuple] = None
+_last_checked = 0.0
+_lock = threading.Lock()
+
+
+def _data_fingerprint() -> tuple:
+    db = SessionLocal()
+    try:
+        parts = []
+        for _, pk, modified in _TRACKED_TABLES:
+            count, max_id, max_modified = db.query(
+                func.count(pk), func.max(pk), func.max(modified)
+            ).one()
+            parts.append((count, max_id, max_modified.isoformat() if max_modified else None))
+        return tuple(parts)
+    finally:
+        db.close()
+
+
+def get_data_version() -> int:
+    """
+    Current data version (blocking: may run the fingerprint query).
+
+    Call from a worker thread in async code.
+    """
+    global _version, _fingerprint, _last_checked
+
+    if time.time() - _last_checked < DATA_VERSION_CHECK_INTERVAL:
+        return _version
+
+    with _lock:
+        if time.time() - _last_checked < DATA_VERSION_CHECK_INTERVAL:
+            return _version
+        try:
+            fingerprint = _data_fingerprint()
+        except Exception as e:
+            # Can't tell whether anything changed; bump so nothing stale is served
+            logger.warning(f"Data version fingerprint failed: {e}")
+            fingerprint = None
+        if fingerprint is None or fingerprint != _fingerprint:
+            if _fingerprint is not None or fingerprint is None:
+                _version += 1
+            _fingerprint = fingerprint
+        _last_checked = time.time()
+        return _version
+
+
+def bump_data_version(reason: str = ""):
+    """Mark tracked data as changed (use after raw SQL writes that skip ORM events)."""
+    global _version
+    _version += 1
+    logger.debug(f"Data version bumped to {_version}{f' ({reason})' if reason else ''}")
+
+
+def _on_data_change(mapper, connection, target):
+    bump_data_version(mapper.class_.__tablename__)
+
+
+for _model, _, _ in _TRACKED_TABLES:
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _on_data_change)
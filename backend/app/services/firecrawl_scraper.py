@@ -19,6 +19,7 @@ from urllib.parse import quote
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
+from app.utils.rate_limits import rate_limited
 from app.services.url_import import (
     detect_source,
     extract_crexi_id,
@@ -162,6 +163,11 @@ class FirecrawlScraperService:
         self.client = FirecrawlClient(api_key=settings.FIRECRAWL_API_KEY)
         self.credit_tracker = credit_tracker
 
+    async def _scrape(self, url: str, **kwargs):
+        """Firecrawl SDK scrape under the shared Firecrawl rate limit (SDK is synchronous — runs in a thread)."""
+        async with rate_limited("firecrawl"):
+            return await asyncio.to_thread(self.client.scrape, url, **kwargs)
+
     # ----- Phase A: Single URL scrape ----- #
 
     async def scrape_single_url(self, url: str) -> dict:
@@ -182,10 +188,8 @@ class FirecrawlScraperService:
         elif source == "loopnet":
             external_id = extract_loopnet_id(url)
 
-        # Firecrawl SDK is synchronous — run in thread to avoid blocking FastAPI
         # v4 SDK: .scrape() returns a Document pydantic model with .json, .markdown, etc.
-        result = await asyncio.to_thread(
-            self.client.scrape,
+        result = await self._scrape(
             url,
             formats=[
                 "markdown",
@@ -287,8 +291,7 @@ class FirecrawlScraperService:
 
             logger.info(f"Scraping {source} search page {page_num + 1}: {current_url}")
 
-            result = await asyncio.to_thread(
-                self.client.scrape,
+            result = await self._scrape(
                 current_url,
                 formats=[
                     "markdown",
@@ -400,7 +403,7 @@ async def backfill_coordinates(listing_data: dict) -> dict:
         return listing_data
 
     try:
-        import httpx
+        from app.utils.http_clients import http_client
 
         mapbox_token = settings.MAPBOX_ACCESS_TOKEN
         if not mapbox_token:
@@ -414,7 +417,7 @@ async def backfill_coordinates(listing_data: dict) -> dict:
             f"&country=US&limit=1&access_token={mapbox_token}"
         )
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("mapbox") as client:
             resp = await client.get(url, timeout=10)
             resp.raise_for_status()
             data = resp.json()
@@ -4,6 +4,7 @@ from typing import Optional, Tuple
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 from app.core.config import settings
+from app.utils.rate_limits import get_rate_limiter, retry_delay
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +14,11 @@ class GeocodingService:
 
     def __init__(self):
         self.geolocator = Nominatim(user_agent=settings.GEOCODING_USER_AGENT)
-        self.rate_limit = settings.GEOCODING_RATE_LIMIT
-        self.last_request_time = 0
+        self.limiter = get_rate_limiter("nominatim")
 
     def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
-        self.last_request_time = time.time()
+        """Wait for a Nominatim rate token (shared by every geocoder in the process)."""
+        self.limiter.acquire_blocking()
 
     def geocode_address(
         self,
@@ -63,11 +60,11 @@ class GeocodingService:
 
             except GeocoderTimedOut:
                 logger.warning(f"Geocoding timeout for '{full_address}', attempt {attempt + 1}/{retries}")
-                time.sleep(2 ** attempt)  # Exponential backoff
+                time.sleep(retry_delay(attempt))  # Jittered exponential backoff
 
             except GeocoderServiceError as e:
                 logger.error(f"Geocoding service error: {e}")
-                time.sleep(2 ** attempt)
+                time.sleep(retry_delay(attempt))
 
             except Exception as e:
                 logger.error(f"Unexpected geocoding error: {e}")
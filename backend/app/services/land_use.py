@@ -0,0 +1,131 @@
+"""
+Land-use classification for opportunity eligibility.
+
+County assessors and ATTOM reuse a small vocabulary of land-use
+descriptions, so each keyword set is compiled into a single regex and
+results are memoized per raw land_use string. The opportunity hot path then
+does at most one regex scan per distinct description instead of ~200
+substring checks per property.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+# Land use keywords indicating incompatible commercial uses (can't convert to wireless retail)
+EXCLUDED_LAND_USE_KEYWORDS = {
+    # Gas/Auto
+    "gas station", "service station", "auto repair", "car wash", "tire",
+    "oil change", "auto body", "auto dealer", "parking garage", "parking lot",
+    "auto parts", "auto service",
+    # Food/Drink
+    "restaurant", "fast food", "bar ", "tavern", "brewery", "pizza",
+    "coffee shop", "bakery", "deli", "liquor store", "ice cream", "donut",
+    # Medical
+    "dental", "medical", "hospital", "clinic", "veterinar", "pharmacy",
+    "optom", "chiropract", "urgent care", "dialysis", "physician",
+    # Finance
+    "bank", "credit union",
+    # Lodging
+    "hotel", "motel", "inn ", "resort",
+    # Religious/Civic
+    "church", "mosque", "temple", "synagogue", "worship", "funeral",
+    "cemetery", "mortuary", "cremator",
+    # Industrial/Utility
+    "warehouse", "storage", "industrial", "manufacturing", "plant ",
+    "utility", "water treatment",
+    # Government
+    "government", "post office", "fire station", "police", "library",
+    "courthouse",
+    # Education
+    "school", "university", "college", "daycare", "child care",
+    # Other incompatible
+    "laundromat", "dry clean", "salon", "barber", "tattoo", "nail salon",
+    "gym", "fitness", "bowling", "theater", "cinema", "nightclub",
+    "car dealer", "grocery", "supermarket", "convenience store",
+    # Residential (NOT suitable for commercial retail)
+    "residential", "single family", "single-family", "multifamily", "multi-family",
+    "apartment", "condominium", "condo", "townhouse", "townhome", "duplex",
+    "triplex", "fourplex", "mobile home", "manufactured home", "rv park",
+    "trailer park", "assisted living", "nursing home", "senior living",
+    "group home", "halfway house",
+    # Parks/Recreation
+    "park", "playground", "recreation", "sports field", "athletic",
+    "golf course", "golf ", "tennis court", "swimming pool", "skate park",
+    # Agriculture
+    "farm", "agricultural", "ranch", "crop", "orchard", "nursery",
+    "vineyard", "greenhouse", "livestock", "dairy", "grain",
+    # Infrastructure
+    "railroad", "rail yard", "airport", "airstrip", "helipad",
+    "cell tower", "telecommunication", "substation", "power line",
+    # Environmental/Waste
+    "junkyard", "scrapyard", "landfill", "dump ", "quarry", "mine ",
+    "stormwater", "retention pond", "drainage", "sewage", "wastewater",
+    # Waterfront/Outdoor
+    "campground", "marina", "boat ramp", "fishing",
+    # Advertising
+    "billboard",
+}
+
+# Land use keywords indicating availability (vacant, former, closed, etc.)
+AVAILABILITY_LAND_USE_KEYWORDS = {
+    "vacant", "former", "closed", "abandoned", "demolished", "unused",
+}
+
+# Terms that mark a large building as multi-tenant (strip centers, plazas)
+MULTI_TENANT_KEYWORDS = {"multi", "center", "plaza", "strip"}
+
+# Distinct land-use strings to memoize (a county has a few hundred at most)
+LAND_USE_CACHE_SIZE = 4096
+
+
+def _compile_keywords(keywords: Iterable[str]) -> re.Pattern:
+    """Compile keywords into one alternation matching any of them as a substring."""
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered))
+
+
+_EXCLUDED_RE = _compile_keywords(EXCLUDED_LAND_USE_KEYWORDS)
+_AVAILABILITY_RE = _compile_keywords(AVAILABILITY_LAND_USE_KEYWORDS)
+_MULTI_TENANT_RE = _compile_keywords(MULTI_TENANT_KEYWORDS)
+
+
+@lru_cache(maxsize=LAND_USE_CACHE_SIZE)
+def _classify(land_use: str) -> tuple[bool, bool, bool]:
+    """(excluded, available, multi_tenant) for a raw land-use string."""
+    text = land_use.lower()
+    return (
+        _EXCLUDED_RE.search(text) is not None,
+        _AVAILABILITY_RE.search(text) is not None,
+        _MULTI_TENANT_RE.search(text) is not None,
+    )
+
+
+def is_excluded_land_use(land_use: Optional[str]) -> bool:
+    """Check if a property's land use indicates an incompatible commercial use."""
+    if not land_use:
+        return False
+    return _classify(land_use)[0]
+
+
+def has_availability_keywords(land_use: Optional[str]) -> bool:
+    """Check if land use text indicates the property is available (vacant, former, closed, etc.)."""
+    if not land_use:
+        return False
+    return _classify(land_use)[1]
+
+
+def has_multi_tenant_terms(texts: Iterable[Optional[str]]) -> bool:
+    """Check if any text (land use, signal descriptions) suggests a multi-tenant building."""
+    return any(text and _classify(text)[2] for text in texts)
+
+
+def get_classifier_stats() -> dict:
+    """Memo hit/miss statistics for the land-use classifier."""
+    info = _classify.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "cached_strings": info.currsize,
+        "max_size": info.maxsize,
+    }
@@ -16,6 +16,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import text, and_, or_
+import asyncio
 import json
 import math
 import logging
@@ -263,7 +264,22 @@ async def search_properties_by_bounds(
     
     This function provides identical interface to attom.search_properties_by_bounds()
     but queries the local county_properties table instead of ATTOM API.
+    The blocking query runs in the threadpool so callers can overlap it with
+    other upstream fetches.
     """
+    return await asyncio.to_thread(
+        _search_properties_by_bounds_sync,
+        bounds, property_types, min_opportunity_score, limit,
+    )
+
+
+def _search_properties_by_bounds_sync(
+    bounds: GeoBounds,
+    property_types: Optional[List[PropertyType]],
+    min_opportunity_score: float,
+    limit: int,
+) -> PropertySearchResult:
+    """Blocking implementation of search_properties_by_bounds()."""
     
     # Calculate center point for response
     center_lat = (bounds.min_lat + bounds.max_lat) / 2
@@ -364,6 +380,7 @@ async def search_properties_by_bounds(
             total_found=len(properties),
             sources=["LOCAL"],
             search_timestamp=datetime.now().isoformat(),
+            truncated=len(raw_results) >= limit * 2 or len(properties) >= limit,
         )
         
     except Exception as e:
@@ -387,6 +404,21 @@ async def search_properties_by_radius(
     This function provides identical interface to attom.search_properties_by_radius()
     but uses PostGIS spatial queries for better performance.
     """
+    return await asyncio.to_thread(
+        _search_properties_by_radius_sync,
+        latitude, longitude, radius_miles, property_types, min_opportunity_score, limit,
+    )
+
+
+def _search_properties_by_radius_sync(
+    latitude: float,
+    longitude: float,
+    radius_miles: float,
+    property_types: Optional[List[PropertyType]],
+    min_opportunity_score: float,
+    limit: int,
+) -> PropertySearchResult:
+    """Blocking implementation of search_properties_by_radius()."""
     
     db = SessionLocal()
     try:
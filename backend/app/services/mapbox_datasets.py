@@ -15,7 +15,6 @@ API Docs: https://docs.mapbox.com/api/maps/datasets/
 Note: Requires access token with datasets:read, datasets:write, datasets:list scopes.
 """
 
-import httpx
 import json
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -23,6 +22,7 @@ from pydantic import BaseModel, Field
 from enum import Enum
 
 from app.core.config import settings
+from app.utils.http_clients import http_client
 
 
 class AnalysisType(str, Enum):
@@ -110,7 +110,7 @@ async def create_dataset(name: str, description: str = "") -> DatasetInfo:
     username = _get_username()
     url = f"{DATASETS_API_BASE}/{username}"
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.post(
             url,
             params={"access_token": settings.MAPBOX_ACCESS_TOKEN},
@@ -145,7 +145,7 @@ async def list_datasets() -> List[DatasetInfo]:
     username = _get_username()
     url = f"{DATASETS_API_BASE}/{username}"
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.get(
             url,
             params={"access_token": settings.MAPBOX_ACCESS_TOKEN},
@@ -185,7 +185,7 @@ async def get_dataset(dataset_id: str) -> DatasetInfo:
     username = _get_username()
     url = f"{DATASETS_API_BASE}/{username}/{dataset_id}"
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.get(
             url,
             params={"access_token": settings.MAPBOX_ACCESS_TOKEN},
@@ -222,7 +222,7 @@ async def delete_dataset(dataset_id: str) -> bool:
     username = _get_username()
     url = f"{DATASETS_API_BASE}/{username}/{dataset_id}"
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.delete(
             url,
             params={"access_token": settings.MAPBOX_ACCESS_TOKEN},
@@ -253,7 +253,7 @@ async def upload_features(
     username = _get_username()
     uploaded_count = 0
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         for i, feature in enumerate(features):
             # Generate feature ID if not provided
             feature_id = feature.id or f"feature-{i}-{datetime.utcnow().timestamp()}"
@@ -326,7 +326,7 @@ async def get_features(
     username = _get_username()
     url = f"{DATASETS_API_BASE}/{username}/{dataset_id}/features"
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.get(
             url,
             params={
@@ -373,7 +373,7 @@ async def export_to_tileset(
     # Full implementation would use S3 staging for large datasets
     uploads_url = f"https://api.mapbox.com/uploads/v1/{username}"
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         # Create upload from GeoJSON
         response = await client.post(
             uploads_url,
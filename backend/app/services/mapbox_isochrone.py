@@ -7,12 +7,12 @@ Used for coverage analysis and service area visualization.
 API Docs: https://docs.mapbox.com/api/navigation/isochrone/
 """
 
-import httpx
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from enum import Enum
 
 from app.core.config import settings
+from app.utils.http_clients import http_client
 
 
 class IsochroneProfile(str, Enum):
@@ -88,7 +88,7 @@ async def fetch_isochrone(
     if contours_colors:
         params["contours_colors"] = ",".join(contours_colors)
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.get(url, params=params, timeout=30.0)
         response.raise_for_status()
         data = response.json()
@@ -144,7 +144,7 @@ async def fetch_multi_contour_isochrone(
     if colors:
         params["contours_colors"] = ",".join(colors[:len(minutes_list)])
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.get(url, params=params, timeout=30.0)
         response.raise_for_status()
         data = response.json()
@@ -17,15 +17,17 @@ Pricing:
 - 25x25 matrix = 625 elements = ~$0.63 per request
 """
 
-import httpx
 import hashlib
 import json
 from typing import List, Tuple, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from pydantic import BaseModel, Field
 from enum import Enum
 
 from app.core.config import settings
+from app.utils.http_clients import http_client
+from app.utils.single_flight import SingleFlight
+from app.utils.ttl_cache import MB, TTLCache
 
 
 class TravelProfile(str, Enum):
@@ -94,9 +96,17 @@ class CompetitorAccessResult(BaseModel):
     analysis_timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
-# Simple in-memory cache (consider Redis for production)
-_matrix_cache: dict = {}
+# Bounded LRU cache, shared across workers via L2 (elements lists are ~100 bytes per pair)
 CACHE_TTL_HOURS = 24
+MATRIX_CACHE_MAX_ENTRIES = 5000
+MATRIX_CACHE_MAX_BYTES = 32 * MB
+_matrix_cache = TTLCache(
+    "matrix", CACHE_TTL_HOURS * 3600,
+    max_entries=MATRIX_CACHE_MAX_ENTRIES,
+    max_bytes=MATRIX_CACHE_MAX_BYTES,
+    l2=True,
+)
+_matrix_flight = SingleFlight("matrix")
 
 
 def _get_cache_key(
@@ -113,14 +123,6 @@ def _get_cache_key(
     return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
 
 
-def _is_cache_valid(cache_entry: dict) -> bool:
-    """Check if a cache entry is still valid."""
-    if "timestamp" not in cache_entry:
-        return False
-    cache_time = datetime.fromisoformat(cache_entry["timestamp"])
-    return datetime.utcnow() - cache_time < timedelta(hours=CACHE_TTL_HOURS)
-
-
 async def calculate_matrix(
     origins: List[Tuple[float, float]],
     destinations: List[Tuple[float, float]],
@@ -155,18 +157,30 @@ async def calculate_matrix(
 
     # Check cache
     cache_key = _get_cache_key(origins, destinations, profile_str)
-    if use_cache and cache_key in _matrix_cache:
-        cache_entry = _matrix_cache[cache_key]
-        if _is_cache_valid(cache_entry):
-            return MatrixResponse(
-                elements=[MatrixElement(**e) for e in cache_entry["elements"]],
-                profile=profile_str,
-                total_origins=len(origins),
-                total_destinations=len(destinations),
-                cached=True,
-                timestamp=datetime.fromisoformat(cache_entry["timestamp"]),
-            )
+    cache_entry = await _matrix_cache.aget(cache_key) if use_cache else None
+    if cache_entry is not None:
+        return MatrixResponse(
+            elements=[MatrixElement(**e) for e in cache_entry["elements"]],
+            profile=profile_str,
+            total_origins=len(origins),
+            total_destinations=len(destinations),
+            cached=True,
+            timestamp=datetime.fromisoformat(cache_entry["timestamp"]),
+        )
+
+    # Concurrent identical requests share one Mapbox call
+    return await _matrix_flight.do(
+        cache_key, lambda: _fetch_matrix(origins, destinations, profile_str, cache_key)
+    )
 
+
+async def _fetch_matrix(
+    origins: List[Tuple[float, float]],
+    destinations: List[Tuple[float, float]],
+    profile_str: str,
+    cache_key: str,
+) -> MatrixResponse:
+    """Call the Mapbox Matrix API and cache the result (see calculate_matrix)."""
     # Build coordinates string
     # Format: "lng,lat;lng,lat;..."
     all_coords = origins + destinations
@@ -188,7 +202,7 @@ async def calculate_matrix(
         "annotations": "duration,distance",
     }
 
-    async with httpx.AsyncClient() as client:
+    async with http_client("mapbox") as client:
         response = await client.get(url, params=params, timeout=30.0)
         response.raise_for_status()
         data = response.json()
@@ -211,10 +225,10 @@ async def calculate_matrix(
 
     # Cache the result
     timestamp = datetime.utcnow()
-    _matrix_cache[cache_key] = {
+    _matrix_cache.set(cache_key, {
         "elements": [e.model_dump() for e in elements],
         "timestamp": timestamp.isoformat(),
-    }
+    })
 
     return MatrixResponse(
         elements=elements,
@@ -343,17 +357,11 @@ async def analyze_competitor_access(
     )
 
 
-def clear_matrix_cache():
-    """Clear the in-memory matrix cache."""
-    global _matrix_cache
-    _matrix_cache = {}
+def clear_matrix_cache(include_l2: bool = True):
+    """Clear the matrix cache (include_l2=False drops only this process's copies)."""
+    _matrix_cache.clear(include_l2=include_l2)
 
 
 def get_cache_stats() -> dict:
-    """Get cache statistics."""
-    valid_entries = sum(1 for entry in _matrix_cache.values() if _is_cache_valid(entry))
-    return {
-        "total_entries": len(_matrix_cache),
-        "valid_entries": valid_entries,
-        "expired_entries": len(_matrix_cache) - valid_entries,
-    }
+    """Get cache statistics (plus request coalescing counts)."""
+    return {**_matrix_cache.stats(), "single_flight": _matrix_flight.stats()}
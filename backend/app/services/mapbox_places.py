@@ -15,6 +15,7 @@ from typing import Optional
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.utils.http_clients import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -163,7 +164,7 @@ async def fetch_mapbox_pois(
     all_pois: list[MapboxPOI] = []
     seen_ids: set[str] = set()
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with http_client("mapbox") as client:
         for our_category in search_categories:
             mapbox_types = MAPBOX_CATEGORIES.get(our_category, [])
             if not mapbox_types:
@@ -174,7 +175,7 @@ async def fetch_mapbox_pois(
                 try:
                     # Use Search Box API category endpoint
                     # Docs: https://docs.mapbox.com/api/search/search-box/#get-category-search
-                    url = f"https://api.mapbox.com/search/searchbox/v1/category/{mapbox_type}"
+                    url = f"{settings.MAPBOX_API_BASE_URL}/search/searchbox/v1/category/{mapbox_type}"
 
                     params = {
                         "access_token": token,
@@ -183,7 +184,7 @@ async def fetch_mapbox_pois(
                         "language": "en",
                     }
 
-                    response = await client.get(url, params=params)
+                    response = await client.get(url, params=params, timeout=60.0)
 
                     if response.status_code != 200:
                         # Log warning but continue - some categories may not exist
@@ -274,14 +275,15 @@ async def check_mapbox_token() -> dict:
 
     # Test token with a simple geocoding request
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client("mapbox") as client:
             response = await client.get(
-                "https://api.mapbox.com/search/geocode/v6/forward",
+                f"{settings.MAPBOX_API_BASE_URL}/search/geocode/v6/forward",
                 params={
                     "q": "test",
                     "access_token": token,
                     "limit": 1,
-                }
+                },
+                timeout=10.0,
             )
 
             if response.status_code == 200:
@@ -0,0 +1,737 @@
+"""
+Materialized opportunity scores for local county properties.
+
+Precomputes _calculate_priority_rank() for every county property under the
+default search filters and stores the result, with its inputs, in the
+opportunity_scores table. Local-mode opportunity search can then rank a
+viewport with a single indexed bbox + ORDER BY rank_score query.
+
+Refreshes are incremental. Each row records the score formula version and the
+store / ACS / anchor data versions it was computed against; a refresh only
+touches rows whose property changed or whose versions are out of date, and
+reuses stored ring demographics (the expensive PostGIS input) unless the ACS
+load changed or the parcel moved.
+
+Inputs differ from per-viewport live search in three deliberate ways:
+- Store distances are to the true nearest store, not the nearest store
+  within a buffer around the requesting viewport.
+- Retail anchors come from local "shopping" activity nodes rather than a
+  per-viewport Mapbox search.
+- Ring demographics are exact per-parcel PostGIS rings, never the population
+  raster or viewport-center values.
+
+Search only serves rows that are current for every version, so parcels
+imported or changed after the last refresh (and rows whose inputs moved) are
+never served stale. Those parcels and scraped listings (which are not
+materialized, and replace any county row within dedup distance) are scored at
+request time by score_with_materialized_inputs(), from these same inputs, so
+every rank_score in one response is comparable.
+
+County imports and store changes call request_score_refresh(), which runs an
+incremental refresh (or, outside the app, records one for run_refresh_watch())
+so the table catches up.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.activity_node import ActivityNode
+from app.models.acs_tract_value import AcsTractValue
+from app.models.county_property import CountyProperty
+from app.models.opportunity_score import OpportunityScore
+from app.services.attom import GeoBounds, PropertyListing, PropertyType
+from app.services.census_demographics import fetch_bulk_ring_demographics
+from app.services.local_property import _convert_county_property_to_listing
+from app.services.opportunity_scoring import (
+    SCORE_VERSION,
+    VERIZON_FAMILY_BRANDS,
+    DEFAULT_MIN_PARCEL_ACRES,
+    DEFAULT_MAX_PARCEL_ACRES,
+    DEFAULT_MIN_BUILDING_SQFT,
+    DEFAULT_MAX_BUILDING_SQFT,
+    CORPORATE_GATE_MILES,
+    _filter_properties_for_opportunities,
+    _calculate_priority_rank,
+)
+from app.services.store_index import StoreIndex, get_store_index, NO_STORE_DISTANCE
+from app.utils.cache_backends import get_l2_backend
+from app.utils.geo import nearest_k
+
+logger = logging.getLogger(__name__)
+
+# Properties scored per batch (bounds memory and the bulk demographics query)
+SCORE_BATCH_SIZE = 1000
+
+# Activity node category used as the retail anchor set
+ANCHOR_NODE_CATEGORY = "shopping"
+
+# Viewports with more unscored or stale parcels than this are scored fully live
+MAX_LIVE_FALLBACK_PARCELS = SCORE_BATCH_SIZE
+
+# Read path re-reads the ACS / anchor versions (and anchors) at most this often
+READ_INPUTS_RECHECK_SECONDS = 60
+
+# Cross-worker lease so only one worker refreshes at a time (L2 namespace / key)
+REFRESH_LEASE_NAMESPACE = "opportunity_scores"
+REFRESH_LEASE_KEY = "refresh"
+REFRESH_LEASE_SECONDS = 3600
+
+# Refreshes requested outside the app (or while another worker held the lease)
+# are recorded under this key and picked up by run_refresh_watch()
+REFRESH_REQUEST_KEY = "requested"
+REFRESH_REQUEST_TTL_SECONDS = 24 * 3600
+REFRESH_WATCH_SECONDS = 60
+
+Anchors = Tuple[np.ndarray, np.ndarray, List[str]]
+
+# Refresh state for the admin endpoint
+_refresh_status: Dict[str, Any] = {"running": False, "pending": False, "last_result": None}
+
+# Background refresh tasks started by this worker (kept referenced until done)
+_refresh_tasks: set = set()
+
+# (checked_at, demographics version, anchors version, anchors) for the read path
+_read_inputs: Optional[Tuple[float, str, str, Anchors]] = None
+
+
+def _version_string(*parts) -> str:
+    return "|".join("" if p is None else str(p) for p in parts)
+
+
+def _demographics_version(db: Session) -> str:
+    """Changes whenever acs_tract_values is reloaded."""
+    count, max_loaded, max_vintage = db.query(
+        func.count(AcsTractValue.geoid),
+        func.max(AcsTractValue.loaded_at),
+        func.max(AcsTractValue.vintage),
+    ).one()
+    return _version_string(count, max_vintage, max_loaded.isoformat() if max_loaded else None)
+
+
+def _anchors_version(db: Session) -> str:
+    """Changes whenever shopping activity nodes are added or removed."""
+    count, max_id = db.query(func.count(ActivityNode.id), func.max(ActivityNode.id)).filter(
+        ActivityNode.node_category == ANCHOR_NODE_CATEGORY
+    ).one()
+    return _version_string(count, max_id)
+
+
+def _load_anchors(db: Session) -> Anchors:
+    rows = db.query(ActivityNode.name, ActivityNode.latitude, ActivityNode.longitude).filter(
+        ActivityNode.node_category == ANCHOR_NODE_CATEGORY
+    ).all()
+    return (
+        np.array([r.latitude for r in rows], dtype=np.float64),
+        np.array([r.longitude for r in rows], dtype=np.float64),
+        [r.name or "Retail anchor" for r in rows],
+    )
+
+
+def _stale_property_ids(
+    db: Session,
+    versions: Dict[str, str],
+    source_county: Optional[str],
+    full: bool,
+) -> List[int]:
+    """County property ids with no score row or an out-of-date one."""
+    query = db.query(CountyProperty.id).outerjoin(
+        OpportunityScore, OpportunityScore.county_property_id == CountyProperty.id
+    )
+    if source_county:
+        query = query.filter(CountyProperty.source_county == source_county)
+    if not full:
+        query = query.filter(_needs_scoring(versions))
+    return [row.id for row in query.order_by(CountyProperty.id).all()]
+
+
+def _needs_scoring(versions: Dict[str, str]):
+    """Filter for county properties (outer-joined to their score row) with no current row."""
+    return or_(
+        OpportunityScore.county_property_id.is_(None),
+        OpportunityScore.score_version != SCORE_VERSION,
+        CountyProperty.data_updated > OpportunityScore.computed_at,
+        # Eligibility doesn't depend on stores/ACS/anchors, so only eligible rows go stale on them
+        and_(
+            OpportunityScore.is_eligible.is_(True),
+            or_(
+                OpportunityScore.stores_version != versions["stores"],
+                OpportunityScore.demographics_version.is_(None),
+                OpportunityScore.demographics_version != versions["demographics"],
+                OpportunityScore.anchors_version != versions["anchors"],
+            ),
+        ),
+    )
+
+
+def _current_eligible(versions: Dict[str, str]) -> list:
+    """Filters for eligible score rows that are current for every version (complement of _needs_scoring)."""
+    return [
+        OpportunityScore.is_eligible.is_(True),
+        OpportunityScore.score_version == SCORE_VERSION,
+        or_(CountyProperty.data_updated.is_(None), CountyProperty.data_updated <= OpportunityScore.computed_at),
+        OpportunityScore.stores_version == versions["stores"],
+        OpportunityScore.demographics_version == versions["demographics"],
+        OpportunityScore.anchors_version == versions["anchors"],
+    ]
+
+
+def _nearest_stores(
+    store_index: StoreIndex,
+    lats: np.ndarray,
+    lngs: np.ndarray,
+) -> Tuple[List[float], List[float], List[str]]:
+    """(corporate miles, VZ-family miles, VZ-family brand) per point, unbounded."""
+    corporate = store_index.nearest(lats, lngs, brands=["verizon_corporate"])
+    family = store_index.nearest(lats, lngs, brands=VERIZON_FAMILY_BRANDS)
+    corp_miles = [
+        round(d, 2) if corporate.stores_in_range else NO_STORE_DISTANCE
+        for d in corporate.distances.tolist()
+    ]
+    vz_miles = [
+        round(d, 2) if family.stores_in_range else NO_STORE_DISTANCE
+        for d in family.distances.tolist()
+    ]
+    return corp_miles, vz_miles, family.brands
+
+
+async def _ring_populations(listings: List[PropertyListing]) -> Optional[List[Optional[dict]]]:
+    """
+    1mi/3mi ring demographics per listing (None entries where uncovered).
+
+    Returns None if the bulk query fails, so the batch is marked for retry.
+    """
+    try:
+        # Stored scores use exact PostGIS rings, not the approximate population raster
+        responses = await fetch_bulk_ring_demographics(
+            [(p.latitude, p.longitude) for p in listings], radii_miles=[1, 3], exact=True
+        )
+    except Exception as e:
+        logger.warning(f"Bulk ring demographics failed for score batch (non-fatal): {e}")
+        return None
+
+    populations = []
+    for demo in responses:
+        ring_1mi, ring_3mi = demo.radii[0], demo.radii[1]
+        if ring_1mi.total_population is None and ring_3mi.total_population is None:
+            populations.append(None)
+            continue
+        populations.append({
+            "pop_1mi": ring_1mi.total_population,
+            "pop_3mi": ring_3mi.total_population,
+            "density_1mi": ring_1mi.population_density,
+            "density_3mi": ring_3mi.population_density,
+            "income_3mi": ring_3mi.median_household_income,
+        })
+    return populations
+
+
+def _load_batch(ids: List[int]) -> Tuple[List[CountyProperty], Dict[int, OpportunityScore]]:
+    db = SessionLocal()
+    try:
+        props = db.query(CountyProperty).filter(CountyProperty.id.in_(ids)).all()
+        existing = {
+            row.county_property_id: row
+            for row in db.query(OpportunityScore).filter(
+                OpportunityScore.county_property_id.in_(ids)
+            ).all()
+        }
+        db.expunge_all()
+        return props, existing
+    finally:
+        db.close()
+
+
+def _save_batch(rows: List[OpportunityScore]) -> None:
+    db = SessionLocal()
+    try:
+        for row in rows:
+            db.merge(row)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _score_rows(
+    listings: List[PropertyListing],
+    county_property_ids: List[Optional[int]],
+    populations: List[Optional[dict]],
+    versions: Dict[str, str],
+    demographics_version: Optional[str],
+    store_index: StoreIndex,
+    anchors: Anchors,
+) -> List[OpportunityScore]:
+    """Score rows for eligible listings from the materialized inputs (populations from _ring_populations)."""
+    lats = np.array([listing.latitude for listing in listings], dtype=np.float64)
+    lngs = np.array([listing.longitude for listing in listings], dtype=np.float64)
+    corp_miles, vz_miles, vz_brands = _nearest_stores(store_index, lats, lngs)
+
+    anchor_lats, anchor_lngs, anchor_names = anchors
+    anchor_dist, anchor_idx = nearest_k(lats, lngs, anchor_lats, anchor_lngs, k=1)
+
+    rows = []
+    for i, listing in enumerate(listings):
+        pop = populations[i] or {}
+        anchor_miles = float(anchor_dist[i, 0]) if anchor_idx[i, 0] >= 0 else None
+        rank_score, priority_signals = _calculate_priority_rank(
+            listing,
+            nearest_corporate_distance=corp_miles[i],
+            nearest_retail_node_distance=anchor_miles,
+            nearest_vz_family_distance=vz_miles[i],
+            area_population_1mi=pop.get("pop_1mi"),
+            area_population_3mi=pop.get("pop_3mi"),
+            area_density_1mi=pop.get("density_1mi"),
+            area_density_3mi=pop.get("density_3mi"),
+            area_income_3mi=pop.get("income_3mi"),
+        )
+        rows.append(OpportunityScore(
+            county_property_id=county_property_ids[i],
+            latitude=listing.latitude,
+            longitude=listing.longitude,
+            state=listing.state or None,
+            property_type=listing.property_type.value,
+            is_eligible=True,
+            nearest_corporate_miles=corp_miles[i],
+            nearest_vz_family_miles=vz_miles[i],
+            nearest_vz_family_brand=vz_brands[i],
+            nearest_anchor_miles=round(anchor_miles, 2) if anchor_miles is not None else None,
+            nearest_anchor_name=anchor_names[anchor_idx[i, 0]] if anchor_miles is not None else None,
+            population_1mi=pop.get("pop_1mi"),
+            population_3mi=pop.get("pop_3mi"),
+            density_1mi=pop.get("density_1mi"),
+            density_3mi=pop.get("density_3mi"),
+            income_3mi=pop.get("income_3mi"),
+            rank_score=rank_score,
+            priority_signals=json.dumps(priority_signals),
+            score_version=SCORE_VERSION,
+            stores_version=versions["stores"],
+            demographics_version=demographics_version,
+            anchors_version=versions["anchors"],
+            computed_at=datetime.now(timezone.utc),
+        ))
+    return rows
+
+
+async def _score_batch(
+    ids: List[int],
+    versions: Dict[str, str],
+    store_index: StoreIndex,
+    anchors: Anchors,
+) -> Dict[str, int]:
+    props, existing = await asyncio.to_thread(_load_batch, ids)
+
+    listings: List[PropertyListing] = []
+    for prop in props:
+        try:
+            listings.append(_convert_county_property_to_listing(prop))
+        except Exception as e:
+            logger.error(f"[Score Job] Error converting property {prop.id}: {e}")
+            listings.append(None)
+
+    pairs = [(prop, listing) for prop, listing in zip(props, listings) if listing is not None]
+    eligible_ids = {
+        p.id for p in _filter_properties_for_opportunities(
+            properties=[listing for _, listing in pairs],
+            min_parcel_acres=DEFAULT_MIN_PARCEL_ACRES,
+            max_parcel_acres=DEFAULT_MAX_PARCEL_ACRES,
+            min_building_sqft=DEFAULT_MIN_BUILDING_SQFT,
+            max_building_sqft=DEFAULT_MAX_BUILDING_SQFT,
+            include_retail=True,
+            include_office=True,
+            include_land=True,
+        )
+    }
+    eligible = [(prop, listing) for prop, listing in pairs if listing.id in eligible_ids]
+
+    # Reuse stored ring demographics unless ACS data changed or the parcel moved
+    populations: List[Optional[dict]] = [None] * len(eligible)
+    to_query = []
+    for i, (prop, _) in enumerate(eligible):
+        row = existing.get(prop.id)
+        if (
+            row is not None
+            and row.demographics_version == versions["demographics"]
+            and row.latitude == prop.latitude
+            and row.longitude == prop.longitude
+        ):
+            populations[i] = {
+                "pop_1mi": row.population_1mi,
+                "pop_3mi": row.population_3mi,
+                "density_1mi": row.density_1mi,
+                "density_3mi": row.density_3mi,
+                "income_3mi": row.income_3mi,
+            }
+        else:
+            to_query.append(i)
+    demographics_version = versions["demographics"]
+    if to_query:
+        queried = await _ring_populations([eligible[i][1] for i in to_query])
+        if queried is None:
+            # Score without demographics now; a NULL version makes the next refresh retry
+            demographics_version = None
+        else:
+            for i, pop in zip(to_query, queried):
+                populations[i] = pop
+
+    rows = _score_rows(
+        [listing for _, listing in eligible],
+        [prop.id for prop, _ in eligible],
+        populations,
+        versions,
+        demographics_version,
+        store_index,
+        anchors,
+    )
+
+    # Ineligible properties get a marker row so they aren't re-checked every refresh
+    for prop, listing in zip(props, listings):
+        if listing is not None and listing.id in eligible_ids:
+            continue
+        rows.append(OpportunityScore(
+            county_property_id=prop.id,
+            latitude=prop.latitude,
+            longitude=prop.longitude,
+            state=prop.state,
+            property_type=listing.property_type.value if listing else PropertyType.UNKNOWN.value,
+            is_eligible=False,
+            rank_score=None,
+            priority_signals=None,
+            score_version=SCORE_VERSION,
+            stores_version=versions["stores"],
+            demographics_version=versions["demographics"],
+            anchors_version=versions["anchors"],
+            computed_at=datetime.now(timezone.utc),
+        ))
+
+    await asyncio.to_thread(_save_batch, rows)
+    return {"scored": len(eligible), "ineligible": len(props) - len(eligible)}
+
+
+def _prepare_refresh(
+    source_county: Optional[str],
+    full: bool,
+) -> Tuple[Dict[str, str], StoreIndex, Anchors, List[int]]:
+    db = SessionLocal()
+    try:
+        store_index = get_store_index(db)
+        versions = {
+            "stores": _version_string(*store_index.fingerprint),
+            "demographics": _demographics_version(db),
+            "anchors": _anchors_version(db),
+        }
+        anchors = _load_anchors(db)
+        stale_ids = _stale_property_ids(db, versions, source_county, full)
+        return versions, store_index, anchors, stale_ids
+    finally:
+        db.close()
+
+
+async def refresh_opportunity_scores(
+    source_county: Optional[str] = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Recompute materialized opportunity scores.
+
+    Args:
+        source_county: Limit the refresh to one county (e.g. "Polk County, IA")
+        full: Rescore every property instead of only stale rows
+
+    Returns:
+        Summary with counts of rows scored / marked ineligible and elapsed time
+    """
+    started = datetime.now(timezone.utc)
+    versions, store_index, anchors, stale_ids = await asyncio.to_thread(
+        _prepare_refresh, source_county, full
+    )
+    logger.info(
+        f"[Score Job] {len(stale_ids)} properties to refresh "
+        f"(county={source_county or 'all'}, full={full}, score_version={SCORE_VERSION})"
+    )
+
+    totals = {"scored": 0, "ineligible": 0}
+    for start in range(0, len(stale_ids), SCORE_BATCH_SIZE):
+        batch = stale_ids[start:start + SCORE_BATCH_SIZE]
+        counts = await _score_batch(batch, versions, store_index, anchors)
+        totals["scored"] += counts["scored"]
+        totals["ineligible"] += counts["ineligible"]
+        logger.info(
+            f"[Score Job] {start + len(batch)}/{len(stale_ids)} processed "
+            f"({totals['scored']} scored, {totals['ineligible']} ineligible)"
+        )
+
+    return {
+        "properties_refreshed": len(stale_ids),
+        **totals,
+        "score_version": SCORE_VERSION,
+        "versions": versions,
+        "elapsed_seconds": round((datetime.now(timezone.utc) - started).total_seconds(), 1),
+    }
+
+
+async def run_refresh_task(source_county: Optional[str] = None, full: bool = False) -> None:
+    """
+    Background-task wrapper that records progress for get_refresh_status().
+
+    A refresh requested while one is running (request_score_refresh) sets
+    "pending" and gets one more incremental pass when this one finishes.
+    Workers share an L2 lease so only one of them refreshes at a time; a
+    worker that finds the lease taken records the request so run_refresh_watch()
+    retries it once the lease is released or expires.
+    """
+    if _refresh_status["running"]:
+        logger.info("[Score Job] Refresh already running, skipping")
+        return
+    backend = get_l2_backend()
+    if backend is not None:
+        if not await asyncio.to_thread(
+            backend.add, REFRESH_LEASE_NAMESPACE, REFRESH_LEASE_KEY,
+            str(os.getpid()).encode(), time.time(), REFRESH_LEASE_SECONDS,
+        ):
+            logger.info("[Score Job] Refresh running on another worker, re-requesting for after it finishes")
+            await asyncio.to_thread(_record_refresh_request, backend)
+            return
+        # This pass covers every request recorded so far
+        await asyncio.to_thread(backend.delete, REFRESH_LEASE_NAMESPACE, REFRESH_REQUEST_KEY)
+    _refresh_status["running"] = True
+    try:
+        while True:
+            _refresh_status["pending"] = False
+            _refresh_status["last_result"] = await refresh_opportunity_scores(source_county, full)
+            if not _refresh_status["pending"]:
+                break
+            source_county, full = None, False
+    except Exception as e:
+        logger.error(f"[Score Job] Refresh failed: {e}")
+        _refresh_status["last_result"] = {"error": str(e)}
+    finally:
+        _refresh_status["running"] = False
+        if backend is not None:
+            await asyncio.to_thread(backend.delete, REFRESH_LEASE_NAMESPACE, REFRESH_LEASE_KEY)
+
+
+def _scores_in_use() -> bool:
+    """True once the table has been populated (a first full refresh is an explicit step)."""
+    db = SessionLocal()
+    try:
+        return db.query(OpportunityScore.county_property_id).first() is not None
+    except Exception:
+        return False
+    finally:
+        db.close()
+
+
+def _record_refresh_request(backend) -> None:
+    backend.set(
+        REFRESH_LEASE_NAMESPACE, REFRESH_REQUEST_KEY, b"1", time.time(), REFRESH_REQUEST_TTL_SECONDS,
+    )
+
+
+def _start_refresh_task(coro) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+def request_score_refresh(source_county: Optional[str] = None) -> None:
+    """
+    Bring materialized scores up to date after county properties or stores change.
+
+    Inside the app (a running event loop) the incremental refresh is started
+    as a background task. Elsewhere (import scripts, worker threads) the
+    request is only recorded in the L2 tier, for the app's run_refresh_watch()
+    or the next scripts/refresh_opportunity_scores.py run; without an L2 tier
+    it runs to completion before returning. Does nothing until the table has
+    been populated with scripts/refresh_opportunity_scores.py.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if _scores_in_use():
+            backend = get_l2_backend()
+            if backend is not None:
+                _record_refresh_request(backend)
+            else:
+                asyncio.run(run_refresh_task(source_county))
+        return
+    if _refresh_status["running"]:
+        _refresh_status["pending"] = True
+        return
+
+    async def refresh():
+        if await asyncio.to_thread(_scores_in_use):
+            await run_refresh_task(source_county)
+
+    _start_refresh_task(refresh())
+
+
+async def run_refresh_watch(interval: Optional[float] = None) -> None:
+    """Run refreshes recorded in the L2 tier every `interval` seconds until cancelled."""
+    interval = interval or REFRESH_WATCH_SECONDS
+    backend = get_l2_backend()
+    if backend is None:
+        return  # requests are never recorded without an L2 tier
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if not _refresh_status["running"] and await asyncio.to_thread(
+                backend.get, REFRESH_LEASE_NAMESPACE, REFRESH_REQUEST_KEY
+            ) is not None:
+                await run_refresh_task()
+        except Exception as e:
+            logger.warning(f"[Score Job] Refresh watch failed: {e}")
+
+
+def get_refresh_status(db: Session) -> Dict[str, Any]:
+    """Refresh state plus a summary of the materialized table."""
+    total, eligible, current = db.query(
+        func.count(OpportunityScore.county_property_id),
+        func.count(OpportunityScore.county_property_id).filter(OpportunityScore.is_eligible.is_(True)),
+        func.count(OpportunityScore.county_property_id).filter(OpportunityScore.score_version == SCORE_VERSION),
+    ).one()
+    return {
+        **_refresh_status,
+        "rows": total,
+        "eligible_rows": eligible,
+        "current_version_rows": current,
+        "score_version": SCORE_VERSION,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Read path for /opportunities/search
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MaterializedInputs:
+    """Versions and inputs current materialized rows were computed against."""
+
+    versions: Dict[str, str]
+    store_index: StoreIndex
+    anchors: Anchors
+
+    def anchors_in(self, bounds: GeoBounds) -> int:
+        lats, lngs, _ = self.anchors
+        return int(np.count_nonzero(
+            (lats >= bounds.min_lat) & (lats <= bounds.max_lat)
+            & (lngs >= bounds.min_lng) & (lngs <= bounds.max_lng)
+        ))
+
+
+@dataclass
+class MaterializedSearch:
+    """Materialized candidates for one viewport."""
+
+    rows: List[Tuple[CountyProperty, OpportunityScore]]  # current, gated, best first
+    unscored: List[CountyProperty]                       # no current row; score with score_with_materialized_inputs
+    inputs: MaterializedInputs
+
+
+def _current_inputs(db: Session) -> MaterializedInputs:
+    """Current versions plus store index and anchors (ACS / anchor state re-read at most once a minute)."""
+    global _read_inputs
+    store_index = get_store_index(db)
+    cached = _read_inputs
+    if cached is None or time.monotonic() - cached[0] >= READ_INPUTS_RECHECK_SECONDS:
+        demographics_version = _demographics_version(db)
+        anchors_version = _anchors_version(db)
+        anchors = cached[3] if cached is not None and cached[2] == anchors_version else _load_anchors(db)
+        cached = _read_inputs = (time.monotonic(), demographics_version, anchors_version, anchors)
+    return MaterializedInputs(
+        versions={
+            "stores": _version_string(*store_index.fingerprint),
+            "demographics": cached[1],
+            "anchors": cached[2],
+        },
+        store_index=store_index,
+        anchors=cached[3],
+    )
+
+
+def query_materialized_opportunities(
+    db: Session,
+    bounds: GeoBounds,
+    property_types: List[PropertyType],
+    limit: int,
+) -> Optional[MaterializedSearch]:
+    """
+    Top-scored current rows in a viewport, plus the county properties in it with no current row.
+
+    Rows are served only when current for every version, and the corporate
+    proximity gate is applied in SQL. Returns None when more than
+    MAX_LIVE_FALLBACK_PARCELS properties in the viewport need scoring (table
+    never built here, or far behind), so the caller scores the viewport live.
+    """
+    inputs = _current_inputs(db)
+    in_bounds = [
+        CountyProperty.latitude >= bounds.min_lat,
+        CountyProperty.latitude <= bounds.max_lat,
+        CountyProperty.longitude >= bounds.min_lng,
+        CountyProperty.longitude <= bounds.max_lng,
+    ]
+    unscored = db.query(CountyProperty).outerjoin(
+        OpportunityScore, OpportunityScore.county_property_id == CountyProperty.id
+    ).filter(
+        *in_bounds,
+        CountyProperty.latitude.isnot(None),
+        CountyProperty.longitude.isnot(None),
+        _needs_scoring(inputs.versions),
+    ).limit(MAX_LIVE_FALLBACK_PARCELS + 1).all()
+    if len(unscored) > MAX_LIVE_FALLBACK_PARCELS:
+        logger.info(f"Materialized scores: over {MAX_LIVE_FALLBACK_PARCELS} unscored properties in viewport")
+        return None
+
+    rows = db.query(CountyProperty, OpportunityScore).join(
+        OpportunityScore, OpportunityScore.county_property_id == CountyProperty.id
+    ).filter(
+        OpportunityScore.latitude >= bounds.min_lat,
+        OpportunityScore.latitude <= bounds.max_lat,
+        OpportunityScore.longitude >= bounds.min_lng,
+        OpportunityScore.longitude <= bounds.max_lng,
+        *_current_eligible(inputs.versions),
+        OpportunityScore.property_type.in_([pt.value for pt in property_types]),
+        OpportunityScore.nearest_corporate_miles >= CORPORATE_GATE_MILES,
+    ).order_by(
+        OpportunityScore.rank_score.desc()
+    ).limit(limit).all()
+    return MaterializedSearch(rows=rows, unscored=unscored, inputs=inputs)
+
+
+async def score_with_materialized_inputs(
+    listings: List[PropertyListing],
+    inputs: MaterializedInputs,
+) -> List[Tuple[PropertyListing, OpportunityScore]]:
+    """
+    Score eligible listings exactly as the refresh would, without storing them.
+
+    For candidates search can't serve from the table (scraped listings,
+    properties with no current row), so their rank_scores are comparable with
+    the stored rows. Listings inside the corporate proximity gate are dropped.
+    """
+    located = [p for p in listings if p.latitude is not None and p.longitude is not None]
+    if not located:
+        return []
+    populations = await _ring_populations(located)
+    rows = _score_rows(
+        located,
+        [None] * len(located),
+        populations or [None] * len(located),
+        inputs.versions,
+        inputs.versions["demographics"] if populations is not None else None,
+        inputs.store_index,
+        inputs.anchors,
+    )
+    return [
+        (listing, row) for listing, row in zip(located, rows)
+        if row.nearest_corporate_miles >= CORPORATE_GATE_MILES
+    ]
@@ -0,0 +1,588 @@
+"""
+Opportunity eligibility and site-quality scoring.
+
+Shared by the /opportunities/search endpoint (live scoring of ATTOM, local
+county and scraped listing candidates) and the offline materialized score
+job, so both rank properties with exactly the same rules.
+
+_calculate_priority_rank() is the reference scalar scorer and also builds the
+human-readable priority signals. score_priority_batch() computes the same
+scores for many candidates at once from columnar features, so callers only
+need to build explanation strings for the candidates they return.
+scripts/check_scoring_parity.py checks the two stay identical.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.services.attom import PropertyListing, PropertySource, PropertyType
+from app.services.land_use import (
+    is_excluded_land_use,
+    has_availability_keywords,
+    has_multi_tenant_terms,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever _calculate_priority_rank changes so materialized scores are rebuilt
+SCORE_VERSION = 2
+
+# Default eligibility filters (OpportunitySearchRequest defaults; materialized scores use these)
+DEFAULT_MIN_PARCEL_ACRES = 0.8
+DEFAULT_MAX_PARCEL_ACRES = 2.0
+DEFAULT_MIN_BUILDING_SQFT = 2500
+DEFAULT_MAX_BUILDING_SQFT = 6000
+
+# Hard gate: candidates closer than this to a VZ Corporate store are dropped
+CORPORATE_GATE_MILES = 1.0
+
+# Verizon-family brands for co-location scoring
+VERIZON_FAMILY_BRANDS = ["russell_cellular", "victra", "verizon_corporate"]
+
+# State-level average population density (people per sq mi) for relative scoring.
+# Source: US Census Bureau. Used to normalize density so rural Iowa retail hubs
+# score well relative to their state, not against absolute metro thresholds.
+STATE_DENSITY_BASELINES = {
+    # Primary target markets
+    "IA": 55.0,    # Iowa
+    "NE": 25.0,    # Nebraska
+    # Secondary target markets
+    "NV": 28.0,    # Nevada
+    "ID": 22.0,    # Idaho
+    # Common surrounding states (for edge cases)
+    "MN": 70.0,    # Minnesota
+    "SD": 12.0,    # South Dakota
+    "MO": 88.0,    # Missouri
+    "WI": 108.0,   # Wisconsin
+    "IL": 230.0,   # Illinois
+    "KS": 36.0,    # Kansas
+    "CO": 56.0,    # Colorado
+    "WY": 6.0,     # Wyoming
+    "MT": 8.0,     # Montana
+    "UT": 40.0,    # Utah
+    "OR": 44.0,    # Oregon
+    "WA": 115.0,   # Washington
+    # Fallback for any other state
+    "_default": 90.0,
+}
+
+
+# ---------------------------------------------------------------------------
+# Eligibility filter — 3 clear categories
+# ---------------------------------------------------------------------------
+
+def _filter_properties_for_opportunities(
+    properties: List[PropertyListing],
+    min_parcel_acres: float,
+    max_parcel_acres: float,
+    min_building_sqft: Optional[float],
+    max_building_sqft: Optional[float],
+    include_retail: bool,
+    include_office: bool,
+    include_land: bool,
+) -> List[PropertyListing]:
+    """
+    Apply CSOKi eligibility filter with 3 categories:
+
+    Category A — Vacant Land (ATTOM):
+        property_type == LAND, lot 0.8-2ac, not excluded land use
+
+    Category B — For-Lease Listings (Crexi/LoopNet):
+        Already confirmed available, size-filtered during import
+
+    Category C — Vacant Retail/Office (ATTOM):
+        property_type in (RETAIL, OFFICE), building 2500-6000 sqft,
+        must have vacancy evidence, not excluded land use, not multi-tenant
+    """
+    filtered = []
+
+    for prop in properties:
+        # Property type gate — only retail, office, and land
+        if prop.property_type == PropertyType.RETAIL and not include_retail:
+            continue
+        if prop.property_type == PropertyType.OFFICE and not include_office:
+            continue
+        if prop.property_type == PropertyType.LAND and not include_land:
+            continue
+        if prop.property_type not in (PropertyType.RETAIL, PropertyType.OFFICE, PropertyType.LAND):
+            continue
+
+        is_scraped = prop.source in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO)
+
+        # --- Category B: For-lease listings pass through ---
+        if is_scraped:
+            filtered.append(prop)
+            continue
+
+        # Excluded land uses apply to all ATTOM properties
+        if is_excluded_land_use(prop.land_use):
+            continue
+
+        # --- Category A: Vacant Land ---
+        if prop.property_type == PropertyType.LAND:
+            # Lot size filter
+            if prop.lot_size_acres:
+                if prop.lot_size_acres < min_parcel_acres or prop.lot_size_acres > max_parcel_acres:
+                    continue
+            filtered.append(prop)
+            continue
+
+        # --- Category C: Vacant Retail/Office ---
+        if prop.property_type in (PropertyType.RETAIL, PropertyType.OFFICE):
+            # Building size filter
+            if prop.sqft:
+                if min_building_sqft and prop.sqft < min_building_sqft:
+                    continue
+                if max_building_sqft and prop.sqft > max_building_sqft:
+                    continue
+
+            # Multi-tenant heuristic
+            if prop.sqft and prop.sqft > 10000:
+                if has_multi_tenant_terms(
+                    [prop.land_use] + [s.description for s in prop.opportunity_signals]
+                ):
+                    continue
+
+            # Must have vacancy evidence
+            prop_signal_types = {s.signal_type for s in prop.opportunity_signals}
+            has_vacancy = "vacant_property" in prop_signal_types
+            has_availability = has_availability_keywords(prop.land_use)
+            if not has_vacancy and not has_availability:
+                continue
+
+            filtered.append(prop)
+
+    logger.info(
+        f"Eligibility filter: {len(filtered)} of {len(properties)} passed "
+        f"(scraped={sum(1 for p in filtered if p.source in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO))}, "
+        f"land={sum(1 for p in filtered if p.property_type == PropertyType.LAND)}, "
+        f"vacant_bldg={sum(1 for p in filtered if p.property_type in (PropertyType.RETAIL, PropertyType.OFFICE) and p.source not in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO))})"
+    )
+    return filtered
+
+
+# ---------------------------------------------------------------------------
+# Site-quality-first scoring (v2 — relative density, income, Goldilocks gap)
+# ---------------------------------------------------------------------------
+
+def _calculate_priority_rank(
+    listing: PropertyListing,
+    nearest_corporate_distance: Optional[float] = None,
+    nearest_retail_node_distance: Optional[float] = None,
+    nearest_vz_family_distance: Optional[float] = None,
+    area_population_1mi: Optional[int] = None,
+    area_population_3mi: Optional[int] = None,
+    area_density_1mi: Optional[float] = None,
+    area_density_3mi: Optional[float] = None,
+    area_income_3mi: Optional[int] = None,
+) -> tuple[int, List[str]]:
+    """
+    Calculate site-quality-first ranking score (v2).
+
+    Returns (rank_score, priority_signals)
+    Higher rank_score = higher priority
+
+    Tier 1: Relative Population Density (0-35)
+    Tier 2: Median Household Income (0-25)
+    Tier 3: Retail Anchor Proximity (0-30)
+    Tier 4: Corporate Gap — Goldilocks Zone (0-30)
+    Tier 5: Availability Quality (0-20) — equalized
+    Tier 6: Size Fit (0-15)
+    Tier 7: VZ-Family Co-location (0-10)
+    Tier 8: Distress Tiebreaker (0-15)
+
+    Max possible: 180 pts. Practical excellent: 120+
+    """
+    rank_score = 0
+    priority_signals = []
+
+    signal_types = {s.signal_type for s in listing.opportunity_signals}
+
+    # === TIER 1: RELATIVE POPULATION DENSITY (up to 35 pts) ===
+    # Uses density ratio to state baseline so rural Iowa retail hubs score well
+
+    if area_density_1mi is not None or area_density_3mi is not None:
+        state = (listing.state or "").upper()
+        baseline = STATE_DENSITY_BASELINES.get(state, STATE_DENSITY_BASELINES["_default"])
+
+        density = area_density_1mi if area_density_1mi is not None else area_density_3mi
+        ratio = density / baseline if baseline > 0 else 0
+
+        density_pts = 0
+        if ratio >= 50:
+            density_pts = 35
+            priority_signals.append(f"Urban-core density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
+        elif ratio >= 20:
+            density_pts = 30
+            priority_signals.append(f"High density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
+        elif ratio >= 10:
+            density_pts = 25
+            priority_signals.append(f"Good density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
+        elif ratio >= 5:
+            density_pts = 18
+            priority_signals.append(f"Moderate density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
+        elif ratio >= 2:
+            density_pts = 8
+            priority_signals.append(f"Low density ({density:,.0f}/sqmi, {ratio:.0f}x state avg)")
+
+        # Bonus for strong 3mi catchment area
+        if area_density_3mi is not None and area_density_1mi is not None:
+            ratio_3mi = area_density_3mi / baseline if baseline > 0 else 0
+            if ratio_3mi >= 10 and density_pts < 35:
+                density_pts = min(density_pts + 5, 35)
+                priority_signals.append(f"Strong 3mi catchment ({area_density_3mi:,.0f}/sqmi)")
+
+        rank_score += density_pts
+
+    # === TIER 2: MEDIAN HOUSEHOLD INCOME (up to 25 pts) ===
+    # Verizon criteria: $50K+ min, $60K+ preferred
+
+    if area_income_3mi is not None:
+        income = area_income_3mi
+        if income >= 80000:
+            rank_score += 25
+            priority_signals.append(f"Premium income area (${income:,} median HH)")
+        elif income >= 70000:
+            rank_score += 22
+            priority_signals.append(f"Strong income (${income:,} median HH)")
+        elif income >= 60000:
+            rank_score += 18
+            priority_signals.append(f"Good income (${income:,} median HH)")
+        elif income >= 50000:
+            rank_score += 12
+            priority_signals.append(f"Adequate income (${income:,} median HH)")
+        elif income >= 40000:
+            rank_score += 5
+            priority_signals.append(f"Below-target income (${income:,} median HH)")
+
+    # === TIER 3: RETAIL ANCHOR PROXIMITY (up to 30 pts) ===
+    # Continuous decay curve for better differentiation
+
+    if nearest_retail_node_distance is not None:
+        d = nearest_retail_node_distance
+        if d <= 0.15:
+            anchor_pts = 30
+            priority_signals.append("Adjacent to major retail anchor")
+        elif d <= 0.5:
+            anchor_pts = round(30 - (d - 0.15) * (12 / 0.35))
+            priority_signals.append(f"Near major retail anchor ({d:.2f}mi)")
+        elif d <= 1.0:
+            anchor_pts = round(18 - (d - 0.5) * (10 / 0.5))
+            priority_signals.append(f"Retail anchor within {d:.1f}mi")
+        elif d <= 1.5:
+            anchor_pts = round(8 - (d - 1.0) * (6 / 0.5))
+            priority_signals.append(f"Retail anchor at {d:.1f}mi")
+        else:
+            anchor_pts = 0
+        rank_score += max(anchor_pts, 0)
+
+    # === TIER 4: CORPORATE GAP — GOLDILOCKS ZONE (up to 30 pts) ===
+    # Bell curve: 2-5mi ideal, <1.5mi too close, >12mi too far
+
+    if nearest_corporate_distance is not None:
+        d = nearest_corporate_distance
+
+        if d >= 900:
+            # No corporate store found in search area
+            corp_pts = 5
+            priority_signals.append("No VZ Corporate store in area (neutral)")
+        elif d < 1.5:
+            corp_pts = 0
+            priority_signals.append(f"Too close to VZ Corporate ({d:.1f}mi)")
+        elif d < 2.0:
+            corp_pts = round((d - 1.5) * (15 / 0.5))
+            priority_signals.append(f"Near corporate boundary ({d:.1f}mi)")
+        elif d <= 5.0:
+            corp_pts = 30
+            priority_signals.append(f"Ideal corporate gap ({d:.1f}mi)")
+        elif d <= 8.0:
+            corp_pts = round(30 - (d - 5.0) * (15 / 3.0))
+            priority_signals.append(f"Good corporate gap ({d:.1f}mi)")
+        elif d <= 12.0:
+            corp_pts = round(15 - (d - 8.0) * (10 / 4.0))
+            priority_signals.append(f"Distant from corporate ({d:.1f}mi)")
+        else:
+            corp_pts = 3
+            priority_signals.append(f"Very distant from corporate ({d:.1f}mi)")
+
+        rank_score += max(corp_pts, 0)
+
+    # === TIER 5: AVAILABILITY QUALITY (up to 20 pts) — EQUALIZED ===
+    # All confirmed-available sources max at 20 pts (no listing auto-domination)
+
+    if listing.source in (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO):
+        rank_score += 20
+        source_label = listing.source.value.title()
+        txn_label = f"for {listing.transaction_type}" if listing.transaction_type else "for lease/sale"
+        priority_signals.append(f"Active listing {txn_label} ({source_label})")
+    elif listing.property_type == PropertyType.LAND:
+        rank_score += 20
+        priority_signals.append("Vacant land (buildable)")
+    else:
+        has_vacancy = "vacant_property" in signal_types
+        has_availability = has_availability_keywords(listing.land_use)
+        if has_vacancy and has_availability:
+            rank_score += 18
+            priority_signals.append(f"Confirmed vacant ({listing.land_use})")
+        elif has_vacancy:
+            rank_score += 14
+            priority_signals.append("Vacant building")
+        elif has_availability:
+            rank_score += 14
+            priority_signals.append(f"Available ({listing.land_use})")
+        else:
+            rank_score += 8
+            priority_signals.append("Potential availability")
+
+    # === TIER 6: SIZE FIT (up to 15 pts) ===
+
+    if listing.property_type == PropertyType.LAND and listing.lot_size_acres:
+        if 0.8 <= listing.lot_size_acres <= 1.2:
+            rank_score += 15
+            priority_signals.append(f"Ideal lot size ({listing.lot_size_acres:.1f}ac)")
+        elif listing.lot_size_acres <= 2.0:
+            rank_score += 10
+            priority_signals.append(f"Acceptable lot size ({listing.lot_size_acres:.1f}ac)")
+    elif listing.sqft and listing.property_type in (PropertyType.RETAIL, PropertyType.OFFICE):
+        if 2500 <= listing.sqft <= 3500:
+            rank_score += 15
+            priority_signals.append(f"Ideal building size ({listing.sqft:,.0f} sqft)")
+        elif listing.sqft <= 6000:
+            rank_score += 10
+            priority_signals.append(f"Acceptable building size ({listing.sqft:,.0f} sqft)")
+
+    # === TIER 7: VZ FAMILY CO-LOCATION BONUS (up to 10 pts) ===
+
+    if nearest_vz_family_distance is not None:
+        if nearest_vz_family_distance <= 0.5:
+            rank_score += 10
+            priority_signals.append(f"Near VZ-family store ({nearest_vz_family_distance:.1f}mi)")
+        elif nearest_vz_family_distance <= 1.0:
+            rank_score += 5
+            priority_signals.append(f"VZ-family store within 1mi")
+
+    # === TIER 8: DISTRESS TIEBREAKER (up to 15 pts) ===
+
+    if "distress" in signal_types:
+        rank_score += 15
+        priority_signals.append("Foreclosure/distress")
+    elif "tax_delinquent" in signal_types:
+        rank_score += 12
+        priority_signals.append("Tax delinquent")
+    elif "absentee_owner" in signal_types and "long_term_owner" in signal_types:
+        rank_score += 8
+        priority_signals.append("Absentee + long-term owner")
+    elif "absentee_owner" in signal_types:
+        rank_score += 5
+        priority_signals.append("Absentee owner")
+    elif "long_term_owner" in signal_types:
+        rank_score += 3
+        priority_signals.append("Long-term owner")
+
+    return rank_score, priority_signals
+
+
+# ---------------------------------------------------------------------------
+# Vectorized scoring (same tiers as _calculate_priority_rank, no strings)
+# ---------------------------------------------------------------------------
+
+_SCRAPED_SOURCES = (PropertySource.CREXI, PropertySource.LOOPNET, PropertySource.COMMERCIALCAFE, PropertySource.ROFO)
+
+
+@dataclass
+class ScoringFeatures:
+    """Columnar _calculate_priority_rank inputs for N candidates (NaN = input not available)."""
+    density_1mi: np.ndarray
+    density_3mi: np.ndarray
+    state_baseline: np.ndarray
+    income_3mi: np.ndarray
+    anchor_miles: np.ndarray
+    corporate_miles: np.ndarray
+    vz_family_miles: np.ndarray
+    lot_size_acres: np.ndarray
+    sqft: np.ndarray
+    is_listing: np.ndarray          # Scraped for-lease/sale listing
+    is_land: np.ndarray
+    is_building: np.ndarray         # Retail or office
+    has_vacancy: np.ndarray
+    has_availability: np.ndarray
+    distress: np.ndarray
+    tax_delinquent: np.ndarray
+    absentee_owner: np.ndarray
+    long_term_owner: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.density_1mi)
+
+
+def _float_column(values: Sequence[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def build_scoring_features(
+    listings: Sequence[PropertyListing],
+    nearest_corporate_distance: Sequence[Optional[float]],
+    nearest_retail_node_distance: Sequence[Optional[float]],
+    nearest_vz_family_distance: Sequence[Optional[float]],
+    area_density_1mi: Sequence[Optional[float]],
+    area_density_3mi: Sequence[Optional[float]],
+    area_income_3mi: Sequence[Optional[int]],
+) -> ScoringFeatures:
+    """
+    Pack per-candidate scoring inputs into columns.
+
+    Every sequence is aligned with ``listings`` and takes the same values the
+    matching _calculate_priority_rank() keyword argument would (None = absent).
+    """
+    default_baseline = STATE_DENSITY_BASELINES["_default"]
+    signal_types = [{sig.signal_type for sig in p.opportunity_signals} for p in listings]
+
+    def flag(values) -> np.ndarray:
+        return np.fromiter(values, dtype=bool, count=len(listings))
+
+    return ScoringFeatures(
+        density_1mi=_float_column(area_density_1mi),
+        density_3mi=_float_column(area_density_3mi),
+        state_baseline=np.array(
+            [STATE_DENSITY_BASELINES.get((p.state or "").upper(), default_baseline) for p in listings],
+            dtype=np.float64,
+        ),
+        income_3mi=_float_column(area_income_3mi),
+        anchor_miles=_float_column(nearest_retail_node_distance),
+        corporate_miles=_float_column(nearest_corporate_distance),
+        vz_family_miles=_float_column(nearest_vz_family_distance),
+        lot_size_acres=_float_column([p.lot_size_acres or None for p in listings]),
+        sqft=_float_column([p.sqft or None for p in listings]),
+        is_listing=flag(p.source in _SCRAPED_SOURCES for p in listings),
+        is_land=flag(p.property_type == PropertyType.LAND for p in listings),
+        is_building=flag(p.property_type in (PropertyType.RETAIL, PropertyType.OFFICE) for p in listings),
+        has_vacancy=flag("vacant_property" in types for types in signal_types),
+        has_availability=flag(has_availability_keywords(p.land_use) for p in listings),
+        distress=flag("distress" in types for types in signal_types),
+        tax_delinquent=flag("tax_delinquent" in types for types in signal_types),
+        absentee_owner=flag("absentee_owner" in types for types in signal_types),
+        long_term_owner=flag("long_term_owner" in types for types in signal_types),
+    )
+
+
+def _tiers(conditions: list, choices: list) -> np.ndarray:
+    """np.select over float point values (first matching condition wins, else 0)."""
+    return np.select(conditions, choices, default=0.0)
+
+
+def score_priority_batch(features: ScoringFeatures) -> np.ndarray:
+    """
+    Vectorized _calculate_priority_rank() scores (int64, one per candidate).
+
+    Rounding uses np.rint, which rounds half to even like Python's round(),
+    so scores match the scalar function exactly.
+    """
+    f = features
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Tier 1: relative population density
+        has_1mi = ~np.isnan(f.density_1mi)
+        has_3mi = ~np.isnan(f.density_3mi)
+        density = np.where(has_1mi, f.density_1mi, f.density_3mi)
+        ratio = np.where(f.state_baseline > 0, density / f.state_baseline, 0.0)
+        density_pts = _tiers(
+            [ratio >= 50, ratio >= 20, ratio >= 10, ratio >= 5, ratio >= 2],
+            [35, 30, 25, 18, 8],
+        )
+        ratio_3mi = np.where(f.state_baseline > 0, f.density_3mi / f.state_baseline, 0.0)
+        catchment_bonus = has_1mi & has_3mi & (ratio_3mi >= 10) & (density_pts < 35)
+        density_pts = np.where(catchment_bonus, np.minimum(density_pts + 5, 35), density_pts)
+        score = np.where(has_1mi | has_3mi, density_pts, 0.0)
+
+        # Tier 2: median household income
+        income = f.income_3mi
+        score += _tiers(
+            [income >= 80000, income >= 70000, income >= 60000, income >= 50000, income >= 40000],
+            [25, 22, 18, 12, 5],
+        )
+
+        # Tier 3: retail anchor proximity (continuous decay)
+        d = f.anchor_miles
+        anchor_pts = _tiers(
+            [d <= 0.15, d <= 0.5, d <= 1.0, d <= 1.5],
+            [
+                30,
+                np.rint(30 - (d - 0.15) * (12 / 0.35)),
+                np.rint(18 - (d - 0.5) * (10 / 0.5)),
+                np.rint(8 - (d - 1.0) * (6 / 0.5)),
+            ],
+        )
+        score += np.maximum(anchor_pts, 0)
+
+        # Tier 4: corporate gap (Goldilocks zone)
+        d = f.corporate_miles
+        known = ~np.isnan(d)
+        corp_pts = _tiers(
+            [d >= 900, d < 1.5, d < 2.0, d <= 5.0, d <= 8.0, d <= 12.0, known],
+            [
+                5,
+                0,
+                np.rint((d - 1.5) * (15 / 0.5)),
+                30,
+                np.rint(30 - (d - 5.0) * (15 / 3.0)),
+                np.rint(15 - (d - 8.0) * (10 / 4.0)),
+                3,
+            ],
+        )
+        score += np.maximum(corp_pts, 0)
+
+        # Tier 5: availability quality (equalized)
+        score += _tiers(
+            [
+                f.is_listing,
+                f.is_land,
+                f.has_vacancy & f.has_availability,
+                f.has_vacancy | f.has_availability,
+                np.ones(len(f), dtype=bool),
+            ],
+            [20, 20, 18, 14, 8],
+        )
+
+        # Tier 6: size fit
+        lot, sqft = f.lot_size_acres, f.sqft
+        has_lot = f.is_land & ~np.isnan(lot)
+        has_sqft = ~has_lot & f.is_building & ~np.isnan(sqft)
+        score += _tiers(
+            [
+                has_lot & (lot >= 0.8) & (lot <= 1.2),
+                has_lot & (lot <= 2.0),
+                has_sqft & (sqft >= 2500) & (sqft <= 3500),
+                has_sqft & (sqft <= 6000),
+            ],
+            [15, 10, 15, 10],
+        )
+
+        # Tier 7: VZ family co-location
+        d = f.vz_family_miles
+        score += _tiers([d <= 0.5, d <= 1.0], [10, 5])
+
+        # Tier 8: distress tiebreaker
+        score += _tiers(
+            [
+                f.distress,
+                f.tax_delinquent,
+                f.absentee_owner & f.long_term_owner,
+                f.absentee_owner,
+                f.long_term_owner,
+            ],
+            [15, 12, 8, 5, 3],
+        )
+
+    return score.astype(np.int64)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Stable, so ties keep input order exactly like
+    ``sorted(..., key=score, reverse=True)``.
+    """
+    return np.argsort(-scores, kind="stable")[:k]
@@ -7,6 +7,7 @@ import logging
 from typing import Optional
 from pydantic import BaseModel
 from app.core.config import settings
+from app.utils.http_clients import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +112,7 @@ async def fetch_nearby_pois(
     seen_place_ids: set[str] = set()
 
     # Fetch POIs for each category's types
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_client("google") as client:
         for category, place_types in POI_CATEGORIES.items():
             for place_type in place_types:
                 params = {
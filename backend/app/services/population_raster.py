@@ -0,0 +1,489 @@
+"""
+Summed-area population raster for approximate ring demographics.
+
+Ring population via PostGIS costs a polygon intersection per tract per ring.
+For hover lookups and per-candidate scoring an approximation is enough, so
+tract values are rasterized once into a 100 m grid and ring totals are read
+from summed-area tables:
+
+- Grid: the ST_SquareGrid grid of census_tract_parts (EPSG:5070 equal-area,
+  anchored at the projection origin), one raster per state covering the
+  state's tract parts.
+- Dasymetric allocation: each tract's population, households and income are
+  spread over the cells it covers, DASYMETRIC_WEIGHT of it in proportion to
+  non-vacant county_properties parcels (a developed-land proxy) and the rest
+  by area. Tracts without parcels, and land area, are allocated by area alone.
+- Storage: per band, the summed-area table S[r, c] = sum(cells[:r, :c]) as a
+  float32 .npy file, memory-mapped read-only, so only the pages a query
+  touches are read.
+- Query: a ring is approximated by up to MAX_STRIPS horizontal rectangles,
+  each four S lookups, vectorized over every point and strip at once. Rings
+  are the same Web Mercator buffers as the exact PostGIS path (radius x
+  cos(latitude) on the ground), so fast and exact results are comparable.
+- Coverage: the manifest records the extent of every target state in
+  census_tracts. A ring reaching a state that has tracts but no raster
+  yet is reported as not covered (PopulationRaster.covered()), and callers
+  use the exact query for that point instead of silently dropping the
+  state's population.
+
+Bands: population, households, income_weighted (median household income x
+households) and income_households, matching fetch_bulk_ring_demographics,
+plus area_sqmiles (tract land area).
+
+Build with scripts/build_population_raster.py after census_tract_parts and
+acs_tract_values are loaded (needs PostGIS 3.1+ for ST_SquareGrid).
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.services.acs_loader import target_state_fips
+from app.services.census_store import ACS_VINTAGE, TARGET_STATE_FIPS
+from app.services.tract_parts import EQUAL_AREA_SRID, TRACT_PARTS_TABLE, tract_parts_states
+
+logger = logging.getLogger(__name__)
+
+BANDS = ("population", "households", "income_weighted", "income_households", "area_sqmiles")
+CELL_METERS = 100.0
+DASYMETRIC_WEIGHT = 0.5   # share of a tract's people placed by parcel density (rest by area)
+MAX_STRIPS = 64           # rectangles approximating one ring
+MANIFEST = "manifest.json"
+RASTER_CHECK_INTERVAL = 60  # seconds between manifest mtime checks
+
+METERS_PER_MILE = 1609.34
+SQ_METERS_PER_SQ_MILE = 2589988.11
+VACANT_LAND_INDICATOR = "80"
+
+_BUILD_CHUNK_ROWS = 200_000
+
+
+# --- EPSG:5070 (NAD83 / Conus Albers, GRS80) forward projection ---
+
+_A = 6378137.0
+_F = 1 / 298.257222101
+_E2 = _F * (2 - _F)
+_E = math.sqrt(_E2)
+_LAT_0, _LAT_1, _LAT_2, _LON_0 = 23.0, 29.5, 45.5, -96.0
+
+
+def _albers_q(phi):
+    s = np.sin(phi)
+    return (1 - _E2) * (s / (1 - _E2 * s * s) - np.log((1 - _E * s) / (1 + _E * s)) / (2 * _E))
+
+
+def _albers_m(phi):
+    s = np.sin(phi)
+    return np.cos(phi) / np.sqrt(1 - _E2 * s * s)
+
+
+_M1 = _albers_m(math.radians(_LAT_1))
+_M2 = _albers_m(math.radians(_LAT_2))
+_Q0 = _albers_q(math.radians(_LAT_0))
+_Q1 = _albers_q(math.radians(_LAT_1))
+_Q2 = _albers_q(math.radians(_LAT_2))
+_N = (_M1 ** 2 - _M2 ** 2) / (_Q2 - _Q1)
+_C = _M1 ** 2 + _N * _Q1
+_RHO_0 = _A * math.sqrt(_C - _N * _Q0) / _N
+
+
+def to_albers(lats, lngs) -> tuple[np.ndarray, np.ndarray]:
+    """Project WGS84/NAD83 degrees to EPSG:5070 meters (x, y)."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    rho = _A * np.sqrt(_C - _N * _albers_q(np.radians(lats))) / _N
+    theta = _N * np.radians(lngs - _LON_0)
+    return rho * np.sin(theta), _RHO_0 - rho * np.cos(theta)
+
+
+def ring_radius_meters(lats: np.ndarray, radius_miles: float) -> np.ndarray:
+    """Ground radius of the exact path's ring: a Web Mercator buffer of radius_miles."""
+    return radius_miles * METERS_PER_MILE * np.cos(np.radians(lats))
+
+
+# --- Query ---
+
+@dataclass
+class StateRaster:
+    """Summed-area tables of one state's grid (see module docstring)."""
+    state_fips: str
+    cell_meters: float
+    col0: int              # ST_SquareGrid i of column 0
+    row0: int              # ST_SquareGrid j of row 0
+    sat: np.ndarray        # (len(BANDS), rows + 1, cols + 1) float32, memory-mapped
+
+    @property
+    def rows(self) -> int:
+        return self.sat.shape[1] - 1
+
+    @property
+    def cols(self) -> int:
+        return self.sat.shape[2] - 1
+
+    def ring_sums(self, x: np.ndarray, y: np.ndarray, radius_m: np.ndarray, strips: int) -> np.ndarray:
+        """(N, len(BANDS)) band totals inside circles of radius_m around (x, y) in EPSG:5070 meters."""
+        sums = np.zeros((len(x), len(BANDS)))
+        cx = x / self.cell_meters - self.col0
+        cy = y / self.cell_meters - self.row0
+        r = radius_m / self.cell_meters
+        hit = (cx + r > 0) & (cx - r < self.cols) & (cy + r > 0) & (cy - r < self.rows)
+        if not hit.any():
+            return sums
+        cx, cy, r = cx[hit, None], cy[hit, None], r[hit, None]
+
+        # Strip k spans rows [r0, r1) at half-width sqrt(1 - mid^2) x radius
+        edges = np.linspace(-1.0, 1.0, strips + 1)
+        half = np.sqrt(1.0 - ((edges[:-1] + edges[1:]) / 2) ** 2)
+        r0 = np.clip(np.rint(cy + r * edges[:-1]), 0, self.rows).astype(np.intp)
+        r1 = np.clip(np.rint(cy + r * edges[1:]), 0, self.rows).astype(np.intp)
+        c0 = np.clip(np.rint(cx - r * half), 0, self.cols).astype(np.intp)
+        c1 = np.clip(np.rint(cx + r * half), 0, self.cols).astype(np.intp)
+
+        s = self.sat
+        rects = (
+            s[:, r1, c1].astype(np.float64) - s[:, r0, c1]
+            - s[:, r1, c0] + s[:, r0, c0]
+        )
+        sums[hit] = rects.sum(axis=2).T
+        return sums
+
+
+class PopulationRaster:
+    """All built state rasters; rings crossing a state line sum every raster they touch."""
+
+    def __init__(self, states: Dict[str, StateRaster], manifest: dict):
+        self.states = states
+        self.manifest = manifest
+        # Extents (EPSG:5070 xmin, ymin, xmax, ymax) of target states with tracts but no raster
+        self.missing_extents = np.array(
+            [extent for fips, extent in manifest.get("extents", {}).items() if fips not in states],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+
+    def covered(self, lats: Sequence[float], lngs: Sequence[float], radius_miles: float) -> np.ndarray:
+        """(N,) True where a ring of radius_miles stays clear of every target state without a raster."""
+        lats = np.asarray(lats, dtype=np.float64)
+        x, y = to_albers(lats, lngs)
+        r = ring_radius_meters(lats, float(radius_miles))
+        covered = np.ones(len(lats), dtype=bool)
+        for xmin, ymin, xmax, ymax in self.missing_extents:
+            covered &= ~((x + r > xmin) & (x - r < xmax) & (y + r > ymin) & (y - r < ymax))
+        return covered
+
+    def ring_totals(
+        self,
+        lats: Sequence[float],
+        lngs: Sequence[float],
+        radii_miles: Sequence[float],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Approximate ring totals for every point and radius in one vectorized pass.
+
+        Returns {band: (N, len(radii_miles)) array} for each of BANDS.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        x, y = to_albers(lats, lngs)
+        totals = np.zeros((len(BANDS), len(lats), len(radii_miles)))
+        for k, radius in enumerate(radii_miles):
+            radius_m = ring_radius_meters(lats, float(radius))
+            for raster in self.states.values():
+                max_cells = float(radius_m.max(initial=0.0)) / raster.cell_meters
+                strips = int(min(MAX_STRIPS, max(1, math.ceil(2 * max_cells))))
+                totals[:, :, k] += raster.ring_sums(x, y, radius_m, strips).T
+        return {band: totals[b] for b, band in enumerate(BANDS)}
+
+
+_raster: Optional[PopulationRaster] = None
+_raster_mtime: Optional[float] = None
+_last_checked: Optional[float] = None
+_raster_lock = threading.Lock()
+
+
+def _raster_dir() -> Path:
+    return Path(settings.POPULATION_RASTER_PATH)
+
+
+def _read_manifest(directory: Path) -> dict:
+    path = directory / MANIFEST
+    if not path.exists():
+        return {"states": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _load_raster(directory: Path) -> Optional[PopulationRaster]:
+    manifest = _read_manifest(directory)
+    states = {}
+    for fips, meta in manifest["states"].items():
+        states[fips] = StateRaster(
+            state_fips=fips,
+            cell_meters=meta["cell_meters"],
+            col0=meta["col0"],
+            row0=meta["row0"],
+            sat=np.load(directory / meta["file"], mmap_mode="r"),
+        )
+    if not states:
+        return None
+    logger.info(f"Population raster loaded: states {', '.join(sorted(states))}")
+    return PopulationRaster(states, manifest)
+
+
+def get_population_raster() -> Optional[PopulationRaster]:
+    """The built raster (None until scripts/build_population_raster.py has run); reloaded after rebuilds."""
+    global _raster, _raster_mtime, _last_checked
+    now = time.monotonic()
+    if _last_checked is not None and now - _last_checked < RASTER_CHECK_INTERVAL:
+        return _raster
+    with _raster_lock:
+        if _last_checked is not None and now - _last_checked < RASTER_CHECK_INTERVAL:
+            return _raster
+        path = _raster_dir() / MANIFEST
+        try:
+            mtime = path.stat().st_mtime if path.exists() else None
+            if mtime != _raster_mtime:
+                _raster = _load_raster(_raster_dir()) if mtime is not None else None
+                _raster_mtime = mtime
+        except Exception as e:
+            logger.warning(f"Population raster unavailable: {e}")
+            _raster, _raster_mtime = None, None
+        _last_checked = now
+        return _raster
+
+
+# --- Build ---
+
+def _tract_values(conn, state_fips: str) -> dict:
+    """Per-tract arrays (sorted by numeric GEOID) of area and the band totals to allocate."""
+    rows = conn.execute(text(f"""
+        SELECT
+            CAST(p.geoid AS bigint) AS geoid,
+            MAX(p.tract_area_m2) AS tract_area_m2,
+            MAX(p.aland) AS aland,
+            MAX(a.total_population) AS population,
+            MAX(a.total_households) AS households,
+            MAX(a.median_household_income) AS income
+        FROM {TRACT_PARTS_TABLE} p
+        LEFT JOIN acs_tract_values a ON a.geoid = p.geoid
+        WHERE p.statefp = :state
+        GROUP BY p.geoid
+        ORDER BY 1
+    """), {"state": state_fips}).fetchall()
+    data = np.array([[0 if v is None else v for v in row] for row in rows], dtype=np.float64).reshape(-1, 6)
+    population = np.maximum(data[:, 3], 0)
+    households = np.maximum(data[:, 4], 0)
+    has_income = (data[:, 5] > 0) & (households > 0)
+    return {
+        "geoid": data[:, 0].astype(np.int64),
+        "tract_area_m2": data[:, 1],
+        "population": population,
+        "households": households,
+        "income_weighted": np.where(has_income, data[:, 5] * households, 0.0),
+        "income_households": np.where(has_income, households, 0.0),
+        "area_sqmiles": data[:, 2] / SQ_METERS_PER_SQ_MILE,
+    }
+
+
+def _state_extents(conn) -> Dict[str, List[float]]:
+    """EPSG:5070 bounding box of every target state's census_tracts, padded by one kilometer."""
+    rows = conn.execute(text(f"""
+        SELECT
+            e.statefp,
+            ST_XMin(e.box) - 1000 AS xmin, ST_YMin(e.box) - 1000 AS ymin,
+            ST_XMax(e.box) + 1000 AS xmax, ST_YMax(e.box) + 1000 AS ymax
+        FROM (
+            SELECT statefp, ST_Extent(ST_Transform(geom, {EQUAL_AREA_SRID})) AS box
+            FROM census_tracts
+            WHERE statefp = ANY(CAST(:states AS text[]))
+            GROUP BY statefp
+        ) e
+    """), {"states": list(TARGET_STATE_FIPS.values())}).fetchall()
+    return {row.statefp: [row.xmin, row.ymin, row.xmax, row.ymax] for row in rows}
+
+
+def _tract_cells(conn, state_fips: str, cell_meters: float) -> dict:
+    """Every (tract, grid cell) overlap of the state's tract parts, streamed into arrays."""
+    result = conn.execution_options(stream_results=True).execute(text(f"""
+        SELECT
+            CAST(p.geoid AS bigint) AS geoid,
+            g.i,
+            g.j,
+            CASE
+                WHEN ST_Within(g.geom, p.geom) THEN :cell_area
+                ELSE ST_Area(ST_Intersection(g.geom, p.geom))
+            END AS overlap_m2
+        FROM {TRACT_PARTS_TABLE} p
+        CROSS JOIN LATERAL ST_SquareGrid(:cell, p.geom) AS g
+        WHERE p.statefp = :state
+            AND ST_Intersects(g.geom, p.geom)
+    """), {"state": state_fips, "cell": cell_meters, "cell_area": cell_meters * cell_meters})
+    geoids, cols, rows, overlaps = [], [], [], []
+    for chunk in result.partitions(_BUILD_CHUNK_ROWS):
+        data = np.array(chunk, dtype=np.float64)
+        geoids.append(data[:, 0].astype(np.int64))
+        cols.append(data[:, 1].astype(np.int64))
+        rows.append(data[:, 2].astype(np.int64))
+        overlaps.append(data[:, 3])
+    if not geoids:
+        return {}
+    return {
+        "geoid": np.concatenate(geoids),
+        "i": np.concatenate(cols),
+        "j": np.concatenate(rows),
+        "overlap_m2": np.concatenate(overlaps),
+    }
+
+
+def _parcel_cells(conn, state_fips: str, cell_meters: float) -> tuple[np.ndarray, np.ndarray]:
+    """Grid (i, j) of every non-vacant county_properties parcel in the state."""
+    abbr = next((a for a, f in TARGET_STATE_FIPS.items() if f == state_fips), state_fips)
+    try:
+        rows = conn.execute(text("""
+            SELECT latitude, longitude FROM county_properties
+            WHERE state = :state
+                AND latitude IS NOT NULL AND longitude IS NOT NULL
+                AND (property_indicator IS NULL OR property_indicator != :vacant)
+        """), {"state": abbr, "vacant": VACANT_LAND_INDICATOR}).fetchall()
+    except Exception as e:
+        logger.warning(f"No parcels for dasymetric allocation in {abbr}, allocating by area: {e}")
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    coords = np.array(rows, dtype=np.float64).reshape(-1, 2)
+    x, y = to_albers(coords[:, 0], coords[:, 1])
+    return np.floor(x / cell_meters).astype(np.int64), np.floor(y / cell_meters).astype(np.int64)
+
+
+def _build_state(
+    conn,
+    state_fips: str,
+    directory: Path,
+    cell_meters: float,
+    dasymetric_weight: float,
+) -> dict:
+    """Rasterize one state and write its summed-area tables; returns its manifest entry."""
+    tracts = _tract_values(conn, state_fips)
+    cells = _tract_cells(conn, state_fips, cell_meters)
+    if not cells or not len(tracts["geoid"]):
+        raise RuntimeError(f"No {TRACT_PARTS_TABLE} rows for state {state_fips}")
+
+    col0, row0 = int(cells["i"].min()), int(cells["j"].min())
+    cols = int(cells["i"].max()) - col0 + 1
+    rows = int(cells["j"].max()) - row0 + 1
+    cell_key = (cells["j"] - row0) * cols + (cells["i"] - col0)
+    tract = np.searchsorted(tracts["geoid"], cells["geoid"])
+
+    # Areal share of each tract in each cell
+    areal = cells["overlap_m2"] / tracts["tract_area_m2"][tract]
+
+    # Parcel share: parcels per cell, prorated by the cell's overlap with the tract
+    parcel_i, parcel_j = _parcel_cells(conn, state_fips, cell_meters)
+    inside = (parcel_i >= col0) & (parcel_i < col0 + cols) & (parcel_j >= row0) & (parcel_j < row0 + rows)
+    parcel_keys, parcel_counts = np.unique(
+        (parcel_j[inside] - row0) * cols + (parcel_i[inside] - col0), return_counts=True
+    )
+    parcels = np.zeros(len(cell_key))
+    if len(parcel_keys):
+        pos = np.minimum(np.searchsorted(parcel_keys, cell_key), len(parcel_keys) - 1)
+        matched = parcel_keys[pos] == cell_key
+        parcels[matched] = parcel_counts[pos[matched]]
+    parcels *= cells["overlap_m2"] / (cell_meters * cell_meters)
+    tract_parcels = np.bincount(tract, weights=parcels, minlength=len(tracts["geoid"]))[tract]
+    dasymetric = areal.copy()
+    has_parcels = tract_parcels > 0
+    dasymetric[has_parcels] = (
+        (1 - dasymetric_weight) * areal[has_parcels]
+        + dasymetric_weight * parcels[has_parcels] / tract_parcels[has_parcels]
+    )
+
+    directory.mkdir(parents=True, exist_ok=True)
+    filename = f"{state_fips}.npy"
+    tmp_path = directory / f".{filename}.tmp"
+    sat = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(len(BANDS), rows + 1, cols + 1))
+    sat[:, 0, :] = 0
+    sat[:, :, 0] = 0
+    for b, band in enumerate(BANDS):
+        share = areal if band == "area_sqmiles" else dasymetric
+        grid = np.bincount(cell_key, weights=tracts[band][tract] * share, minlength=rows * cols)
+        grid = grid.reshape(rows, cols)
+        np.cumsum(grid, axis=0, out=grid)
+        np.cumsum(grid, axis=1, out=grid)
+        sat[b, 1:, 1:] = grid
+        del grid
+    sat.flush()
+    del sat
+    os.replace(tmp_path, directory / filename)
+
+    return {
+        "file": filename,
+        "cell_meters": cell_meters,
+        "col0": col0,
+        "row0": row0,
+        "rows": rows,
+        "cols": cols,
+        "tracts": int(len(tracts["geoid"])),
+        "parcels": int(inside.sum()),
+        "population": round(float(tracts["population"].sum())),
+        "dasymetric_weight": dasymetric_weight,
+        "acs_vintage": ACS_VINTAGE,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def build_population_raster(
+    states: Optional[Iterable[str]] = None,
+    cell_meters: float = CELL_METERS,
+    dasymetric_weight: float = DASYMETRIC_WEIGHT,
+) -> Dict[str, object]:
+    """
+    (Re)build the raster for the given states (abbreviations or FIPS; default: all target states).
+
+    Each state's file is replaced atomically and the manifest rewritten after
+    it, so running processes pick up rebuilt states within RASTER_CHECK_INTERVAL.
+    """
+    global _last_checked
+    state_fips = target_state_fips(states)
+    unbuilt = sorted(set(state_fips) - tract_parts_states())
+    if unbuilt:
+        raise RuntimeError(
+            f"Build {TRACT_PARTS_TABLE} for {', '.join(unbuilt)} first (scripts/build_tract_parts.py)"
+        )
+    directory = _raster_dir()
+    manifest = _read_manifest(directory)
+    manifest["bands"] = list(BANDS)
+    manifest["srid"] = EQUAL_AREA_SRID
+    with engine.connect() as conn:
+        manifest["extents"] = _state_extents(conn)
+
+    started = time.monotonic()
+    built: List[str] = []
+    for fips in state_fips:
+        state_started = time.monotonic()
+        with engine.connect() as conn:
+            entry = _build_state(conn, fips, directory, cell_meters, dasymetric_weight)
+        manifest["states"][fips] = entry
+        tmp_manifest = directory / f".{MANIFEST}.tmp"
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_manifest, directory / MANIFEST)
+        built.append(fips)
+        logger.info(
+            f"Population raster state {fips}: {entry['rows']}x{entry['cols']} cells, "
+            f"{entry['tracts']} tracts, {entry['parcels']} parcels in {time.monotonic() - state_started:.1f}s"
+        )
+    _last_checked = None  # reload on next use in this process
+
+    return {
+        "states": {fips: manifest["states"][fips] for fips in built},
+        "path": str(directory),
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+    }
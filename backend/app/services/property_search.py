@@ -12,9 +12,9 @@ This approach is:
 
 from typing import Optional
 from pydantic import BaseModel
-import httpx
 
 from ..core.config import settings
+from ..utils.http_clients import http_client
 
 
 class ExternalSearchLink(BaseModel):
@@ -115,7 +115,7 @@ async def reverse_geocode_to_city(lat: float, lng: float) -> tuple[str, str]:
         return "", ""
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client("google") as client:
             response = await client.get(
                 "https://maps.googleapis.com/maps/api/geocode/json",
                 params={
@@ -123,6 +123,7 @@ async def reverse_geocode_to_city(lat: float, lng: float) -> tuple[str, str]:
                     "key": settings.GOOGLE_PLACES_API_KEY,
                     "result_type": "locality|administrative_area_level_2",
                 },
+                timeout=10.0,
             )
 
             if response.status_code == 200:
@@ -0,0 +1,253 @@
+"""
+In-process spatial index over Store rows.
+
+Loads every geocoded store once into per-brand NumPy coordinate arrays and
+answers batched nearest-store queries for opportunity scoring, replacing a
+Store query + Python haversine double loop per request.
+
+The index is rebuilt lazily when stores change:
+- Inserts/updates/deletes made through this process's ORM mark it stale
+  immediately (SQLAlchemy mapper events).
+- Writes from other processes (import scripts, other workers) are picked up
+  by a cheap fingerprint query (count, max id, max updated_at) that runs at
+  most once every STORE_INDEX_CHECK_INTERVAL seconds.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.models.store import Store
+from app.utils.geo import nearest_k
+
+logger = logging.getLogger(__name__)
+
+STORE_INDEX_CHECK_INTERVAL = 60  # seconds between fingerprint checks
+
+# Sentinel distance used by opportunity scoring when no store is in range
+NO_STORE_DISTANCE = 999.0
+
+
+@dataclass
+class NearestStoreResult:
+    """Nearest-store lookup for a batch of query points."""
+    distances: np.ndarray            # (N,) miles, NO_STORE_DISTANCE when none in range
+    brands: list[str]                # (N,) brand of nearest store, "none" when none in range
+    store_ids: np.ndarray            # (N,) Store.id of nearest store, -1 when none in range
+    stores_in_range: int = 0         # Stores that passed the bounds filter
+
+
+@dataclass
+class _BrandPoints:
+    """Coordinate arrays for a single brand."""
+    ids: np.ndarray
+    lats: np.ndarray
+    lngs: np.ndarray
+
+
+@dataclass
+class StoreIndex:
+    """Immutable snapshot of store coordinates keyed by brand."""
+    by_brand: dict[str, _BrandPoints] = field(default_factory=dict)
+    fingerprint: tuple = ()
+    built_at: float = 0.0
+
+    @property
+    def total_stores(self) -> int:
+        return sum(len(p.ids) for p in self.by_brand.values())
+
+    def _select(
+        self,
+        brands: Sequence[str],
+        bounds: Optional[tuple[float, float, float, float]],
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Concatenate the requested brands, optionally clipped to (min_lat, max_lat, min_lng, max_lng)."""
+        ids, lats, lngs, brand_codes = [], [], [], []
+        for code, brand in enumerate(brands):
+            points = self.by_brand.get(brand)
+            if points is None or len(points.ids) == 0:
+                continue
+            mask = np.ones(len(points.ids), dtype=bool)
+            if bounds is not None:
+                min_lat, max_lat, min_lng, max_lng = bounds
+                mask = (
+                    (points.lats >= min_lat) & (points.lats <= max_lat)
+                    & (points.lngs >= min_lng) & (points.lngs <= max_lng)
+                )
+            ids.append(points.ids[mask])
+            lats.append(points.lats[mask])
+            lngs.append(points.lngs[mask])
+            brand_codes.append(np.full(int(mask.sum()), code, dtype=np.int64))
+        if not ids:
+            empty = np.empty(0)
+            return empty.astype(np.int64), empty, empty, empty.astype(np.int64)
+        return (
+            np.concatenate(ids),
+            np.concatenate(lats),
+            np.concatenate(lngs),
+            np.concatenate(brand_codes),
+        )
+
+    def nearest(
+        self,
+        lats: Sequence[float],
+        lngs: Sequence[float],
+        brands: Sequence[str],
+        bounds: Optional[tuple[float, float, float, float]] = None,
+    ) -> NearestStoreResult:
+        """
+        Find the nearest store of any of ``brands`` for every query point.
+
+        Args:
+            lats, lngs: Query coordinates
+            brands: Brands to consider (e.g. VERIZON_FAMILY_BRANDS)
+            bounds: Optional (min_lat, max_lat, min_lng, max_lng) box that
+                candidate stores must fall inside
+
+        Returns:
+            NearestStoreResult with one entry per query point
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        ids, store_lats, store_lngs, brand_codes = self._select(brands, bounds)
+
+        n = len(lats)
+        if len(ids) == 0:
+            return NearestStoreResult(
+                distances=np.full(n, NO_STORE_DISTANCE),
+                brands=["none"] * n,
+                store_ids=np.full(n, -1, dtype=np.int64),
+                stores_in_range=0,
+            )
+
+        dist, idx = nearest_k(lats, lngs, store_lats, store_lngs, k=1)
+        idx = idx[:, 0]
+        return NearestStoreResult(
+            distances=dist[:, 0],
+            brands=[brands[c] for c in brand_codes[idx]],
+            store_ids=ids[idx],
+            stores_in_range=len(ids),
+        )
+
+    def nearest_per_brand(
+        self,
+        lats: Sequence[float],
+        lngs: Sequence[float],
+        brands: Sequence[str],
+        k: int = 1,
+        bounds: Optional[tuple[float, float, float, float]] = None,
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the k nearest stores of each brand for every query point.
+
+        Returns:
+            {brand: (distances, store_ids)} with (N, k) arrays; missing
+            neighbours are ``inf`` / -1.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        results = {}
+        for brand in brands:
+            ids, store_lats, store_lngs, _ = self._select([brand], bounds)
+            dist, idx = nearest_k(lats, lngs, store_lats, store_lngs, k=k)
+            if len(ids):
+                store_ids = np.where(idx >= 0, ids[np.clip(idx, 0, None)], -1)
+            else:
+                store_ids = idx
+            results[brand] = (dist, store_ids)
+        return results
+
+
+# --- Singleton management ---
+
+_index: Optional[StoreIndex] = None
+_stale = True
+_last_checked = 0.0
+_lock = threading.Lock()
+
+
+def _store_fingerprint(db: Session) -> tuple:
+    """Cheap aggregate that changes whenever stores are added, removed or edited."""
+    count, max_id, max_updated = db.query(
+        func.count(Store.id), func.max(Store.id), func.max(Store.updated_at)
+    ).one()
+    return (count, max_id, max_updated.isoformat() if max_updated else None)
+
+
+def _build_index(db: Session, fingerprint: tuple) -> StoreIndex:
+    rows = db.query(Store.id, Store.brand, Store.latitude, Store.longitude).filter(
+        Store.latitude.isnot(None),
+        Store.longitude.isnot(None),
+    ).all()
+
+    grouped: dict[str, list[tuple[int, float, float]]] = {}
+    for store_id, brand, lat, lng in rows:
+        grouped.setdefault(brand, []).append((store_id, lat, lng))
+
+    by_brand = {}
+    for brand, items in grouped.items():
+        arr = np.asarray(items, dtype=np.float64)
+        by_brand[brand] = _BrandPoints(
+            ids=arr[:, 0].astype(np.int64),
+            lats=arr[:, 1],
+            lngs=arr[:, 2],
+        )
+
+    index = StoreIndex(by_brand=by_brand, fingerprint=fingerprint, built_at=time.time())
+    logger.info(f"Store index built: {index.total_stores} stores across {len(by_brand)} brands")
+    return index
+
+
+def get_store_index(db: Session) -> StoreIndex:
+    """Return the current store index, rebuilding it if stores have changed."""
+    global _index, _stale, _last_checked
+
+    now = time.time()
+    if _index is not None and not _stale and now - _last_checked < STORE_INDEX_CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        now = time.time()
+        if _index is not None and not _stale and now - _last_checked < STORE_INDEX_CHECK_INTERVAL:
+            return _index
+
+        fingerprint = _store_fingerprint(db)
+        if _index is None or _stale or fingerprint != _index.fingerprint:
+            _index = _build_index(db, fingerprint)
+        _stale = False
+        _last_checked = now
+        return _index
+
+
+def invalidate_store_index():
+    """Mark the store index stale so the next query rebuilds it."""
+    global _stale
+    _stale = True
+    logger.debug("Store index invalidated")
+
+
+def get_store_index_stats() -> dict:
+    """Get store index statistics."""
+    if _index is None:
+        return {"built": False}
+    return {
+        "built": True,
+        "stale": _stale,
+        "total_stores": _index.total_stores,
+        "brands": {brand: len(p.ids) for brand, p in _index.by_brand.items()},
+        "age_seconds": round(time.time() - _index.built_at, 1),
+    }
+
+
+def _on_store_change(mapper, connection, target):
+    invalidate_store_index()
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Store, _event_name, _on_store_change)
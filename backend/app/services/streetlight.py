@@ -7,12 +7,12 @@ for site selection analysis. Uses the SATC (Streetlight Advanced Traffic Counts)
 API Documentation: https://developer.streetlightdata.com/docs/intro-to-the-advanced-traffic-counts-api
 """
 import asyncio
-import httpx
 from typing import Optional, Literal
 from pydantic import BaseModel
 from enum import Enum
 
 from app.core.config import settings
+from app.utils.http_clients import http_client
 
 
 # =============================================================================
@@ -216,7 +216,7 @@ class StreetlightClient:
         """
         url = f"{self.base_url}/date_ranges/{country}/{mode.value}/{source.value}"
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("streetlight") as client:
             response = await client.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             data = response.json()
@@ -256,7 +256,7 @@ class StreetlightClient:
         if road_classes:
             payload["roadway_classification"] = {"include": road_classes}
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("streetlight") as client:
             response = await client.post(
                 url,
                 json=payload,
@@ -297,7 +297,7 @@ class StreetlightClient:
         if road_classes:
             payload["roadway_classification"] = {"include": road_classes}
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("streetlight") as client:
             response = await client.post(
                 url, json=payload, headers=self.headers, timeout=30
             )
@@ -378,7 +378,7 @@ class StreetlightClient:
         if road_classes:
             payload["roadway_classification"] = {"include": road_classes}
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("streetlight") as client:
             response = await client.post(
                 url,
                 json=payload,
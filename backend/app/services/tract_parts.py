@@ -0,0 +1,202 @@
+"""
+Subdivided census tract geometry for fast ring intersection.
+
+census_tracts holds full-resolution TIGER polygons in EPSG:4326. A rural
+Nevada or Idaho tract can have tens of thousands of vertices and span a
+whole county, so every ST_Intersects / ST_Intersection / ST_Area against a
+ring buffer walks the entire polygon. census_tract_parts is a preprocessed
+companion table:
+
+- geometry simplified (SIMPLIFY_METERS, topology preserving) and split with
+  ST_Subdivide into parts of at most MAX_VERTICES vertices,
+- stored in EPSG:5070 (CONUS Albers equal-area), so areas are plain
+  ST_Area and rings are transformed once per query instead of per tract,
+- whole-tract and per-part areas precomputed (tract_area_m2, part_area_m2),
+- LIST-partitioned by state with a GiST index per partition; a state is
+  built into a staging table and swapped in as its partition, so a rebuild
+  only blocks ring queries for the brief DETACH/ATTACH.
+
+Ring queries then intersect a handful of small parts per tract, and parts
+wholly inside a ring contribute part_area_m2 without any ST_Intersection.
+CensusDemographicsService reads built states (tract_parts_states()) from
+here and the rest from census_tracts, so states can be built one at a time.
+
+Build with scripts/build_tract_parts.py after loading census_tracts.
+"""
+
+import logging
+import time
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import inspect, text
+
+from app.core.database import engine
+from app.services.acs_loader import target_state_fips
+
+logger = logging.getLogger(__name__)
+
+TRACT_PARTS_TABLE = "census_tract_parts"
+EQUAL_AREA_SRID = 5070   # NAD83 / Conus Albers
+MAX_VERTICES = 256       # ST_Subdivide limit per part
+SIMPLIFY_METERS = 5.0    # well under tract-boundary precision at ring scale
+
+# Re-check built states this often (states may be built while the app runs)
+_STATES_RECHECK_SECONDS = 300
+_built_states: Optional[FrozenSet[str]] = None
+_checked_at = 0.0
+
+
+def _query_built_states() -> FrozenSet[str]:
+    """State FIPS of every attached census_tract_parts partition."""
+    if engine.dialect.name != "postgresql" or not inspect(engine).has_table(TRACT_PARTS_TABLE):
+        return frozenset()
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            WHERE parent.relname = :table
+        """), {"table": TRACT_PARTS_TABLE}).fetchall()
+    prefix = f"{TRACT_PARTS_TABLE}_"
+    return frozenset(row.relname[len(prefix):] for row in rows if row.relname.startswith(prefix))
+
+
+def tract_parts_states() -> FrozenSet[str]:
+    """State FIPS codes with a built census_tract_parts partition (cached, re-checked every few minutes)."""
+    global _built_states, _checked_at
+    if _built_states is not None and time.monotonic() - _checked_at < _STATES_RECHECK_SECONDS:
+        return _built_states
+    try:
+        _built_states = _query_built_states()
+    except Exception as e:
+        logger.warning(f"Could not check {TRACT_PARTS_TABLE} partitions: {e}")
+        _built_states = frozenset()
+    _checked_at = time.monotonic()
+    return _built_states
+
+
+def tract_parts_available() -> bool:
+    """True once at least one state of census_tract_parts is built."""
+    return bool(tract_parts_states())
+
+
+def _create_parent(conn):
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {TRACT_PARTS_TABLE} (
+            geoid varchar(11) NOT NULL,
+            statefp varchar(2) NOT NULL,
+            countyfp varchar(3) NOT NULL,
+            tractce varchar(6) NOT NULL,
+            aland double precision,
+            tract_area_m2 double precision NOT NULL,
+            part_area_m2 double precision NOT NULL,
+            geom geometry(Polygon, {EQUAL_AREA_SRID}) NOT NULL
+        ) PARTITION BY LIST (statefp)
+    """))
+    # Created on every partition, present and future
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS idx_{TRACT_PARTS_TABLE}_geom ON {TRACT_PARTS_TABLE} USING GIST (geom)"
+    ))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS idx_{TRACT_PARTS_TABLE}_geoid ON {TRACT_PARTS_TABLE} (geoid)"
+    ))
+
+
+def _build_staging(conn, state_fips: str, max_vertices: int, simplify_meters: float) -> int:
+    """Build one state's parts into a standalone staging table; returns parts written."""
+    staging = f"{TRACT_PARTS_TABLE}_{state_fips}_staging"
+    conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    # The CHECK matches the partition bound, so ATTACH skips its validation scan
+    conn.execute(text(f"""
+        CREATE TABLE {staging} (
+            LIKE {TRACT_PARTS_TABLE} INCLUDING DEFAULTS,
+            CHECK (statefp = '{state_fips}')
+        )
+    """))
+    result = conn.execute(text(f"""
+        WITH projected AS (
+            SELECT
+                t.geoid, t.statefp, t.countyfp, t.tractce, t.aland,
+                ST_MakeValid(ST_SimplifyPreserveTopology(
+                    ST_Transform(t.geom, {EQUAL_AREA_SRID}), :simplify
+                )) AS geom
+            FROM census_tracts t
+            WHERE t.statefp = :state
+        )
+        INSERT INTO {staging}
+            (geoid, statefp, countyfp, tractce, aland, tract_area_m2, part_area_m2, geom)
+        SELECT
+            p.geoid, p.statefp, p.countyfp, p.tractce, p.aland,
+            ST_Area(p.geom),
+            ST_Area(part.geom),
+            part.geom
+        FROM projected p
+        CROSS JOIN LATERAL ST_Subdivide(
+            ST_CollectionExtract(p.geom, 3), :max_vertices
+        ) AS part(geom)
+        WHERE ST_Area(p.geom) > 0
+    """), {"state": state_fips, "simplify": simplify_meters, "max_vertices": max_vertices})
+    # Matching indexes are adopted by the parent's partitioned indexes on ATTACH
+    conn.execute(text(f"CREATE INDEX ON {staging} USING GIST (geom)"))
+    conn.execute(text(f"CREATE INDEX ON {staging} (geoid)"))
+    conn.execute(text(f"ANALYZE {staging}"))
+    return result.rowcount
+
+
+def _swap_partition(conn, state_fips: str):
+    """Replace the state's partition with its staging table (short ACCESS EXCLUSIVE window)."""
+    partition = f"{TRACT_PARTS_TABLE}_{state_fips}"
+    staging = f"{partition}_staging"
+    attached = conn.execute(text("""
+        SELECT 1
+        FROM pg_inherits i
+        JOIN pg_class child ON child.oid = i.inhrelid
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        WHERE parent.relname = :table AND child.relname = :partition
+    """), {"table": TRACT_PARTS_TABLE, "partition": partition}).first()
+    if attached:
+        conn.execute(text(f"ALTER TABLE {TRACT_PARTS_TABLE} DETACH PARTITION {partition}"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {partition}"))
+    conn.execute(text(f"ALTER TABLE {staging} RENAME TO {partition}"))
+    conn.execute(text(
+        f"ALTER TABLE {TRACT_PARTS_TABLE} ATTACH PARTITION {partition} FOR VALUES IN ('{state_fips}')"
+    ))
+
+
+def build_tract_parts(
+    states: Optional[Iterable[str]] = None,
+    max_vertices: int = MAX_VERTICES,
+    simplify_meters: float = SIMPLIFY_METERS,
+) -> Dict[str, object]:
+    """
+    (Re)build census_tract_parts for the given states (abbreviations or FIPS; default: all target states).
+
+    Each state is built into a staging table without touching the live
+    partition, so queries keep reading the previous parts (or census_tracts
+    for a new state) until the staging table is swapped in by a short
+    DETACH/ATTACH transaction.
+    """
+    if engine.dialect.name != "postgresql":
+        raise RuntimeError("census_tract_parts needs PostgreSQL/PostGIS")
+    global _built_states
+
+    started = time.monotonic()
+    with engine.begin() as conn:
+        _create_parent(conn)
+    parts: Dict[str, int] = {}
+    for fips in target_state_fips(states):
+        state_started = time.monotonic()
+        with engine.begin() as conn:
+            parts[fips] = _build_staging(conn, fips, max_vertices, simplify_meters)
+        with engine.begin() as conn:
+            _swap_partition(conn, fips)
+        logger.info(f"{TRACT_PARTS_TABLE}: state {fips} -> {parts[fips]} parts in {time.monotonic() - state_started:.1f}s")
+    _built_states = None  # re-read on next use in this process
+
+    return {
+        "parts": parts,
+        "max_vertices": max_vertices,
+        "simplify_meters": simplify_meters,
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+    }
@@ -2,25 +2,82 @@
 Viewport-level cache for demographic and POI data.
 
 Caches ArcGIS population data and Mapbox retail node data by coarse geohash
-to avoid redundant API calls when users pan/zoom within the same area.
+to avoid redundant API calls when users pan/zoom within the same area,
+property search results per fixed grid tile, plus whole opportunity search
+responses keyed by snapped viewport and data version.
 
-Follows the caching pattern established in mapbox_matrix.py.
+All caches are bounded LRU + TTL namespaces (see app/utils/ttl_cache.py).
+The upstream-data caches are also shared across workers through the L2 tier;
+opportunity responses stay per-process because their keys embed the
+in-process data version (app/services/data_version.py). Getters for the
+L2-backed caches are coroutines so the L2 read never blocks the event loop.
 """
 
 import time
+import json
+import math
+import hashlib
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 
-logger = logging.getLogger(__name__)
+from app.utils.cache_backends import get_l2_backend
+from app.utils.single_flight import get_single_flight_namespaces
+from app.utils.ttl_cache import KB, MB, TTLCache
 
-# In-memory caches keyed by geohash
-_demographic_cache: dict[str, dict] = {}
-_retail_node_cache: dict[str, dict] = {}
-_attom_cache: dict[str, dict] = {}
+logger = logging.getLogger(__name__)
 
 DEMOGRAPHIC_CACHE_TTL = 86400  # 24 hours (population data changes slowly)
 RETAIL_NODE_CACHE_TTL = 3600   # 1 hour (POI data changes occasionally)
 ATTOM_CACHE_TTL = 3600         # 1 hour (property data is relatively stable)
+PROPERTY_TILE_CACHE_TTL = 3600  # same data as the ATTOM viewport cache
+
+# Stale-while-revalidate grace windows: past the TTL (but within the grace)
+# entries are still served while a background refresh runs. TTL + grace is
+# the hard max staleness.
+DEMOGRAPHIC_CACHE_STALE_GRACE = 6 * 86400  # population figures are annual estimates
+RETAIL_NODE_CACHE_STALE_GRACE = 23 * 3600  # anchors rarely open/close within a day
+OPPORTUNITY_CACHE_TTL = 3600   # 1 hour (bounded by the ATTOM/anchor data it is built from)
+
+# Demographic / retail node entries are small (one per ~7mi cell)
+DEMOGRAPHIC_CACHE_MAX_ENTRIES = 5000
+RETAIL_NODE_CACHE_MAX_ENTRIES = 5000
+# Property lists and serialized responses are large: bound by bytes, compress
+ATTOM_CACHE_MAX_ENTRIES = 1000
+ATTOM_CACHE_MAX_BYTES = 64 * MB
+PROPERTY_TILE_CACHE_MAX_ENTRIES = 20000
+PROPERTY_TILE_CACHE_MAX_BYTES = 64 * MB
+OPPORTUNITY_CACHE_MAX_ENTRIES = 500
+OPPORTUNITY_CACHE_MAX_BYTES = 64 * MB
+LARGE_VALUE_COMPRESS_BYTES = 32 * KB
+
+_demographic_cache = TTLCache(
+    "demographics", DEMOGRAPHIC_CACHE_TTL, max_entries=DEMOGRAPHIC_CACHE_MAX_ENTRIES, l2=True,
+    stale_grace_seconds=DEMOGRAPHIC_CACHE_STALE_GRACE,
+)
+_retail_node_cache = TTLCache(
+    "retail_nodes", RETAIL_NODE_CACHE_TTL, max_entries=RETAIL_NODE_CACHE_MAX_ENTRIES, l2=True,
+    stale_grace_seconds=RETAIL_NODE_CACHE_STALE_GRACE,
+)
+_attom_cache = TTLCache(
+    "attom", ATTOM_CACHE_TTL,
+    max_entries=ATTOM_CACHE_MAX_ENTRIES,
+    max_bytes=ATTOM_CACHE_MAX_BYTES,
+    compress_min_bytes=LARGE_VALUE_COMPRESS_BYTES,
+    l2=True,
+)
+_property_tile_cache = TTLCache(
+    "property_tiles", PROPERTY_TILE_CACHE_TTL,
+    max_entries=PROPERTY_TILE_CACHE_MAX_ENTRIES,
+    max_bytes=PROPERTY_TILE_CACHE_MAX_BYTES,
+    compress_min_bytes=LARGE_VALUE_COMPRESS_BYTES,
+    l2=True,
+)
+_opportunity_cache = TTLCache(
+    "opportunity_search", OPPORTUNITY_CACHE_TTL,
+    max_entries=OPPORTUNITY_CACHE_MAX_ENTRIES,
+    max_bytes=OPPORTUNITY_CACHE_MAX_BYTES,
+    compress_min_bytes=LARGE_VALUE_COMPRESS_BYTES,
+)
 
 
 def _make_geohash(lat: float, lng: float, precision: int = 2) -> str:
@@ -37,45 +94,60 @@ def _make_geohash(lat: float, lng: float, precision: int = 2) -> str:
 
 # --- Demographic Cache ---
 
-def get_cached_demographics(lat: float, lng: float) -> Optional[dict]:
+def demographics_cache_key(lat: float, lng: float) -> str:
+    """Cache key for a location's demographics (also the single-flight key)."""
+    return _make_geohash(lat, lng, precision=1)
+
+
+async def get_cached_demographics(lat: float, lng: float) -> Optional[dict]:
     """Get cached demographic data for a location, or None if not cached/expired."""
-    key = _make_geohash(lat, lng, precision=1)
-    if key in _demographic_cache:
-        entry = _demographic_cache[key]
-        if time.time() - entry["_cached_at"] < DEMOGRAPHIC_CACHE_TTL:
-            logger.debug(f"Demographics cache hit for {key}")
-            return entry
-    return None
+    key = demographics_cache_key(lat, lng)
+    entry = await _demographic_cache.aget(key)
+    if entry is not None:
+        logger.debug(f"Demographics cache hit for {key}")
+    return entry
+
+
+async def get_demographics_allow_stale(lat: float, lng: float) -> tuple[Optional[dict], bool]:
+    """(cached demographics or None, is_stale); stale entries should be refreshed in the background."""
+    found = await _demographic_cache.aget_allow_stale(demographics_cache_key(lat, lng))
+    return found if found is not None else (None, False)
 
 
 def cache_demographics(lat: float, lng: float, data: dict):
     """Cache demographic data for a location."""
-    key = _make_geohash(lat, lng, precision=1)
+    key = demographics_cache_key(lat, lng)
     data["_cached_at"] = time.time()
-    _demographic_cache[key] = data
+    _demographic_cache.set(key, data, stored_at=data["_cached_at"])
     logger.debug(f"Cached demographics for {key}")
 
 
 # --- Retail Node Cache ---
 
-def get_cached_retail_nodes(lat: float, lng: float) -> Optional[list]:
+def retail_nodes_cache_key(lat: float, lng: float) -> str:
+    """Cache key for a location's retail nodes (also the single-flight key)."""
+    return _make_geohash(lat, lng, precision=1)
+
+
+async def get_cached_retail_nodes(lat: float, lng: float) -> Optional[list]:
     """Get cached retail node POIs for a location, or None if not cached/expired."""
-    key = _make_geohash(lat, lng, precision=1)
-    if key in _retail_node_cache:
-        entry = _retail_node_cache[key]
-        if time.time() - entry["_cached_at"] < RETAIL_NODE_CACHE_TTL:
-            logger.debug(f"Retail node cache hit for {key}")
-            return entry["nodes"]
-    return None
+    key = retail_nodes_cache_key(lat, lng)
+    nodes = await _retail_node_cache.aget(key)
+    if nodes is not None:
+        logger.debug(f"Retail node cache hit for {key}")
+    return nodes
+
+
+async def get_retail_nodes_allow_stale(lat: float, lng: float) -> tuple[Optional[list], bool]:
+    """(cached retail nodes or None, is_stale); stale entries should be refreshed in the background."""
+    found = await _retail_node_cache.aget_allow_stale(retail_nodes_cache_key(lat, lng))
+    return found if found is not None else (None, False)
 
 
 def cache_retail_nodes(lat: float, lng: float, nodes: list):
     """Cache retail node POIs for a location."""
-    key = _make_geohash(lat, lng, precision=1)
-    _retail_node_cache[key] = {
-        "_cached_at": time.time(),
-        "nodes": nodes,
-    }
+    key = retail_nodes_cache_key(lat, lng)
+    _retail_node_cache.set(key, nodes)
     logger.debug(f"Cached {len(nodes)} retail nodes for {key}")
 
 
@@ -89,67 +161,129 @@ def _make_bounds_key(min_lat: float, max_lat: float, min_lng: float, max_lng: fl
     return f"{r(min_lat)}_{r(max_lat)}_{r(min_lng)}_{r(max_lng)}_{prop_type}"
 
 
-def get_cached_attom(min_lat: float, max_lat: float, min_lng: float, max_lng: float, prop_type: str = "") -> Optional[list]:
+async def get_cached_attom(min_lat: float, max_lat: float, min_lng: float, max_lng: float, prop_type: str = "") -> Optional[list]:
     """Get cached ATTOM properties for a viewport, or None if not cached/expired."""
     key = _make_bounds_key(min_lat, max_lat, min_lng, max_lng, prop_type)
-    if key in _attom_cache:
-        entry = _attom_cache[key]
-        if time.time() - entry["_cached_at"] < ATTOM_CACHE_TTL:
-            logger.debug(f"ATTOM cache hit for {key} ({len(entry['properties'])} properties)")
-            return entry["properties"]
-    return None
+    properties = await _attom_cache.aget(key)
+    if properties is not None:
+        logger.debug(f"ATTOM cache hit for {key} ({len(properties)} properties)")
+    return properties
 
 
 def cache_attom(min_lat: float, max_lat: float, min_lng: float, max_lng: float, properties: list, prop_type: str = ""):
     """Cache ATTOM properties for a viewport."""
     key = _make_bounds_key(min_lat, max_lat, min_lng, max_lng, prop_type)
-    _attom_cache[key] = {
-        "_cached_at": time.time(),
-        "properties": properties,
-    }
+    _attom_cache.set(key, properties)
     logger.debug(f"Cached {len(properties)} ATTOM properties for {key}")
 
 
+# --- Property Tile Cache ---
+#
+# Property search results are also cached per fixed PROPERTY_TILE_DEG grid
+# cell, so a panned/zoomed viewport is assembled from cached tiles and only
+# the missing ones are fetched. Tiles are identified by integer (row, col)
+# indices: tile (r, c) spans [r, r+1) x [c, c+1) in PROPERTY_TILE_DEG units.
+
+PROPERTY_TILE_DEG = 0.05  # ~3.5mi north-south
+
+
+def property_tiles_for_bounds(min_lat: float, max_lat: float, min_lng: float, max_lng: float) -> list[tuple[int, int]]:
+    """Grid tiles intersecting the bounds, row-major."""
+    rows = range(math.floor(min_lat / PROPERTY_TILE_DEG), math.floor(max_lat / PROPERTY_TILE_DEG) + 1)
+    cols = range(math.floor(min_lng / PROPERTY_TILE_DEG), math.floor(max_lng / PROPERTY_TILE_DEG) + 1)
+    return [(r, c) for r in rows for c in cols]
+
+
+def property_tile_bounds(tiles: Iterable[tuple[int, int]]) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) of the rectangle enclosing the tiles."""
+    tiles = list(tiles)
+    rows = [r for r, _ in tiles]
+    cols = [c for _, c in tiles]
+    return (
+        min(rows) * PROPERTY_TILE_DEG, (max(rows) + 1) * PROPERTY_TILE_DEG,
+        min(cols) * PROPERTY_TILE_DEG, (max(cols) + 1) * PROPERTY_TILE_DEG,
+    )
+
+
+def property_tile_of(lat: float, lng: float) -> tuple[int, int]:
+    """Tile containing a point."""
+    return math.floor(lat / PROPERTY_TILE_DEG), math.floor(lng / PROPERTY_TILE_DEG)
+
+
+def _make_tile_key(tile: tuple[int, int], source: str, prop_type: str) -> str:
+    return f"{tile[0]}_{tile[1]}_{source}_{prop_type}"
+
+
+async def get_cached_property_tiles(tiles: Iterable[tuple[int, int]], source: str, prop_type: str = "") -> dict[tuple[int, int], list]:
+    """Cached property lists for whichever of the tiles are cached (missing tiles are omitted)."""
+    found = {}
+    for tile in tiles:
+        properties = await _property_tile_cache.aget(_make_tile_key(tile, source, prop_type))
+        if properties is not None:
+            found[tile] = properties
+    return found
+
+
+def cache_property_tile(tile: tuple[int, int], source: str, properties: list, prop_type: str = ""):
+    """Cache the complete property list for one tile."""
+    _property_tile_cache.set(_make_tile_key(tile, source, prop_type), properties)
+
+
+# --- Opportunity Search Response Cache ---
+
+def _make_search_key(params: dict, data_version: int) -> str:
+    """
+    Cache key for a normalized opportunity search.
+
+    Bounds are snapped to the ATTOM cache grid; every other parameter is
+    hashed as-is. data_version changes whenever stores, listings or county
+    properties change, so stale responses are never matched.
+    """
+    others = {k: v for k, v in params.items() if k not in ("min_lat", "max_lat", "min_lng", "max_lng")}
+    digest = hashlib.md5(json.dumps(others, sort_keys=True, default=str).encode()).hexdigest()
+    bounds_key = _make_bounds_key(params["min_lat"], params["max_lat"], params["min_lng"], params["max_lng"])
+    return f"{bounds_key}{digest}_v{data_version}"
+
+
+def get_cached_opportunity_search(params: dict, data_version: int) -> Optional[dict]:
+    """Get a cached search response ({"body": bytes, "etag": str}), or None if not cached/expired."""
+    key = _make_search_key(params, data_version)
+    entry = _opportunity_cache.get(key)
+    if entry is not None:
+        logger.debug(f"Opportunity search cache hit for {key}")
+    return entry
+
+
+def cache_opportunity_search(params: dict, data_version: int, body: bytes) -> str:
+    """Cache a serialized search response; returns its ETag."""
+    key = _make_search_key(params, data_version)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    _opportunity_cache.set(key, {
+        "_cached_at": time.time(),
+        "body": body,
+        "etag": etag,
+    })
+    logger.debug(f"Cached opportunity search for {key} ({len(body)} bytes)")
+    return etag
+
+
 # --- Cache Management ---
 
-def clear_viewport_caches():
-    """Clear all viewport caches."""
-    global _demographic_cache, _retail_node_cache, _attom_cache
-    _demographic_cache = {}
-    _retail_node_cache = {}
-    _attom_cache = {}
-    logger.info("Viewport caches cleared")
+def clear_viewport_caches(include_l2: bool = True):
+    """Clear all viewport caches (include_l2=False drops only this process's copies)."""
+    for cache in (_demographic_cache, _retail_node_cache, _attom_cache, _property_tile_cache, _opportunity_cache):
+        cache.clear(include_l2=include_l2)
+    logger.info("Viewport caches cleared" + ("" if include_l2 else " (L1 only)"))
 
 
 def get_cache_stats() -> dict:
-    """Get cache statistics."""
-    now = time.time()
-    valid_demo = sum(
-        1 for entry in _demographic_cache.values()
-        if now - entry["_cached_at"] < DEMOGRAPHIC_CACHE_TTL
-    )
-    valid_retail = sum(
-        1 for entry in _retail_node_cache.values()
-        if now - entry["_cached_at"] < RETAIL_NODE_CACHE_TTL
-    )
-    valid_attom = sum(
-        1 for entry in _attom_cache.values()
-        if now - entry["_cached_at"] < ATTOM_CACHE_TTL
-    )
+    """Get cache statistics (entries, bytes, hits/misses, evictions per cache)."""
     return {
-        "demographic_cache": {
-            "total_entries": len(_demographic_cache),
-            "valid_entries": valid_demo,
-            "ttl_seconds": DEMOGRAPHIC_CACHE_TTL,
-        },
-        "retail_node_cache": {
-            "total_entries": len(_retail_node_cache),
-            "valid_entries": valid_retail,
-            "ttl_seconds": RETAIL_NODE_CACHE_TTL,
-        },
-        "attom_cache": {
-            "total_entries": len(_attom_cache),
-            "valid_entries": valid_attom,
-            "ttl_seconds": ATTOM_CACHE_TTL,
-        },
+        "demographic_cache": _demographic_cache.stats(),
+        "retail_node_cache": _retail_node_cache.stats(),
+        "attom_cache": _attom_cache.stats(),
+        "property_tile_cache": _property_tile_cache.stats(),
+        "opportunity_cache": _opportunity_cache.stats(),
+        "l2_cache": backend.stats() if (backend := get_l2_backend()) else None,
+        "single_flight": {name: flight.stats() for name, flight in get_single_flight_namespaces().items()},
     }
@@ -0,0 +1,452 @@
+"""Second-tier (L2) cache backends shared by every worker process.
+
+TTLCache namespaces created with ``l2=True`` read L1 (process memory) ->
+L2 -> upstream and write both tiers, so N workers pay once for the same
+ATTOM / ArcGIS / Mapbox call and a restarted worker starts warm.
+
+Backends (CACHE_L2_BACKEND):
+    sqlite  on-disk SQLite file under CACHE_L2_PATH (default, stdlib only)
+    lmdb    on-disk LMDB environment under CACHE_L2_PATH (needs `lmdb`)
+    redis   any Redis-protocol server at CACHE_L2_REDIS_URL (needs `redis`)
+    none    L1 only
+
+Values are opaque bytes (TTLCache pickles them), so the L2 store must be
+private to this application. Backend errors are never fatal: the failing
+backend is skipped for L2_RETRY_AFTER_SECONDS and callers fall through to
+the upstream fetch.
+"""
+
+import logging
+import os
+import sqlite3
+import struct
+import threading
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    import lmdb
+    LMDB_AVAILABLE = True
+except ImportError:
+    LMDB_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+L2_RETRY_AFTER_SECONDS = 30   # skip a failing backend this long before retrying
+L2_PRUNE_EVERY_WRITES = 500   # expired-row sweep frequency for on-disk stores
+
+
+class CacheBackend:
+    """Byte store keyed by (namespace, key) with per-entry expiry."""
+
+    name = "base"
+
+    def __init__(self):
+        self._disabled_until = 0.0
+        self.errors = 0
+
+    # --- Public API (never raises) ---
+
+    def get(self, namespace: str, key: str) -> Optional[tuple[bytes, float]]:
+        """(payload, stored_at) or None when missing, expired or unavailable."""
+        if not self._available():
+            return None
+        try:
+            found = self._get(namespace, key)
+        except Exception as e:
+            self._failed("get", e)
+            return None
+        if found is None:
+            return None
+        payload, stored_at, expires_at = found
+        if expires_at <= time.time():
+            return None
+        return payload, stored_at
+
+    def set(self, namespace: str, key: str, payload: bytes, stored_at: float, ttl_seconds: float):
+        if not self._available():
+            return
+        try:
+            self._set(namespace, key, payload, stored_at, stored_at + ttl_seconds)
+        except Exception as e:
+            self._failed("set", e)
+
+    def add(self, namespace: str, key: str, payload: bytes, stored_at: float, ttl_seconds: float) -> bool:
+        """Store only when no unexpired entry exists (atomic across workers); True when stored."""
+        if not self._available():
+            return False
+        try:
+            return self._add(namespace, key, payload, stored_at, stored_at + ttl_seconds)
+        except Exception as e:
+            self._failed("add", e)
+            return False
+
+    def delete(self, namespace: str, key: str):
+        if not self._available():
+            return
+        try:
+            self._delete(namespace, key)
+        except Exception as e:
+            self._failed("delete", e)
+
+    def clear(self, namespace: str):
+        if not self._available():
+            return
+        try:
+            self._clear(namespace)
+        except Exception as e:
+            self._failed("clear", e)
+
+    def keys(self, namespace: str) -> list[str]:
+        """Unexpired keys in a namespace (for small bookkeeping namespaces, not cache data)."""
+        if not self._available():
+            return []
+        try:
+            return self._keys(namespace)
+        except Exception as e:
+            self._failed("keys", e)
+            return []
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "available": self._available(),
+            "errors": self.errors,
+        }
+
+    # --- Implemented by backends ---
+
+    def _get(self, namespace: str, key: str) -> Optional[tuple[bytes, float, float]]:
+        raise NotImplementedError
+
+    def _set(self, namespace: str, key: str, payload: bytes, stored_at: float, expires_at: float):
+        raise NotImplementedError
+
+    def _add(self, namespace: str, key: str, payload: bytes, stored_at: float, expires_at: float) -> bool:
+        raise NotImplementedError
+
+    def _delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def _clear(self, namespace: str):
+        raise NotImplementedError
+
+    def _keys(self, namespace: str) -> list[str]:
+        raise NotImplementedError
+
+    # --- Internals ---
+
+    def _available(self) -> bool:
+        return time.time() >= self._disabled_until
+
+    def _failed(self, operation: str, error: Exception):
+        self.errors += 1
+        self._disabled_until = time.time() + L2_RETRY_AFTER_SECONDS
+        logger.warning(
+            f"L2 cache ({self.name}) {operation} failed, bypassing for {L2_RETRY_AFTER_SECONDS}s: {error}"
+        )
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Single SQLite file in WAL mode; safe for concurrent worker processes."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+            " stored_at REAL NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, namespace, key):
+        row = self._conn().execute(
+            "SELECT value, stored_at, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        return (bytes(row[0]), row[1], row[2]) if row else None
+
+    def _set(self, namespace, key, payload, stored_at, expires_at):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, sqlite3.Binary(payload), stored_at, expires_at),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            prune = self._writes % L2_PRUNE_EVERY_WRITES == 0
+        if prune:
+            self._prune()
+
+    def _add(self, namespace, key, payload, stored_at, expires_at):
+        cursor = self._conn().execute(
+            "INSERT INTO cache_entries (namespace, key, value, stored_at, expires_at)"
+            " VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value,"
+            " stored_at = excluded.stored_at, expires_at = excluded.expires_at"
+            " WHERE cache_entries.expires_at <= ?",
+            (namespace, key, sqlite3.Binary(payload), stored_at, expires_at, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def _delete(self, namespace, key):
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def _clear(self, namespace):
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def _keys(self, namespace):
+        rows = self._conn().execute(
+            "SELECT key FROM cache_entries WHERE namespace = ? AND expires_at > ?",
+            (namespace, time.time()),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _prune(self):
+        """Drop expired rows, then the oldest rows while over max_bytes."""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        if self.max_bytes is None:
+            return
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries").fetchone()[0]
+        while total > self.max_bytes:
+            freed = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(value)), 0), COUNT(*) FROM ("
+                " SELECT value FROM cache_entries ORDER BY stored_at LIMIT 100)"
+            ).fetchone()
+            if not freed[1]:
+                break
+            conn.execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                " SELECT rowid FROM cache_entries ORDER BY stored_at LIMIT 100)"
+            )
+            total -= freed[0]
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["path"] = self.path
+        try:
+            count, size = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries"
+            ).fetchone()
+            stats.update({"total_entries": count, "total_bytes": size, "max_bytes": self.max_bytes})
+        except Exception as e:
+            stats["error"] = str(e)
+        return stats
+
+
+class LMDBCacheBackend(CacheBackend):
+    """LMDB environment (memory-mapped B+tree); map_size caps the store."""
+
+    name = "lmdb"
+    _HEADER = struct.Struct("<dd")  # stored_at, expires_at
+
+    def __init__(self, path: str, map_size: int):
+        super().__init__()
+        if not LMDB_AVAILABLE:
+            raise RuntimeError("lmdb is not installed (pip install lmdb)")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._env = lmdb.open(path, map_size=map_size, max_dbs=0, lock=True)
+        self._writes = 0
+
+    @staticmethod
+    def _key(namespace: str, key: str) -> bytes:
+        return f"{namespace}\x00{key}".encode()
+
+    def _get(self, namespace, key):
+        with self._env.begin() as txn:
+            raw = txn.get(self._key(namespace, key))
+        if raw is None:
+            return None
+        stored_at, expires_at = self._HEADER.unpack_from(raw)
+        return bytes(raw[self._HEADER.size:]), stored_at, expires_at
+
+    def _set(self, namespace, key, payload, stored_at, expires_at):
+        value = self._HEADER.pack(stored_at, expires_at) + payload
+        try:
+            with self._env.begin(write=True) as txn:
+                txn.put(self._key(namespace, key), value)
+        except lmdb.MapFullError:
+            # Full map: start over rather than growing past the configured cap
+            self._prune(expired_only=False)
+            with self._env.begin(write=True) as txn:
+                txn.put(self._key(namespace, key), value)
+        self._writes += 1
+        if self._writes % L2_PRUNE_EVERY_WRITES == 0:
+            self._prune()
+
+    def _add(self, namespace, key, payload, stored_at, expires_at):
+        with self._env.begin(write=True) as txn:
+            raw = txn.get(self._key(namespace, key))
+            if raw is not None and self._HEADER.unpack_from(raw)[1] > time.time():
+                return False
+            txn.put(self._key(namespace, key), self._HEADER.pack(stored_at, expires_at) + payload)
+        return True
+
+    def _delete(self, namespace, key):
+        with self._env.begin(write=True) as txn:
+            txn.delete(self._key(namespace, key))
+
+    def _clear(self, namespace):
+        prefix = f"{namespace}\x00".encode()
+        with self._env.begin(write=True) as txn:
+            cursor = txn.cursor()
+            if cursor.set_range(prefix):
+                while cursor.key().startswith(prefix):
+                    if not cursor.delete():
+                        break
+
+    def _keys(self, namespace):
+        prefix = f"{namespace}\x00".encode()
+        now = time.time()
+        keys = []
+        with self._env.begin() as txn:
+            cursor = txn.cursor()
+            if cursor.set_range(prefix):
+                for raw_key, raw in cursor:
+                    if not raw_key.startswith(prefix):
+                        break
+                    if self._HEADER.unpack_from(raw)[1] > now:
+                        keys.append(raw_key[len(prefix):].decode())
+        return keys
+
+    def _prune(self, expired_only: bool = True):
+        """Drop expired entries (or everything, when the map is full)."""
+        now = time.time()
+        with self._env.begin(write=True) as txn:
+            cursor = txn.cursor()
+            for raw_key, raw in list(cursor):
+                if not expired_only or self._HEADER.unpack_from(raw)[1] <= now:
+                    txn.delete(raw_key)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        info = self._env.info()
+        stats.update({"path": self.path, "total_entries": self._env.stat()["entries"], "max_bytes": info["map_size"]})
+        return stats
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-protocol server (Redis, Valkey, KeyDB, or the benchmarks/ stand-in)."""
+
+    name = "redis"
+    _HEADER = struct.Struct("<d")  # stored_at (expiry is the Redis TTL)
+
+    def __init__(self, url: str, key_prefix: str = "csoki:l2:"):
+        super().__init__()
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis is not installed (pip install redis)")
+        self.key_prefix = key_prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.key_prefix}{namespace}:{key}"
+
+    def _get(self, namespace, key):
+        raw = self._client.get(self._key(namespace, key))
+        if raw is None:
+            return None
+        (stored_at,) = self._HEADER.unpack_from(raw)
+        return bytes(raw[self._HEADER.size:]), stored_at, float("inf")
+
+    def _set(self, namespace, key, payload, stored_at, expires_at):
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms > 0:
+            self._client.set(self._key(namespace, key), self._HEADER.pack(stored_at) + payload, px=ttl_ms)
+
+    def _add(self, namespace, key, payload, stored_at, expires_at):
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return False
+        value = self._HEADER.pack(stored_at) + payload
+        return bool(self._client.set(self._key(namespace, key), value, px=ttl_ms, nx=True))
+
+    def _delete(self, namespace, key):
+        self._client.delete(self._key(namespace, key))
+
+    def _clear(self, namespace):
+        keys = list(self._client.scan_iter(match=f"{self.key_prefix}{namespace}:*", count=500))
+        for start in range(0, len(keys), 500):
+            self._client.delete(*keys[start:start + 500])
+
+    def _keys(self, namespace):
+        prefix = f"{self.key_prefix}{namespace}:"
+        return [
+            (k.decode() if isinstance(k, bytes) else k)[len(prefix):]
+            for k in self._client.scan_iter(match=f"{prefix}*", count=500)
+        ]
+
+
+_backend: Optional[CacheBackend] = None
+_backend_resolved = False
+_backend_lock = threading.Lock()
+
+
+def get_l2_backend() -> Optional[CacheBackend]:
+    """The configured process-wide L2 backend, or None when disabled/unavailable."""
+    global _backend, _backend_resolved
+    if _backend_resolved:
+        return _backend
+    with _backend_lock:
+        if _backend_resolved:
+            return _backend
+        kind = (settings.CACHE_L2_BACKEND or "none").lower()
+        try:
+            if kind == "sqlite":
+                _backend = SQLiteCacheBackend(
+                    os.path.join(settings.CACHE_L2_PATH, "l2_cache.sqlite"), settings.CACHE_L2_MAX_BYTES
+                )
+            elif kind == "lmdb":
+                _backend = LMDBCacheBackend(
+                    os.path.join(settings.CACHE_L2_PATH, "l2_cache.lmdb"), settings.CACHE_L2_MAX_BYTES
+                )
+            elif kind == "redis":
+                if not settings.CACHE_L2_REDIS_URL:
+                    raise RuntimeError("CACHE_L2_REDIS_URL is not set")
+                _backend = RedisCacheBackend(settings.CACHE_L2_REDIS_URL)
+            elif kind != "none":
+                raise RuntimeError(f"unknown CACHE_L2_BACKEND '{kind}'")
+            if _backend:
+                logger.info(f"L2 cache backend: {_backend.name}")
+        except Exception as e:
+            logger.warning(f"L2 cache disabled, could not initialise '{kind}' backend: {e}")
+            _backend = None
+        _backend_resolved = True
+        return _backend
+
+
+def set_l2_backend(backend: Optional[CacheBackend]):
+    """Replace the process-wide L2 backend (benchmarks, scripts)."""
+    global _backend, _backend_resolved
+    with _backend_lock:
+        _backend = backend
+        _backend_resolved = True
@@ -0,0 +1,173 @@
+"""Per-namespace cache metrics, per worker and aggregated across workers.
+
+Combines every TTLCache namespace (hits, misses, stale hits, evictions, bytes
+held, average entry age) with the SingleFlight namespace of the same name
+(upstream calls made, callers coalesced onto an in-flight call):
+
+    upstream_calls_avoided = cache hits (fresh, stale and L2) + coalesced callers
+
+Each worker publishes its snapshot to the shared L2 tier every
+METRICS_PUBLISH_INTERVAL seconds (run_metrics_publisher, started from the app
+lifespan) under the "cache_metrics" namespace, keyed by worker id. Snapshots
+expire after METRICS_SNAPSHOT_TTL, so exited workers drop out of the
+aggregate. Without an L2 backend only the current worker is reported.
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import socket
+import time
+from typing import Optional
+
+from app.utils.cache_backends import get_l2_backend
+from app.utils.single_flight import get_single_flight_namespaces
+from app.utils.ttl_cache import get_cache_namespaces
+
+logger = logging.getLogger(__name__)
+
+METRICS_NAMESPACE = "cache_metrics"
+METRICS_PUBLISH_INTERVAL = 30  # seconds
+METRICS_SNAPSHOT_TTL = 5 * METRICS_PUBLISH_INTERVAL
+
+# Summed across workers; the remaining fields are derived after summing
+_COUNTERS = (
+    "hits", "l2_hits", "stale_hits", "misses", "evictions", "expirations",
+    "entries", "stale_entries", "bytes",
+    "upstream_calls", "coalesced", "refreshes", "refresh_failures", "upstream_calls_avoided",
+)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _derive(metrics: dict) -> dict:
+    lookups = metrics["hits"] + metrics["misses"]
+    metrics["hit_rate"] = round(metrics["hits"] / lookups, 4) if lookups else None
+    return metrics
+
+
+def collect_worker_metrics() -> dict[str, dict]:
+    """This worker's metrics per namespace (cache and single-flight namespaces merged by name)."""
+    caches = get_cache_namespaces()
+    flights = get_single_flight_namespaces()
+    metrics = {}
+    for name in sorted(set(caches) | set(flights)):
+        m = dict.fromkeys(_COUNTERS, 0)
+        m["avg_age_seconds"] = None
+        cache = caches.get(name)
+        if cache is not None:
+            stats = cache.stats()
+            m.update({
+                "hits": stats["hits"],
+                "l2_hits": stats["l2_hits"],
+                "stale_hits": stats["stale_hits"],
+                "misses": stats["misses"],
+                "evictions": stats["evictions"],
+                "expirations": stats["expirations"],
+                "entries": stats["total_entries"],
+                "stale_entries": stats["stale_entries"],
+                "bytes": stats["total_bytes"],
+                "avg_age_seconds": stats["avg_age_seconds"],
+                "ttl_seconds": stats["ttl_seconds"],
+            })
+        flight = flights.get(name)
+        if flight is not None:
+            stats = flight.stats()
+            m.update({
+                "upstream_calls": stats["calls"],
+                "coalesced": stats["coalesced"],
+                "refreshes": stats["refreshes"],
+                "refresh_failures": stats["refresh_failures"],
+            })
+        m["upstream_calls_avoided"] = m["hits"] + m["coalesced"]
+        metrics[name] = _derive(m)
+    return metrics
+
+
+def aggregate_metrics(snapshots: list[dict[str, dict]]) -> dict[str, dict]:
+    """Sum per-namespace counters across worker snapshots (average age weighted by entries)."""
+    totals: dict[str, dict] = {}
+    age_weight: dict[str, float] = {}
+    for snapshot in snapshots:
+        for name, m in snapshot.items():
+            total = totals.setdefault(name, dict.fromkeys(_COUNTERS, 0))
+            for counter in _COUNTERS:
+                total[counter] += m.get(counter, 0)
+            if "ttl_seconds" in m:
+                total["ttl_seconds"] = m["ttl_seconds"]
+            if m.get("avg_age_seconds") is not None:
+                age_weight[name] = age_weight.get(name, 0.0) + m["avg_age_seconds"] * m["entries"]
+    for name, total in totals.items():
+        total["avg_age_seconds"] = (
+            round(age_weight[name] / total["entries"], 1)
+            if name in age_weight and total["entries"] else None
+        )
+        _derive(total)
+    return totals
+
+
+def publish_worker_metrics() -> bool:
+    """Write this worker's snapshot to L2; False when there is no L2 backend."""
+    backend = get_l2_backend()
+    if backend is None:
+        return False
+    snapshot = {"collected_at": time.time(), "metrics": collect_worker_metrics()}
+    backend.set(METRICS_NAMESPACE, WORKER_ID, pickle.dumps(snapshot), snapshot["collected_at"], METRICS_SNAPSHOT_TTL)
+    return True
+
+
+def _load_worker_snapshots() -> dict[str, dict]:
+    backend = get_l2_backend()
+    if backend is None:
+        return {}
+    snapshots = {}
+    for worker_id in backend.keys(METRICS_NAMESPACE):
+        found = backend.get(METRICS_NAMESPACE, worker_id)
+        if found is None:
+            continue
+        try:
+            snapshots[worker_id] = pickle.loads(found[0])
+        except Exception:
+            continue
+    return snapshots
+
+
+def get_cache_metrics(include_workers: bool = True) -> dict:
+    """
+    This worker's metrics, every live worker's published snapshot, and their aggregate.
+
+    The current worker is always reported live (its published snapshot is replaced).
+    """
+    publish_worker_metrics()
+    current = collect_worker_metrics()
+    snapshots = _load_worker_snapshots()
+    snapshots[WORKER_ID] = {"collected_at": time.time(), "metrics": current}
+
+    result = {
+        "worker_id": WORKER_ID,
+        "worker": current,
+        "worker_count": len(snapshots),
+        "aggregate": aggregate_metrics([s["metrics"] for s in snapshots.values()]),
+    }
+    if include_workers:
+        result["workers"] = {
+            worker_id: {
+                "age_seconds": round(time.time() - s["collected_at"], 1),
+                "metrics": s["metrics"],
+            }
+            for worker_id, s in sorted(snapshots.items())
+        }
+    return result
+
+
+async def run_metrics_publisher(interval: Optional[float] = None):
+    """Publish this worker's snapshot every `interval` seconds until cancelled."""
+    interval = interval or METRICS_PUBLISH_INTERVAL
+    while True:
+        try:
+            if not await asyncio.to_thread(publish_worker_metrics):
+                return  # no L2 tier to share through
+        except Exception as e:
+            logger.warning(f"Cache metrics publish failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,215 @@
+"""Per-provider circuit breakers and hedging delays for upstream calls.
+
+A degraded upstream (ArcGIS GeoEnrichment timing out, Mapbox returning 5xx)
+otherwise costs every caller the full httpx timeout. Each provider limit in
+app/utils/rate_limits.py gets a breaker:
+
+- closed: calls go through; a failure (connection error, timeout, 5xx) or a
+  call slower than `slow_call_seconds` counts against the breaker, a healthy
+  call resets the count,
+- open: after `failure_threshold` consecutive bad calls, calls fail
+  immediately with CircuitOpenError for `open_seconds`,
+- half-open: then one trial call is let through; success closes the
+  breaker, failure reopens it.
+
+GovernedTransport checks and updates breakers automatically. CircuitOpenError
+is an httpx.TransportError, so existing `except httpx.HTTPError` handlers
+treat it like any other upstream failure; callers with a local fallback can
+also ask circuit_open(name) before trying the provider at all.
+
+The breaker also keeps a window of recent healthy latencies, which sets the
+delay before a hedged GET (see GovernedTransport and HEDGED_REQUEST_PROVIDERS).
+
+Override policies with CIRCUIT_BREAKERS, e.g.
+CIRCUIT_BREAKERS='{"arcgis": {"slow_call_seconds": 5}}' ("*" applies to every
+provider without its own entry).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+    failure_threshold: int = 5        # consecutive failed/slow calls that open the breaker
+    slow_call_seconds: float = 10.0   # calls slower than this count as failures
+    open_seconds: float = 30.0        # fail-fast period before a trial call
+
+
+DEFAULT_POLICY = BreakerPolicy()
+
+BREAKER_POLICIES: dict[str, BreakerPolicy] = {
+    "arcgis": BreakerPolicy(slow_call_seconds=8.0),
+    "attom": BreakerPolicy(slow_call_seconds=10.0),
+    "census": BreakerPolicy(slow_call_seconds=8.0),
+    "mapbox_search": BreakerPolicy(slow_call_seconds=5.0),
+    "mapbox_geocoding": BreakerPolicy(slow_call_seconds=5.0),
+    "mapbox_isochrone": BreakerPolicy(slow_call_seconds=8.0),
+    "tigerweb": BreakerPolicy(slow_call_seconds=60.0, open_seconds=60.0),  # whole-state layers
+    "census_geocoder": BreakerPolicy(slow_call_seconds=120.0),              # 10k-row batches
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+LATENCY_WINDOW = 200     # recent healthy call latencies kept for hedging
+HEDGE_MIN_SAMPLES = 20   # no hedging until the latency percentile means something
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one provider limit (thread-safe)."""
+
+    def __init__(self, name: str, policy: BreakerPolicy):
+        self.name = name
+        self.policy = policy
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+        self.opened = 0       # times the breaker opened
+        self.rejected = 0     # calls failed fast while open
+        self.failures = 0
+        self.slow_calls = 0
+        self.hedged = 0       # hedge requests sent
+        self.hedge_wins = 0   # hedges that answered first
+
+    def _open(self, now: float):
+        if self.state != OPEN:
+            self.opened += 1
+            logger.warning(
+                f"Circuit breaker {self.name} open for {self.policy.open_seconds:g}s "
+                f"after {self._failures} failed or slow calls"
+            )
+        self.state = OPEN
+        self._opened_at = now
+        self._trial_in_flight = False
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (open, or half-open with the trial in flight)."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self._opened_at < self.policy.open_seconds
+            return self.state == HALF_OPEN and self._trial_in_flight
+
+    def before_call(self, request: Optional[httpx.Request] = None):
+        """Admit a call or raise CircuitOpenError; an admitted call must be recorded or released."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.policy.open_seconds:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            if self.state == CLOSED:
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"{self.name} circuit breaker is open", request=request)
+
+    def check(self, request: Optional[httpx.Request] = None):
+        """Raise CircuitOpenError if the breaker has opened (e.g. while this call queued)."""
+        with self._lock:
+            rejected = self.state == OPEN and time.monotonic() - self._opened_at < self.policy.open_seconds
+            if rejected:
+                self.rejected += 1
+        if rejected:
+            raise CircuitOpenError(f"{self.name} circuit breaker is open", request=request)
+
+    def record(self, ok: bool, elapsed: float):
+        """Outcome of an admitted call: `ok` is False for errors and 5xx responses."""
+        slow = ok and elapsed > self.policy.slow_call_seconds
+        with self._lock:
+            if ok and not slow:
+                self._latencies.append(elapsed)
+                self._failures = 0
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                    self._trial_in_flight = False
+                    logger.info(f"Circuit breaker {self.name} closed")
+                return
+            if slow:
+                self.slow_calls += 1
+            else:
+                self.failures += 1
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.policy.failure_threshold:
+                self._open(time.monotonic())
+
+    def release(self):
+        """An admitted call was cancelled before it finished (no outcome to record)."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    def hedge_delay(self, percentile: float, min_delay: float) -> Optional[float]:
+        """Latency percentile of recent healthy calls (None until there are enough samples)."""
+        with self._lock:
+            if self.state != CLOSED or len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+        return max(min_delay, latencies[index])
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "p50_ms": round(latencies[len(latencies) // 2] * 1000) if latencies else None,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def _configured_policy(name: str) -> BreakerPolicy:
+    policy = BREAKER_POLICIES.get(name, DEFAULT_POLICY)
+    overrides = settings.CIRCUIT_BREAKERS.get(name, settings.CIRCUIT_BREAKERS.get("*"))
+    return replace(policy, **overrides) if overrides else policy
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker for a provider limit (see rate_limits.PROVIDER_LIMITS)."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name, _configured_policy(name)))
+    return breaker
+
+
+def circuit_open(name: str) -> bool:
+    """True while the provider's breaker is failing calls fast."""
+    if not settings.CIRCUIT_BREAKERS_ENABLED:
+        return False
+    breaker = _breakers.get(name)
+    return breaker is not None and breaker.is_open()
+
+
+def get_circuit_breaker_stats() -> dict:
+    """State, failures and hedging counts per provider breaker used in this process."""
+    with _breakers_lock:
+        return {name: breaker.stats() for name, breaker in sorted(_breakers.items())}
@@ -2,6 +2,14 @@
 
 from math import radians, cos, sin, asin, sqrt
 
+import numpy as np
+
+EARTH_RADIUS_MILES = 3956
+
+# Rows per block when computing distance matrices, keeps the N x M
+# intermediate arrays to a few MB even for state-sized viewports.
+_DISTANCE_BLOCK_ROWS = 1024
+
 
 def haversine(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
     """Calculate the great circle distance in miles between two points on earth.
@@ -20,4 +28,69 @@ def haversine(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
     dlat = lat2 - lat1
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     c = 2 * asin(sqrt(a))
-    return c * 3956  # Earth radius in miles
+    return c * EARTH_RADIUS_MILES
+
+
+def haversine_matrix(
+    lats1: np.ndarray,
+    lngs1: np.ndarray,
+    lats2: np.ndarray,
+    lngs2: np.ndarray,
+) -> np.ndarray:
+    """Vectorized great circle distance in miles between two point sets.
+
+    Args:
+        lats1, lngs1: Coordinates of the N query points (decimal degrees)
+        lats2, lngs2: Coordinates of the M target points (decimal degrees)
+
+    Returns:
+        (N, M) array of distances in miles.
+    """
+    lat1 = np.radians(np.asarray(lats1, dtype=np.float64))[:, None]
+    lng1 = np.radians(np.asarray(lngs1, dtype=np.float64))[:, None]
+    lat2 = np.radians(np.asarray(lats2, dtype=np.float64))[None, :]
+    lng2 = np.radians(np.asarray(lngs2, dtype=np.float64))[None, :]
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0))) * EARTH_RADIUS_MILES
+
+
+def nearest_k(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    target_lats: np.ndarray,
+    target_lngs: np.ndarray,
+    k: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the k nearest targets for every query point.
+
+    Distances are computed in row blocks so memory stays bounded for
+    large candidate sets.
+
+    Returns:
+        (distances, indices), both shaped (N, k) and sorted nearest-first.
+        When there are fewer than k targets the trailing columns hold
+        ``inf`` distances and index -1.
+    """
+    n = len(lats)
+    m = len(target_lats)
+    distances = np.full((n, k), np.inf)
+    indices = np.full((n, k), -1, dtype=np.int64)
+    if n == 0 or m == 0:
+        return distances, indices
+
+    kk = min(k, m)
+    for start in range(0, n, _DISTANCE_BLOCK_ROWS):
+        stop = min(start + _DISTANCE_BLOCK_ROWS, n)
+        block = haversine_matrix(lats[start:stop], lngs[start:stop], target_lats, target_lngs)
+        if kk == 1:
+            idx = np.argmin(block, axis=1)[:, None]
+        else:
+            idx = np.argpartition(block, kk - 1, axis=1)[:, :kk]
+            order = np.argsort(np.take_along_axis(block, idx, axis=1), axis=1, kind="stable")
+            idx = np.take_along_axis(idx, order, axis=1)
+        distances[start:stop, :kk] = np.take_along_axis(block, idx, axis=1)
+        indices[start:stop, :kk] = idx
+    return distances, indices
@@ -0,0 +1,114 @@
+"""App-lifetime pooled HTTP clients, one per upstream provider.
+
+Services used to open a new httpx.AsyncClient per call, paying DNS, TCP and
+TLS setup on every ATTOM / ArcGIS / Census / Mapbox request. Each provider
+now has one long-lived client with keep-alive connection pools (per host,
+inside the client), HTTP/2 where the `h2` package is installed, its own
+default timeout, and the provider's rate limit / concurrency cap / retry
+policy (app/utils/rate_limits.py):
+
+    async with http_client("attom") as client:
+        response = await client.get(url, params=params)
+
+The context manager yields the shared client and does not close it, so call
+sites keep their existing `async with` shape. Per-request `timeout=` still
+overrides the provider default. Don't set per-call headers/cookies on the
+client itself; pass them per request.
+
+Clients are opened in the app lifespan (open_http_clients) and closed on
+shutdown (close_http_clients). httpx connections belong to the event loop
+that opened them, so clients are kept per loop: scripts and benchmarks that
+run their own loop get clients created lazily on first use.
+"""
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import httpx
+
+from app.core.config import settings
+from app.utils.rate_limits import GovernedTransport
+
+try:
+    import h2  # noqa: F401 (enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    timeout: float             # default per-request timeout (seconds)
+    max_connections: int = 50
+    max_keepalive: int = 10
+
+
+PROVIDERS: dict[str, ProviderConfig] = {
+    "attom": ProviderConfig(timeout=30.0, max_connections=20),
+    "arcgis": ProviderConfig(timeout=30.0),
+    "census": ProviderConfig(timeout=15.0),
+    "mapbox": ProviderConfig(timeout=30.0, max_connections=100, max_keepalive=20),
+    "google": ProviderConfig(timeout=30.0),
+    "streetlight": ProviderConfig(timeout=30.0, max_connections=10),
+    "tigerweb": ProviderConfig(timeout=90.0, max_connections=10),  # whole-state GeoJSON layers
+    "state_dot": ProviderConfig(timeout=30.0, max_connections=10),
+    "reportall": ProviderConfig(timeout=15.0, max_connections=10),
+}
+KEEPALIVE_EXPIRY = 30.0  # seconds an idle pooled connection is kept open
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _create_client(provider: str) -> httpx.AsyncClient:
+    config = PROVIDERS[provider]
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        http2=HTTP2_AVAILABLE and settings.HTTP2_ENABLED,
+    )
+    return httpx.AsyncClient(timeout=config.timeout, transport=GovernedTransport(provider, transport))
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """The shared client for a provider on the running event loop (created on first use)."""
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown HTTP provider: {provider}")
+    loop_clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = loop_clients.get(provider)
+    if client is None or client.is_closed:
+        client = loop_clients[provider] = _create_client(provider)
+    return client
+
+
+@asynccontextmanager
+async def http_client(provider: str) -> AsyncIterator[httpx.AsyncClient]:
+    """`async with` access to the shared provider client (not closed on exit)."""
+    yield get_http_client(provider)
+
+
+async def open_http_clients():
+    """Create every provider client on the running loop (app startup)."""
+    for provider in PROVIDERS:
+        get_http_client(provider)
+    logger.info(
+        f"Opened pooled HTTP clients for {len(PROVIDERS)} providers "
+        f"(HTTP/2 {'on' if HTTP2_AVAILABLE and settings.HTTP2_ENABLED else 'off'})"
+    )
+
+
+async def close_http_clients():
+    """Close the running loop's provider clients (app shutdown)."""
+    loop_clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in loop_clients.values():
+        await client.aclose()
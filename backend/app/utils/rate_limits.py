@@ -0,0 +1,315 @@
+"""Per-provider rate limits, concurrency caps and retry for upstream calls.
+
+Each provider limit combines:
+- a token bucket (`rate` requests/second sustained, `burst` back-to-back),
+- a semaphore capping requests in flight (`concurrency`),
+- retry with full-jitter exponential backoff on 429 / 5xx responses and
+  connection failures (honouring Retry-After), up to `max_retries`,
+- a circuit breaker that fails calls fast while the provider is down or
+  slow (app/utils/circuit_breakers.py).
+
+HTTP calls made through app/utils/http_clients.py go through it
+automatically: each provider client's transport is a GovernedTransport, which
+picks the limit from the provider and request path (e.g. Mapbox Matrix vs
+Search Box vs Isochrone have separate quotas). Non-httpx clients use the
+limiter directly:
+
+    async with rate_limited("firecrawl"):
+        result = await asyncio.to_thread(client.scrape, url)
+
+    get_rate_limiter("nominatim").acquire_blocking()   # sync code (no concurrency cap)
+
+Defaults below are conservative fractions of each provider's documented
+quota; override per provider with PROVIDER_RATE_LIMITS, e.g.
+PROVIDER_RATE_LIMITS='{"attom": {"rate": 10, "concurrency": 16}}' ("*" applies
+to every provider without its own entry).
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.utils.circuit_breakers import CircuitBreaker, get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float           # sustained requests per second
+    burst: int            # requests allowed back-to-back before pacing
+    concurrency: int      # requests in flight
+    max_retries: int = 2  # retries after the first attempt
+
+
+PROVIDER_LIMITS: dict[str, RateLimit] = {
+    "mapbox_matrix": RateLimit(rate=1.0, burst=5, concurrency=4),       # 60 req/min
+    "mapbox_search": RateLimit(rate=10.0, burst=20, concurrency=10),     # Search Box
+    "mapbox_isochrone": RateLimit(rate=4.0, burst=10, concurrency=4),    # 300 req/min
+    "mapbox_geocoding": RateLimit(rate=10.0, burst=20, concurrency=10),
+    "mapbox": RateLimit(rate=5.0, burst=10, concurrency=4),              # datasets/uploads
+    "arcgis": RateLimit(rate=5.0, burst=10, concurrency=8),
+    "census": RateLimit(rate=10.0, burst=20, concurrency=8),
+    "census_geocoder": RateLimit(rate=1.0, burst=1, concurrency=1),      # batch endpoint
+    "attom": RateLimit(rate=5.0, burst=10, concurrency=8),
+    "streetlight": RateLimit(rate=1.0, burst=2, concurrency=2),
+    "firecrawl": RateLimit(rate=0.5, burst=2, concurrency=2, max_retries=0),  # SDK retries itself
+    "google": RateLimit(rate=20.0, burst=20, concurrency=10),
+    "nominatim": RateLimit(rate=1.0 / settings.GEOCODING_RATE_LIMIT, burst=1, concurrency=1),  # policy: <= 1 req/s
+    "tigerweb": RateLimit(rate=2.0, burst=4, concurrency=4),
+    "state_dot": RateLimit(rate=1.0, burst=2, concurrency=2),
+    "reportall": RateLimit(rate=2.0, burst=4, concurrency=4),
+}
+
+# URL path segments that select a more specific limit within an http_clients provider
+PATH_LIMITS: dict[str, list[tuple[str, str]]] = {
+    "mapbox": [
+        ("/directions-matrix/", "mapbox_matrix"),
+        ("/search/searchbox/", "mapbox_search"),
+        ("/isochrone/", "mapbox_isochrone"),
+        ("/search/geocode/", "mapbox_geocoding"),
+    ],
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+RETRY_AFTER_MAX_SECONDS = 30.0
+
+
+class ProviderLimiter:
+    """Token bucket + per-event-loop semaphore for one provider (thread-safe)."""
+
+    def __init__(self, name: str, limit: RateLimit):
+        self.name = name
+        self.limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.requests = 0
+        self.throttled = 0        # requests that waited for a token
+        self.wait_seconds = 0.0
+        self.retries = 0
+
+    def _reserve(self) -> float:
+        """Take a token (possibly one not yet refilled); seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.limit.burst, self._tokens + (now - self._updated) * self.limit.rate)
+            self._updated = now
+            self._tokens -= 1
+            self.requests += 1
+            wait = -self._tokens / self.limit.rate if self._tokens < 0 else 0.0
+            if wait > 0:
+                self.throttled += 1
+                self.wait_seconds += wait
+            return wait
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit.concurrency)
+        return semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot and one rate token for the duration of a request."""
+        async with self._semaphore():
+            wait = self._reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+
+    def acquire_blocking(self):
+        """Rate token for synchronous callers (blocks the thread; no concurrency cap)."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.limit.rate,
+            "burst": self.limit.burst,
+            "concurrency": self.limit.concurrency,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 2),
+            "retries": self.retries,
+        }
+
+
+_limiters: dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _configured_limit(name: str) -> RateLimit:
+    limit = PROVIDER_LIMITS[name]
+    overrides = settings.PROVIDER_RATE_LIMITS.get(name, settings.PROVIDER_RATE_LIMITS.get("*"))
+    return replace(limit, **overrides) if overrides else limit
+
+
+def get_rate_limiter(name: str) -> ProviderLimiter:
+    """The process-wide limiter for a provider (see PROVIDER_LIMITS)."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        if name not in PROVIDER_LIMITS:
+            raise ValueError(f"Unknown rate-limited provider: {name}")
+        with _limiters_lock:
+            limiter = _limiters.setdefault(name, ProviderLimiter(name, _configured_limit(name)))
+    return limiter
+
+
+def rate_limited(name: str):
+    """`async with` one slot of a provider's limit (for non-httpx clients)."""
+    return get_rate_limiter(name).slot()
+
+
+def limiter_for_request(provider: str, path: str) -> ProviderLimiter:
+    for segment, name in PATH_LIMITS.get(provider, ()):
+        if segment in path:
+            return get_rate_limiter(name)
+    return get_rate_limiter(provider)
+
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Full-jitter exponential backoff, or the server's Retry-After when given."""
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = 0.0
+        if seconds > 0:
+            return min(seconds, RETRY_AFTER_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def get_rate_limit_stats() -> dict:
+    """Requests, throttling and retries per provider limit used in this process."""
+    with _limiters_lock:
+        return {name: limiter.stats() for name, limiter in sorted(_limiters.items())}
+
+
+class GovernedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport applying the provider's rate limit, concurrency cap,
+    retries and circuit breaker, and hedging GETs for HEDGED_REQUEST_PROVIDERS.
+    """
+
+    def __init__(self, provider: str, transport: httpx.AsyncBaseTransport):
+        self.provider = provider
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = limiter_for_request(self.provider, request.url.path)
+        breaker = get_circuit_breaker(limiter.name) if settings.CIRCUIT_BREAKERS_ENABLED else None
+        if breaker is not None and request.method == "GET" and limiter.name in settings.HEDGED_REQUEST_PROVIDERS:
+            delay = breaker.hedge_delay(settings.HEDGE_DELAY_PERCENTILE, settings.HEDGE_MIN_DELAY_SECONDS)
+            if delay is not None:
+                return await self._send_hedged(limiter, breaker, request, delay)
+        return await self._send(limiter, breaker, request)
+
+    async def _send_once(
+        self, limiter: ProviderLimiter, breaker: Optional[CircuitBreaker], request: httpx.Request
+    ) -> httpx.Response:
+        if breaker is None:
+            async with limiter.slot():
+                return await self._transport.handle_async_request(request)
+
+        # Fail fast rather than queue for a slot behind calls to a dead upstream
+        breaker.before_call(request)
+        try:
+            async with limiter.slot():
+                breaker.check(request)
+                started = time.monotonic()
+                try:
+                    response = await self._transport.handle_async_request(request)
+                except httpx.TransportError:
+                    breaker.record(False, time.monotonic() - started)
+                    raise
+        except BaseException:
+            breaker.release()  # no-op unless this was the half-open trial call
+            raise
+        breaker.record(response.status_code < 500, time.monotonic() - started)
+        return response
+
+    async def _send(
+        self, limiter: ProviderLimiter, breaker: Optional[CircuitBreaker], request: httpx.Request
+    ) -> httpx.Response:
+        retry_any_status = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = await self._send_once(limiter, breaker, request)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # Nothing reached the server, so any method is safe to resend
+                if attempt >= limiter.limit.max_retries:
+                    raise
+                delay = retry_delay(attempt)
+                logger.info(f"{limiter.name}: {type(e).__name__}, retry {attempt + 1} in {delay:.1f}s")
+            else:
+                retryable = response.status_code == 429 or (
+                    retry_any_status and response.status_code in RETRY_STATUSES
+                )
+                if not retryable or attempt >= limiter.limit.max_retries:
+                    return response
+                delay = retry_delay(attempt, response.headers.get("retry-after"))
+                await response.aclose()
+                logger.info(f"{limiter.name}: HTTP {response.status_code}, retry {attempt + 1} in {delay:.1f}s")
+            limiter.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send_hedged(
+        self, limiter: ProviderLimiter, breaker: CircuitBreaker, request: httpx.Request, delay: float
+    ) -> httpx.Response:
+        """Send a second copy of a GET still unanswered after `delay`; first response wins."""
+        primary = asyncio.ensure_future(self._send(limiter, breaker, request))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        breaker.hedged += 1
+        hedge = asyncio.ensure_future(self._send(limiter, breaker, request))
+        pending = {primary, hedge}
+        winner: Optional[httpx.Response] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                    elif winner is None:
+                        winner = task.result()
+                        if task is hedge:
+                            breaker.hedge_wins += 1
+                    else:
+                        await task.result().aclose()
+        finally:
+            for task in pending:
+                task.cancel()
+        if winner is None:
+            raise error
+        return winner
+
+    async def aclose(self):
+        await self._transport.aclose()
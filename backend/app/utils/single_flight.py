@@ -0,0 +1,112 @@
+"""Single-flight coalescing of concurrent identical async fetches.
+
+Caches are only filled once an upstream call completes, so N requests that
+miss the same key at the same time would otherwise make N identical (often
+billable) calls. A SingleFlight namespace runs the first caller's fetch as a
+task and lets every concurrent caller with the same key await that task:
+
+    _demographics_flight = SingleFlight("demographics")
+
+    data = await _demographics_flight.do(key, lambda: fetch_demographics(lat, lng))
+
+- Keys should be the cache keys for the same data (see viewport_cache and
+  mapbox_matrix._get_cache_key) so coalescing matches cache hits exactly.
+- All waiters receive the same result object (treat it as read-only, like a
+  cached value) or the same exception.
+- The shared task is shielded: a caller that is cancelled (e.g. client
+  disconnect) stops waiting without cancelling the fetch for the others.
+- refresh() starts the same fetch without waiting for it (stale-while-
+  revalidate); foreground callers for that key join the refresh.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_namespaces: dict[str, "SingleFlight"] = {}
+_namespaces_lock = threading.Lock()
+
+
+class SingleFlight(Generic[T]):
+    """Per-event-loop registry of in-flight fetches keyed by cache key."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+        self.calls = 0      # fetches started
+        self.coalesced = 0  # callers that joined an in-flight fetch instead
+        self.refreshes = 0  # background refreshes started
+        self.refresh_failures = 0
+
+        with _namespaces_lock:
+            _namespaces[namespace] = self
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Result of fetch(), shared with any concurrent caller using the same key."""
+        task = self._current(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self._start(key, fetch)
+        return await asyncio.shield(task)
+
+    def refresh(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> bool:
+        """Start fetch() in the background unless one is in flight; True if started."""
+        if self._current(key) is not None:
+            return False
+        task = self._start(key, fetch)
+        task.add_done_callback(self._refresh_done)
+        self.refreshes += 1
+        return True
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "in_flight": len(self._inflight),
+        }
+
+    def _current(self, key: Hashable) -> Optional[asyncio.Task]:
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop() and not task.done():
+            return task
+        return None
+
+    def _start(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(fetch())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, key=key: self._finished(key, t))
+        self.calls += 1
+        return task
+
+    def _refresh_done(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None:
+            self.refresh_failures += 1
+            logger.warning(
+                f"Background refresh failed ({self.namespace}): "
+                f"{'cancelled' if task.cancelled() else task.exception()}"
+            )
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled
+            task.exception()
+
+
+def get_single_flight_namespaces() -> dict[str, SingleFlight]:
+    """Every SingleFlight created in this process, by namespace."""
+    with _namespaces_lock:
+        return dict(_namespaces)
@@ -0,0 +1,97 @@
+"""Grid-hashed proximity deduplication for point records.
+
+Buckets points into square lat/lng cells the size of the match tolerance
+(~50m by default), so a proximity lookup only inspects the 3x3 block of
+neighbouring cells instead of every stored point.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# ~50m at our latitudes; matches the historical abs(dlat/dlng) < 0.0005 check
+DEDUP_TOLERANCE_DEG = 0.0005
+
+
+class SpatialHash(Generic[T]):
+    """Point index answering "first stored item within tolerance" queries."""
+
+    def __init__(self, tolerance_deg: float = DEDUP_TOLERANCE_DEG):
+        self.tolerance = tolerance_deg
+        self._cells: dict[tuple[int, int], list[tuple[int, float, float, T]]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.tolerance), math.floor(lng / self.tolerance)
+
+    def add(self, lat: float, lng: float, item: T) -> None:
+        """Store an item at a coordinate (insertion order breaks ties in find_near)."""
+        self._cells.setdefault(self._cell(lat, lng), []).append((self._count, lat, lng, item))
+        self._count += 1
+
+    def find_near(self, lat: float, lng: float) -> Optional[T]:
+        """
+        Return the earliest-added item within tolerance of (lat, lng), or None.
+
+        Matches use the same box test as the original linear scan:
+        abs(dlat) < tolerance and abs(dlng) < tolerance.
+        """
+        cell_lat, cell_lng = self._cell(lat, lng)
+        best: Optional[tuple[int, T]] = None
+        for dlat in (-1, 0, 1):
+            for dlng in (-1, 0, 1):
+                for order, slat, slng, item in self._cells.get((cell_lat + dlat, cell_lng + dlng), ()):
+                    if abs(lat - slat) < self.tolerance and abs(lng - slng) < self.tolerance:
+                        if best is None or order < best[0]:
+                            best = (order, item)
+        return best[1] if best else None
+
+
+@dataclass
+class DedupResult(Generic[T]):
+    """Outcome of dedupe_by_proximity()."""
+    kept: list[T] = field(default_factory=list)
+    # key of each dropped record -> key of the preferred record it was merged into
+    merged_into: dict[Hashable, Hashable] = field(default_factory=dict)
+
+    @property
+    def removed(self) -> int:
+        return len(self.merged_into)
+
+
+def dedupe_by_proximity(
+    preferred: Iterable[T],
+    candidates: Iterable[T],
+    coords: Callable[[T], tuple[Optional[float], Optional[float]]],
+    key: Callable[[T], Hashable],
+    tolerance_deg: float = DEDUP_TOLERANCE_DEG,
+) -> DedupResult[T]:
+    """
+    Drop candidates that sit within tolerance of a preferred record.
+
+    Preferred records always win (e.g. scraped listings over ATTOM parcels).
+    ``kept`` is the preferred records followed by the surviving candidates,
+    each in their original order. Records without coordinates are never
+    treated as duplicates.
+    """
+    preferred = list(preferred)
+    index: SpatialHash[Any] = SpatialHash(tolerance_deg)
+    for record in preferred:
+        lat, lng = coords(record)
+        if lat is not None and lng is not None:
+            index.add(lat, lng, record)
+
+    result: DedupResult[T] = DedupResult(kept=list(preferred))
+    for record in candidates:
+        lat, lng = coords(record)
+        match = index.find_near(lat, lng) if lat is not None and lng is not None and len(index) else None
+        if match is None:
+            result.kept.append(record)
+        else:
+            result.merged_into[key(record)] = key(match)
+    return result
@@ -0,0 +1,74 @@
+"""Per-request stage timings, reported as a Server-Timing response header.
+
+Usage:
+    timer = StageTimer()
+    with timer.stage("filter"):
+        ...
+    stores = await timer.timed("store_index", asyncio.to_thread(load))
+    timer.mark()
+    ...
+    timer.lap("score")  # time since the last mark()/lap()
+    response.headers["Server-Timing"] = timer.server_timing_header()
+
+Stages that run concurrently (asyncio.gather) are each timed on their own,
+so their durations can add up to more than the request's wall time.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """Accumulates wall-clock milliseconds per named stage."""
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._lap_started = self._started
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed_ms
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        with self.stage(name):
+            return await awaitable
+
+    def mark(self):
+        """Start timing the next lap() from now."""
+        self._lap_started = time.perf_counter()
+
+    def lap(self, name: str):
+        """Record the time since the previous mark()/lap() as stage `name`."""
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + (now - self._lap_started) * 1000
+        self._lap_started = now
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def server_timing_header(self) -> str:
+        """Server-Timing header value: `stage;dur=ms, ..., total;dur=ms`."""
+        entries = [f"{name};dur={ms:.1f}" for name, ms in self.stages.items()]
+        entries.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(entries)
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    """Inverse of StageTimer.server_timing_header (used by benchmarks/)."""
+    stages = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and value:
+                stages[name] = float(value)
+    return stages
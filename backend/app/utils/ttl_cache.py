@@ -0,0 +1,379 @@
+"""Bounded in-memory LRU cache with per-namespace TTL and memory accounting.
+
+Replaces the plain module-level dicts that used to back viewport_cache,
+mapbox_matrix and the traffic route. Those never evicted expired entries, so a
+long-running worker grew without bound as users panned across states.
+
+Each cache is one namespace with its own TTL and limits:
+
+    _attom_cache = TTLCache("attom", ttl_seconds=3600, max_entries=500,
+                            max_bytes=64 * MB, compress_min_bytes=64 * KB)
+    _attom_cache.set(key, properties)
+    properties = _attom_cache.get(key)   # None when missing or expired
+
+- Least recently used entries are evicted once max_entries or max_bytes is
+  exceeded; expired entries are dropped on access and swept periodically.
+- Entry size is the pickled size of the value. Values at least
+  compress_min_bytes large are stored pickled + zlib-compressed and
+  unpickled on every get (callers receive a fresh copy).
+- Every cache registers itself by name so stats can be reported together
+  (see get_cache_namespaces).
+- Namespaces created with l2=True are backed by the shared second tier
+  (app/utils/cache_backends.py): reads go L1 -> L2 -> caller's upstream
+  fetch, writes populate both, so workers share entries and survive restarts.
+  Keys are converted with str() for L2.
+- L2 is blocking I/O (SQLite, LMDB, Redis), so async code must read through
+  aget() / aget_with_timestamp() / aget_allow_stale(), which check L1 in
+  place and run the L2 read in a worker thread. Writes (set, delete, clear)
+  made while an event loop is running hand the L2 write to the loop's
+  default executor; L1 is updated immediately either way.
+- stale_grace_seconds enables stale-while-revalidate: get() still only
+  returns fresh entries, but get_allow_stale() also returns entries up to
+  ttl_seconds + stale_grace_seconds old (the hard max staleness), flagged
+  stale so the caller can serve them and refresh in the background. Set
+  CACHE_STALE_WHILE_REVALIDATE=false to disable stale reads everywhere.
+"""
+
+import asyncio
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Generic, Hashable, Optional, TypeVar
+
+from app.core.config import settings
+from app.utils.cache_backends import CacheBackend, get_l2_backend
+
+V = TypeVar("V")
+
+KB = 1024
+MB = 1024 * KB
+
+DEFAULT_MAX_ENTRIES = 1024
+COMPRESSION_LEVEL = 1  # favour speed; property/GeoJSON payloads still shrink ~5-10x
+
+# L2 payload prefix: pickled value, or zlib-compressed pickled value
+_L2_PLAIN = b"p"
+_L2_ZLIB = b"z"
+
+_namespaces: dict[str, "TTLCache"] = {}
+_namespaces_lock = threading.Lock()
+
+
+@dataclass
+class _Entry:
+    value: Any           # the value itself, or zlib(pickle(value)) when compressed
+    stored_at: float
+    size: int            # bytes accounted against max_bytes
+    compressed: bool = False
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU + TTL cache bounded by entry count and (optionally) bytes."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: Optional[int] = None,
+        compress_min_bytes: Optional[int] = None,
+        l2: bool = False,
+        stale_grace_seconds: float = 0,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.l2 = l2
+        self.stale_grace_seconds = stale_grace_seconds
+        self.max_age_seconds = ttl_seconds + stale_grace_seconds
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+
+        self.hits = 0
+        self.l2_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        with _namespaces_lock:
+            _namespaces[namespace] = self
+
+    # --- Reads ---
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Cached value for key, or None when missing or expired."""
+        found = self.get_with_timestamp(key)
+        return found[0] if found is not None else None
+
+    def get_with_timestamp(self, key: Hashable) -> Optional[tuple[V, float]]:
+        """(value, stored_at epoch seconds), or None when missing or expired."""
+        found = self._lookup(key, max_age=self.ttl_seconds)
+        return found[:2] if found is not None else None
+
+    def get_allow_stale(self, key: Hashable) -> Optional[tuple[V, bool]]:
+        """
+        (value, is_stale), or None when missing or past the max staleness.
+
+        Stale entries (older than the TTL, within the grace window) should be
+        served and refreshed in the background by the caller.
+        """
+        return self._count_stale(self._lookup(key, max_age=self._stale_max_age()))
+
+    # --- Async reads (L2 off the event loop) ---
+
+    async def aget(self, key: Hashable) -> Optional[V]:
+        """get() for async code: a miss in L1 reads L2 in a worker thread."""
+        found = await self.aget_with_timestamp(key)
+        return found[0] if found is not None else None
+
+    async def aget_with_timestamp(self, key: Hashable) -> Optional[tuple[V, float]]:
+        found = await self._alookup(key, max_age=self.ttl_seconds)
+        return found[:2] if found is not None else None
+
+    async def aget_allow_stale(self, key: Hashable) -> Optional[tuple[V, bool]]:
+        return self._count_stale(await self._alookup(key, max_age=self._stale_max_age()))
+
+    def _stale_max_age(self) -> float:
+        return self.max_age_seconds if settings.CACHE_STALE_WHILE_REVALIDATE else self.ttl_seconds
+
+    def _count_stale(self, found: Optional[tuple[V, float, bool]]) -> Optional[tuple[V, bool]]:
+        if found is None:
+            return None
+        value, stored_at, stale = found
+        if stale:
+            with self._lock:
+                self.stale_hits += 1
+        return value, stale
+
+    def _lookup(self, key: Hashable, max_age: float) -> Optional[tuple[V, float, bool]]:
+        """
+        Entry younger than max_age as (value, stored_at, is_stale), from L1 or L2.
+
+        A stale L1 entry is only used when L2 has nothing fresher (another
+        worker may already have refreshed it).
+        """
+        now = time.time()
+        fresh, entry = self._get_l1(key, now)
+        if fresh is not None:
+            return self._decode(fresh), fresh.stored_at, False
+        found = self._get_l2(key, self.ttl_seconds if entry is not None else max_age)
+        return self._resolve(found, entry, now, max_age)
+
+    async def _alookup(self, key: Hashable, max_age: float) -> Optional[tuple[V, float, bool]]:
+        """_lookup() with the L2 read run in a worker thread."""
+        now = time.time()
+        fresh, entry = self._get_l1(key, now)
+        if fresh is not None:
+            return self._decode(fresh), fresh.stored_at, False
+        found = None
+        if self.l2:
+            found = await asyncio.to_thread(
+                self._get_l2, key, self.ttl_seconds if entry is not None else max_age
+            )
+        return self._resolve(found, entry, now, max_age)
+
+    def _get_l1(self, key: Hashable, now: float) -> tuple[Optional[_Entry], Optional[_Entry]]:
+        """(fresh L1 entry or None, L1 entry still within the max staleness or None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.stored_at >= self.max_age_seconds:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None and now - entry.stored_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry, entry
+            return None, entry
+
+    def _resolve(
+        self, found: Optional[tuple[V, float]], entry: Optional[_Entry], now: float, max_age: float,
+    ) -> Optional[tuple[V, float, bool]]:
+        """Combine an L2 result with the (non-fresh) L1 entry; decompresses outside the lock."""
+        if found is None and entry is not None and now - entry.stored_at < max_age:
+            with self._lock:
+                self.hits += 1
+            return self._decode(entry), entry.stored_at, True
+        with self._lock:
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.l2_hits += 1
+        value, stored_at = found
+        return value, stored_at, now - stored_at >= self.ttl_seconds
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.time() - entry.stored_at < self.ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- Writes ---
+
+    def set(self, key: Hashable, value: V, stored_at: Optional[float] = None):
+        """Store value (stored_at defaults to now), evicting LRU entries past the limits."""
+        entry, payload = self._encode(value, stored_at if stored_at is not None else time.time())
+        backend = self._l2_backend()
+        if backend is not None:
+            _write_l2(backend.set, self.namespace, str(key), payload, entry.stored_at, self.max_age_seconds)
+        self._set_l1(key, entry)
+
+    def _set_l1(self, key: Hashable, entry: "_Entry"):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and entry.size > self.max_bytes:
+                # Larger than the whole budget: caching it would evict everything else
+                return
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._enforce_limits()
+            self._maybe_sweep()
+
+    def delete(self, key: Hashable) -> bool:
+        backend = self._l2_backend()
+        if backend is not None:
+            _write_l2(backend.delete, self.namespace, str(key))
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self, include_l2: bool = True):
+        """Drop every entry (and, by default, this namespace's shared L2 entries)."""
+        backend = self._l2_backend()
+        if include_l2 and backend is not None:
+            _write_l2(backend.clear, self.namespace)
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # --- Stats ---
+
+    def stats(self) -> dict:
+        backend = self._l2_backend()
+        with self._lock:
+            now = time.time()
+            valid = sum(1 for e in self._entries.values() if now - e.stored_at < self.ttl_seconds)
+            stale = sum(
+                1 for e in self._entries.values()
+                if self.ttl_seconds <= now - e.stored_at < self.max_age_seconds
+            )
+            compressed = sum(1 for e in self._entries.values() if e.compressed)
+            ages = [now - e.stored_at for e in self._entries.values()]
+            return {
+                "total_entries": len(self._entries),
+                "valid_entries": valid,
+                "stale_entries": stale,
+                "expired_entries": len(self._entries) - valid - stale,
+                "compressed_entries": compressed,
+                "total_bytes": self._bytes,
+                "avg_age_seconds": round(sum(ages) / len(ages), 1) if ages else None,
+                "ttl_seconds": self.ttl_seconds,
+                "stale_grace_seconds": self.stale_grace_seconds,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "l2_hits": self.l2_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "l2_backend": backend.name if backend else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    # --- Internals (callers hold self._lock) ---
+
+    def _encode(self, value: V, stored_at: float) -> tuple[_Entry, bytes]:
+        """L1 entry plus the equivalent L2 payload."""
+        pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.compress_min_bytes is not None and len(pickled) >= self.compress_min_bytes:
+            packed = zlib.compress(pickled, COMPRESSION_LEVEL)
+            return _Entry(packed, stored_at, len(packed), compressed=True), _L2_ZLIB + packed
+        return _Entry(value, stored_at, len(pickled)), _L2_PLAIN + pickled
+
+    @staticmethod
+    def _decode(entry: _Entry):
+        if entry.compressed:
+            return pickle.loads(zlib.decompress(entry.value))
+        return entry.value
+
+    def _l2_backend(self) -> Optional[CacheBackend]:
+        return get_l2_backend() if self.l2 else None
+
+    def _get_l2(self, key: Hashable, max_age: float) -> Optional[tuple[V, float]]:
+        """Read through to L2 and promote the entry into L1 (not under the lock)."""
+        backend = self._l2_backend()
+        if backend is None:
+            return None
+        found = backend.get(self.namespace, str(key))
+        if found is None:
+            return None
+        payload, stored_at = found
+        if time.time() - stored_at >= max_age:
+            return None
+        try:
+            if payload[:1] == _L2_ZLIB:
+                packed = payload[1:]
+                entry = _Entry(packed, stored_at, len(packed), compressed=True)
+                value = pickle.loads(zlib.decompress(packed))
+            else:
+                value = pickle.loads(payload[1:])
+                entry = _Entry(value, stored_at, len(payload) - 1)
+        except Exception:
+            # Written by an incompatible version of the code; treat as a miss
+            return None
+        self._set_l1(key, entry)
+        return value, stored_at
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _enforce_limits(self):
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _maybe_sweep(self):
+        """Drop entries past the max staleness at most every 5 minutes (entries aren't expiry-ordered)."""
+        now = time.time()
+        if now - self._last_sweep < min(self.max_age_seconds, 300):
+            return
+        self._last_sweep = now
+        expired = [k for k, e in self._entries.items() if now - e.stored_at >= self.max_age_seconds]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+
+
+def _write_l2(operation, *args):
+    """Run an L2 write, in the default executor when called from a running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        operation(*args)  # scripts and worker threads: write through
+        return
+    loop.run_in_executor(None, operation, *args)
+
+
+def get_cache_namespaces() -> dict[str, TTLCache]:
+    """Every TTLCache created in this process, by namespace."""
+    with _namespaces_lock:
+        return dict(_namespaces)
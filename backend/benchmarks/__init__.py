@@ -0,0 +1 @@
+"""Offline performance benchmarks (synthetic data + recorded upstream payloads)."""
@@ -0,0 +1,26 @@
+"""Benchmark metros: where synthetic data is seeded and viewports are centred.
+
+Kept free of app imports so the runner can load it before the app's settings
+are configured.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Metro:
+    name: str
+    county: str
+    state: str
+    lat: float
+    lng: float
+    spread_deg: float  # std dev of the point cloud
+    weight: float      # share of generated rows
+
+
+METROS = [
+    Metro("Des Moines", "Polk County", "IA", 41.5868, -93.6250, 0.12, 0.30),
+    Metro("Omaha", "Douglas County", "NE", 41.2565, -96.0045, 0.12, 0.25),
+    Metro("Las Vegas", "Clark County", "NV", 36.1699, -115.1398, 0.15, 0.30),
+    Metro("Boise", "Ada County", "ID", 43.6150, -116.2023, 0.10, 0.15),
+]
@@ -0,0 +1,191 @@
+"""
+Minimal in-memory Redis-protocol server for benchmarking the L2 cache.
+
+Implements only what RedisCacheBackend uses (GET, SET with PX/EX, DEL,
+UNLINK, EXISTS, SCAN MATCH/COUNT, FLUSHDB, PING, plus the HELLO/CLIENT/SELECT
+handshake redis-py sends, over RESP2 or RESP3), so `--l2 redis` runs need no
+Redis install:
+
+    python -m benchmarks.resp_standin --port 6390
+    CACHE_L2_BACKEND=redis CACHE_L2_REDIS_URL=redis://127.0.0.1:6390/0 uvicorn app.main:app
+
+Not a Redis replacement: single keyspace, no persistence, no eviction.
+"""
+
+import argparse
+import fnmatch
+import logging
+import socketserver
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Store:
+    def __init__(self):
+        self.data: dict[bytes, tuple[bytes, Optional[float]]] = {}  # key -> (value, expires_at)
+        self.lock = threading.Lock()
+        self.commands = 0
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def live_keys(self) -> list[bytes]:
+        return [k for k in list(self.data) if self.get(k) is not None]
+
+
+def _encode(reply, resp3: bool = False) -> bytes:
+    if reply is None:
+        return b"_\r\n" if resp3 else b"$-1\r\n"
+    if isinstance(reply, dict):
+        items = [x for pair in reply.items() for x in pair]
+        if resp3:
+            return b"%%%d\r\n" % len(reply) + b"".join(_encode(x, resp3) for x in items)
+        return _encode(items)
+    if isinstance(reply, bool):
+        return b":1\r\n" if reply else b":0\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode(item, resp3) for item in reply)
+    if isinstance(reply, Exception):
+        return f"-ERR {reply}\r\n".encode()
+    return f"+{reply}\r\n".encode()  # simple string
+
+
+class RespStandin:
+    """Threaded TCP server speaking enough RESP2/RESP3 for the L2 cache backend."""
+
+    def __init__(self, port: int = 0):
+        self.store = _Store()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RespStandin":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Redis-protocol stand-in listening on {self.url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # --- Commands ---
+
+    def execute(self, args: list[bytes]):
+        store = self.store
+        command = args[0].upper().decode()
+        with store.lock:
+            store.commands += 1
+            if command == "PING":
+                return "PONG"
+            if command in ("CLIENT", "SELECT"):
+                return "OK"
+            if command == "GET":
+                return store.get(args[1])
+            if command == "SET":
+                expires_at = None
+                options = [a.upper() for a in args[3:]]
+                if b"NX" in options and store.get(args[1]) is not None:
+                    return None
+                for i, option in enumerate(options):
+                    if option == b"PX":
+                        expires_at = time.time() + int(args[4 + i]) / 1000
+                    elif option == b"EX":
+                        expires_at = time.time() + int(args[4 + i])
+                store.data[args[1]] = (args[2], expires_at)
+                return "OK"
+            if command in ("DEL", "UNLINK"):
+                return sum(1 for key in args[1:] if store.data.pop(key, None) is not None)
+            if command == "EXISTS":
+                return sum(1 for key in args[1:] if store.get(key) is not None)
+            if command == "SCAN":
+                # Single pass: return everything matching with cursor 0
+                pattern = None
+                options = [a.upper() for a in args[2:]]
+                if b"MATCH" in options:
+                    pattern = args[2 + options.index(b"MATCH") + 1].decode()
+                keys = [k for k in store.live_keys() if pattern is None or fnmatch.fnmatchcase(k.decode(), pattern)]
+                return [b"0", keys]
+            if command == "FLUSHDB":
+                store.data.clear()
+                return "OK"
+            if command == "DBSIZE":
+                return len(store.live_keys())
+        return ValueError(f"unknown command '{command}'")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def _read_command(self) -> Optional[list[bytes]]:
+                line = self.rfile.readline()
+                if not line:
+                    return None
+                if not line.startswith(b"*"):
+                    return line.strip().split()  # inline command
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                return args
+
+            def handle(self):
+                resp3 = False
+                while True:
+                    try:
+                        args = self._read_command()
+                    except (ConnectionError, ValueError):
+                        return
+                    if args is None:
+                        return
+                    if not args:
+                        continue
+                    if args[0].upper() == b"HELLO":
+                        version = int(args[1]) if len(args) > 1 else 2
+                        resp3 = version == 3
+                        reply = {b"server": b"resp-standin", b"version": b"7.0.0", b"proto": version,
+                                 b"id": 1, b"mode": b"standalone", b"role": b"master", b"modules": []}
+                    else:
+                        reply = server.execute(args)
+                    self.wfile.write(_encode(reply, resp3))
+                    self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minimal Redis-protocol server for L2 cache benchmarks")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    server = RespStandin(args.port).start()
+    print(f"export CACHE_L2_BACKEND=redis CACHE_L2_REDIS_URL={server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
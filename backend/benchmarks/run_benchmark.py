@@ -0,0 +1,293 @@
+"""
+Offline latency benchmark for opportunity search.
+
+Starts the upstream stand-ins (benchmarks/standins.py), points the app's
+ATTOM / ArcGIS / Census / Mapbox base URLs at them, then drives
+POST /api/v1/opportunities/search in-process over representative viewports
+(neighborhood, city and metro zoom around each benchmark metro) and reports
+p50/p95/p99 end-to-end latency plus per-stage timings taken from the
+Server-Timing response header.
+
+Uses the database from DATABASE_URL; seed it first with
+benchmarks/seed_data.py for the local-properties path.
+
+Usage:
+    python -m benchmarks.run_benchmark
+    python -m benchmarks.run_benchmark --properties local --demographics arcgis --cache cold
+    python -m benchmarks.run_benchmark --latency attom=800 --iterations 50 --concurrency 8
+    python -m benchmarks.run_benchmark --endpoint stream --json results.json
+    python -m benchmarks.run_benchmark --l2 redis --cache l2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from benchmarks.metros import METROS
+from benchmarks.resp_standin import RespStandin
+from benchmarks.standins import DEFAULT_JITTER, StandinServer, parse_latency, standin_settings
+
+logger = logging.getLogger(__name__)
+
+# Viewport half-height in degrees per zoom level (width scaled by latitude)
+VIEWPORT_ZOOMS = {
+    "neighborhood": 0.025,
+    "city": 0.1,
+    "metro": 0.3,
+}
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class Viewport:
+    name: str
+    min_lat: float
+    max_lat: float
+    min_lng: float
+    max_lng: float
+
+    def panned(self, rng: random.Random, fraction: float) -> "Viewport":
+        """Same-size viewport shifted by up to `fraction` of its size (simulates map panning)."""
+        if fraction <= 0:
+            return self
+        dlat = (self.max_lat - self.min_lat) * rng.uniform(-fraction, fraction)
+        dlng = (self.max_lng - self.min_lng) * rng.uniform(-fraction, fraction)
+        return Viewport(self.name, self.min_lat + dlat, self.max_lat + dlat, self.min_lng + dlng, self.max_lng + dlng)
+
+
+@dataclass
+class Sample:
+    viewport: str
+    status: int
+    latency_ms: float
+    stages: dict[str, float] = field(default_factory=dict)
+    opportunities: int = 0
+
+
+def representative_viewports(zooms: list[str]) -> list[Viewport]:
+    viewports = []
+    for metro in METROS:
+        for zoom in zooms:
+            half_lat = VIEWPORT_ZOOMS[zoom]
+            half_lng = half_lat / math.cos(math.radians(metro.lat))
+            viewports.append(Viewport(
+                f"{metro.name} {zoom}",
+                metro.lat - half_lat, metro.lat + half_lat,
+                metro.lng - half_lng, metro.lng + half_lng,
+            ))
+    return viewports
+
+
+def percentile_summary(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {f"p{p}": float("nan") for p in PERCENTILES}
+    return {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+
+
+def configure_environment(args, base_url: str, redis_url: str = ""):
+    """Env overrides must be set before the app (and its Settings) is imported."""
+    os.environ.update(standin_settings(base_url))
+    # Stand-ins accept any key; real keys are never sent anywhere
+    for key in ("ATTOM_API_KEY", "ARCGIS_API_KEY", "MAPBOX_ACCESS_TOKEN"):
+        os.environ[key] = "benchmark"
+    os.environ.pop("CENSUS_API_KEY", None)
+
+    local_properties = args.properties == "local"
+    local_demographics = args.demographics == "local"
+    os.environ["ENABLE_LOCAL_PROPERTIES"] = str(local_properties).lower()
+    os.environ["ENABLE_LOCAL_DEMOGRAPHICS"] = str(local_demographics).lower()
+    os.environ["DATA_SOURCE_MODE"] = "local" if (local_properties or local_demographics) else "external"
+    os.environ.setdefault("DEBUG", "false")
+
+    # Stand-ins have no quotas: lift provider rate limits unless measuring them
+    if not args.rate_limits:
+        os.environ["PROVIDER_RATE_LIMITS"] = json.dumps({"*": {"rate": 1e6, "burst": 1000000, "concurrency": 1000}})
+
+    # L2 tier: a throwaway SQLite file, the Redis-protocol stand-in, or off
+    os.environ["CACHE_L2_BACKEND"] = args.l2
+    if args.l2 == "sqlite":
+        os.environ["CACHE_L2_PATH"] = tempfile.mkdtemp(prefix="l2-benchmark-")
+    elif args.l2 == "redis":
+        os.environ["CACHE_L2_REDIS_URL"] = redis_url
+
+
+def clear_process_caches(include_l2: bool = True):
+    from app.services.mapbox_matrix import clear_matrix_cache
+    from app.services.store_index import invalidate_store_index
+    from app.services.viewport_cache import clear_viewport_caches
+
+    clear_viewport_caches(include_l2=include_l2)
+    clear_matrix_cache(include_l2=include_l2)
+    invalidate_store_index()
+
+
+async def run(args) -> list[Sample]:
+    import httpx
+
+    from app.main import app
+    from app.utils.timing import parse_server_timing
+
+    path = "/api/v1/opportunities/search" + ("/stream" if args.endpoint == "stream" else "")
+    rng = random.Random(args.seed)
+    viewports = representative_viewports(args.zooms)
+    samples: list[Sample] = []
+
+    def payload(viewport: Viewport) -> dict:
+        return {
+            "min_lat": viewport.min_lat, "max_lat": viewport.max_lat,
+            "min_lng": viewport.min_lng, "max_lng": viewport.max_lng,
+            "limit": args.limit,
+        }
+
+    async def one(client, viewport: Viewport) -> Sample:
+        started = time.perf_counter()
+        response = await client.post(path, json=payload(viewport))
+        body = response.content
+        latency = (time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            logger.warning(f"{viewport.name}: HTTP {response.status_code} {body[:300]!r}")
+        if args.endpoint == "stream":
+            count = max(0, body.count(b"\n") - 1)
+        else:
+            count = len(json.loads(body).get("opportunities", [])) if response.status_code == 200 else 0
+        return Sample(
+            viewport=viewport.name,
+            status=response.status_code,
+            latency_ms=latency,
+            stages=parse_server_timing(response.headers.get("server-timing", "")),
+            opportunities=count,
+        )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=300.0) as client:
+        for viewport in viewports:
+            if args.cache in ("warm", "l2"):
+                await one(client, viewport)  # populate caches, not recorded
+            remaining = args.iterations
+            while remaining > 0:
+                batch = min(args.concurrency, remaining)
+                if args.cache == "cold":
+                    clear_process_caches()
+                elif args.cache == "l2":
+                    clear_process_caches(include_l2=False)  # a fresh worker sharing the L2
+                results = await asyncio.gather(*[
+                    one(client, viewport.panned(rng, args.pan)) for _ in range(batch)
+                ])
+                samples.extend(results)
+                remaining -= batch
+            logger.info(f"{viewport.name}: {args.iterations} requests done")
+    return samples
+
+
+def report(samples: list[Sample], standin_requests: dict[str, int]):
+    def row(label: str, group: list[Sample]):
+        latencies = [s.latency_ms for s in group]
+        summary = percentile_summary(latencies)
+        errors = sum(1 for s in group if s.status >= 400)
+        found = np.mean([s.opportunities for s in group]) if group else 0
+        print(f"{label:<26} {len(group):>5} {errors:>4} "
+              f"{summary['p50']:>9.1f} {summary['p95']:>9.1f} {summary['p99']:>9.1f} {found:>7.1f}")
+
+    print()
+    print(f"{'viewport':<26} {'n':>5} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'found':>7}")
+    print("-" * 74)
+    for name in dict.fromkeys(s.viewport for s in samples):
+        row(name, [s for s in samples if s.viewport == name])
+    print("-" * 74)
+    row("all", samples)
+
+    stage_names = list(dict.fromkeys(name for s in samples for name in s.stages))
+    if stage_names:
+        print()
+        print(f"{'stage (Server-Timing)':<26} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        print("-" * 62)
+        for name in stage_names:
+            values = [s.stages[name] for s in samples if name in s.stages]
+            summary = percentile_summary(values)
+            print(f"{name:<26} {len(values):>5} {summary['p50']:>9.1f} {summary['p95']:>9.1f} {summary['p99']:>9.1f}")
+
+    print()
+    print("Upstream stand-in requests: " + (
+        ", ".join(f"{k}={v}" for k, v in sorted(standin_requests.items())) or "none"
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark opportunity search against local stand-ins")
+    parser.add_argument("--properties", choices=["attom", "local"], default="attom",
+                        help="Candidate source: ATTOM stand-in or seeded county_properties")
+    parser.add_argument("--demographics", choices=["arcgis", "local"], default="arcgis",
+                        help="Demographics source: ArcGIS stand-in or local census tables")
+    parser.add_argument("--endpoint", choices=["search", "stream"], default="search")
+    parser.add_argument("--cache", choices=["cold", "warm", "l2"], default="cold",
+                        help="cold: clear all caches before each batch; warm: prime each viewport once; "
+                             "l2: prime once, then clear only in-process caches before each batch")
+    parser.add_argument("--l2", choices=["none", "sqlite", "redis"], default="none",
+                        help="Shared L2 cache tier (redis uses the in-process RESP stand-in)")
+    parser.add_argument("--rate-limits", action="store_true",
+                        help="Keep production provider rate limits (default: lifted for stand-ins)")
+    parser.add_argument("--iterations", type=int, default=20, help="Requests per viewport")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent requests per batch")
+    parser.add_argument("--zooms", default="neighborhood,city,metro",
+                        help=f"Comma-separated viewport sizes ({', '.join(VIEWPORT_ZOOMS)})")
+    parser.add_argument("--pan", type=float, default=0.0,
+                        help="Random pan per request as a fraction of viewport size (0 = identical requests)")
+    parser.add_argument("--limit", type=int, default=50, help="Opportunities per search")
+    parser.add_argument("--latency", default="", help='Stand-in latency ms, e.g. "attom=250,arcgis=400" or "0"')
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="Stand-in latency jitter fraction")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write raw samples to this file")
+    args = parser.parse_args()
+    args.zooms = [z.strip() for z in args.zooms.split(",") if z.strip()]
+    unknown = [z for z in args.zooms if z not in VIEWPORT_ZOOMS]
+    if unknown:
+        parser.error(f"unknown zoom(s): {', '.join(unknown)}")
+    if args.cache == "l2" and args.l2 == "none":
+        parser.error("--cache l2 needs --l2 sqlite or --l2 redis")
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    standins = StandinServer(latency_ms=parse_latency(args.latency), jitter=args.jitter).start()
+    resp = RespStandin().start() if args.l2 == "redis" else None
+    try:
+        configure_environment(args, standins.base_url, resp.url if resp else "")
+        started = time.time()
+        samples = asyncio.run(run(args))
+        elapsed = time.time() - started
+    finally:
+        standins.stop()
+        if resp:
+            resp.stop()
+
+    print(f"\n{len(samples)} requests in {elapsed:.1f}s "
+          f"(properties={args.properties}, demographics={args.demographics}, "
+          f"endpoint={args.endpoint}, cache={args.cache}, l2={args.l2}, concurrency={args.concurrency})")
+    report(samples, standins.stats.snapshot())
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "args": {k: v for k, v in vars(args).items() if k != "json_path"},
+                "samples": [s.__dict__ for s in samples],
+                "standin_requests": standins.stats.snapshot(),
+            }, f, indent=2)
+        print(f"Raw samples written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Seed the database with synthetic county_properties, stores and scraped_listings.
+
+Rows are clustered around the benchmark metros (see METROS) with realistic
+mixes of property indicators, land uses, lot/building sizes and distress
+flags, so opportunity search exercises the same filters and scoring paths as
+real county data. Every row is tagged so it can be removed again:
+
+- county_properties: import_batch_id = "benchmark"
+- stores:            store_name LIKE "Benchmark Store %"
+- scraped_listings:  external_id LIKE "bench-%"
+
+Usage:
+    python -m benchmarks.seed_data --properties 100000
+    python -m benchmarks.seed_data --properties 1000000 --reset
+    python -m benchmarks.seed_data --reset-only
+"""
+
+import argparse
+import logging
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert
+
+from app.core.database import Base, SessionLocal, engine
+from app.models.county_property import CountyProperty
+from app.models.opportunity_score import OpportunityScore
+from app.models.scraped_listing import ScrapedListing
+from app.models.store import Brand, Store
+from benchmarks.metros import METROS, Metro
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_BATCH_ID = "benchmark"
+BENCHMARK_STORE_PREFIX = "Benchmark Store"
+BENCHMARK_EXTERNAL_PREFIX = "bench-"
+INSERT_CHUNK_SIZE = 5000
+
+
+# (property_indicator, property_type_raw, land uses, weight)
+PROPERTY_MIX = [
+    ("80", "VACANT LAND", ["VACANT COMMERCIAL LAND", "COMMERCIAL ACREAGE", "VACANT LAND"], 0.30),
+    ("25", "RETAIL", ["STORE BUILDING", "RETAIL TRADE", "RESTAURANT BUILDING", "CONVENIENCE STORE"], 0.30),
+    ("27", "OFFICE", ["OFFICE BUILDING", "PROFESSIONAL BUILDING", "MEDICAL OFFICE"], 0.20),
+    ("20", "COMMERCIAL", ["COMMERCIAL (GENERAL)", "SHOPPING CENTER", "STRIP CENTER"], 0.10),
+    ("50", "INDUSTRIAL", ["WAREHOUSE", "LIGHT INDUSTRIAL"], 0.10),
+]
+
+STORE_BRANDS = [
+    (Brand.VERIZON_CORPORATE.value, 0.25),
+    (Brand.RUSSELL_CELLULAR.value, 0.20),
+    (Brand.VICTRA.value, 0.20),
+    (Brand.TMOBILE.value, 0.20),
+    (Brand.USCELLULAR.value, 0.10),
+    (Brand.CSOKI.value, 0.05),
+]
+
+STREETS = ["Main St", "University Ave", "Center St", "Grand Ave", "Oak St", "Maple Ave",
+           "Washington St", "Park Ave", "Lake Rd", "Commerce Dr", "Market St", "Airport Rd"]
+
+
+def _weighted(rng: random.Random, items, weight_index: int = -1):
+    return rng.choices(items, weights=[item[weight_index] for item in items])[0]
+
+
+def _point(rng: random.Random, metro: Metro) -> tuple[float, float]:
+    lat = metro.lat + rng.gauss(0, metro.spread_deg)
+    lng = metro.lng + rng.gauss(0, metro.spread_deg / math.cos(math.radians(metro.lat)))
+    return round(lat, 6), round(lng, 6)
+
+
+def _pick_metro(rng: random.Random) -> Metro:
+    return rng.choices(METROS, weights=[m.weight for m in METROS])[0]
+
+
+def _county_property_row(rng: random.Random, i: int) -> dict:
+    metro = _pick_metro(rng)
+    lat, lng = _point(rng, metro)
+    indicator, type_raw, land_uses, _ = _weighted(rng, PROPERTY_MIX)
+    lot_acres = round(rng.lognormvariate(0.0, 0.6), 3)
+    building_sqft = None if indicator == "80" else float(rng.randint(1200, 20000))
+    assessed = float(rng.randint(50_000, 4_000_000))
+    vacant = rng.random() < (0.6 if indicator == "80" else 0.12)
+    return {
+        "source_county": f"{metro.county}, {metro.state}",
+        "source_state": metro.state,
+        "parcel_id": f"BENCH-{i:08d}",
+        "address": f"{rng.randint(100, 19999)} {rng.choice(STREETS)}",
+        "city": metro.name,
+        "state": metro.state,
+        "zip_code": f"{rng.randint(10000, 99999)}",
+        "latitude": lat,
+        "longitude": lng,
+        "property_indicator": indicator,
+        "property_type_raw": type_raw,
+        "land_use": rng.choice(land_uses),
+        "year_built": None if indicator == "80" else rng.randint(1950, 2020),
+        "building_sqft": building_sqft,
+        "lot_size_sqft": round(lot_acres * 43560),
+        "lot_size_acres": lot_acres,
+        "owner_name": f"OWNER {i} LLC",
+        "owner_state": metro.state if rng.random() < 0.8 else rng.choice(["CA", "TX", "FL", "NY"]),
+        "owner_type": rng.choice(["individual", "corporate", "trust", "estate"]),
+        "assessed_value": assessed,
+        "prior_assessed_value": round(assessed / rng.uniform(0.9, 1.3)),
+        "market_value": round(assessed * rng.uniform(1.0, 1.4)),
+        "last_sale_date": f"{rng.randint(1980, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "last_sale_price": float(rng.randint(40_000, 3_000_000)),
+        "tax_delinquent": rng.random() < 0.04,
+        "foreclosure_status": "pre-foreclosure" if rng.random() < 0.01 else None,
+        "occupancy_status": "vacant" if vacant else "occupied",
+        "vacancy_indicator": vacant,
+        "import_source": "benchmarks/seed_data.py",
+        "import_batch_id": BENCHMARK_BATCH_ID,
+    }
+
+
+def _store_row(rng: random.Random, i: int) -> dict:
+    metro = _pick_metro(rng)
+    lat, lng = _point(rng, metro)
+    return {
+        "brand": _weighted(rng, STORE_BRANDS)[0],
+        "street": f"{rng.randint(100, 19999)} {rng.choice(STREETS)}",
+        "city": metro.name,
+        "state": metro.state,
+        "postal_code": f"{rng.randint(10000, 99999)}",
+        "latitude": lat,
+        "longitude": lng,
+        "store_name": f"{BENCHMARK_STORE_PREFIX} {i}",
+    }
+
+
+def _scraped_listing_row(rng: random.Random, i: int) -> dict:
+    metro = _pick_metro(rng)
+    lat, lng = _point(rng, metro)
+    property_type = rng.choice(["retail", "retail", "land", "office"])
+    return {
+        "source": rng.choice(["crexi", "loopnet"]),
+        "external_id": f"{BENCHMARK_EXTERNAL_PREFIX}{i}",
+        "address": f"{rng.randint(100, 19999)} {rng.choice(STREETS)}",
+        "city": metro.name,
+        "state": metro.state,
+        "latitude": lat,
+        "longitude": lng,
+        "property_type": property_type,
+        "price": float(rng.randint(150_000, 2_500_000)),
+        "sqft": None if property_type == "land" else float(rng.randint(1500, 9000)),
+        "lot_size_acres": round(rng.uniform(0.5, 2.5), 2),
+        "transaction_type": rng.choice(["lease", "sale"]),
+        "title": f"Benchmark listing {i}",
+        "search_city": metro.name,
+        "search_state": metro.state,
+        "is_active": True,
+    }
+
+
+def _insert_rows(model, make_row, count: int, rng: random.Random):
+    started = time.time()
+    with engine.begin() as conn:
+        for start in range(0, count, INSERT_CHUNK_SIZE):
+            rows = [make_row(rng, i) for i in range(start, min(start + INSERT_CHUNK_SIZE, count))]
+            conn.execute(insert(model), rows)
+            if count > INSERT_CHUNK_SIZE:
+                logger.info(f"  {model.__tablename__}: {start + len(rows):,}/{count:,}")
+    logger.info(f"Inserted {count:,} {model.__tablename__} in {time.time() - started:.1f}s")
+
+
+def reset_benchmark_data():
+    """Delete every row this script created."""
+    db = SessionLocal()
+    try:
+        benchmark_ids = db.query(CountyProperty.id).filter(
+            CountyProperty.import_batch_id == BENCHMARK_BATCH_ID
+        )
+        scores = db.query(OpportunityScore).filter(
+            OpportunityScore.county_property_id.in_(benchmark_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+        props = db.query(CountyProperty).filter(
+            CountyProperty.import_batch_id == BENCHMARK_BATCH_ID
+        ).delete(synchronize_session=False)
+        stores = db.query(Store).filter(
+            Store.store_name.like(f"{BENCHMARK_STORE_PREFIX} %")
+        ).delete(synchronize_session=False)
+        listings = db.query(ScrapedListing).filter(
+            ScrapedListing.external_id.like(f"{BENCHMARK_EXTERNAL_PREFIX}%")
+        ).delete(synchronize_session=False)
+        db.commit()
+        logger.info(
+            f"Removed benchmark data: {props:,} properties ({scores:,} scores), "
+            f"{stores:,} stores, {listings:,} scraped listings"
+        )
+    finally:
+        db.close()
+
+
+def seed(properties: int, stores: int, listings: int, seed_value: int = 42):
+    rng = random.Random(seed_value)
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[CountyProperty.__table__, OpportunityScore.__table__, Store.__table__, ScrapedListing.__table__],
+    )
+    _insert_rows(CountyProperty, _county_property_row, properties, rng)
+    _insert_rows(Store, _store_row, stores, rng)
+    _insert_rows(ScrapedListing, _scraped_listing_row, listings, rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed synthetic data for benchmarks")
+    parser.add_argument("--properties", type=int, default=10_000, help="county_properties rows (1k-1M)")
+    parser.add_argument("--stores", type=int, default=None, help="stores rows (default: properties/100, min 200)")
+    parser.add_argument("--listings", type=int, default=None, help="scraped_listings rows (default: properties/50, min 50)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--reset", action="store_true", help="Remove previous benchmark rows first")
+    parser.add_argument("--reset-only", action="store_true", help="Only remove benchmark rows")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.reset or args.reset_only:
+        reset_benchmark_data()
+    if args.reset_only:
+        return
+
+    stores = args.stores if args.stores is not None else max(200, args.properties // 100)
+    listings = args.listings if args.listings is not None else max(50, args.properties // 50)
+    seed(args.properties, stores, listings, args.seed)
+    print("Run scripts/refresh_opportunity_scores.py to benchmark the materialized-score path.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Local HTTP stand-ins for the upstream APIs the opportunity search calls.
+
+Replays recorded payloads from benchmarks/fixtures/ with configurable
+latency so search performance can be measured offline and repeatably:
+
+    ATTOM      GET  {ATTOM_BASE_URL}/property/snapshot          attom_snapshot.json
+    ArcGIS     POST {ARCGIS_GEOENRICH_URL}                        arcgis_enrich.json
+    Census     GET  {CENSUS_API_BASE_URL}/2022/acs/acs5          census_acs.json
+               GET  {CENSUS_API_BASE_URL}/2021/cbp               census_cbp.json
+               GET  {CENSUS_GEOCODER_URL}/geographies/coordinates census_geocoder.json
+    Mapbox     GET  {MAPBOX_API_BASE_URL}/search/searchbox/v1/category/{type}
+                                                                 mapbox_category.json
+
+ATTOM properties are repeated on a fixed lattice (one copy of the recorded
+cloud per fixture-sized cell) so every location has the recorded density and
+a property always sits at the same place under the same ID; each request gets
+the radius / propertyindicator / pagesize subset, nearest first. Mapbox POIs
+are re-centred on the requested proximity point.
+
+Record mode proxies to the real APIs (keys come from the normal settings)
+and overwrites the fixture for each provider it sees:
+
+    python -m benchmarks.standins --port 8765 --record
+
+Replay mode (what run_benchmark.py starts in-process):
+
+    python -m benchmarks.standins --port 8765 --latency attom=250,arcgis=400
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Typical production latencies (ms) observed for each provider
+DEFAULT_LATENCY_MS = {
+    "attom": 350.0,
+    "arcgis": 450.0,
+    "census": 200.0,
+    "mapbox": 120.0,
+}
+DEFAULT_JITTER = 0.25  # +/- fraction of the base latency
+
+# Real upstream base URLs, used only in record mode
+UPSTREAM_URLS = {
+    "attom": "https://api.gateway.attomdata.com/propertyapi/v1.0.0",
+    "arcgis": "https://geoenrich.arcgis.com/arcgis/rest/services/World/geoenrichmentserver/GeoEnrichment/enrich",
+    "census": "https://api.census.gov/data",
+    "census_geocoder": "https://geocoding.geo.census.gov/geocoder",
+    "mapbox": "https://api.mapbox.com",
+}
+
+
+@dataclass
+class _Route:
+    provider: str               # latency bucket
+    fixture: str                # fixture file stem
+    upstream: str               # key into UPSTREAM_URLS
+    recenter: Optional[str] = None  # point payloads: "attom" (lattice) / "mapbox" (re-centred)
+
+
+# Stand-in path prefix -> route. Base URL settings point at these prefixes.
+ROUTES = {
+    "/attom/property/snapshot": _Route("attom", "attom_snapshot", "attom", recenter="attom"),
+    "/arcgis/enrich": _Route("arcgis", "arcgis_enrich", "arcgis"),
+    "/census/2022/acs/acs5": _Route("census", "census_acs", "census"),
+    "/census/2021/cbp": _Route("census", "census_cbp", "census"),
+    "/census-geocoder/geographies/coordinates": _Route("census", "census_geocoder", "census_geocoder"),
+    "/mapbox/search/searchbox/v1/category/": _Route("mapbox", "mapbox_category", "mapbox", recenter="mapbox"),
+}
+
+# Upstream path for a stand-in path (strip the provider prefix)
+_PREFIXES = {"attom": "/attom", "arcgis": "/arcgis", "census": "/census",
+             "census_geocoder": "/census-geocoder", "mapbox": "/mapbox"}
+
+
+def standin_settings(base_url: str) -> dict[str, str]:
+    """Settings overrides (env var -> URL) that point the app at a stand-in server."""
+    return {
+        "ATTOM_BASE_URL": f"{base_url}/attom",
+        "ARCGIS_GEOENRICH_URL": f"{base_url}/arcgis/enrich",
+        "CENSUS_API_BASE_URL": f"{base_url}/census",
+        "CENSUS_GEOCODER_URL": f"{base_url}/census-geocoder",
+        "MAPBOX_API_BASE_URL": f"{base_url}/mapbox",
+    }
+
+
+def parse_latency(spec: str) -> dict[str, float]:
+    """Parse "attom=250,arcgis=400" (ms); a bare number applies to every provider."""
+    latency = dict(DEFAULT_LATENCY_MS)
+    if not spec:
+        return latency
+    for part in spec.split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            latency = {provider: float(name) for provider in latency}
+        elif name.strip() in latency:
+            latency[name.strip()] = float(value)
+        else:
+            raise ValueError(f"Unknown provider '{name}' (expected one of {', '.join(latency)})")
+    return latency
+
+
+@dataclass
+class StandinStats:
+    """Request counts per provider (for checking cache effectiveness)."""
+    requests: dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, provider: str):
+        with self.lock:
+            self.requests[provider] = self.requests.get(provider, 0) + 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self.lock:
+            return dict(self.requests)
+
+
+def _fixture_center(payload: dict) -> tuple[float, float]:
+    """Mean (lat, lng) of a GeoJSON fixture's features."""
+    points = [
+        (f["geometry"]["coordinates"][1], f["geometry"]["coordinates"][0])
+        for f in payload.get("features", [])
+    ]
+    if not points:
+        return 0.0, 0.0
+    return sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points)
+
+
+def _fixture_extent(payload: dict) -> tuple[float, float, float, float]:
+    """(min_lat, min_lng, lat_span, lng_span) of an ATTOM fixture's properties."""
+    lats = [float(p["location"]["latitude"]) for p in payload.get("property", []) if p.get("location", {}).get("latitude")]
+    lngs = [float(p["location"]["longitude"]) for p in payload.get("property", []) if p.get("location", {}).get("longitude")]
+    if not lats:
+        return 0.0, 0.0, 1.0, 1.0
+    return min(lats), min(lngs), max(max(lats) - min(lats), 1e-3), max(max(lngs) - min(lngs), 1e-3)
+
+
+def _attom_lattice(payload: dict, extent: tuple[float, float, float, float], params: dict[str, list[str]]) -> dict:
+    """ATTOM snapshot response for a radius search over the fixture repeated on a lattice."""
+    lat, lng = float(params["latitude"][0]), float(params["longitude"][0])
+    radius = float(params.get("radius", ["5"])[0])
+    pagesize = int(params.get("pagesize", ["100"])[0])
+    indicators = set(params["propertyindicator"][0].split("|")) if "propertyindicator" in params else None
+    min_lat, min_lng, lat_span, lng_span = extent
+
+    dlat = radius / 69.0
+    dlng = radius / (69.0 * max(math.cos(math.radians(lat)), 0.01))
+    rows = range(math.floor((lat - dlat - min_lat) / lat_span), math.floor((lat + dlat - min_lat) / lat_span) + 1)
+    cols = range(math.floor((lng - dlng - min_lng) / lng_span), math.floor((lng + dlng - min_lng) / lng_span) + 1)
+
+    matches = []
+    for prop in payload.get("property", []):
+        loc = prop.get("location", {})
+        if not loc.get("latitude"):
+            continue
+        if indicators and str(prop.get("summary", {}).get("propIndicator")) not in indicators:
+            continue
+        for r in rows:
+            for c in cols:
+                plat = float(loc["latitude"]) + r * lat_span
+                plng = float(loc["longitude"]) + c * lng_span
+                miles = math.hypot(plat - lat, (plng - lng) * math.cos(math.radians(lat))) * 69.0
+                if miles <= radius:
+                    matches.append((miles, r, c, prop))
+    matches.sort(key=lambda m: m[0])
+
+    properties = []
+    for miles, r, c, prop in matches[:pagesize]:
+        prop = json.loads(json.dumps(prop))
+        loc = prop["location"]
+        loc["latitude"] = f"{float(loc['latitude']) + r * lat_span:.6f}"
+        loc["longitude"] = f"{float(loc['longitude']) + c * lng_span:.6f}"
+        identifier = prop.setdefault("identifier", {})
+        identifier["attomId"] = f"{identifier.get('attomId', id(prop))}-{r}-{c}"
+        properties.append(prop)
+    return {**{k: v for k, v in payload.items() if k != "property"}, "property": properties}
+
+
+def _recenter(payload, center: tuple[float, float], lat: float, lng: float):
+    """Copy of a GeoJSON payload translated from its recorded center to (lat, lng)."""
+    dlat, dlng = lat - center[0], lng - center[1]
+    payload = json.loads(json.dumps(payload))
+    for feature in payload.get("features", []):
+        coords = feature["geometry"]["coordinates"]
+        feature["geometry"]["coordinates"] = [coords[0] + dlng, coords[1] + dlat]
+        # Distinct IDs per location so merges/dedup behave like real data
+        props = feature.get("properties", {})
+        props["mapbox_id"] = f"{props.get('mapbox_id', '')}-{lat:.3f}-{lng:.3f}"
+    return payload
+
+
+class StandinServer:
+    """Threaded HTTP server replaying (or recording) upstream fixtures."""
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency_ms: Optional[dict[str, float]] = None,
+        jitter: float = DEFAULT_JITTER,
+        record: bool = False,
+        fixtures_dir: Path = FIXTURES_DIR,
+    ):
+        self.latency_ms = latency_ms or dict(DEFAULT_LATENCY_MS)
+        self.jitter = jitter
+        self.record = record
+        self.fixtures_dir = fixtures_dir
+        self.stats = StandinStats()
+        self._fixtures: dict[str, object] = {}
+        self._centers: dict[str, tuple[float, float]] = {}
+        self._extents: dict[str, tuple[float, float, float, float]] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandinServer":
+        if not self.record:
+            for route in ROUTES.values():
+                self._load_fixture(route)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Upstream stand-ins listening on {self.base_url} ({'record' if self.record else 'replay'} mode)")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _load_fixture(self, route: _Route):
+        if route.fixture not in self._fixtures:
+            with open(self.fixtures_dir / f"{route.fixture}.json") as f:
+                payload = json.load(f)
+            self._fixtures[route.fixture] = payload
+            if route.recenter == "attom":
+                self._extents[route.fixture] = _fixture_extent(payload)
+            elif route.recenter:
+                self._centers[route.fixture] = _fixture_center(payload)
+        return self._fixtures[route.fixture]
+
+    def _delay(self, provider: str):
+        base = self.latency_ms.get(provider, 0.0)
+        if base > 0:
+            time.sleep(max(0.0, base * (1 + random.uniform(-self.jitter, self.jitter))) / 1000)
+
+    def _replay(self, route: _Route, params: dict[str, list[str]]) -> tuple[int, bytes]:
+        payload = self._load_fixture(route)
+        if route.recenter == "attom":
+            payload = _attom_lattice(payload, self._extents[route.fixture], params)
+        elif route.recenter:
+            lng, lat = (float(v) for v in params["proximity"][0].split(","))
+            payload = _recenter(payload, self._centers[route.fixture], lat, lng)
+        return 200, json.dumps(payload).encode()
+
+    def _proxy(self, route: _Route, method: str, path: str, query: str, body: bytes, headers) -> tuple[int, bytes]:
+        """Record mode: forward to the real API and save a successful response as the fixture."""
+        upstream_path = path[len(_PREFIXES[route.upstream]):]
+        if route.upstream == "arcgis":
+            upstream_path = ""
+        url = UPSTREAM_URLS[route.upstream] + upstream_path + (f"?{query}" if query else "")
+        forward = {k: v for k, v in headers.items() if k.lower() in ("apikey", "accept", "content-type")}
+        response = httpx.request(method, url, content=body or None, headers=forward, timeout=60.0)
+        if response.status_code == 200:
+            with open(self.fixtures_dir / f"{route.fixture}.json", "w") as f:
+                json.dump(response.json(), f, indent=1)
+                f.write("\n")
+            logger.info(f"Recorded {route.fixture}.json from {url.split('?')[0]}")
+        return response.status_code, response.content
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self, method: str):
+                parts = urlsplit(self.path)
+                route = next((r for prefix, r in ROUTES.items() if parts.path.startswith(prefix)), None)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if route is None:
+                    self._send(404, b'{"error": "no stand-in for this path"}')
+                    return
+
+                server.stats.record(route.provider)
+                try:
+                    if server.record:
+                        status, content = server._proxy(route, method, parts.path, parts.query, body, self.headers)
+                    else:
+                        server._delay(route.provider)
+                        status, content = server._replay(route, parse_qs(parts.query))
+                except Exception as e:
+                    logger.warning(f"Stand-in error for {parts.path}: {e}")
+                    status, content = 502, json.dumps({"error": str(e)}).encode()
+                self._send(status, content)
+
+            def _send(self, status: int, content: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded upstream API payloads locally")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="", help='Per-provider ms, e.g. "attom=250,arcgis=400" or "0"')
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="Latency jitter fraction")
+    parser.add_argument("--record", action="store_true", help="Proxy to the real APIs and save fixtures")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    server = StandinServer(args.port, parse_latency(args.latency), args.jitter, args.record).start()
+    print("Point the app at the stand-ins with:")
+    for name, value in standin_settings(server.base_url).items():
+        print(f"  export {name}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
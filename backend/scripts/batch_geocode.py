@@ -14,12 +14,16 @@ import argparse
 import csv
 import logging
 import sys
-import time
 from io import StringIO
 from pathlib import Path
 
 import requests
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.rate_limits import get_rate_limiter
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -115,6 +119,7 @@ def geocode_batch(addresses: list[dict]) -> dict[str, tuple]:
     }
 
     try:
+        get_rate_limiter("census_geocoder").acquire_blocking()
         response = requests.post(
             CENSUS_GEOCODER_URL,
             files=files,
@@ -188,10 +193,6 @@ def process_csv_file(csv_path: Path, output_path: Path) -> dict:
 
         logger.info(f"Batch {batch_num}: {len(results)} matches")
 
-        # Small delay between batches to be nice to the API
-        if i + BATCH_SIZE < len(addresses):
-            time.sleep(1)
-
     stats['matched'] = len(all_results)
     stats['unmatched'] = stats['total'] - stats['matched']
 
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Build the summed-area population raster from census_tract_parts.
+
+Rasterizes every tract of the target states into CELL_METERS cells
+(dasymetric allocation, see app/services/population_raster.py) and writes
+memory-mapped summed-area tables under POPULATION_RASTER_PATH. Bulk ring
+demographics use it when DEMOGRAPHICS_FAST_MODE is on. Build census_tract_parts
+for the states first; re-run after reloading acs_tract_values or rebuilding
+census_tract_parts.
+
+Usage:
+    python scripts/build_population_raster.py
+    python scripts/build_population_raster.py --state NV
+    python scripts/build_population_raster.py --cell-meters 250 --dasymetric-weight 0
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.population_raster import CELL_METERS, DASYMETRIC_WEIGHT, build_population_raster
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the population raster for the target states")
+    parser.add_argument("--state", action="append", default=[],
+                        help="State abbreviation or FIPS to build (repeatable; default: all target states)")
+    parser.add_argument("--cell-meters", type=float, default=CELL_METERS,
+                        help=f"Cell size in meters (default: {CELL_METERS:g})")
+    parser.add_argument("--dasymetric-weight", type=float, default=DASYMETRIC_WEIGHT,
+                        help=f"Share allocated by parcel density, 0 for area only (default: {DASYMETRIC_WEIGHT:g})")
+    args = parser.parse_args()
+
+    result = build_population_raster(args.state, args.cell_meters, args.dasymetric_weight)
+
+    print("\n=== Population Raster Summary ===")
+    for state, entry in sorted(result["states"].items()):
+        print(f"    state {state}: {entry['rows']}x{entry['cols']} cells, "
+              f"{entry['tracts']} tracts, population {entry['population']:,}")
+    print(f"  Path:     {result['path']}")
+    print(f"  Elapsed:  {result['elapsed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
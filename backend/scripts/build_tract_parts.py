@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Build the subdivided census_tract_parts table from census_tracts.
+
+Simplifies, reprojects (equal-area) and ST_Subdivides every tract of the
+target states into a state-partitioned table with GiST indexes. Ring
+demographics use it automatically once it exists. Re-run after reloading
+census_tracts; each state's partition is replaced on its own.
+
+Usage:
+    python scripts/build_tract_parts.py
+    python scripts/build_tract_parts.py --state NV --state ID
+    python scripts/build_tract_parts.py --max-vertices 128 --simplify-meters 10
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.tract_parts import MAX_VERTICES, SIMPLIFY_METERS, build_tract_parts
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build census_tract_parts for the target states")
+    parser.add_argument("--state", action="append", default=[],
+                        help="State abbreviation or FIPS to build (repeatable; default: all target states)")
+    parser.add_argument("--max-vertices", type=int, default=MAX_VERTICES,
+                        help=f"ST_Subdivide vertex limit per part (default: {MAX_VERTICES})")
+    parser.add_argument("--simplify-meters", type=float, default=SIMPLIFY_METERS,
+                        help=f"Simplification tolerance in meters, 0 to disable (default: {SIMPLIFY_METERS:g})")
+    args = parser.parse_args()
+
+    result = build_tract_parts(args.state, args.max_vertices, args.simplify_meters)
+
+    print("\n=== Tract Parts Summary ===")
+    for state, count in sorted(result["parts"].items()):
+        print(f"    state {state}: {count} parts")
+    print(f"  Max vertices: {result['max_vertices']}")
+    print(f"  Simplify:     {result['simplify_meters']:g} m")
+    print(f"  Elapsed:      {result['elapsed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
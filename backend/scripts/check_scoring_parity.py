@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Parity check: vectorized opportunity scoring vs. the scalar reference.
+
+Generates random candidates (plus every tier boundary value) and checks that
+score_priority_batch() returns exactly the scores of _calculate_priority_rank()
+and that top_k_indices() reproduces the endpoint's stable sort order.
+No database or API keys needed.
+
+Usage:
+    python scripts/check_scoring_parity.py
+    python scripts/check_scoring_parity.py --candidates 200000 --seed 7
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.attom import OpportunitySignal, PropertyListing, PropertySource, PropertyType
+from app.services.opportunity_scoring import (
+    STATE_DENSITY_BASELINES,
+    _calculate_priority_rank,
+    build_scoring_features,
+    score_priority_batch,
+    top_k_indices,
+)
+
+# Tier thresholds, so boundary behaviour (<= vs <, half-even rounding) is exercised
+DISTANCE_EDGES = [0.0, 0.15, 0.325, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 5.0, 6.5, 8.0, 10.0, 12.0, 15.0, 900.0, 999.0]
+DENSITY_RATIO_EDGES = [0, 2, 5, 10, 20, 50]
+INCOME_EDGES = [0, 40000, 50000, 60000, 70000, 80000]
+LOT_EDGES = [0, 0.8, 1.2, 2.0, 3.0]
+SQFT_EDGES = [0, 2500, 3500, 6000, 8000]
+SIGNAL_TYPES = ["vacant_property", "distress", "tax_delinquent", "absentee_owner", "long_term_owner"]
+LAND_USES = [None, "Retail Store", "Vacant Commercial", "Former bank building", "Office", "For Lease"]
+STATES = [s for s in STATE_DENSITY_BASELINES if s != "_default"] + ["TX", ""]
+
+
+def _maybe(rng: random.Random, value, p_none: float = 0.15):
+    return None if rng.random() < p_none else value
+
+
+def _distance(rng: random.Random):
+    return _maybe(rng, rng.choice(DISTANCE_EDGES) if rng.random() < 0.3 else round(rng.uniform(0, 20), 2))
+
+
+def _random_candidate(rng: random.Random, i: int) -> tuple[PropertyListing, dict]:
+    state = rng.choice(STATES)
+    baseline = STATE_DENSITY_BASELINES.get(state.upper(), STATE_DENSITY_BASELINES["_default"])
+    listing = PropertyListing(
+        id=f"p{i}",
+        address=f"{i} Main St",
+        city="Test",
+        state=state,
+        latitude=41.6,
+        longitude=-93.6,
+        property_type=rng.choice([PropertyType.RETAIL, PropertyType.OFFICE, PropertyType.LAND]),
+        source=rng.choice(list(PropertySource)),
+        sqft=_maybe(rng, rng.choice(SQFT_EDGES) if rng.random() < 0.3 else rng.uniform(500, 12000)),
+        lot_size_acres=_maybe(rng, rng.choice(LOT_EDGES) if rng.random() < 0.3 else rng.uniform(0.1, 4)),
+        land_use=rng.choice(LAND_USES),
+        transaction_type=rng.choice([None, "lease", "sale"]),
+        opportunity_signals=[
+            OpportunitySignal(signal_type=t, description=t, strength="medium")
+            for t in SIGNAL_TYPES if rng.random() < 0.3
+        ],
+    )
+
+    def density():
+        if rng.random() < 0.3:
+            return float(rng.choice(DENSITY_RATIO_EDGES) * baseline)
+        return round(rng.uniform(0, 60 * baseline), 1)
+
+    inputs = {
+        "nearest_corporate_distance": _distance(rng),
+        "nearest_retail_node_distance": _distance(rng),
+        "nearest_vz_family_distance": _distance(rng),
+        "area_density_1mi": _maybe(rng, density(), 0.3),
+        "area_density_3mi": _maybe(rng, density(), 0.3),
+        "area_income_3mi": _maybe(rng, rng.choice(INCOME_EDGES) if rng.random() < 0.3 else rng.randint(20000, 120000)),
+    }
+    return listing, inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check vectorized vs scalar opportunity scoring")
+    parser.add_argument("--candidates", type=int, default=50000, help="Random candidates to score")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--limit", type=int, default=100, help="Top-K to compare ranking order")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    candidates = [_random_candidate(rng, i) for i in range(args.candidates)]
+    listings = [listing for listing, _ in candidates]
+
+    scalar_scores = [_calculate_priority_rank(listing, **inputs)[0] for listing, inputs in candidates]
+    features = build_scoring_features(
+        listings,
+        **{key: [inputs[key] for _, inputs in candidates] for key in candidates[0][1]},
+    )
+    batch_scores = score_priority_batch(features)
+
+    mismatches = [i for i, (a, b) in enumerate(zip(scalar_scores, batch_scores.tolist())) if a != b]
+    if mismatches:
+        print(f"FAIL: {len(mismatches)} of {len(candidates)} scores differ")
+        for i in mismatches[:10]:
+            listing, inputs = candidates[i]
+            print(f"  {listing.id}: scalar={scalar_scores[i]} batch={int(batch_scores[i])} inputs={inputs}")
+        return 1
+
+    expected_order = sorted(range(len(candidates)), key=lambda i: scalar_scores[i], reverse=True)[:args.limit]
+    actual_order = top_k_indices(batch_scores, args.limit).tolist()
+    if expected_order != actual_order:
+        print("FAIL: top-K ranking order differs from stable scalar sort")
+        return 1
+
+    print(f"OK: {len(candidates)} candidates, scores and top-{args.limit} order identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
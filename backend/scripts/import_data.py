@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.core.database import SessionLocal
 from app.services.data_import import import_all_competitors, import_csv_to_db, BRAND_FILE_MAPPING
+from app.services.opportunity_score_job import request_score_refresh
 
 
 def main():
@@ -73,6 +74,10 @@ def main():
 
         else:
             parser.print_help()
+            return
+
+        # New stores change nearest-store distances in materialized opportunity scores
+        request_score_refresh()
 
     finally:
         db.close()
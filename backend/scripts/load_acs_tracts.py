@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Bulk-load ACS 5-Year tract estimates into acs_tract_values.
+
+Loads every target state in one bulk write (a single COPY on PostgreSQL),
+after which ring demographics are one PostGIS query with no Census API calls.
+
+Usage:
+    python scripts/load_acs_tracts.py --fetch
+    python scripts/load_acs_tracts.py --fetch --state IA --state NE
+    python scripts/load_acs_tracts.py --api-dump data/acs_ia.json --api-dump data/acs_ne.json
+    python scripts/load_acs_tracts.py --summary-dir data/acs5y2022_tables
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import engine
+from app.models.acs_tract_value import AcsTractValue
+from app.services.acs_loader import (
+    fetch_states,
+    load_acs_tract_values,
+    read_api_dumps,
+    read_summary_files,
+    target_state_fips,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load ACS tract values for the target states")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fetch", action="store_true", help="Fetch each state from the Census API")
+    source.add_argument("--api-dump", type=Path, action="append", help="Saved Census API JSON response (repeatable)")
+    source.add_argument("--summary-dir", type=Path, help="Directory of ACS Table-based Summary File .dat tables")
+    parser.add_argument("--state", action="append", default=[],
+                        help="State abbreviation or FIPS to load (repeatable; default: all target states)")
+    args = parser.parse_args()
+
+    states = target_state_fips(args.state)
+    if args.fetch:
+        records = asyncio.run(fetch_states(states))
+    elif args.api_dump:
+        records = {g: r for g, r in read_api_dumps(args.api_dump).items() if r["statefp"] in states}
+    else:
+        records = read_summary_files(args.summary_dir, states)
+
+    AcsTractValue.__table__.create(bind=engine, checkfirst=True)
+    result = load_acs_tract_values(records)
+
+    print("\n=== ACS Load Summary ===")
+    print(f"  Tracts:   {result['tracts']}")
+    for state, count in sorted(result["states"].items()):
+        print(f"    state {state}: {count}")
+    print(f"  Method:   {result['method']}")
+    print(f"  Elapsed:  {result['elapsed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Preload the persistent Census response store for whole states.
+
+Fetches ACS 5-Year tract values and County Business Patterns county totals
+with one API call per dataset per state and stores them in census_responses,
+so demographics for those states no longer call api.census.gov. The vintages
+are fixed, so this only needs to run once per database (rerunning replaces
+the stored rows).
+
+Usage:
+    python scripts/preload_census.py
+    python scripts/preload_census.py --state IA --state NE
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import engine
+from app.models.census_response import CensusResponse
+from app.services.census_store import TARGET_STATE_FIPS, preload_states
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preload Census ACS/CBP responses for whole states")
+    parser.add_argument("--state", action="append", default=[],
+                        help=f"State abbreviation (repeatable; default: {', '.join(TARGET_STATE_FIPS)})")
+    args = parser.parse_args()
+
+    CensusResponse.__table__.create(bind=engine, checkfirst=True)
+    result = asyncio.run(preload_states([s.upper() for s in args.state] or None))
+
+    print("\n=== Census Preload Summary ===")
+    for state, counts in result.items():
+        print(f"  {state}: {counts['tracts']} tracts, {counts['counties']} counties")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Recompute materialized opportunity scores for local county properties.
+
+Incremental by default: only properties with no score, a changed record, or
+out-of-date store / ACS / anchor inputs are rescored.
+
+Usage:
+    python scripts/refresh_opportunity_scores.py
+    python scripts/refresh_opportunity_scores.py --county "Polk County, IA"
+    python scripts/refresh_opportunity_scores.py --full
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import Base, engine
+from app.models.county_property import CountyProperty  # noqa: F401 (FK target)
+from app.models.opportunity_score import OpportunityScore  # noqa: F401
+from app.services.opportunity_score_job import refresh_opportunity_scores
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh materialized opportunity scores")
+    parser.add_argument("--county", type=str, help='Only refresh one county (e.g. "Polk County, IA")')
+    parser.add_argument("--full", action="store_true", help="Rescore every property, not just stale rows")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    result = asyncio.run(refresh_opportunity_scores(source_county=args.county, full=args.full))
+
+    print("\n=== Score Refresh Summary ===")
+    print(f"  Properties refreshed: {result['properties_refreshed']}")
+    print(f"  Scored (eligible):    {result['scored']}")
+    print(f"  Ineligible:           {result['ineligible']}")
+    print(f"  Score version:        {result['score_version']}")
+    print(f"  Elapsed:              {result['elapsed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,6 @@ Requires GOOGLE_PLACES_API_KEY environment variable.
 
 import os
 import sys
-import time
 import requests
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
@@ -19,6 +18,7 @@ from sqlalchemy.orm import sessionmaker
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.config import settings
+from app.utils.rate_limits import get_rate_limiter
 
 
 def geocode_address(address: str, api_key: str) -> tuple[float, float] | None:
@@ -33,6 +33,7 @@ def geocode_address(address: str, api_key: str) -> tuple[float, float] | None:
     }
 
     try:
+        get_rate_limiter("google").acquire_blocking()
         response = requests.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
@@ -131,9 +132,6 @@ def main():
             else:
                 failed += 1
 
-            # Rate limiting - Google allows 50 QPS but let's be conservative
-            time.sleep(0.1)
-
             # Commit every 100 stores
             if (i + 1) % 100 == 0:
                 session.commit()
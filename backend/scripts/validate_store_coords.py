@@ -19,7 +19,6 @@ Requires GOOGLE_PLACES_API_KEY environment variable for re-geocoding.
 
 import os
 import sys
-import time
 import argparse
 import json
 import math
@@ -33,6 +32,7 @@ from sqlalchemy.orm import sessionmaker
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.config import settings
+from app.utils.rate_limits import get_rate_limiter
 
 
 # Continental US bounding box (approximate)
@@ -74,6 +74,7 @@ def geocode_address(address: str, api_key: str) -> Optional[tuple[float, float]]
     }
 
     try:
+        get_rate_limiter("google").acquire_blocking()
         response = requests.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
@@ -277,9 +278,6 @@ def main():
                         "address": address,
                     })
 
-                # Rate limiting
-                time.sleep(0.1)
-
         # Commit fixes
         if args.fix and fixed > 0:
             session.commit()
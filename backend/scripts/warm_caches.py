@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Warm the upstream-data caches for the target markets.
+
+Fills the shared L2 cache tier (CACHE_L2_BACKEND), so running this from cron
+before business hours warms every API worker reading the same L2. Fresh
+entries are skipped; provider spacing and call budgets come from the
+CACHE_WARM_* settings.
+
+Usage:
+    python scripts/warm_caches.py
+    python scripts/warm_caches.py --city "Boise, ID" --city "Omaha, NE"
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.cache_warmer import warm_caches
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm caches for the target markets")
+    parser.add_argument("--city", action="append", default=[],
+                        help='Only warm this market (repeatable, e.g. "Boise, ID")')
+    args = parser.parse_args()
+
+    cities = None
+    if args.city:
+        cities = []
+        for value in args.city:
+            city, _, state = value.rpartition(",")
+            if not city:
+                parser.error(f'expected "City, ST", got "{value}"')
+            cities.append((city.strip(), state.strip().upper()))
+
+    result = asyncio.run(warm_caches(cities))
+
+    print("\n=== Cache Warm Summary ===")
+    print(f"  Markets:  {result['markets']} ({', '.join(result['states'])})")
+    for stage, counts in result["counts"].items():
+        print(f"  {stage:<13} " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    print(f"  Calls:    {result['calls']}")
+    print(f"  Elapsed:  {result['elapsed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
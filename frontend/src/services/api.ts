@@ -527,11 +527,31 @@ export const listingsApi = {
 // Opportunities API (CSOKi-filtered ATTOM properties)
 // ============================================
 
+// Last response per search body, revalidated with If-None-Match (server returns 304 if unchanged)
+const opportunitySearchCache = new Map<string, { etag: string; data: OpportunitySearchResponse }>();
+const OPPORTUNITY_SEARCH_CACHE_MAX = 50;
+
 export const opportunitiesApi = {
   // Search for CSOKi-qualified property opportunities
   search: async (request: OpportunitySearchRequest): Promise<OpportunitySearchResponse> => {
-    const { data } = await api.post('/opportunities/search', request);
-    return data;
+    const key = JSON.stringify(request);
+    const cached = opportunitySearchCache.get(key);
+    const response = await api.post('/opportunities/search', request, {
+      headers: cached ? { 'If-None-Match': cached.etag } : undefined,
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
+    if (response.status === 304 && cached) {
+      return cached.data;
+    }
+    const etag = response.headers['etag'];
+    if (etag) {
+      opportunitySearchCache.delete(key);
+      opportunitySearchCache.set(key, { etag, data: response.data });
+      if (opportunitySearchCache.size > OPPORTUNITY_SEARCH_CACHE_MAX) {
+        opportunitySearchCache.delete(opportunitySearchCache.keys().next().value as string);
+      }
+    }
+    return response.data;
   },
 
   // Get opportunity statistics and metadata